@@ -40,6 +40,8 @@ def create_argument_parser() -> argparse.ArgumentParser:
     argument_parser = argparse.ArgumentParser()
     argument_parser.add_argument("--simulate", action = "store_true",
         help = "perform a test run, without writing changes")
+    argument_parser.add_argument("--jobs", type = int, default = 1,
+        metavar = "<count>", help = "set the number of processes to use for the commands supporting it (default: 1, without additional processes)")
     argument_parser.add_argument("--verbosity", choices = logging_helpers.all_log_levels,
         metavar = "<level>", help = "set the logging level (%s)" % ", ".join(logging_helpers.all_log_levels))
     argument_parser.add_argument("--log-file",
@@ -24,6 +24,10 @@ class ConvertMarkdownToOdtCommand(ApplicationCommand):
             metavar = "<path>", help = "path to the markdown document (set this or definition)")
         argument_parser.add_argument("--destination", required = True,
             metavar = "<path>", help = "path to the odt document to create")
+        argument_parser.add_argument("--cache",
+            metavar = "<path>", help = "path to the directory where to cache the converted source documents")
+        argument_parser.add_argument("--cache-size-limit", type = int,
+            metavar = "<megabytes>", help = "set the maximum size of the cache, least recently used entries being evicted beyond it (default: 512)")
         argument_parser.add_argument("--overwrite", action = "store_true",
             help = "overwrite the destination file in case it already exists")
 
@@ -46,6 +50,9 @@ class ConvertMarkdownToOdtCommand(ApplicationCommand):
             definition_file_path = os.path.normpath(arguments.definition) if arguments.definition is not None else None,
             source_file_path = os.path.normpath(arguments.source) if arguments.source is not None else None,
             destination_file_path = os.path.normpath(arguments.destination),
+            cache_directory = os.path.normpath(arguments.cache) if arguments.cache is not None else None,
+            cache_size_limit = arguments.cache_size_limit * 1024 * 1024 if arguments.cache_size_limit is not None else None,
+            job_count = arguments.jobs,
             overwrite = arguments.overwrite,
             simulate = simulate)
 
@@ -35,6 +35,10 @@ class ConvertOdtToEpubCommand(ApplicationCommand):
             metavar = "<path>", help = "path to the directory where to create the intermediate files")
         argument_parser.add_argument("--extra", nargs = "*", type = parse_key_value_parameter, default = [],
             metavar = "<key=value>", help = "provide extra information as key value pairs")
+        argument_parser.add_argument("--cache",
+            metavar = "<path>", help = "path to the directory where to cache the converted source documents")
+        argument_parser.add_argument("--cache-size-limit", type = int,
+            metavar = "<megabytes>", help = "set the maximum size of the cache, least recently used entries being evicted beyond it (default: 512)")
         argument_parser.add_argument("--overwrite", action = "store_true",
             help = "overwrite the destination file or directory in case it already exists")
 
@@ -53,6 +57,9 @@ class ConvertOdtToEpubCommand(ApplicationCommand):
             destination_file_path = os.path.normpath(arguments.destination),
             intermediate_directory = os.path.normpath(arguments.intermediate),
             extra_information = dict(arguments.extra),
+            cache_directory = os.path.normpath(arguments.cache) if arguments.cache is not None else None,
+            cache_size_limit = arguments.cache_size_limit * 1024 * 1024 if arguments.cache_size_limit is not None else None,
+            job_count = arguments.jobs,
             overwrite = arguments.overwrite,
             simulate = simulate)
 
@@ -25,6 +25,14 @@ class ConvertOdtToMarkdownCommand(ApplicationCommand):
             metavar = "<path>", help = "path to the document or directory to create")
         argument_parser.add_argument("--single-file", action = "store_true",
             help = "write the document as a single file")
+        argument_parser.add_argument("--cache",
+            metavar = "<path>", help = "path to the directory where to cache the converted source documents")
+        argument_parser.add_argument("--cache-size-limit", type = int,
+            metavar = "<megabytes>", help = "set the maximum size of the cache, least recently used entries being evicted beyond it (default: 512)")
+        argument_parser.add_argument("--write-threads", type = int, default = 0,
+            metavar = "<count>", help = "set the number of threads to write the output files with (default: 0, from the main thread)")
+        argument_parser.add_argument("--skip-unchanged", action = "store_true",
+            help = "update the destination in place, leaving untouched the files whose content did not change")
         argument_parser.add_argument("--overwrite", action = "store_true",
             help = "overwrite the destination file or directory in case it already exists")
 
@@ -42,6 +50,11 @@ class ConvertOdtToMarkdownCommand(ApplicationCommand):
             source_file_path = os.path.normpath(arguments.source) if arguments.source is not None else None,
             destination_file_path_or_directory = os.path.normpath(arguments.destination),
             write_as_single_file = arguments.single_file,
+            cache_directory = os.path.normpath(arguments.cache) if arguments.cache is not None else None,
+            cache_size_limit = arguments.cache_size_limit * 1024 * 1024 if arguments.cache_size_limit is not None else None,
+            job_count = arguments.jobs,
+            write_thread_count = arguments.write_threads,
+            skip_unchanged = arguments.skip_unchanged,
             overwrite = arguments.overwrite,
             simulate = simulate)
 
@@ -16,6 +16,8 @@ class GenerateEpubFilesCommand(ApplicationCommand):
         argument_parser = subparsers.add_parser("generate-epub-files", help = "generate files for an epub package")
         argument_parser.add_argument("--configuration", required = True, metavar = "<path>", help = "path to the epub configuration")
         argument_parser.add_argument("--destination", required = True, metavar = "<path>", help = "path to the directory where to create the new files")
+        argument_parser.add_argument("--cache",
+            metavar = "<path>", help = "path to the directory where to cache the titles of the content files")
         argument_parser.add_argument("--overwrite", action = "store_true", help = "overwrite the files if they exist")
 
         return argument_parser
@@ -30,6 +32,7 @@ class GenerateEpubFilesCommand(ApplicationCommand):
             serializer = create_serializer(os.path.splitext(arguments.configuration)[1].lstrip(".")),
             configuration_file_path = os.path.normpath(arguments.configuration),
             destination_directory = os.path.normpath(arguments.destination),
+            cache_directory = os.path.normpath(arguments.cache) if arguments.cache is not None else None,
             overwrite = arguments.overwrite,
             simulate = simulate)
 
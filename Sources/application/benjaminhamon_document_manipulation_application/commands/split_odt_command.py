@@ -19,6 +19,11 @@ class SplitOdtCommand(ApplicationCommand):
         argument_parser.add_argument("--source", required = True, metavar = "<path>", help = "path to the odt or fodt file to use as the source")
         argument_parser.add_argument("--destination", required = True, metavar = "<path>", help = "path to the directory where to create the new fodt files")
         argument_parser.add_argument("--template", metavar = "<path>", help = "path to the fodt file to use as the template")
+        argument_parser.add_argument("--cache", metavar = "<path>", help = "path to the directory where to cache the digests of the output files")
+        argument_parser.add_argument("--write-threads", type = int, default = 0,
+            metavar = "<count>", help = "set the number of threads to write the output files with (default: 0, from the main thread)")
+        argument_parser.add_argument("--skip-unchanged", action = "store_true",
+            help = "update the destination in place, leaving untouched the files whose content did not change")
         argument_parser.add_argument("--overwrite", action = "store_true", help = "overwrite the destination if it exists")
 
         return argument_parser
@@ -33,6 +38,10 @@ class SplitOdtCommand(ApplicationCommand):
             source_file_path = os.path.normpath(arguments.source),
             destination_directory = os.path.normpath(arguments.destination),
             template_file_path = os.path.normpath(arguments.template) if arguments.template is not None else None,
+            cache_directory = os.path.normpath(arguments.cache) if arguments.cache is not None else None,
+            job_count = arguments.jobs,
+            write_thread_count = arguments.write_threads,
+            skip_unchanged = arguments.skip_unchanged,
             overwrite = arguments.overwrite,
             simulate = simulate)
 
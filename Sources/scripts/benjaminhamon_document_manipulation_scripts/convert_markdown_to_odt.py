@@ -1,8 +1,9 @@
 # cspell:words fodt lxml
 
 import argparse
+import functools
 import os
-from typing import Optional
+from typing import Callable, Optional
 
 import lxml.etree
 import lxml.html.html5parser
@@ -41,6 +42,9 @@ def main() -> None:
         definition_file_path = os.path.normpath(arguments.definition) if arguments.definition is not None else None,
         source_file_path = os.path.normpath(arguments.source) if arguments.source is not None else None,
         destination_file_path = os.path.normpath(arguments.destination),
+        cache_directory = os.path.normpath(arguments.cache) if arguments.cache is not None else None,
+        cache_size_limit = arguments.cache_size_limit * 1024 * 1024 if arguments.cache_size_limit is not None else None,
+        job_count = arguments.jobs,
         overwrite = arguments.overwrite)
 
 
@@ -55,6 +59,12 @@ def parse_arguments() -> argparse.Namespace:
         metavar = "<path>", help = "path to the markdown document (set this or definition)")
     argument_parser.add_argument("--destination", required = True,
         metavar = "<path>", help = "path to the odt document to create")
+    argument_parser.add_argument("--cache",
+        metavar = "<path>", help = "path to the directory where to cache the converted source documents")
+    argument_parser.add_argument("--cache-size-limit", type = int,
+        metavar = "<megabytes>", help = "set the maximum size of the cache, least recently used entries being evicted beyond it (default: 512)")
+    argument_parser.add_argument("--jobs", type = int, default = 1,
+        metavar = "<count>", help = "set the number of processes to load the source files with (default: 1, without additional processes)")
     argument_parser.add_argument("--overwrite", action = "store_true",
         help = "overwrite the destination file or directory in case it already exists")
 
@@ -73,12 +83,22 @@ def create_serializer(serialization_type: str) -> Serializer:
     return serializer
 
 
+def create_document_reader(cache_directory: Optional[str] = None, cache_size_limit: Optional[int] = None) -> DocumentReader:
+    html_parser = lxml.html.html5parser.HTMLParser(namespaceHTMLElements = False)
+    html_reader = HtmlReader(HtmlToDocumentConverter(), html_parser)
+    markdown_reader = MarkdownReader(MarkdownToHtmlConverter(), html_reader)
+    return script_helpers.add_cache_to_document_reader(markdown_reader, cache_directory, cache_size_limit)
+
+
 def convert_markdown_to_odt( # pylint: disable = too-many-arguments
         serializer: Serializer,
         configuration_file_path: str,
         definition_file_path: Optional[str],
         source_file_path: Optional[str],
         destination_file_path: str,
+        cache_directory: Optional[str] = None,
+        cache_size_limit: Optional[int] = None,
+        job_count: Optional[int] = 1,
         overwrite: bool = False,
         simulate: bool = False) -> None:
 
@@ -91,15 +111,17 @@ def convert_markdown_to_odt( # pylint: disable = too-many-arguments
         if not overwrite:
             raise RuntimeError("Destination already exists: '%s'" % destination_file_path)
 
-    html_parser = lxml.html.html5parser.HTMLParser(namespaceHTMLElements = False)
-    html_reader = HtmlReader(HtmlToDocumentConverter(), html_parser)
-    markdown_reader = MarkdownReader(MarkdownToHtmlConverter(), html_reader)
+    markdown_reader = create_document_reader(cache_directory, cache_size_limit)
 
     xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
     odt_writer = OdtWriter(DocumentToOdtConverter(), xml_parser)
 
     markdown_to_odt_configuration: MarkdownToOdtConfiguration = serializer.deserialize_from_file(configuration_file_path, MarkdownToOdtConfiguration)
-    document_content = load_document(markdown_reader, serializer, definition_file_path, source_file_path)
+    document_content = load_document(markdown_reader, serializer, definition_file_path, source_file_path,
+        job_count = job_count, document_reader_factory = functools.partial(create_document_reader, cache_directory, cache_size_limit))
+
+    if markdown_to_odt_configuration.merge_text_elements:
+        document_operations.merge_text_elements(document_content)
 
     odt_writer.write_as_single_document(
         output_file_path = destination_file_path,
@@ -110,12 +132,14 @@ def convert_markdown_to_odt( # pylint: disable = too-many-arguments
         simulate = simulate)
 
 
-def load_document(
-        document_reader: DocumentReader, serializer: Serializer, definition_file_path: Optional[str], source_file_path: Optional[str]) -> RootElement:
+def load_document( # pylint: disable = too-many-arguments
+        document_reader: DocumentReader, serializer: Serializer, definition_file_path: Optional[str], source_file_path: Optional[str],
+        job_count: Optional[int] = 1, document_reader_factory: Callable[[], DocumentReader] = create_document_reader) -> RootElement:
 
     if definition_file_path is not None:
         document_definition: DocumentDefinition = serializer.deserialize_from_file(definition_file_path, DocumentDefinition)
-        return document_operations.load_document_from_definition(document_definition, document_reader)
+        return document_operations.load_document_from_definition(document_definition, document_reader,
+            job_count = job_count, document_reader_factory = document_reader_factory)
 
     if source_file_path is not None:
         return document_reader.read_content_from_file(source_file_path)
@@ -1,34 +1,65 @@
+# cspell:words lxml
+
 import argparse
 import datetime
+import functools
 import glob
+import inspect
+import json
+import logging
 import os
 import shutil
-from typing import List, Mapping, Optional
+from typing import IO, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+import lxml.etree
+import lxml.html
 
+import benjaminhamon_document_manipulation_scripts
+import benjaminhamon_document_manipulation_toolkit
 from benjaminhamon_document_manipulation_scripts import script_helpers
 from benjaminhamon_document_manipulation_scripts.convert_odt_to_xhtml import convert_odt_to_xhtml
+from benjaminhamon_document_manipulation_scripts.convert_odt_to_xhtml import load_document
 from benjaminhamon_document_manipulation_scripts.create_epub_package import create_epub_package
-from benjaminhamon_document_manipulation_scripts.generate_cover import generate_cover
+from benjaminhamon_document_manipulation_scripts.generate_cover import create_cover_parameters
+from benjaminhamon_document_manipulation_scripts.generate_cover import render_cover
 from benjaminhamon_document_manipulation_scripts.generate_epub_files import generate_epub_files
 from benjaminhamon_document_manipulation_scripts.stage_files_for_epub_package import stage_files_for_epub_package
 from benjaminhamon_document_manipulation_toolkit.conversion.odt_to_epub_configuration import OdtToEpubConfiguration
 from benjaminhamon_document_manipulation_toolkit.conversion.odt_to_xhtml_configuration import OdtToXhtmlConfiguration
 from benjaminhamon_document_manipulation_toolkit.conversion.serialization import odt_to_epub_configuration_serialization_converter
 from benjaminhamon_document_manipulation_toolkit.conversion.serialization import odt_to_xhtml_configuration_serialization_converter
+from benjaminhamon_document_manipulation_toolkit.documents import document_operations
 from benjaminhamon_document_manipulation_toolkit.documents.document_definition import DocumentDefinition
 from benjaminhamon_document_manipulation_toolkit.documents.document_information import DocumentInformation
+from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
+from benjaminhamon_document_manipulation_toolkit.documents.elements.section_element import SectionElement
+from benjaminhamon_document_manipulation_toolkit.documents.elements.text_element import TextElement
 from benjaminhamon_document_manipulation_toolkit.documents.serialization import document_definition_serialization_converter
 from benjaminhamon_document_manipulation_toolkit.documents.serialization import document_information_serialization_converter
+from benjaminhamon_document_manipulation_toolkit.epub import epub_build_manifest
 from benjaminhamon_document_manipulation_toolkit.epub import epub_metadata_builder
+from benjaminhamon_document_manipulation_toolkit.epub import epub_package_configuration_builder
+from benjaminhamon_document_manipulation_toolkit.epub import epub_xhtml_helpers
+from benjaminhamon_document_manipulation_toolkit.epub.document_to_xhtml_converter import DocumentToXhtmlConverter
+from benjaminhamon_document_manipulation_toolkit.epub.epub_build_manifest import EpubBuildManifest
 from benjaminhamon_document_manipulation_toolkit.epub.epub_content_configuration import EpubContentConfiguration
+from benjaminhamon_document_manipulation_toolkit.epub.epub_content_writer import EpubContentWriter
 from benjaminhamon_document_manipulation_toolkit.epub.epub_generation_configuration import EpubGenerationConfiguration
+from benjaminhamon_document_manipulation_toolkit.epub.epub_link_index import EpubLinkIndex
 from benjaminhamon_document_manipulation_toolkit.epub.epub_metadata_item import EpubMetadataItem
+from benjaminhamon_document_manipulation_toolkit.epub.epub_package_builder import EpubPackageBuilder
+from benjaminhamon_document_manipulation_toolkit.epub.epub_package_configuration import EpubPackageConfiguration
+from benjaminhamon_document_manipulation_toolkit.epub.epub_xhtml_writer import EpubXhtmlWriter
 from benjaminhamon_document_manipulation_toolkit.epub.serialization import epub_content_configuration_serialization_converter
 from benjaminhamon_document_manipulation_toolkit.epub.serialization import epub_generation_configuration_serialization_converter
 from benjaminhamon_document_manipulation_toolkit.metadata.dc_metadata import DcMetadata
 from benjaminhamon_document_manipulation_toolkit.metadata.serialization import dc_metadata_serialization_converter
 from benjaminhamon_document_manipulation_toolkit.serialization import serializer_factory
 from benjaminhamon_document_manipulation_toolkit.serialization.serializer import Serializer
+from benjaminhamon_document_manipulation_toolkit.xml import xml_operations
+
+
+logger = logging.getLogger("ConvertOdtToEpub")
 
 
 def main() -> None:
@@ -43,7 +74,12 @@ def main() -> None:
         destination_file_path = os.path.normpath(arguments.destination),
         intermediate_directory = os.path.normpath(arguments.intermediate),
         extra_information = dict(arguments.extra),
-        overwrite = arguments.overwrite)
+        cache_directory = os.path.normpath(arguments.cache) if arguments.cache is not None else None,
+        cache_size_limit = arguments.cache_size_limit * 1024 * 1024 if arguments.cache_size_limit is not None else None,
+        job_count = arguments.jobs,
+        overwrite = arguments.overwrite,
+        write_intermediate_files = arguments.write_intermediate_files,
+        incremental = arguments.incremental)
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -68,8 +104,18 @@ def parse_arguments() -> argparse.Namespace:
         metavar = "<path>", help = "path to the directory where to create the intermediate files")
     argument_parser.add_argument("--extra", nargs = "*", type = parse_key_value_parameter, default = [],
         metavar = "<key=value>", help = "provide extra information as key value pairs")
+    argument_parser.add_argument("--cache",
+        metavar = "<path>", help = "path to the directory where to cache the converted source documents")
+    argument_parser.add_argument("--cache-size-limit", type = int,
+        metavar = "<megabytes>", help = "set the maximum size of the cache, least recently used entries being evicted beyond it (default: 512)")
+    argument_parser.add_argument("--jobs", type = int, default = 1,
+        metavar = "<count>", help = "set the number of processes to load the source files with (default: 1, without additional processes)")
     argument_parser.add_argument("--overwrite", action = "store_true",
         help = "overwrite the destination file or directory in case it already exists")
+    argument_parser.add_argument("--write-intermediate-files", action = "store_true",
+        help = "write all the intermediate files and create the package from them, for debugging")
+    argument_parser.add_argument("--incremental", action = "store_true",
+        help = "update the package from the previous run, converting only the files whose inputs changed")
 
     argument_parser.add_argument("--verbosity", choices = script_helpers.all_logging_levels, default = "info", type = str.lower,
         metavar = "<level>", help = "set the logging level (%s)" % ", ".join(script_helpers.all_logging_levels))
@@ -99,23 +145,32 @@ def convert_odt_to_epub( # pylint: disable = too-many-arguments, too-many-locals
         intermediate_directory: str,
         extra_information: Mapping[str,str],
         now: Optional[datetime.datetime] = None,
+        cache_directory: Optional[str] = None,
+        cache_size_limit: Optional[int] = None,
+        job_count: Optional[int] = 1,
         overwrite: bool = False,
-        simulate: bool = False) -> None:
+        simulate: bool = False,
+        write_intermediate_files: bool = False,
+        incremental: bool = False) -> None:
 
-    if definition_file_path is None and source_file_path is None:
-        raise ValueError("Exactly one of 'definition_file_path' and 'source_file_path' must be set")
-    if definition_file_path is not None and source_file_path is not None:
+    # By default, the converted documents and the package files are written directly to the package, without intermediate files.
+    # When writing intermediate files, each step writes its output to the intermediate directory and the next one reads it from there.
+    # In incremental mode, the package from the previous run is updated, using the input hashes recorded in the intermediate directory
+    # to convert and write again only the files whose inputs changed. Other files are copied from the previous package as they are.
+
+    if (definition_file_path is None) == (source_file_path is None):
         raise ValueError("Exactly one of 'definition_file_path' and 'source_file_path' must be set")
 
     if simulate:
         raise NotImplementedError("Simulate option is not supported")
+    if incremental and write_intermediate_files:
+        raise ValueError("Incremental mode is not supported when writing intermediate files")
 
     if now is None:
         now = datetime.datetime.now(datetime.timezone.utc)
 
-    if os.path.exists(destination_file_path):
-        if not overwrite:
-            raise RuntimeError("Destination already exists: '%s'" % destination_file_path)
+    if os.path.exists(destination_file_path) and not overwrite and not incremental:
+        raise RuntimeError("Destination already exists: '%s'" % destination_file_path)
 
     serializer = create_serializer(os.path.splitext(configuration_file_path)[1].lstrip("."))
 
@@ -124,35 +179,141 @@ def convert_odt_to_epub( # pylint: disable = too-many-arguments, too-many-locals
     metadata_items = load_metadata(serializer, document_definition)
 
     intermediate_cover_file_path = os.path.join(intermediate_directory, "Cover.jpeg")
-    intermediate_odt_to_xhtml_conversion_file_path = os.path.join(intermediate_directory, "OdtToXhtmlConfiguration.yaml")
-    intermediate_xhtml_extra_directory = os.path.join(intermediate_directory, "ExtraAsXhtml")
-    intermediate_xhtml_section_directory = os.path.join(intermediate_directory, "SectionsAsXhtml")
-    intermediate_epub_generation_file_path = os.path.join(intermediate_directory, "EpubGenerationConfiguration.yaml")
-    intermediate_epub_file_directory = os.path.join(intermediate_directory, "EpubFiles")
-    intermediate_staging_directory = os.path.join(intermediate_directory, "Staging")
+    build_manifest_file_path = os.path.join(intermediate_directory, "BuildManifest.json")
 
-    if not simulate:
-        if os.path.exists(intermediate_directory):
-            shutil.rmtree(intermediate_directory)
-        os.makedirs(intermediate_directory)
+    build_manifest = EpubBuildManifest(compute_build_input_hash(configuration_file_path, odt_to_epub_configuration))
+    previous_build_manifest = EpubBuildManifest(build_manifest.input_hash)
+    if incremental:
+        previous_build_manifest.load_from_file(build_manifest_file_path)
 
     if not simulate:
-        os.makedirs(intermediate_xhtml_extra_directory)
+        if os.path.exists(intermediate_directory) and not incremental:
+            shutil.rmtree(intermediate_directory)
+        os.makedirs(intermediate_directory, exist_ok = True)
 
     if odt_to_epub_configuration.cover_svg_template_file_path is not None:
-        generate_cover(
+        create_cover(
             serializer = serializer,
-            information_file_path = document_definition.information_file_path,
-            dc_metadata_file_path = document_definition.dc_metadata_file_path,
-            destination_file_path = intermediate_cover_file_path,
-            template_file_path = odt_to_epub_configuration.cover_svg_template_file_path,
-            image_format = "jpeg",
-            revision_control = odt_to_epub_configuration.revision_control,
+            odt_to_epub_configuration = odt_to_epub_configuration,
+            document_definition = document_definition,
+            cover_file_path = intermediate_cover_file_path,
             extra_information = extra_information,
             now = now,
+            build_manifest = build_manifest,
+            previous_build_manifest = previous_build_manifest,
+            simulate = simulate)
+
+    if write_intermediate_files:
+        create_package_from_intermediate_files(
+            serializer = serializer,
+            odt_to_epub_configuration = odt_to_epub_configuration,
+            definition_file_path = definition_file_path,
+            source_file_path = source_file_path,
+            metadata_items = metadata_items,
+            destination_file_path = destination_file_path,
+            intermediate_directory = intermediate_directory,
+            now = now,
+            cache_directory = cache_directory,
+            cache_size_limit = cache_size_limit,
+            job_count = job_count,
+            overwrite = overwrite,
+            simulate = simulate)
+
+    else:
+        create_package_directly(
+            serializer = serializer,
+            odt_to_epub_configuration = odt_to_epub_configuration,
+            document_definition = document_definition,
+            metadata_items = metadata_items,
+            destination_file_path = destination_file_path,
+            intermediate_directory = intermediate_directory,
+            now = now,
+            build_manifest = build_manifest,
+            previous_build_manifest = previous_build_manifest,
+            cache_directory = cache_directory,
+            cache_size_limit = cache_size_limit,
+            job_count = job_count,
             simulate = simulate)
 
-        odt_to_epub_configuration.cover_file = intermediate_cover_file_path
+        if not simulate:
+            build_manifest.save_to_file(build_manifest_file_path)
+
+
+def compute_build_input_hash(configuration_file_path: str, odt_to_epub_configuration: OdtToEpubConfiguration) -> str:
+
+    # The entry hashes cover the source sections before their conversion, so the build manifest is discarded
+    # whenever the code or the configuration for the conversion change.
+
+    all_file_paths = [ configuration_file_path ]
+    if odt_to_epub_configuration.style_map_file_path is not None:
+        all_file_paths.append(odt_to_epub_configuration.style_map_file_path)
+
+    for package in [ benjaminhamon_document_manipulation_toolkit, benjaminhamon_document_manipulation_scripts ]:
+        package_directory = os.path.dirname(inspect.getfile(package))
+        all_file_paths += glob.glob(os.path.join(package_directory, "**", "*.py"), recursive = True)
+
+    return script_helpers.compute_source_hash(all_file_paths)
+
+
+def create_cover( # pylint: disable = too-many-arguments
+        serializer: Serializer,
+        odt_to_epub_configuration: OdtToEpubConfiguration,
+        document_definition: DocumentDefinition,
+        cover_file_path: str,
+        extra_information: Mapping[str,str],
+        now: datetime.datetime,
+        build_manifest: EpubBuildManifest,
+        previous_build_manifest: EpubBuildManifest,
+        simulate: bool = False) -> None:
+
+    # The cover is converted from SVG by an external application, so it is always written as a file
+
+    if odt_to_epub_configuration.cover_svg_template_file_path is None:
+        raise ValueError("Cover SVG template file path must not be None")
+
+    cover_parameters = create_cover_parameters(
+        serializer = serializer,
+        information_file_path = document_definition.information_file_path,
+        dc_metadata_file_path = document_definition.dc_metadata_file_path,
+        revision_control = odt_to_epub_configuration.revision_control,
+        extra_information = extra_information,
+        now = now)
+
+    build_manifest.cover_hash = epub_build_manifest.compute_hash([
+        epub_build_manifest.compute_file_hash(odt_to_epub_configuration.cover_svg_template_file_path).encode("ascii"),
+        json.dumps(cover_parameters, sort_keys = True).encode("utf-8"),
+    ])
+
+    if build_manifest.cover_hash != previous_build_manifest.cover_hash or not os.path.exists(cover_file_path):
+        render_cover(cover_file_path, odt_to_epub_configuration.cover_svg_template_file_path, cover_parameters, "jpeg", simulate = simulate)
+
+    odt_to_epub_configuration.cover_file = cover_file_path
+
+
+def create_package_from_intermediate_files( # pylint: disable = too-many-arguments, too-many-locals
+        serializer: Serializer,
+        odt_to_epub_configuration: OdtToEpubConfiguration,
+        definition_file_path: Optional[str],
+        source_file_path: Optional[str],
+        metadata_items: List[EpubMetadataItem],
+        destination_file_path: str,
+        intermediate_directory: str,
+        now: datetime.datetime,
+        cache_directory: Optional[str] = None,
+        cache_size_limit: Optional[int] = None,
+        job_count: Optional[int] = 1,
+        overwrite: bool = False,
+        simulate: bool = False) -> None:
+
+    intermediate_odt_to_xhtml_conversion_file_path = os.path.join(intermediate_directory, "OdtToXhtmlConfiguration.yaml")
+    intermediate_xhtml_extra_directory = os.path.join(intermediate_directory, "ExtraAsXhtml")
+    intermediate_xhtml_section_directory = os.path.join(intermediate_directory, "SectionsAsXhtml")
+    intermediate_epub_generation_file_path = os.path.join(intermediate_directory, "EpubGenerationConfiguration.yaml")
+    intermediate_epub_file_directory = os.path.join(intermediate_directory, "EpubFiles")
+    intermediate_staging_directory = os.path.join(intermediate_directory, "Staging")
+
+    if not simulate:
+        os.makedirs(intermediate_xhtml_extra_directory)
 
     write_odt_to_xhtml_configuration(
         serializer = serializer,
@@ -167,6 +328,9 @@ def convert_odt_to_epub( # pylint: disable = too-many-arguments, too-many-locals
         destination_file_path_or_directory = intermediate_xhtml_section_directory,
         write_as_single_file = False,
         now = now,
+        cache_directory = cache_directory,
+        cache_size_limit = cache_size_limit,
+        job_count = job_count,
         simulate = simulate)
 
     write_epub_generation_configuration(
@@ -181,6 +345,7 @@ def convert_odt_to_epub( # pylint: disable = too-many-arguments, too-many-locals
         serializer = serializer,
         configuration_file_path = intermediate_epub_generation_file_path,
         destination_directory = intermediate_epub_file_directory,
+        cache_directory = cache_directory,
         simulate = simulate)
 
     stage_files_for_epub_package(
@@ -198,6 +363,224 @@ def convert_odt_to_epub( # pylint: disable = too-many-arguments, too-many-locals
         simulate = simulate)
 
 
+def create_package_directly( # pylint: disable = too-many-arguments, too-many-locals
+        serializer: Serializer,
+        odt_to_epub_configuration: OdtToEpubConfiguration,
+        document_definition: DocumentDefinition,
+        metadata_items: List[EpubMetadataItem],
+        destination_file_path: str,
+        intermediate_directory: str,
+        now: datetime.datetime,
+        build_manifest: EpubBuildManifest,
+        previous_build_manifest: EpubBuildManifest,
+        cache_directory: Optional[str] = None,
+        cache_size_limit: Optional[int] = None,
+        job_count: Optional[int] = 1,
+        simulate: bool = False) -> None:
+
+    # The files are identified by the paths they would have in the intermediate directory, without being written there,
+    # so that the package configuration, the file names and the links are resolved the same way as with intermediate files.
+    # The package document is created with a placeholder for its modification date, as when staging files, and the date is set
+    # only once the entry hashes are computed, so that it does not cause an update on every run.
+
+    intermediate_xhtml_section_directory = os.path.join(intermediate_directory, "SectionsAsXhtml")
+    intermediate_epub_file_directory = os.path.join(intermediate_directory, "EpubFiles")
+    intermediate_staging_directory = os.path.join(intermediate_directory, "Staging")
+
+    xhtml_parser = lxml.html.XHTMLParser(encoding = "utf-8", remove_blank_text = True)
+    xhtml_writer = EpubXhtmlWriter(DocumentToXhtmlConverter(), xhtml_parser)
+    content_writer = EpubContentWriter()
+    package_builder = EpubPackageBuilder(content_writer)
+
+    odt_to_xhtml_configuration = create_odt_to_xhtml_configuration(odt_to_epub_configuration)
+
+    document_metadata, document_content = load_document(
+        serializer = serializer,
+        odt_to_xhtml_configuration = odt_to_xhtml_configuration,
+        document_definition = document_definition,
+        now = now,
+        cache_directory = cache_directory,
+        cache_size_limit = cache_size_limit,
+        job_count = job_count)
+
+    all_xhtml_documents = list(xhtml_writer.enumerate_many_documents(
+        output_directory = intermediate_xhtml_section_directory,
+        metadata = document_metadata,
+        content = document_content,
+        section_template_file_path = odt_to_xhtml_configuration.xhtml_section_template_file_path,
+        information_template_file_path = odt_to_xhtml_configuration.xhtml_information_template_file_path,
+        css_file_path = odt_to_xhtml_configuration.style_sheet_file_path))
+
+    epub_package_configuration = create_package_configuration_for_documents(
+        metadata_items = metadata_items,
+        odt_to_epub_configuration = odt_to_epub_configuration,
+        all_xhtml_documents = all_xhtml_documents,
+        epub_file_directory = intermediate_epub_file_directory,
+        cache_directory = cache_directory,
+        simulate = simulate)
+
+    package_document_file_path = os.path.join(intermediate_epub_file_directory, "content.opf")
+    package_document_as_xml = content_writer.convert_package_document_to_xhtml(epub_package_configuration.document, "EPUB")
+
+    all_documents: Dict[str, Tuple[lxml.etree._ElementTree, Optional[Iterable[lxml.etree._Element]]]] = {
+        package_document_file_path: (package_document_as_xml, None),
+        os.path.join(intermediate_epub_file_directory, "toc.xhtml"):
+            (content_writer.convert_navigation_to_xhtml(epub_package_configuration.navigation, "EPUB"), None),
+        os.path.join(intermediate_epub_file_directory, "container.xml"):
+            (content_writer.create_container_as_xml(os.path.join("EPUB", "content.opf")), None),
+    }
+
+    for file_path, _, xhtml_document, xhtml_content in all_xhtml_documents:
+        all_documents[file_path] = (xhtml_document, xhtml_content)
+
+    link_mappings = epub_package_configuration.content_configuration.link_mappings
+    link_index = EpubLinkIndex(link_mappings)
+    all_file_mappings = sorted(epub_package_configuration.content_configuration.file_mappings, key = lambda x: os.path.normpath(x[1]))
+
+    build_manifest.entry_hashes = compute_entry_hashes(
+        all_file_mappings, all_documents, all_xhtml_documents, document_content, link_mappings, build_manifest.input_hash)
+
+    all_unchanged_entries = find_unchanged_entries(destination_file_path, build_manifest, previous_build_manifest)
+
+    if len(all_unchanged_entries) == len(build_manifest.entry_hashes) and build_manifest.entry_hashes == previous_build_manifest.entry_hashes:
+        logger.info("Package is up to date: '%s'", destination_file_path)
+        build_manifest.package_fingerprint = previous_build_manifest.package_fingerprint
+        return
+
+    # The package document is written again along with any other entry, for its modification date
+    all_unchanged_entries.discard(get_entry_name(dict(all_file_mappings)[package_document_file_path]))
+    modified = now.astimezone(datetime.timezone.utc).replace(tzinfo = None).isoformat() + "Z"
+    xml_operations.format_text_in_xml(package_document_as_xml.getroot(), { "modified": modified })
+
+    logger.info("Updating package (Updated: %s, Unchanged: %s)", len(build_manifest.entry_hashes) - len(all_unchanged_entries), len(all_unchanged_entries))
+
+    def write_entry(source: str, destination: str, output_file: IO[bytes]) -> None:
+        if source in all_documents:
+            document, content = all_documents.pop(source)
+        elif source.endswith(".xhtml"):
+            document, content = epub_xhtml_helpers.load_xhtml(source), None
+        else:
+            with open(source, mode = "rb") as source_file:
+                shutil.copyfileobj(source_file, output_file)
+            return
+
+        if source.endswith(".xhtml"):
+            package_builder.update_xhtml_document_links(document, source, destination, intermediate_staging_directory, link_index)
+
+        if content is None:
+            content_writer.write_xml_to_stream(output_file, document)
+        else:
+            xhtml_writer.write_to_stream(output_file, document, content = content)
+
+    all_file_entries: List[Tuple[str, Optional[Callable[[IO[bytes]], None]]]] = [
+        (destination, None if get_entry_name(destination) in all_unchanged_entries else functools.partial(write_entry, source, destination))
+        for source, destination in all_file_mappings
+    ]
+
+    package_builder.write_package(destination_file_path, all_file_entries,
+        simulate = simulate, source_package_file_path = destination_file_path if len(all_unchanged_entries) > 0 else None)
+
+    if not simulate:
+        build_manifest.record_package(destination_file_path)
+
+
+def create_package_configuration_for_documents( # pylint: disable = too-many-arguments
+        metadata_items: List[EpubMetadataItem],
+        odt_to_epub_configuration: OdtToEpubConfiguration,
+        all_xhtml_documents: List[Tuple[str, str, lxml.etree._ElementTree, Optional[Iterable[lxml.etree._Element]]]],
+        epub_file_directory: str,
+        cache_directory: Optional[str] = None,
+        simulate: bool = False) -> EpubPackageConfiguration:
+
+    # The titles of the converted documents are known without reading them, and the others are read from the title cache
+
+    all_xhtml_titles = { file_path: title for file_path, title, _, _ in all_xhtml_documents }
+    title_cache = script_helpers.create_title_cache(cache_directory)
+
+    content_files = []
+    content_files += resolve_file_patterns(odt_to_epub_configuration.content_files_before)
+    content_files += [ file_path for file_path, _, _, _ in all_xhtml_documents ]
+    content_files += resolve_file_patterns(odt_to_epub_configuration.content_files_after)
+
+    epub_generation_configuration = create_epub_generation_configuration(metadata_items, odt_to_epub_configuration, content_files)
+    epub_generation_configuration.resource_files = resolve_file_patterns(epub_generation_configuration.resource_files)
+
+    epub_package_configuration = epub_package_configuration_builder.create_package_configuration(
+        epub_generation_configuration, epub_file_directory, title_getter = title_cache.get_title, all_known_titles = all_xhtml_titles)
+
+    title_cache.save(simulate = simulate)
+
+    return epub_package_configuration
+
+
+def compute_entry_hashes( # pylint: disable = too-many-arguments
+        all_file_mappings: List[Tuple[str,str]],
+        all_documents: Mapping[str, Tuple[lxml.etree._ElementTree, Optional[Iterable[lxml.etree._Element]]]],
+        all_xhtml_documents: List[Tuple[str, str, lxml.etree._ElementTree, Optional[Iterable[lxml.etree._Element]]]],
+        document_content: RootElement,
+        link_mappings: List[Tuple[str,str]],
+        input_hash: str) -> Dict[str,str]:
+
+    # Each entry hash covers everything its data is created from: for converted documents, the document before adding its content,
+    # which includes the template, title and style sheet, and the source section; for other files, their data.
+    # The XHTML documents with content are the ones for the sections, in order, while the information document is complete.
+
+    all_sections = iter(document_operations.enumerate_sections(document_content))
+    all_section_hashes = {
+        file_path: compute_section_hash(next(all_sections))
+        for file_path, _, _, content in all_xhtml_documents if content is not None
+    }
+
+    link_mappings_as_bytes = json.dumps(link_mappings).encode("utf-8")
+
+    all_entry_hashes: Dict[str,str] = {}
+    for source, destination in all_file_mappings:
+        if source in all_documents:
+            document_as_bytes = lxml.etree.tostring(all_documents[source][0])
+            source_hash = epub_build_manifest.compute_hash([ document_as_bytes, all_section_hashes.get(source, "").encode("ascii") ])
+        else:
+            source_hash = epub_build_manifest.compute_file_hash(source)
+
+        all_entry_hashes[get_entry_name(destination)] = epub_build_manifest.compute_hash([
+            input_hash.encode("utf-8"),
+            source.encode("utf-8"),
+            source_hash.encode("ascii"),
+            link_mappings_as_bytes if source.endswith(".xhtml") else b"",
+        ])
+
+    return all_entry_hashes
+
+
+def compute_section_hash(section: SectionElement) -> str:
+
+    # The elements are hashed in document order with their child count, which is enough to tell their structure apart.
+    # Only their values are serialized, so that the hash does not depend on how the document was read, such as shared style names.
+
+    all_components: List[bytes] = []
+    for element in document_operations.enumerate_all_elements(section):
+        element_data = [ type(element).__name__, element.identifier, element.style_collection, len(element.children) ]
+        if isinstance(element, TextElement):
+            element_data += [ element.text, element.line_break ]
+        all_components.append(json.dumps(element_data).encode("utf-8"))
+
+    return epub_build_manifest.compute_hash(all_components)
+
+
+def find_unchanged_entries(destination_file_path: str, build_manifest: EpubBuildManifest, previous_build_manifest: EpubBuildManifest) -> Set[str]:
+
+    # Entries can be copied from the previous package only if it is the one recorded in the previous manifest
+
+    if not previous_build_manifest.is_package_unchanged(destination_file_path):
+        return set()
+
+    return { destination for destination, entry_hash in build_manifest.entry_hashes.items()
+        if previous_build_manifest.entry_hashes.get(destination) == entry_hash }
+
+
+def get_entry_name(destination: str) -> str:
+    return os.path.normpath(destination).replace("\\", "/")
+
+
 def load_metadata(serializer: Serializer, document_definition: DocumentDefinition) -> List[EpubMetadataItem]:
     if document_definition.dc_metadata_file_path is not None:
         dc_metadata: DcMetadata = serializer.deserialize_from_file(document_definition.dc_metadata_file_path, DcMetadata)
@@ -216,15 +599,22 @@ def write_odt_to_xhtml_configuration(
         odt_to_epub_configuration: OdtToEpubConfiguration,
         simulate: bool = False) -> None:
 
+    odt_to_xhtml_configuration = create_odt_to_xhtml_configuration(odt_to_epub_configuration)
+
+    if not simulate:
+        serializer.serialize_to_file(odt_to_xhtml_configuration, configuration_file_path)
+
+
+def create_odt_to_xhtml_configuration(odt_to_epub_configuration: OdtToEpubConfiguration) -> OdtToXhtmlConfiguration:
     odt_to_xhtml_configuration = OdtToXhtmlConfiguration()
     odt_to_xhtml_configuration.revision_control = odt_to_epub_configuration.revision_control
     odt_to_xhtml_configuration.xhtml_information_template_file_path = odt_to_epub_configuration.xhtml_information_template_file_path
     odt_to_xhtml_configuration.xhtml_section_template_file_path = odt_to_epub_configuration.xhtml_section_template_file_path
     odt_to_xhtml_configuration.style_sheet_file_path = odt_to_epub_configuration.style_sheet_file_path
     odt_to_xhtml_configuration.style_map_file_path = odt_to_epub_configuration.style_map_file_path
+    odt_to_xhtml_configuration.merge_text_elements = odt_to_epub_configuration.merge_text_elements
 
-    if not simulate:
-        serializer.serialize_to_file(odt_to_xhtml_configuration, configuration_file_path)
+    return odt_to_xhtml_configuration
 
 
 def write_epub_generation_configuration( # pylint: disable = too-many-arguments
@@ -235,21 +625,36 @@ def write_epub_generation_configuration( # pylint: disable = too-many-arguments
         xhtml_directory: str,
         simulate: bool = False) -> None:
 
+    content_files = []
+    content_files += odt_to_epub_configuration.content_files_before
+    content_files += sorted(glob.glob(os.path.join(xhtml_directory, "*.xhtml")))
+    content_files += odt_to_epub_configuration.content_files_after
+
+    epub_generation_configuration = create_epub_generation_configuration(metadata, odt_to_epub_configuration, content_files)
+
+    if not simulate:
+        serializer.serialize_to_file(epub_generation_configuration, configuration_file_path)
+
+
+def create_epub_generation_configuration(
+        metadata: List[EpubMetadataItem], odt_to_epub_configuration: OdtToEpubConfiguration, content_files: List[str]) -> EpubGenerationConfiguration:
+
     epub_generation_configuration = EpubGenerationConfiguration()
     epub_generation_configuration.metadata = metadata
     epub_generation_configuration.cover_file = odt_to_epub_configuration.cover_file
-
-    epub_generation_configuration.content_files = []
-    epub_generation_configuration.content_files += odt_to_epub_configuration.content_files_before
-    epub_generation_configuration.content_files += glob.glob(os.path.join(xhtml_directory, "*.xhtml"))
-    epub_generation_configuration.content_files += odt_to_epub_configuration.content_files_after
-
+    epub_generation_configuration.content_files = content_files
     epub_generation_configuration.resource_files = odt_to_epub_configuration.resource_files
     epub_generation_configuration.link_overrides = odt_to_epub_configuration.link_overrides
     epub_generation_configuration.landmarks = odt_to_epub_configuration.landmarks
 
-    if not simulate:
-        serializer.serialize_to_file(epub_generation_configuration, configuration_file_path)
+    return epub_generation_configuration
+
+
+def resolve_file_patterns(file_pattern_collection: List[str]) -> List[str]:
+    file_collection: List[str] = []
+    for file_pattern in file_pattern_collection:
+        file_collection += glob.glob(file_pattern)
+    return file_collection
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 import argparse
+import functools
 import os
-import shutil
 from typing import Optional
 
 import lxml.etree
@@ -14,6 +14,8 @@ from benjaminhamon_document_manipulation_toolkit.documents.document_information
 from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
 from benjaminhamon_document_manipulation_toolkit.documents.serialization import document_definition_serialization_converter
 from benjaminhamon_document_manipulation_toolkit.documents.serialization import document_information_serialization_converter
+from benjaminhamon_document_manipulation_toolkit.interfaces.document_reader import DocumentReader
+from benjaminhamon_document_manipulation_toolkit.interfaces.output_sink import OutputSink
 from benjaminhamon_document_manipulation_toolkit.markdown.document_to_markdown_converter import DocumentToMarkdownConverter
 from benjaminhamon_document_manipulation_toolkit.markdown.markdown_writer import MarkdownWriter
 from benjaminhamon_document_manipulation_toolkit.open_document.odt_reader import OdtReader
@@ -34,6 +36,11 @@ def main() -> None:
         source_file_path = os.path.normpath(arguments.source) if arguments.source is not None else None,
         destination_file_path_or_directory = os.path.normpath(arguments.destination),
         write_as_single_file = arguments.single_file,
+        cache_directory = os.path.normpath(arguments.cache) if arguments.cache is not None else None,
+        cache_size_limit = arguments.cache_size_limit * 1024 * 1024 if arguments.cache_size_limit is not None else None,
+        job_count = arguments.jobs,
+        write_thread_count = arguments.write_threads,
+        skip_unchanged = arguments.skip_unchanged,
         overwrite = arguments.overwrite)
 
 
@@ -50,6 +57,16 @@ def parse_arguments() -> argparse.Namespace:
         metavar = "<path>", help = "path to the document or directory to create")
     argument_parser.add_argument("--single-file", action = "store_true",
         help = "write the document as a single file")
+    argument_parser.add_argument("--cache",
+        metavar = "<path>", help = "path to the directory where to cache the converted source documents")
+    argument_parser.add_argument("--cache-size-limit", type = int,
+        metavar = "<megabytes>", help = "set the maximum size of the cache, least recently used entries being evicted beyond it (default: 512)")
+    argument_parser.add_argument("--jobs", type = int, default = 1,
+        metavar = "<count>", help = "set the number of processes to load the sources and render the sections with (default: 1, without additional processes)")
+    argument_parser.add_argument("--write-threads", type = int, default = 0,
+        metavar = "<count>", help = "set the number of threads to write the output files with (default: 0, from the main thread)")
+    argument_parser.add_argument("--skip-unchanged", action = "store_true",
+        help = "update the destination in place, leaving untouched the files whose content did not change")
     argument_parser.add_argument("--overwrite", action = "store_true",
         help = "overwrite the destination file or directory in case it already exists")
 
@@ -69,12 +86,26 @@ def create_serializer(serialization_type: str) -> Serializer:
     return serializer
 
 
+def create_document_reader(cache_directory: Optional[str] = None, cache_size_limit: Optional[int] = None) -> DocumentReader:
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    return script_helpers.add_cache_to_document_reader(OdtReader(OdtToDocumentConverter(), xml_parser), cache_directory, cache_size_limit)
+
+
+def create_markdown_writer(output_sink: Optional[OutputSink] = None) -> MarkdownWriter:
+    return MarkdownWriter(DocumentToMarkdownConverter(), YamlSerializer(), output_sink = output_sink)
+
+
 def convert_odt_to_markdown( # pylint: disable = too-many-arguments, too-many-locals
         configuration_file_path: str,
         definition_file_path: Optional[str],
         source_file_path: Optional[str],
         destination_file_path_or_directory: str,
         write_as_single_file: bool,
+        cache_directory: Optional[str] = None,
+        cache_size_limit: Optional[int] = None,
+        job_count: Optional[int] = 1,
+        write_thread_count: int = 0,
+        skip_unchanged: bool = False,
         overwrite: bool = False,
         simulate: bool = False) -> None:
 
@@ -88,9 +119,7 @@ def convert_odt_to_markdown( # pylint: disable = too-many-arguments, too-many-lo
             raise RuntimeError("Destination already exists: '%s'" % destination_file_path_or_directory)
 
     serializer = create_serializer(os.path.splitext(configuration_file_path)[1].lstrip("."))
-    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
-    odt_reader = OdtReader(OdtToDocumentConverter(), xml_parser)
-    markdown_writer = MarkdownWriter(DocumentToMarkdownConverter(), YamlSerializer())
+    odt_reader = create_document_reader(cache_directory, cache_size_limit)
 
     odt_to_markdown_configuration: OdtToMarkdownConfiguration = serializer.deserialize_from_file(configuration_file_path, OdtToMarkdownConfiguration)
     document_definition: DocumentDefinition = script_helpers.load_document_definition(serializer, definition_file_path, source_file_path)
@@ -108,30 +137,42 @@ def convert_odt_to_markdown( # pylint: disable = too-many-arguments, too-many-lo
         extra_metadata = extra_metadata,
         revision_control = odt_to_markdown_configuration.revision_control)
 
-    document_content = document_operations.load_document_from_definition(document_definition, odt_reader)
+    document_content = document_operations.load_document_from_definition(document_definition, odt_reader,
+        job_count = job_count, document_reader_factory = functools.partial(create_document_reader, cache_directory, cache_size_limit))
 
     if odt_to_markdown_configuration.style_map_file_path is not None:
         convert_styles(serializer, document_content, odt_to_markdown_configuration.style_map_file_path)
 
+    if odt_to_markdown_configuration.merge_text_elements:
+        document_operations.merge_text_elements(document_content)
+
+    hash_index_file_path = script_helpers.get_output_hash_index_file_path(cache_directory, destination_file_path_or_directory)
+
     if write_as_single_file:
-        markdown_writer.write_as_single_document(
-            output_file_path = destination_file_path_or_directory,
-            title = document_metadata["title"],
-            metadata = document_metadata,
-            content = document_content,
-            simulate = simulate)
+        with script_helpers.create_output_sink(write_thread_count, skip_unchanged, hash_index_file_path, simulate = simulate) as output_sink:
+            create_markdown_writer(output_sink).write_as_single_document(
+                output_file_path = destination_file_path_or_directory,
+                title = document_metadata["title"],
+                metadata = document_metadata,
+                content = document_content,
+                simulate = simulate)
 
     else:
         if not simulate:
-            if os.path.exists(destination_file_path_or_directory):
-                shutil.rmtree(destination_file_path_or_directory)
-            os.makedirs(destination_file_path_or_directory)
-
-        markdown_writer.write_as_many_documents(
-            output_directory = destination_file_path_or_directory,
-            metadata = document_metadata,
-            content = document_content,
-            simulate = simulate)
+            os.makedirs(destination_file_path_or_directory, exist_ok = True)
+
+        with script_helpers.create_output_sink(write_thread_count, skip_unchanged, hash_index_file_path,
+                destination_directory = destination_file_path_or_directory, simulate = simulate) as output_sink:
+            create_markdown_writer(output_sink).write_as_many_documents(
+                output_directory = destination_file_path_or_directory,
+                metadata = document_metadata,
+                content = document_content,
+                simulate = simulate,
+                job_count = job_count,
+                writer_factory = create_markdown_writer)
+
+    if skip_unchanged:
+        script_helpers.log_output_summary(output_sink)
 
 
 def convert_styles(serializer: Serializer, document_content: RootElement, style_map_file_path: str) -> None:
@@ -2,9 +2,9 @@
 
 import argparse
 import datetime
+import functools
 import os
-import shutil
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 import lxml.etree
 import lxml.html
@@ -20,6 +20,8 @@ from benjaminhamon_document_manipulation_toolkit.documents.serialization import
 from benjaminhamon_document_manipulation_toolkit.documents.serialization import document_information_serialization_converter
 from benjaminhamon_document_manipulation_toolkit.epub.document_to_xhtml_converter import DocumentToXhtmlConverter
 from benjaminhamon_document_manipulation_toolkit.epub.epub_xhtml_writer import EpubXhtmlWriter
+from benjaminhamon_document_manipulation_toolkit.interfaces.document_reader import DocumentReader
+from benjaminhamon_document_manipulation_toolkit.interfaces.output_sink import OutputSink
 from benjaminhamon_document_manipulation_toolkit.open_document.odt_reader import OdtReader
 from benjaminhamon_document_manipulation_toolkit.open_document.odt_to_document_converter import OdtToDocumentConverter
 from benjaminhamon_document_manipulation_toolkit.serialization import serializer_factory
@@ -37,6 +39,11 @@ def main() -> None:
         source_file_path = os.path.normpath(arguments.source) if arguments.source is not None else None,
         destination_file_path_or_directory = os.path.normpath(arguments.destination),
         write_as_single_file = arguments.single_file,
+        cache_directory = os.path.normpath(arguments.cache) if arguments.cache is not None else None,
+        cache_size_limit = arguments.cache_size_limit * 1024 * 1024 if arguments.cache_size_limit is not None else None,
+        job_count = arguments.jobs,
+        write_thread_count = arguments.write_threads,
+        skip_unchanged = arguments.skip_unchanged,
         overwrite = arguments.overwrite)
 
 
@@ -54,6 +61,16 @@ def parse_arguments() -> argparse.Namespace:
         metavar = "<path>", help = "path to the document or directory to create")
     argument_parser.add_argument("--single-file", action = "store_true",
         help = "write the document as a single file")
+    argument_parser.add_argument("--cache",
+        metavar = "<path>", help = "path to the directory where to cache the converted source documents")
+    argument_parser.add_argument("--cache-size-limit", type = int,
+        metavar = "<megabytes>", help = "set the maximum size of the cache, least recently used entries being evicted beyond it (default: 512)")
+    argument_parser.add_argument("--jobs", type = int, default = 1,
+        metavar = "<count>", help = "set the number of processes to load the sources and render the sections with (default: 1, without additional processes)")
+    argument_parser.add_argument("--write-threads", type = int, default = 0,
+        metavar = "<count>", help = "set the number of threads to write the output files with (default: 0, from the main thread)")
+    argument_parser.add_argument("--skip-unchanged", action = "store_true",
+        help = "update the destination in place, leaving untouched the files whose content did not change")
     argument_parser.add_argument("--overwrite", action = "store_true",
         help = "overwrite the destination file or directory in case it already exists")
 
@@ -73,6 +90,16 @@ def create_serializer(serialization_type: str) -> Serializer:
     return serializer
 
 
+def create_document_reader(cache_directory: Optional[str] = None, cache_size_limit: Optional[int] = None) -> DocumentReader:
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    return script_helpers.add_cache_to_document_reader(OdtReader(OdtToDocumentConverter(), xml_parser), cache_directory, cache_size_limit)
+
+
+def create_xhtml_writer(output_sink: Optional[OutputSink] = None) -> EpubXhtmlWriter:
+    xhtml_parser = lxml.html.XHTMLParser(encoding = "utf-8", remove_blank_text = True)
+    return EpubXhtmlWriter(DocumentToXhtmlConverter(), xhtml_parser, output_sink = output_sink)
+
+
 def convert_odt_to_xhtml( # pylint: disable = too-many-arguments, too-many-branches, too-many-locals
         configuration_file_path: str,
         definition_file_path: Optional[str],
@@ -80,6 +107,11 @@ def convert_odt_to_xhtml( # pylint: disable = too-many-arguments, too-many-branc
         destination_file_path_or_directory: str,
         write_as_single_file: bool,
         now: Optional[datetime.datetime] = None,
+        cache_directory: Optional[str] = None,
+        cache_size_limit: Optional[int] = None,
+        job_count: Optional[int] = 1,
+        write_thread_count: int = 0,
+        skip_unchanged: bool = False,
         overwrite: bool = False,
         simulate: bool = False) -> None:
 
@@ -96,17 +128,69 @@ def convert_odt_to_xhtml( # pylint: disable = too-many-arguments, too-many-branc
             raise RuntimeError("Destination already exists: '%s'" % destination_file_path_or_directory)
 
     serializer = create_serializer(os.path.splitext(configuration_file_path)[1].lstrip("."))
-    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
-    odt_reader = OdtReader(OdtToDocumentConverter(), xml_parser)
-    xhtml_parser = lxml.html.XHTMLParser(encoding = "utf-8", remove_blank_text = True)
-    xhtml_writer = EpubXhtmlWriter(DocumentToXhtmlConverter(), xhtml_parser)
 
     odt_to_xhtml_configuration: OdtToXhtmlConfiguration = serializer.deserialize_from_file(configuration_file_path, OdtToXhtmlConfiguration)
     document_definition: DocumentDefinition = script_helpers.load_document_definition(serializer, definition_file_path, source_file_path)
 
+    document_metadata, document_content = load_document(
+        serializer = serializer,
+        odt_to_xhtml_configuration = odt_to_xhtml_configuration,
+        document_definition = document_definition,
+        now = now,
+        cache_directory = cache_directory,
+        cache_size_limit = cache_size_limit,
+        job_count = job_count)
+
+    hash_index_file_path = script_helpers.get_output_hash_index_file_path(cache_directory, destination_file_path_or_directory)
+
+    if write_as_single_file:
+        with script_helpers.create_output_sink(write_thread_count, skip_unchanged, hash_index_file_path, simulate = simulate) as output_sink:
+            create_xhtml_writer(output_sink).write_as_single_document(
+                output_file_path = destination_file_path_or_directory,
+                title = document_metadata["title"],
+                content = document_content,
+                template_file_path = odt_to_xhtml_configuration.xhtml_section_template_file_path,
+                css_file_path = odt_to_xhtml_configuration.style_sheet_file_path,
+                simulate = simulate)
+
+    else:
+        if not simulate:
+            os.makedirs(destination_file_path_or_directory, exist_ok = True)
+
+        with script_helpers.create_output_sink(write_thread_count, skip_unchanged, hash_index_file_path,
+                destination_directory = destination_file_path_or_directory, simulate = simulate) as output_sink:
+            create_xhtml_writer(output_sink).write_as_many_documents(
+                output_directory = destination_file_path_or_directory,
+                metadata = document_metadata,
+                content = document_content,
+                section_template_file_path = odt_to_xhtml_configuration.xhtml_section_template_file_path,
+                information_template_file_path = odt_to_xhtml_configuration.xhtml_information_template_file_path,
+                css_file_path = odt_to_xhtml_configuration.style_sheet_file_path,
+                simulate = simulate,
+                job_count = job_count,
+                writer_factory = create_xhtml_writer)
+
+    if skip_unchanged:
+        script_helpers.log_output_summary(output_sink)
+
+
+def load_document( # pylint: disable = too-many-arguments
+        serializer: Serializer,
+        odt_to_xhtml_configuration: OdtToXhtmlConfiguration,
+        document_definition: DocumentDefinition,
+        now: datetime.datetime,
+        cache_directory: Optional[str] = None,
+        cache_size_limit: Optional[int] = None,
+        job_count: Optional[int] = 1) -> Tuple[Dict[str,str], RootElement]:
+
+    odt_reader = create_document_reader(cache_directory, cache_size_limit)
+
     metadata_from_source = None
+    content_from_source = None
     if document_definition.source_file_path is not None:
-        metadata_from_source  = odt_reader.read_metadata_from_file(document_definition.source_file_path)
+        document_from_source = odt_reader.read_document_from_file(document_definition.source_file_path)
+        metadata_from_source = document_from_source.metadata
+        content_from_source = document_from_source.content
 
     extra_metadata: dict = {}
     if document_definition.extra_metadata is not None:
@@ -123,34 +207,19 @@ def convert_odt_to_xhtml( # pylint: disable = too-many-arguments, too-many-branc
         date = now,
         revision_control = odt_to_xhtml_configuration.revision_control)
 
-    document_content = document_operations.load_document_from_definition(document_definition, odt_reader)
+    if content_from_source is not None:
+        document_content = document_operations.select_sections_from_definition(document_definition, content_from_source)
+    else:
+        document_content = document_operations.load_document_from_definition(document_definition, odt_reader,
+            job_count = job_count, document_reader_factory = functools.partial(create_document_reader, cache_directory, cache_size_limit))
 
     if odt_to_xhtml_configuration.style_map_file_path is not None:
         convert_styles(serializer, document_content, odt_to_xhtml_configuration.style_map_file_path)
 
-    if write_as_single_file:
-        xhtml_writer.write_as_single_document(
-            output_file_path = destination_file_path_or_directory,
-            title = document_metadata["title"],
-            content = document_content,
-            template_file_path = odt_to_xhtml_configuration.xhtml_section_template_file_path,
-            css_file_path = odt_to_xhtml_configuration.style_sheet_file_path,
-            simulate = simulate)
+    if odt_to_xhtml_configuration.merge_text_elements:
+        document_operations.merge_text_elements(document_content)
 
-    else:
-        if not simulate:
-            if os.path.exists(destination_file_path_or_directory):
-                shutil.rmtree(destination_file_path_or_directory)
-            os.makedirs(destination_file_path_or_directory)
-
-        xhtml_writer.write_as_many_documents(
-            output_directory = destination_file_path_or_directory,
-            metadata = document_metadata,
-            content = document_content,
-            section_template_file_path = odt_to_xhtml_configuration.xhtml_section_template_file_path,
-            information_template_file_path = odt_to_xhtml_configuration.xhtml_information_template_file_path,
-            css_file_path = odt_to_xhtml_configuration.style_sheet_file_path,
-            simulate = simulate)
+    return (document_metadata, document_content)
 
 
 def convert_styles(serializer: Serializer, document_content: RootElement, style_map_file_path: str) -> None:
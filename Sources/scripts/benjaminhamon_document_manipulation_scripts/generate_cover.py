@@ -3,7 +3,7 @@
 import argparse
 import datetime
 import os
-from typing import Mapping, Optional
+from typing import Dict, Mapping, Optional
 
 import lxml.etree
 
@@ -98,7 +98,26 @@ def generate_cover( # pylint: disable = too-many-arguments, too-many-locals
         if not overwrite:
             raise RuntimeError("Destination already exists: '%s'" % destination_file_path)
 
-    format_parameters: Mapping[str,str] = {}
+    format_parameters = create_cover_parameters(
+        serializer = serializer,
+        information_file_path = information_file_path,
+        dc_metadata_file_path = dc_metadata_file_path,
+        revision_control = revision_control,
+        extra_information = extra_information,
+        now = now)
+
+    render_cover(destination_file_path, template_file_path, format_parameters, image_format, simulate = simulate)
+
+
+def create_cover_parameters( # pylint: disable = too-many-arguments
+        serializer: Serializer,
+        information_file_path: Optional[str],
+        dc_metadata_file_path: Optional[str],
+        revision_control: Optional[str],
+        extra_information: Mapping[str,str],
+        now: datetime.datetime) -> Dict[str,str]:
+
+    format_parameters: Dict[str,str] = {}
 
     if information_file_path is not None:
         format_parameters.update(get_parameters_from_document_information(serializer, information_file_path))
@@ -116,6 +135,12 @@ def generate_cover( # pylint: disable = too-many-arguments, too-many-locals
     for index, line in enumerate(format_parameters["title"].split("-")):
         format_parameters["title_multiline_%s" % index] = line
 
+    return format_parameters
+
+
+def render_cover(
+        destination_file_path: str, template_file_path: str, format_parameters: Mapping[str,str], image_format: str, simulate: bool = False) -> None:
+
     xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
     svg_document = lxml.etree.parse(template_file_path, xml_parser)
     xml_operations.format_text_in_xml(svg_document.getroot(), format_parameters)
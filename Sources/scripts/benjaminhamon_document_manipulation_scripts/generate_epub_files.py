@@ -1,6 +1,7 @@
 import argparse
 import os
 import shutil
+from typing import Optional
 
 from benjaminhamon_document_manipulation_scripts import script_helpers
 from benjaminhamon_document_manipulation_toolkit.epub import epub_package_configuration_builder
@@ -22,6 +23,7 @@ def main() -> None:
         serializer = create_serializer(os.path.splitext(arguments.configuration)[1].lstrip(".")),
         configuration_file_path = os.path.normpath(arguments.configuration),
         destination_directory = os.path.normpath(arguments.destination),
+        cache_directory = os.path.normpath(arguments.cache) if arguments.cache is not None else None,
         overwrite = arguments.overwrite)
 
 
@@ -29,6 +31,8 @@ def parse_arguments() -> argparse.Namespace:
     argument_parser = argparse.ArgumentParser(description = "Generate files for an epub package.")
     argument_parser.add_argument("--configuration", required = True, metavar = "<path>", help = "path to the epub configuration")
     argument_parser.add_argument("--destination", required = True, metavar = "<path>", help = "path to the directory where to create the new files")
+    argument_parser.add_argument("--cache",
+        metavar = "<path>", help = "path to the directory where to cache the titles of the content files")
     argument_parser.add_argument("--overwrite", action = "store_true", help = "overwrite the files if they exist")
 
     argument_parser.add_argument("--verbosity", choices = script_helpers.all_logging_levels, default = "info", type = str.lower,
@@ -46,10 +50,11 @@ def create_serializer(serialization_type: str) -> Serializer:
     return serializer
 
 
-def generate_epub_files(
+def generate_epub_files( # pylint: disable = too-many-arguments
         serializer: Serializer,
         configuration_file_path: str,
         destination_directory: str,
+        cache_directory: Optional[str] = None,
         overwrite: bool = False,
         simulate: bool = False) -> None:
 
@@ -62,7 +67,13 @@ def generate_epub_files(
 
     epub_generation_configuration.resolve_file_patterns()
 
-    epub_package_configuration = epub_package_configuration_builder.create_package_configuration(epub_generation_configuration, destination_directory)
+    # The titles of the content files are read from them, or from the cache for the ones which did not change since the previous run
+    title_cache = script_helpers.create_title_cache(cache_directory)
+
+    epub_package_configuration = epub_package_configuration_builder.create_package_configuration(
+        epub_generation_configuration, destination_directory, title_getter = title_cache.get_title)
+
+    title_cache.save(simulate = simulate)
 
     epub_content_configuration_file_path = os.path.join(destination_directory, "content.yaml")
     container_file_path = os.path.join(destination_directory, "container.xml")
@@ -55,11 +55,10 @@ def rewrite_odt(
     odt_reader = OdtReader(OdtToDocumentConverter(), xml_parser)
     odt_writer = OdtWriter(DocumentToOdtConverter(), xml_parser)
 
-    document_content = odt_reader.read_content_from_file(source_file_path)
-    document_comments = odt_reader.read_comments_from_file(source_file_path)
+    document = odt_reader.read_document_from_file(source_file_path)
 
     odt_writer.write_as_single_document(
-        destination_file_path, document_content, document_comments,
+        destination_file_path, document.content, document.comments,
         template_file_path = template_file_path, flat_odt = True, simulate = simulate)
 
 
@@ -1,18 +1,32 @@
 # cspell:words levelname
 
 import datetime
+import glob
+import hashlib
+import inspect
 import logging
-from typing import Dict, Mapping, Optional
+import os
+from typing import Dict, Iterable, Mapping, Optional
 
+import benjaminhamon_document_manipulation_toolkit
 from benjaminhamon_document_manipulation_scripts.revision_control.git_client import GitClient
 from benjaminhamon_document_manipulation_scripts.revision_control.revision_control_client import RevisionControlClient
 from benjaminhamon_document_manipulation_toolkit.documents import metadata_operations
+from benjaminhamon_document_manipulation_toolkit.documents.cached_document_reader import CachedDocumentReader
+from benjaminhamon_document_manipulation_toolkit.documents.document_cache import DocumentCache
 from benjaminhamon_document_manipulation_toolkit.documents.document_definition import DocumentDefinition
 from benjaminhamon_document_manipulation_toolkit.documents.document_information import DocumentInformation
+from benjaminhamon_document_manipulation_toolkit.epub.xhtml_title_cache import XhtmlTitleCache
+from benjaminhamon_document_manipulation_toolkit.interfaces.document_reader import DocumentReader
 from benjaminhamon_document_manipulation_toolkit.metadata.dc_metadata import DcMetadata
+from benjaminhamon_document_manipulation_toolkit.output.file_hash_index import FileHashIndex
+from benjaminhamon_document_manipulation_toolkit.output.file_system_output_sink import FileSystemOutputSink
 from benjaminhamon_document_manipulation_toolkit.serialization.serializer import Serializer
 
 
+logger = logging.getLogger("ScriptHelpers")
+
+
 all_logging_levels = [ "debug", "info", "warning", "error", "critical" ]
 
 
@@ -56,6 +70,78 @@ def load_document_definition(
     raise RuntimeError("Unreachable")
 
 
+def add_cache_to_document_reader(
+        document_reader: DocumentReader, cache_directory: Optional[str], cache_size_limit: Optional[int] = None) -> DocumentReader:
+
+    if cache_directory is None:
+        return document_reader
+
+    document_cache = DocumentCache(cache_directory, get_document_reader_version(document_reader))
+    if cache_size_limit is not None:
+        document_cache.size_limit = cache_size_limit
+
+    return CachedDocumentReader(document_reader, document_cache)
+
+
+def get_document_reader_version(document_reader: DocumentReader) -> str:
+
+    # Cache entries are keyed on the reader type and on the source code of the whole toolkit, rather than only of the reader and its converter,
+    # so that they are invalidated whenever the conversion changes, including through the helper modules it imports,
+    # and including in a development environment where the package version does not.
+
+    reader_type = type(document_reader)
+    package_directory = os.path.dirname(inspect.getfile(benjaminhamon_document_manipulation_toolkit))
+    all_module_file_paths = glob.glob(os.path.join(package_directory, "**", "*.py"), recursive = True)
+
+    version_data = "%s.%s\n%s" % (reader_type.__module__, reader_type.__qualname__, compute_source_hash(all_module_file_paths))
+    return hashlib.sha256(version_data.encode("utf-8")).hexdigest()
+
+
+def compute_source_hash(all_file_paths: Iterable[str]) -> str:
+    source_hash = hashlib.sha256()
+    for file_path in sorted(set(all_file_paths)):
+        with open(file_path, mode = "rb") as source_file:
+            source_hash.update(source_file.read())
+
+    return source_hash.hexdigest()
+
+
+def create_output_sink(thread_count: int = 0, skip_unchanged: bool = False,
+        hash_index_file_path: Optional[str] = None, destination_directory: Optional[str] = None, simulate: bool = False) -> FileSystemOutputSink:
+
+    # Files are written by the threads while the next ones are produced, if any, and all of them replace their destination once complete.
+    # When skipping unchanged files, the digests of the existing files are read from the hash index when set, instead of reading the files.
+    # When writing to a destination directory, the files which were not written again are removed on commit, rather than before writing anything.
+
+    hash_index = FileHashIndex(hash_index_file_path)
+    if skip_unchanged:
+        hash_index.load()
+
+    return FileSystemOutputSink(thread_count = thread_count, skip_unchanged = skip_unchanged, hash_index = hash_index,
+        destination_directory = destination_directory, simulate = simulate)
+
+
+def create_title_cache(cache_directory: Optional[str]) -> XhtmlTitleCache:
+
+    # Without a cache directory, the titles are still kept in memory for the duration of the command
+
+    title_cache = XhtmlTitleCache(os.path.join(cache_directory, "XhtmlTitles.json") if cache_directory is not None else None)
+    title_cache.load()
+    return title_cache
+
+
+def get_output_hash_index_file_path(cache_directory: Optional[str], destination_directory: str) -> Optional[str]:
+    if cache_directory is None:
+        return None
+
+    destination_hash = hashlib.sha256(os.path.abspath(destination_directory).encode("utf-8")).hexdigest()
+    return os.path.join(cache_directory, "OutputHashes-%s.json" % destination_hash[:16])
+
+
+def log_output_summary(output_sink: FileSystemOutputSink) -> None:
+    logger.info("Output files (Written: %s, Unchanged: %s)", output_sink.written_file_count, output_sink.skipped_file_count)
+
+
 def gather_document_metadata( # pylint: disable = too-many-arguments
         serializer: Serializer,
         metadata_from_source: Optional[Mapping[str,str]] = None,
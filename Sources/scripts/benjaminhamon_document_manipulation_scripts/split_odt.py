@@ -2,12 +2,12 @@
 
 import argparse
 import os
-import shutil
 from typing import Optional
 
 import lxml.etree
 
 from benjaminhamon_document_manipulation_scripts import script_helpers
+from benjaminhamon_document_manipulation_toolkit.interfaces.output_sink import OutputSink
 from benjaminhamon_document_manipulation_toolkit.open_document.document_to_odt_converter import DocumentToOdtConverter
 from benjaminhamon_document_manipulation_toolkit.open_document.odt_reader import OdtReader
 from benjaminhamon_document_manipulation_toolkit.open_document.odt_to_document_converter import OdtToDocumentConverter
@@ -23,6 +23,10 @@ def main() -> None:
         source_file_path = os.path.normpath(arguments.source),
         destination_directory = os.path.normpath(arguments.destination),
         template_file_path = os.path.normpath(arguments.template) if arguments.template is not None else None,
+        cache_directory = os.path.normpath(arguments.cache) if arguments.cache is not None else None,
+        job_count = arguments.jobs,
+        write_thread_count = arguments.write_threads,
+        skip_unchanged = arguments.skip_unchanged,
         overwrite = arguments.overwrite)
 
 
@@ -31,6 +35,13 @@ def parse_arguments() -> argparse.Namespace:
     argument_parser.add_argument("--source", required = True, metavar = "<path>", help = "path to the odt or fodt file to use as the source")
     argument_parser.add_argument("--destination", required = True, metavar = "<path>", help = "path to the directory where to create the new fodt files")
     argument_parser.add_argument("--template", metavar = "<path>", help = "path to the fodt file to use as the template")
+    argument_parser.add_argument("--cache", metavar = "<path>", help = "path to the directory where to cache the digests of the output files")
+    argument_parser.add_argument("--jobs", type = int, default = 1,
+        metavar = "<count>", help = "set the number of processes to render the sections with (default: 1, without additional processes)")
+    argument_parser.add_argument("--write-threads", type = int, default = 0,
+        metavar = "<count>", help = "set the number of threads to write the output files with (default: 0, from the main thread)")
+    argument_parser.add_argument("--skip-unchanged", action = "store_true",
+        help = "update the destination in place, leaving untouched the files whose content did not change")
     argument_parser.add_argument("--overwrite", action = "store_true", help = "overwrite the destination if it exists")
 
     argument_parser.add_argument("--verbosity", choices = script_helpers.all_logging_levels, default = "info", type = str.lower,
@@ -41,10 +52,19 @@ def parse_arguments() -> argparse.Namespace:
     return arguments
 
 
-def split_odt(
+def create_odt_writer(output_sink: Optional[OutputSink] = None) -> OdtWriter:
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    return OdtWriter(DocumentToOdtConverter(), xml_parser, output_sink = output_sink)
+
+
+def split_odt( # pylint: disable = too-many-arguments
         source_file_path: str,
         destination_directory: str,
         template_file_path: Optional[str] = None,
+        cache_directory: Optional[str] = None,
+        job_count: Optional[int] = 1,
+        write_thread_count: int = 0,
+        skip_unchanged: bool = False,
         overwrite: bool = False,
         simulate: bool = False) -> None:
 
@@ -54,19 +74,23 @@ def split_odt(
 
     xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
     odt_reader = OdtReader(OdtToDocumentConverter(), xml_parser)
-    odt_writer = OdtWriter(DocumentToOdtConverter(), xml_parser)
 
-    document_content = odt_reader.read_content_from_file(source_file_path)
-    document_comments = odt_reader.read_comments_from_file(source_file_path)
+    document = odt_reader.read_document_from_file(source_file_path)
 
     if not simulate:
-        if os.path.exists(destination_directory):
-            shutil.rmtree(destination_directory)
-        os.makedirs(destination_directory)
+        os.makedirs(destination_directory, exist_ok = True)
+
+    hash_index_file_path = script_helpers.get_output_hash_index_file_path(cache_directory, destination_directory)
+
+    with script_helpers.create_output_sink(write_thread_count, skip_unchanged, hash_index_file_path,
+            destination_directory = destination_directory, simulate = simulate) as output_sink:
+        create_odt_writer(output_sink).write_as_many_documents(
+            destination_directory, document.content, document.comments,
+            template_file_path = template_file_path, flat_odt = True, simulate = simulate,
+            job_count = job_count, writer_factory = create_odt_writer)
 
-    odt_writer.write_as_many_documents(
-        destination_directory, document_content, document_comments,
-        template_file_path = template_file_path, flat_odt = True, simulate = simulate)
+    if skip_unchanged:
+        script_helpers.log_output_summary(output_sink)
 
 
 if __name__ == "__main__":
@@ -82,11 +82,10 @@ def stage_files_for_epub_package( # pylint: disable = too-many-arguments
             shutil.rmtree(destination_directory)
         os.makedirs(destination_directory)
 
-    package_builder.stage_files(destination_directory, epub_content_configuration.file_mappings, simulate = simulate)
+    package_builder.stage_files(destination_directory, epub_content_configuration.file_mappings,
+        simulate = simulate, link_mappings = epub_content_configuration.link_mappings)
 
     if not simulate:
-        package_builder.update_xhtml_links(
-            destination_directory, epub_content_configuration.file_mappings, epub_content_configuration.link_mappings, simulate = simulate)
         package_builder.update_package_information(os.path.join(destination_directory, "EPUB", "content.opf"), parameters, simulate = simulate)
 
 
@@ -10,3 +10,4 @@ class MarkdownToOdtConfiguration:
     # Content conversion
     fodt_template_file_path: Optional[str] = None
     style_map_file_path: Optional[str] = None
+    merge_text_elements: bool = False
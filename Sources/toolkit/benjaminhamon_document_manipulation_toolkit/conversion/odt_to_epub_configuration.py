@@ -25,6 +25,7 @@ class OdtToEpubConfiguration: # pylint: disable = too-many-instance-attributes
     xhtml_section_template_file_path: Optional[str] = None
     style_sheet_file_path: Optional[str] = None
     style_map_file_path: Optional[str] = None
+    merge_text_elements: bool = False
 
     # Package
     content_files_before: List[str] = dataclasses.field(default_factory = list)
@@ -11,3 +11,4 @@ class OdtToMarkdownConfiguration:
 
     # Content conversion
     style_map_file_path: Optional[str] = None
+    merge_text_elements: bool = False
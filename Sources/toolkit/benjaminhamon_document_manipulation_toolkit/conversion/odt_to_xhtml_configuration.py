@@ -14,3 +14,4 @@ class OdtToXhtmlConfiguration:
     xhtml_section_template_file_path: Optional[str] = None
     style_sheet_file_path: Optional[str] = None
     style_map_file_path: Optional[str] = None
+    merge_text_elements: bool = False
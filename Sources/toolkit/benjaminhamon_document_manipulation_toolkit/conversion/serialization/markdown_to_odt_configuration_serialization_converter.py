@@ -31,6 +31,7 @@ class MarkdownToOdtConfigurationSerializationConverter(SerializationConverter):
         # Content conversion
         markdown_to_odt_configuration.fodt_template_file_path = self._path_converter.convert_from_serializable(obj_as_serializable.get("fodt_template_file_path", None))
         markdown_to_odt_configuration.style_map_file_path = self._path_converter.convert_from_serializable(obj_as_serializable.get("style_map_file_path", None))
+        markdown_to_odt_configuration.merge_text_elements = obj_as_serializable.get("merge_text_elements", False)
 
         return markdown_to_odt_configuration
 
@@ -57,6 +57,7 @@ class OdtToEpubConfigurationSerializationConverter(SerializationConverter):
         odt_to_epub_configuration.xhtml_section_template_file_path = self._path_converter.convert_from_serializable(obj_as_serializable.get("xhtml_section_template_file_path", None))
         odt_to_epub_configuration.style_sheet_file_path = self._path_converter.convert_from_serializable(obj_as_serializable.get("style_sheet_file_path", None))
         odt_to_epub_configuration.style_map_file_path = self._path_converter.convert_from_serializable(obj_as_serializable.get("style_map_file_path", None))
+        odt_to_epub_configuration.merge_text_elements = obj_as_serializable.get("merge_text_elements", False)
 
         # Package
         if obj_as_serializable.get("content_files_before", None) is not None:
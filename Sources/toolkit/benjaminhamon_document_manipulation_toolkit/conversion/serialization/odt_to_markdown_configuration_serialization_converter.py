@@ -33,6 +33,7 @@ class OdtToMarkdownConfigurationSerializationConverter(SerializationConverter):
 
         # Content conversion
         odt_to_markdown_configuration.style_map_file_path = self._path_converter.convert_from_serializable(obj_as_serializable.get("style_map_file_path", None))
+        odt_to_markdown_configuration.merge_text_elements = obj_as_serializable.get("merge_text_elements", False)
 
         return odt_to_markdown_configuration
 
@@ -36,6 +36,7 @@ class OdtToXhtmlConfigurationSerializationConverter(SerializationConverter):
         odt_to_xhtml_configuration.xhtml_section_template_file_path = self._path_converter.convert_from_serializable(obj_as_serializable.get("xhtml_section_template_file_path", None))
         odt_to_xhtml_configuration.style_sheet_file_path = self._path_converter.convert_from_serializable(obj_as_serializable.get("style_sheet_file_path", None))
         odt_to_xhtml_configuration.style_map_file_path = self._path_converter.convert_from_serializable(obj_as_serializable.get("style_map_file_path", None))
+        odt_to_xhtml_configuration.merge_text_elements = obj_as_serializable.get("merge_text_elements", False)
 
         return odt_to_xhtml_configuration
 
@@ -54,4 +55,5 @@ class OdtToXhtmlConfigurationSerializationConverter(SerializationConverter):
             "xhtml_section_template_file_path": obj.xhtml_section_template_file_path,
             "style_sheet_file_path": obj.style_sheet_file_path,
             "style_map_file_path": obj.style_map_file_path,
+            "merge_text_elements": obj.merge_text_elements,
         }
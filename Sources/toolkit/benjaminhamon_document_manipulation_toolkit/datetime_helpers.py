@@ -0,0 +1,40 @@
+# cspell:words dateutil
+
+import datetime
+import functools
+import re
+
+import dateutil.parser
+
+
+_iso_datetime_regex = re.compile(
+    r"^(?P<date>[0-9]{4}-[0-9]{2}-[0-9]{2})"
+    + r"(?:[T ](?P<time>[0-9]{2}:[0-9]{2}:[0-9]{2})(?:\.(?P<fraction>[0-9]+))?(?P<timezone>Z|[+\-][0-9]{2}:[0-9]{2})?)?$")
+
+
+@functools.lru_cache(maxsize = 4096)
+def parse_datetime(value: str) -> datetime.datetime:
+
+    # Handle the ISO 8601 forms written by LibreOffice and by the serializers with datetime.fromisoformat,
+    # after normalizing what it does not support before Python 3.11: fractions other than 6 digits and the Z suffix.
+    # Anything else goes through dateutil, which is much slower but supports many more formats.
+    # Results are cached since documents repeat the same dates, for example for comments written in a single session.
+
+    iso_match = _iso_datetime_regex.match(value)
+    if iso_match is None:
+        return dateutil.parser.parse(value)
+
+    if iso_match.group("time") is None:
+        return datetime.datetime.fromisoformat(iso_match.group("date"))
+
+    value_normalized = iso_match.group("date") + "T" + iso_match.group("time")
+
+    if iso_match.group("fraction") is not None:
+        value_normalized += "." + iso_match.group("fraction")[:6].ljust(6, "0")
+
+    if iso_match.group("timezone") == "Z":
+        value_normalized += "+00:00"
+    elif iso_match.group("timezone") is not None:
+        value_normalized += iso_match.group("timezone")
+
+    return datetime.datetime.fromisoformat(value_normalized)
@@ -0,0 +1,82 @@
+from typing import Any, Callable, List
+
+from benjaminhamon_document_manipulation_toolkit.documents import document_operations
+from benjaminhamon_document_manipulation_toolkit.documents.document_cache import DocumentCache
+from benjaminhamon_document_manipulation_toolkit.documents.document_data import DocumentData
+from benjaminhamon_document_manipulation_toolkit.documents.elements.document_comment import DocumentComment
+from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
+from benjaminhamon_document_manipulation_toolkit.interfaces.document_reader import DocumentReader
+
+
+class CachedDocumentReader(DocumentReader):
+    """ Document reader storing the results of another reader in a cache, for reading files which did not change since the last run """
+
+
+    def __init__(self, document_reader: DocumentReader, document_cache: DocumentCache) -> None:
+        self._document_reader = document_reader
+        self._document_cache = document_cache
+
+
+    def read_metadata_from_file(self, document_file_path: str) -> dict:
+        return self._read_with_cache(document_file_path, "metadata", self._document_reader.read_metadata_from_file)
+
+
+    def read_metadata_from_string(self, document_data: str) -> dict:
+        return self._document_reader.read_metadata_from_string(document_data)
+
+
+    def read_metadata_from_bytes(self, document_data: bytes) -> dict:
+        return self._document_reader.read_metadata_from_bytes(document_data)
+
+
+    def read_content_from_file(self, document_file_path: str) -> RootElement:
+        return self._read_with_cache(document_file_path, "content", self._document_reader.read_content_from_file)
+
+
+    def read_content_from_string(self, document_data: str) -> RootElement:
+        return self._document_reader.read_content_from_string(document_data)
+
+
+    def read_content_from_bytes(self, document_data: bytes) -> RootElement:
+        return self._document_reader.read_content_from_bytes(document_data)
+
+
+    def read_selected_content_from_file(self, document_file_path: str, section_filter: Callable[[str], bool]) -> RootElement:
+        # The filter cannot be part of the cache key, so the complete content is cached and filtered afterwards
+        document_content = self.read_content_from_file(document_file_path)
+        return document_operations.filter_sections(document_content, section_filter)
+
+
+    def read_comments_from_file(self, document_file_path: str) -> List[DocumentComment]:
+        return self._read_with_cache(document_file_path, "comments", self._document_reader.read_comments_from_file)
+
+
+    def read_comments_from_string(self, document_data: str) -> List[DocumentComment]:
+        return self._document_reader.read_comments_from_string(document_data)
+
+
+    def read_comments_from_bytes(self, document_data: bytes) -> List[DocumentComment]:
+        return self._document_reader.read_comments_from_bytes(document_data)
+
+
+    def read_document_from_file(self, document_file_path: str) -> DocumentData:
+        return self._read_with_cache(document_file_path, "document", self._document_reader.read_document_from_file)
+
+
+    def read_document_from_string(self, document_data: str) -> DocumentData:
+        return self._document_reader.read_document_from_string(document_data)
+
+
+    def read_document_from_bytes(self, document_data: bytes) -> DocumentData:
+        return self._document_reader.read_document_from_bytes(document_data)
+
+
+    def _read_with_cache(self, document_file_path: str, data_type: str, read_function: Callable[[str], Any]) -> Any:
+        key = self._document_cache.create_key(document_file_path, type(self._document_reader).__name__, data_type)
+
+        data = self._document_cache.try_get(key)
+        if data is None:
+            data = read_function(document_file_path)
+            self._document_cache.set(key, data)
+
+        return data
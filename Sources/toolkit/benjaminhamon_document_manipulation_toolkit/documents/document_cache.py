@@ -0,0 +1,125 @@
+import hashlib
+import logging
+import os
+import pickle
+import zlib
+from typing import Any, List, Optional, Tuple
+
+
+logger = logging.getLogger("DocumentCache")
+
+
+class DocumentCache:
+    """ On-disk cache for objects converted from a source file, keyed by the source file fingerprint """
+
+
+    format_version = "1"
+
+
+    def __init__(self, cache_directory: str, version: str, size_limit: int = 512 * 1024 * 1024) -> None:
+        self.cache_directory = cache_directory
+        self.version = version
+        self.size_limit = size_limit
+
+
+    def create_key(self, source_file_path: str, *extra: str) -> str:
+        source_file_status = os.stat(source_file_path)
+
+        key_components = [
+            self.format_version,
+            self.version,
+            os.path.abspath(source_file_path),
+            str(source_file_status.st_size),
+            str(source_file_status.st_mtime_ns),
+            self._compute_file_hash(source_file_path),
+        ]
+
+        key_components.extend(extra)
+
+        return hashlib.sha256("\n".join(key_components).encode("utf-8")).hexdigest()
+
+
+    def try_get(self, key: str) -> Optional[Any]:
+        entry_file_path = self._get_entry_file_path(key)
+
+        try:
+            with open(entry_file_path, mode = "rb") as entry_file:
+                entry_data = entry_file.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            value = pickle.loads(zlib.decompress(entry_data))
+        except (zlib.error, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            logger.warning("Discarding invalid cache entry '%s'", entry_file_path)
+            try:
+                os.remove(entry_file_path)
+            except FileNotFoundError:
+                pass
+            return None
+
+        # Entries are evicted by least recent use, so a hit refreshes the entry modification time
+        try:
+            os.utime(entry_file_path)
+        except FileNotFoundError:
+            pass
+
+        return value
+
+
+    def set(self, key: str, value: Any) -> None:
+        entry_file_path = self._get_entry_file_path(key)
+        entry_data = zlib.compress(pickle.dumps(value, protocol = pickle.HIGHEST_PROTOCOL))
+
+        os.makedirs(self.cache_directory, exist_ok = True)
+
+        # Several processes may share the cache, so the temporary file name is unique to each one
+        entry_temporary_file_path = entry_file_path + ".%s.tmp" % os.getpid()
+        with open(entry_temporary_file_path, mode = "wb") as entry_file:
+            entry_file.write(entry_data)
+        os.replace(entry_temporary_file_path, entry_file_path)
+
+        self.evict()
+
+
+    def evict(self) -> None:
+        all_entries: List[Tuple[float, int, str]] = []
+
+        if not os.path.isdir(self.cache_directory):
+            return
+
+        for file_name in os.listdir(self.cache_directory):
+            if file_name.endswith(".cache"):
+                entry_file_path = os.path.join(self.cache_directory, file_name)
+                try:
+                    entry_file_status = os.stat(entry_file_path)
+                except FileNotFoundError:
+                    continue
+                all_entries.append((entry_file_status.st_mtime, entry_file_status.st_size, entry_file_path))
+
+        total_size = sum(entry[1] for entry in all_entries)
+
+        for _, entry_size, entry_file_path in sorted(all_entries):
+            if total_size <= self.size_limit:
+                break
+
+            logger.debug("Evicting cache entry '%s'", entry_file_path)
+            try:
+                os.remove(entry_file_path)
+            except FileNotFoundError:
+                pass
+            total_size -= entry_size
+
+
+    def _get_entry_file_path(self, key: str) -> str:
+        return os.path.join(self.cache_directory, key + ".cache")
+
+
+    def _compute_file_hash(self, file_path: str) -> str:
+        file_hash = hashlib.sha256()
+
+        with open(file_path, mode = "rb") as source_file:
+            for chunk in iter(lambda: source_file.read(1024 * 1024), b""):
+                file_hash.update(chunk)
+
+        return file_hash.hexdigest()
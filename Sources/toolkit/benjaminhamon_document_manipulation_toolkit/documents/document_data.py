@@ -0,0 +1,12 @@
+import dataclasses
+from typing import List
+
+from benjaminhamon_document_manipulation_toolkit.documents.elements.document_comment import DocumentComment
+from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
+
+
+@dataclasses.dataclass()
+class DocumentData:
+    content: RootElement
+    comments: List[DocumentComment]
+    metadata: dict
@@ -1,77 +1,192 @@
+import concurrent.futures
 import fnmatch
 import os
-from typing import Dict, Iterator, List, Optional
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
 
 from benjaminhamon_document_manipulation_toolkit import convert_helpers
 from benjaminhamon_document_manipulation_toolkit.documents.document_definition import DocumentDefinition
 from benjaminhamon_document_manipulation_toolkit.documents.elements.document_element import DocumentElement
+from benjaminhamon_document_manipulation_toolkit.documents.elements.paragraph_element import ParagraphElement
 from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
 from benjaminhamon_document_manipulation_toolkit.documents.elements.section_element import SectionElement
+from benjaminhamon_document_manipulation_toolkit.documents.elements.text_element import TextElement
 from benjaminhamon_document_manipulation_toolkit.interfaces.document_reader import DocumentReader
 
 
-def load_document_from_definition(document_definition: DocumentDefinition, document_reader: DocumentReader) -> RootElement:
+_worker_document_reader: Optional[DocumentReader] = None
+
+
+def load_document_from_definition(
+        document_definition: DocumentDefinition,
+        document_reader: DocumentReader,
+        job_count: Optional[int] = 1,
+        document_reader_factory: Optional[Callable[[], DocumentReader]] = None) -> RootElement:
+
     if document_definition.source_file_path is not None:
         return load_document_from_definition_as_single_file(document_definition, document_reader)
 
     if document_definition.source_directory is not None:
-        return load_document_from_definition_as_many_files(document_definition, document_reader)
+        return load_document_from_definition_as_many_files(
+            document_definition, document_reader, job_count = job_count, document_reader_factory = document_reader_factory)
 
     raise ValueError("'source_file_path' or 'source_directory' must be set")
 
 
 def load_document_from_definition_as_single_file(document_definition: DocumentDefinition, document_reader: DocumentReader) -> RootElement:
-
-    def enumerate_matching_sections(section_identifier_collection: List[str]) -> Iterator[SectionElement]:
-        for section in document_source.enumerate_sections():
-            for section_identifier in section_identifier_collection:
-                if fnmatch.fnmatch(section.get_heading().get_title(), section_identifier):
-                    yield section
-
     if document_definition.source_file_path is None:
         raise ValueError("'source_file_path' must be set")
 
-    document_source = document_reader.read_content_from_file(document_definition.source_file_path)
+    # Sections matching none of the identifiers are skipped by the reader, so that they are not converted for nothing
+    section_filter = compile_section_identifiers(list(enumerate_section_identifiers(document_definition)))
+    document_source = document_reader.read_selected_content_from_file(document_definition.source_file_path, section_filter)
+    return select_sections_from_definition(document_definition, document_source)
+
+
+def select_sections_from_definition(document_definition: DocumentDefinition, document_source: RootElement) -> RootElement:
+    section_index = [ (section.get_heading().get_title(), section) for section in document_source.enumerate_sections() ]
 
     document_content = RootElement()
 
-    if document_definition.front_section_identifiers is not None:
-        for section in enumerate_matching_sections(document_definition.front_section_identifiers):
-            document_content.children.append(section)
+    for section_identifier_collection in [
+            document_definition.front_section_identifiers,
+            document_definition.content_section_identifiers,
+            document_definition.back_section_identifiers ]:
 
-    if document_definition.content_section_identifiers is not None:
-        for section in enumerate_matching_sections(document_definition.content_section_identifiers):
-            document_content.children.append(section)
+        if section_identifier_collection is not None:
+            section_filter = compile_section_identifiers(section_identifier_collection)
+            document_content.children.extend(section for title, section in section_index if section_filter(title))
 
+    return document_content
+
+
+def enumerate_section_identifiers(document_definition: DocumentDefinition) -> Iterator[str]:
+    if document_definition.front_section_identifiers is not None:
+        yield from document_definition.front_section_identifiers
+    if document_definition.content_section_identifiers is not None:
+        yield from document_definition.content_section_identifiers
     if document_definition.back_section_identifiers is not None:
-        for section in enumerate_matching_sections(document_definition.back_section_identifiers):
-            document_content.children.append(section)
+        yield from document_definition.back_section_identifiers
+
+
+def compile_section_identifiers(section_identifier_collection: List[str]) -> Callable[[str], bool]:
+
+    # Identifiers are glob patterns, as for fnmatch, combined into a single regular expression to check each title only once
+
+    if len(section_identifier_collection) == 0:
+        return lambda title: False
+
+    pattern = "|".join("(?:%s)" % fnmatch.translate(os.path.normcase(identifier)) for identifier in section_identifier_collection)
+    expression = re.compile(pattern)
+
+    return lambda title: expression.match(os.path.normcase(title)) is not None
+
+
+def filter_sections(document_content: RootElement, section_filter: Callable[[str], bool]) -> RootElement:
+    document_content.children = [
+        child for child in document_content.children
+        if not isinstance(child, SectionElement) or section_filter(child.get_heading().get_title())
+    ]
 
     return document_content
 
 
-def load_document_from_definition_as_many_files(document_definition: DocumentDefinition, document_reader: DocumentReader) -> RootElement:
+def load_document_from_definition_as_many_files(
+        document_definition: DocumentDefinition,
+        document_reader: DocumentReader,
+        job_count: Optional[int] = 1,
+        document_reader_factory: Optional[Callable[[], DocumentReader]] = None) -> RootElement:
 
-    def read_section(section_file_path: str) -> RootElement:
-        if document_definition.source_directory is not None:
-            section_file_path = os.path.join(document_definition.source_directory, section_file_path)
-        return document_reader.read_content_from_file(section_file_path)
+    # Readers cannot be sent to worker processes, so each worker creates its own using the factory, which must be picklable.
+    # A job count set to None uses all the available processors.
+
+    if job_count is None:
+        job_count = os.cpu_count() or 1
+
+    section_file_path_collection = list(enumerate_section_file_paths(document_definition))
+    job_count = min(job_count, len(section_file_path_collection))
+
+    if job_count > 1:
+        if document_reader_factory is None:
+            raise ValueError("A document reader factory is required to load files with several jobs")
+        section_content_collection = _read_files_in_parallel(document_reader_factory, section_file_path_collection, job_count)
+    else:
+        section_content_collection = _read_files_with_prefetch(document_reader, section_file_path_collection)
 
     document_content = RootElement()
+    for section_content in section_content_collection:
+        document_content.children.extend(section_content.children)
 
-    if document_definition.front_section_file_paths is not None:
-        for section_file_path in document_definition.front_section_file_paths:
-            document_content.children.extend(read_section(section_file_path).children)
+    return document_content
 
-    if document_definition.content_section_file_paths is not None:
-        for section_file_path in document_definition.content_section_file_paths:
-            document_content.children.extend(read_section(section_file_path).children)
 
+def enumerate_section_file_paths(document_definition: DocumentDefinition) -> Iterator[str]:
+    all_section_file_paths: List[str] = []
+
+    if document_definition.front_section_file_paths is not None:
+        all_section_file_paths.extend(document_definition.front_section_file_paths)
+    if document_definition.content_section_file_paths is not None:
+        all_section_file_paths.extend(document_definition.content_section_file_paths)
     if document_definition.back_section_file_paths is not None:
-        for section_file_path in document_definition.back_section_file_paths:
-            document_content.children.extend(read_section(section_file_path).children)
+        all_section_file_paths.extend(document_definition.back_section_file_paths)
+
+    for section_file_path in all_section_file_paths:
+        if document_definition.source_directory is not None:
+            section_file_path = os.path.join(document_definition.source_directory, section_file_path)
+        yield section_file_path
+
+
+def _read_files_in_parallel(
+        document_reader_factory: Callable[[], DocumentReader], file_path_collection: List[str], job_count: int) -> Iterator[RootElement]:
+
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers = job_count, initializer = _initialize_worker, initargs = (document_reader_factory,)) as executor:
+
+        # Results are returned in the order of the file paths, whatever the order in which the workers complete them
+        yield from executor.map(_read_file_in_worker, file_path_collection)
+
+
+def _initialize_worker(document_reader_factory: Callable[[], DocumentReader]) -> None:
+    global _worker_document_reader # pylint: disable = global-statement
+    _worker_document_reader = document_reader_factory()
+
+
+def _read_file_in_worker(file_path: str) -> RootElement:
+    if _worker_document_reader is None:
+        raise RuntimeError("Worker is not initialized")
+    return _worker_document_reader.read_content_from_file(file_path)
+
+
+def _read_files_with_prefetch(document_reader: DocumentReader, file_path_collection: List[str]) -> Iterator[RootElement]:
+
+    # Read the next file in the background while converting the current one, so that disk access overlaps with the conversion
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers = 1) as executor:
+        for file_index, file_path in enumerate(file_path_collection):
+            if file_index + 1 < len(file_path_collection):
+                executor.submit(_prefetch_file, file_path_collection[file_index + 1])
+            yield document_reader.read_content_from_file(file_path)
+
+
+def _prefetch_file(file_path: str) -> None:
+    with open(file_path, mode = "rb") as file:
+        while file.read(1024 * 1024):
+            pass
 
-    return document_content
+
+def enumerate_sections(content: Union[RootElement, Iterable[SectionElement]]) -> Iterator[SectionElement]:
+    if isinstance(content, RootElement):
+        return content.enumerate_sections()
+    return iter(content)
+
+
+def get_section_count(content: Union[RootElement, Iterable[SectionElement]], section_count: Optional[int] = None) -> int:
+    if section_count is not None:
+        return section_count
+    if isinstance(content, RootElement):
+        return content.get_section_count()
+
+    raise ValueError("Section count must be provided when content is not a RootElement")
 
 
 def enumerate_all_elements(element: DocumentElement) -> Iterator[DocumentElement]:
@@ -96,3 +211,41 @@ def convert_styles(root: DocumentElement, style_map: Dict[str,Optional[str]]) ->
             if style_converted is not None:
                 new_style_collection.append(style_converted)
         element.style_collection = new_style_collection
+
+
+def merge_text_elements(root: DocumentElement) -> None:
+
+    # Merge adjacent text elements with the same style, such as the many runs LibreOffice creates for spell checking or tracked changes.
+    # Text is not merged across a line break or a region boundary, and headings are left untouched since their title depends on their text elements.
+
+    def can_merge(first: TextElement, second: TextElement) -> bool:
+        return (not first.line_break
+            and first.identifier is None and second.identifier is None
+            and len(first.children) == 0 and len(second.children) == 0
+            and first.style_collection == second.style_collection)
+
+    for element in enumerate_all_elements(root):
+        if not isinstance(element, ParagraphElement) or len(element.children) < 2:
+            continue
+
+        merged_children: List[DocumentElement] = []
+        run_element: Optional[TextElement] = None
+        run_text: List[str] = []
+
+        for child in element.children:
+            if run_element is not None and isinstance(child, TextElement) and can_merge(run_element, child):
+                run_text.append(child.text)
+                run_element.line_break = child.line_break
+                continue
+
+            if run_element is not None and len(run_text) > 1:
+                run_element.text = "".join(run_text)
+
+            merged_children.append(child)
+            run_element = child if isinstance(child, TextElement) else None
+            run_text = [ child.text ] if isinstance(child, TextElement) else []
+
+        if run_element is not None and len(run_text) > 1:
+            run_element.text = "".join(run_text)
+
+        element.children = merged_children
@@ -0,0 +1,72 @@
+import collections
+import concurrent.futures
+import itertools
+import os
+from typing import Any, Callable, Deque, Iterable, Iterator, Optional, Sequence
+
+
+_worker_renderer: Optional[Any] = None
+
+
+def render_sections(
+        renderer: Any,
+        render_function: Callable[..., Any],
+        all_arguments: Iterable[Sequence[Any]],
+        job_count: Optional[int] = 1,
+        renderer_factory: Optional[Callable[[], Any]] = None) -> Iterator[Any]:
+
+    # Call the render function with a renderer and each set of arguments, and yield the results in the order of the arguments.
+    # Renderers hold lxml parsers and trees, which cannot be sent to worker processes, so each worker creates its own using the factory.
+    # The factory, the render function and the arguments must be picklable, for example a module function with section models,
+    # and results should be bytes or strings, so that the files are written by the calling process in a deterministic order.
+    # A job count set to None uses all the available processors.
+    # Only the first arguments are read ahead to choose the job count, so that they can be produced while rendering.
+
+    if job_count is None:
+        job_count = os.cpu_count() or 1
+
+    if job_count > 1:
+        all_arguments = iter(all_arguments)
+        all_first_arguments = list(itertools.islice(all_arguments, job_count))
+        job_count = min(job_count, len(all_first_arguments))
+        all_arguments = itertools.chain(all_first_arguments, all_arguments)
+
+    if job_count > 1:
+        if renderer_factory is None:
+            raise ValueError("A renderer factory is required to render sections with several jobs")
+        yield from _render_in_parallel(renderer_factory, render_function, all_arguments, job_count)
+    else:
+        for arguments in all_arguments:
+            yield render_function(renderer, *arguments)
+
+
+def _render_in_parallel(
+        renderer_factory: Callable[[], Any], render_function: Callable[..., Any], all_arguments: Iterable[Sequence[Any]], job_count: int) -> Iterator[Any]:
+
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers = job_count, initializer = _initialize_worker, initargs = (renderer_factory,)) as executor:
+
+        # Results are returned in the order of the arguments, whatever the order in which the workers complete them.
+        # Arguments are submitted only a few sections ahead of the next result, since executor.map would submit all of them at once,
+        # holding every section and every result in memory.
+
+        all_pending_futures: Deque[concurrent.futures.Future] = collections.deque()
+
+        for arguments in all_arguments:
+            if len(all_pending_futures) >= job_count * 2:
+                yield all_pending_futures.popleft().result()
+            all_pending_futures.append(executor.submit(_render_in_worker, render_function, arguments))
+
+        while len(all_pending_futures) > 0:
+            yield all_pending_futures.popleft().result()
+
+
+def _initialize_worker(renderer_factory: Callable[[], Any]) -> None:
+    global _worker_renderer # pylint: disable = global-statement
+    _worker_renderer = renderer_factory()
+
+
+def _render_in_worker(render_function: Callable[..., Any], arguments: Sequence[Any]) -> Any:
+    if _worker_renderer is None:
+        raise RuntimeError("Worker is not initialized")
+    return render_function(_worker_renderer, *arguments)
@@ -1,78 +1,100 @@
 # cspell:words lxml
 
+from typing import Dict, Iterable, Iterator, Tuple, Union
+
 import lxml.etree
 
+from benjaminhamon_document_manipulation_toolkit.documents import document_operations
 from benjaminhamon_document_manipulation_toolkit.documents.elements.document_element import DocumentElement
 from benjaminhamon_document_manipulation_toolkit.documents.elements.heading_element import HeadingElement
 from benjaminhamon_document_manipulation_toolkit.documents.elements.paragraph_element import ParagraphElement
 from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
 from benjaminhamon_document_manipulation_toolkit.documents.elements.section_element import SectionElement
 from benjaminhamon_document_manipulation_toolkit.documents.elements.text_element import TextElement
+from benjaminhamon_document_manipulation_toolkit.epub import epub_namespaces
 from benjaminhamon_document_manipulation_toolkit.epub import epub_xhtml_helpers
+from benjaminhamon_document_manipulation_toolkit.xml import xml_namespace
 
 
 class DocumentToXhtmlConverter:
 
 
+    def __init__(self) -> None:
+        self._xhtml_namespace = xml_namespace.get_namespace(epub_namespaces.xhtml_default_namespace)
+        self._all_style_attributes: Dict[Tuple[str,...],Dict[str,str]] = {}
+
+
     def convert(self,
             xhtml_document: lxml.etree._ElementTree,
-            content: RootElement) -> lxml.etree._ElementTree:
+            content: Union[RootElement, Iterable[SectionElement]]) -> lxml.etree._ElementTree:
 
         body_as_html = epub_xhtml_helpers.find_xhtml_element(xhtml_document.getroot(), "./x:body")
-        for section in content.enumerate_sections():
-            body_as_html.append(self._convert_section(section, level = 1))
+        for section_as_html in self.enumerate_content_elements(content):
+            body_as_html.append(section_as_html)
 
         return xhtml_document
 
 
+    def enumerate_content_elements(self, content: Union[RootElement, Iterable[SectionElement]]) -> Iterator[lxml.etree._Element]:
+        for section in document_operations.enumerate_sections(content):
+            yield self._convert_section(section, level = 1)
+
+
     def _convert_section(self, section_element: SectionElement, level: int) -> lxml.etree._Element:
         attributes = self._get_html_attributes_from_element(section_element)
-        section_as_html = epub_xhtml_helpers.create_xhtml_element("section", attributes = attributes)
+        section_as_html = lxml.etree.Element(self._xhtml_namespace.get_name("section"), attrib = attributes)
+        self._fill_section(section_as_html, section_element, level)
+        return section_as_html
+
 
-        section_as_html.append(self._convert_heading(section_element.get_heading(), level))
+    def _fill_section(self, section_as_html: lxml.etree._Element, section_element: SectionElement, level: int) -> None:
+        self._convert_heading(section_as_html, section_element.get_heading(), level)
         for paragraph_element in section_element.enumerate_paragraphs():
-            section_as_html.append(self._convert_paragraph(paragraph_element))
+            self._convert_paragraph(section_as_html, paragraph_element)
         for subsection_element in section_element.enumerate_subsections():
-            section_as_html.append(self._convert_section(subsection_element, level + 1))
-
-        return section_as_html
+            attributes = self._get_html_attributes_from_element(subsection_element)
+            subsection_as_html = lxml.etree.SubElement(section_as_html, self._xhtml_namespace.get_name("section"), attrib = attributes)
+            self._fill_section(subsection_as_html, subsection_element, level + 1)
 
 
-    def _convert_heading(self, heading_element: HeadingElement, level: int) -> lxml.etree._Element:
+    def _convert_heading(self, parent_as_html: lxml.etree._Element, heading_element: HeadingElement, level: int) -> None:
         attributes = self._get_html_attributes_from_element(heading_element)
-        heading_as_html = epub_xhtml_helpers.create_xhtml_element("h" + str(level), attributes = attributes)
+        heading_as_html = lxml.etree.SubElement(parent_as_html, self._xhtml_namespace.get_name("h" + str(level)), attrib = attributes)
 
         for text_element in heading_element.enumerate_text():
-            heading_as_html.append(self._convert_text(text_element))
-
-        return heading_as_html
+            self._convert_text(heading_as_html, text_element)
 
 
-    def _convert_paragraph(self, paragraph_element: ParagraphElement) -> lxml.etree._Element:
+    def _convert_paragraph(self, parent_as_html: lxml.etree._Element, paragraph_element: ParagraphElement) -> None:
         attributes = self._get_html_attributes_from_element(paragraph_element)
-        paragraph_as_html = epub_xhtml_helpers.create_xhtml_element("p", attributes = attributes)
+        paragraph_as_html = lxml.etree.SubElement(parent_as_html, self._xhtml_namespace.get_name("p"), attrib = attributes)
 
         for text_element in paragraph_element.enumerate_text():
-            paragraph_as_html.append(self._convert_text(text_element))
+            self._convert_text(paragraph_as_html, text_element)
 
         if len(paragraph_element.children) == 0:
             paragraph_as_html.text = "\u00a0" # no-break space
 
-        return paragraph_as_html
 
-
-    def _convert_text(self, text_element: TextElement) -> lxml.etree._Element:
+    def _convert_text(self, parent_as_html: lxml.etree._Element, text_element: TextElement) -> None:
         attributes = self._get_html_attributes_from_element(text_element)
-        text_as_html = epub_xhtml_helpers.create_xhtml_element("span", attributes = attributes)
+        text_as_html = lxml.etree.SubElement(parent_as_html, self._xhtml_namespace.get_name("span"), attrib = attributes)
         text_as_html.text = text_element.text
-        return text_as_html
 
 
-    def _get_html_attributes_from_element(self, element: DocumentElement) -> dict:
-        attributes = {}
+    def _get_html_attributes_from_element(self, element: DocumentElement) -> Dict[str,str]:
+
+        # Attributes are shared by the elements with the same styles, lxml copies them when creating an element
+
+        if element.identifier is None:
+            style_key = tuple(element.style_collection)
+            attributes = self._all_style_attributes.get(style_key)
+            if attributes is None:
+                attributes = { "class": " ".join(style_key) } if len(style_key) > 0 else {}
+                self._all_style_attributes[style_key] = attributes
+            return attributes
 
-        if element.identifier is not None:
-            attributes["id"] = element.identifier
+        attributes = { "id": element.identifier }
         if len(element.style_collection) > 0:
             attributes["class"] = " ".join(element.style_collection)
 
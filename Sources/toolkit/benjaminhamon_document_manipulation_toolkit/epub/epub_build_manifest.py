@@ -0,0 +1,78 @@
+import hashlib
+import os
+from typing import Dict, Iterable, Optional
+
+from benjaminhamon_document_manipulation_toolkit import sidecar_file_helpers
+
+
+class EpubBuildManifest:
+    """ Input hashes of the files created by a package build, to create again only the files whose inputs changed """
+
+
+    format_version = "3"
+
+
+    def __init__(self, input_hash: str) -> None:
+        self.input_hash = input_hash
+        self.cover_hash: Optional[str] = None
+        self.entry_hashes: Dict[str,str] = {}
+        self.package_fingerprint: Optional[str] = None
+
+
+    def load_from_file(self, manifest_file_path: str) -> None:
+
+        # A manifest for other inputs is ignored as well, so that everything is created again
+
+        manifest_data = sidecar_file_helpers.load_sidecar_file(manifest_file_path, self.format_version)
+        if manifest_data is None or manifest_data.get("input_hash") != self.input_hash:
+            return
+
+        self.cover_hash = manifest_data.get("cover_hash")
+        self.entry_hashes = dict(manifest_data.get("entry_hashes", {}))
+        self.package_fingerprint = manifest_data.get("package_fingerprint")
+
+
+    def save_to_file(self, manifest_file_path: str, simulate: bool = False) -> None:
+        manifest_data = {
+            "input_hash": self.input_hash,
+            "cover_hash": self.cover_hash,
+            "entry_hashes": self.entry_hashes,
+            "package_fingerprint": self.package_fingerprint,
+        }
+
+        sidecar_file_helpers.save_sidecar_file(manifest_file_path, self.format_version, manifest_data, simulate = simulate)
+
+
+    def record_package(self, package_file_path: str) -> None:
+        self.package_fingerprint = self._compute_package_fingerprint(package_file_path)
+
+
+    def is_package_unchanged(self, package_file_path: str) -> bool:
+        # The package may have been modified or removed since it was recorded, in which case it cannot be reused
+        return self.package_fingerprint is not None and self.package_fingerprint == self._compute_package_fingerprint(package_file_path)
+
+
+    def _compute_package_fingerprint(self, package_file_path: str) -> Optional[str]:
+        try:
+            package_file_status = os.stat(package_file_path)
+        except FileNotFoundError:
+            return None
+
+        return "%s:%s" % (package_file_status.st_size, package_file_status.st_mtime_ns)
+
+
+def compute_hash(all_components: Iterable[bytes]) -> str:
+    # Components are prefixed with their length, so that their boundaries are part of the hash
+    hash_object = hashlib.sha256()
+    for component in all_components:
+        hash_object.update(str(len(component)).encode("ascii") + b":")
+        hash_object.update(component)
+    return hash_object.hexdigest()
+
+
+def compute_file_hash(file_path: str) -> str:
+    hash_object = hashlib.sha256()
+    with open(file_path, mode = "rb") as source_file:
+        for chunk in iter(lambda: source_file.read(1024 * 1024), b""):
+            hash_object.update(chunk)
+    return hash_object.hexdigest()
@@ -4,7 +4,7 @@ import datetime
 import logging
 import os
 import urllib.parse
-from typing import Any, List
+from typing import IO, Any, Optional, Sequence
 
 import lxml.etree
 
@@ -13,6 +13,8 @@ from benjaminhamon_document_manipulation_toolkit.epub.epub_metadata_item import
 from benjaminhamon_document_manipulation_toolkit.epub.epub_navigation import EpubNavigation
 from benjaminhamon_document_manipulation_toolkit.epub.epub_navigation_xhtml_builder import EpubNavigationXhtmlBuilder
 from benjaminhamon_document_manipulation_toolkit.epub.epub_package_document import EpubPackageDocument
+from benjaminhamon_document_manipulation_toolkit.interfaces.output_sink import OutputSink
+from benjaminhamon_document_manipulation_toolkit.xml import xml_file_writer
 
 
 logger = logging.getLogger("EpubContentWriter")
@@ -21,7 +23,8 @@ logger = logging.getLogger("EpubContentWriter")
 class EpubContentWriter:
 
 
-    def __init__(self) -> None:
+    def __init__(self, output_sink: Optional[OutputSink] = None) -> None:
+        self._output_sink = output_sink
         self.encoding = "utf-8"
         self.pretty_print = True
         self.version = "3.0"
@@ -35,12 +38,7 @@ class EpubContentWriter:
 
 
     def write_navigation_file(self, toc_file_path: str, navigation: EpubNavigation, reference_base: str, simulate: bool = False) -> None:
-        xhtml_builder = EpubNavigationXhtmlBuilder("Table of Contents")
-        xhtml_builder.add_table_of_contents(navigation.navigation_items, reference_base)
-        xhtml_builder.add_landmarks(navigation.landmarks, reference_base)
-
-        navigation_document = xhtml_builder.get_xhtml_document()
-
+        navigation_document = self.convert_navigation_to_xhtml(navigation, reference_base)
         self.write_xml_file(toc_file_path, navigation_document, simulate = simulate)
 
 
@@ -52,18 +50,26 @@ class EpubContentWriter:
     def write_xml_file(self, output_file_path: str, document_as_html: lxml.etree._ElementTree, simulate: bool = False) -> None:
         logger.debug("Writing '%s'", output_file_path)
 
+        with xml_file_writer.open_output_file(output_file_path, simulate = simulate, output_sink = self._output_sink) as output_file:
+            self.write_xml_to_stream(output_file, document_as_html)
+
+
+    def write_xml_to_stream(self, output_file: IO[bytes], document_as_html: lxml.etree._ElementTree) -> None:
         write_options = {
             "encoding": self.encoding,
             "pretty_print": self.pretty_print,
             "doctype": "<?xml version=\"1.0\" encoding=\"%s\"?>" % self.encoding,
         }
 
-        document_as_xml_string: str = lxml.etree.tostring(document_as_html, **write_options).decode(self.encoding)
+        xml_file_writer.write_document(output_file, document_as_html, **write_options)
+
+
+    def convert_navigation_to_xhtml(self, navigation: EpubNavigation, reference_base: str) -> lxml.etree._ElementTree:
+        xhtml_builder = EpubNavigationXhtmlBuilder("Table of Contents")
+        xhtml_builder.add_table_of_contents(navigation.navigation_items, reference_base)
+        xhtml_builder.add_landmarks(navigation.landmarks, reference_base)
 
-        if not simulate:
-            with open(output_file_path + ".tmp", mode = "w", encoding = self.encoding) as output_file:
-                output_file.write(document_as_xml_string)
-            os.replace(output_file_path + ".tmp", output_file_path)
+        return xhtml_builder.get_xhtml_document()
 
 
     def create_container_as_xml(self, opf_file_path: str) -> lxml.etree._ElementTree:
@@ -124,7 +130,7 @@ class EpubContentWriter:
         return lxml.etree.ElementTree(package_as_xhtml)
 
 
-    def convert_package_document_metadata_to_xhtml(self, all_metadata_items: List[EpubMetadataItem]) -> lxml.etree._Element:
+    def convert_package_document_metadata_to_xhtml(self, all_metadata_items: Sequence[EpubMetadataItem]) -> lxml.etree._Element:
 
         def value_to_str(value: Any) -> str:
             if isinstance(value, str):
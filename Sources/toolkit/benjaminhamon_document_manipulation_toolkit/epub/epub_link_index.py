@@ -0,0 +1,27 @@
+import os
+from typing import Dict, List, Optional, Tuple
+
+
+class EpubLinkIndex:
+    """ Index of link mappings, to find the mapping for a link without scanning and normalizing all of them for each link """
+
+
+    def __init__(self, link_mappings: List[Tuple[str,str]]) -> None:
+
+        # Relative links are matched on their normalized path, other links on their exact value.
+        # When several mappings have the same source, the first one is used, as when scanning the list.
+
+        self._all_mappings_by_link: Dict[str,str] = {}
+        self._all_mappings_by_path: Dict[str,str] = {}
+
+        for link_before, link_after in link_mappings:
+            self._all_mappings_by_link.setdefault(link_before, link_after)
+            self._all_mappings_by_path.setdefault(os.path.normpath(link_before), link_after)
+
+
+    def try_get_mapping_for_link(self, link: str) -> Optional[str]:
+        return self._all_mappings_by_link.get(link)
+
+
+    def try_get_mapping_for_path(self, path: str) -> Optional[str]:
+        return self._all_mappings_by_path.get(os.path.normpath(path))
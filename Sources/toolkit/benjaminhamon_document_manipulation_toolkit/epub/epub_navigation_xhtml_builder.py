@@ -5,9 +5,11 @@ from typing import List
 
 import lxml.etree
 
+from benjaminhamon_document_manipulation_toolkit.epub import epub_namespaces
 from benjaminhamon_document_manipulation_toolkit.epub import epub_xhtml_helpers
 from benjaminhamon_document_manipulation_toolkit.epub.epub_landmark import EpubLandmark
 from benjaminhamon_document_manipulation_toolkit.epub.epub_navigation_item import EpubNavigationItem
+from benjaminhamon_document_manipulation_toolkit.xml import xml_namespace
 
 
 class EpubNavigationXhtmlBuilder:
@@ -15,6 +17,7 @@ class EpubNavigationXhtmlBuilder:
 
     def __init__(self, title: str) -> None:
         self._xhtml_document = epub_xhtml_helpers.create_xhtml_base(title)
+        self._epub_type_attribute = xml_namespace.get_namespace(epub_namespaces.xhtml_epub_namespace).get_name("type")
 
 
     def get_xhtml_document(self) -> lxml.etree._ElementTree:
@@ -25,7 +28,7 @@ class EpubNavigationXhtmlBuilder:
         body_element = epub_xhtml_helpers.find_xhtml_element(self._xhtml_document.getroot(), "./x:body")
 
         nav_element = epub_xhtml_helpers.create_xhtml_subelement(body_element, "nav",
-            attributes = { lxml.etree.QName(body_element.nsmap["epub"], "type"): "toc" })
+            attributes = { self._epub_type_attribute: "toc" })
 
         epub_xhtml_helpers.create_xhtml_subelement(nav_element, "h1", text = "Table of Contents")
 
@@ -41,7 +44,7 @@ class EpubNavigationXhtmlBuilder:
         body_element = epub_xhtml_helpers.find_xhtml_element(self._xhtml_document.getroot(), "./x:body")
 
         nav_element = epub_xhtml_helpers.create_xhtml_subelement(body_element, "nav",
-            attributes = { lxml.etree.QName(body_element.nsmap["epub"], "type"): "landmarks" })
+            attributes = { self._epub_type_attribute: "landmarks" })
 
         epub_xhtml_helpers.create_xhtml_subelement(nav_element, "h1", text = "Landmarks")
 
@@ -50,5 +53,5 @@ class EpubNavigationXhtmlBuilder:
         for item in item_collection:
             reference_relative = os.path.relpath(item.reference, reference_base).replace("\\", "/")
             list_item_element = epub_xhtml_helpers.create_xhtml_subelement(list_element, "li")
-            attributes = { lxml.etree.QName(body_element.nsmap["epub"], "type"): item.epub_type, "href": reference_relative }
+            attributes = { self._epub_type_attribute: item.epub_type, "href": reference_relative }
             epub_xhtml_helpers.create_xhtml_subelement(list_item_element, "a", attributes = attributes, text = item.display_name)
@@ -1,14 +1,22 @@
+# cspell:words lxml
+
+import contextlib
 import glob
 import logging
 import os
 import shutil
 import urllib.parse
 import zipfile
-from typing import Dict, List, Tuple
+from typing import IO, Callable, Dict, Iterable, List, Optional, Tuple
+
+import lxml.etree
 
 from benjaminhamon_document_manipulation_toolkit import text_operations
 from benjaminhamon_document_manipulation_toolkit.epub import epub_xhtml_helpers
 from benjaminhamon_document_manipulation_toolkit.epub.epub_content_writer import EpubContentWriter
+from benjaminhamon_document_manipulation_toolkit.epub.epub_link_index import EpubLinkIndex
+from benjaminhamon_document_manipulation_toolkit.output.zip_package_writer import ZipPackageWriter
+from benjaminhamon_document_manipulation_toolkit.xml import xml_file_writer
 
 
 logger = logging.getLogger("EpubPackageBuilder")
@@ -21,16 +29,32 @@ class EpubPackageBuilder:
         self._content_writer = content_writer
 
 
-    def stage_files(self, staging_directory: str, file_mappings: List[Tuple[str,str]], simulate: bool = False) -> None:
+    def stage_files(self,
+            staging_directory: str,
+            file_mappings: List[Tuple[str,str]],
+            simulate: bool = False,
+            link_mappings: Optional[List[Tuple[str,str]]] = None) -> None:
+
+        # With link mappings, the XHTML files have their links updated while they are staged, so that they are read and written only once.
+        # Other files are copied as they are, without reading them.
+
         logger.debug("Staging files")
 
+        link_index = EpubLinkIndex(link_mappings) if link_mappings is not None else None
+
         for source, destination in file_mappings:
-            destination = os.path.normpath(os.path.join(staging_directory, destination))
-            logger.debug("+ '%s' => '%s'", source, destination)
+            destination_file_path = os.path.normpath(os.path.join(staging_directory, destination))
+            logger.debug("+ '%s' => '%s'", source, destination_file_path)
 
             if not simulate:
-                os.makedirs(os.path.dirname(destination), exist_ok = True)
-                shutil.copy(source, destination)
+                os.makedirs(os.path.dirname(destination_file_path), exist_ok = True)
+
+            if link_index is not None and source.endswith(".xhtml"):
+                document = epub_xhtml_helpers.load_xhtml(source)
+                self.update_xhtml_document_links(document, source, destination, staging_directory, link_index)
+                self._content_writer.write_xml_file(destination_file_path, document, simulate = simulate)
+            elif not simulate:
+                shutil.copy(source, destination_file_path)
 
 
     def update_package_information(self,
@@ -55,31 +79,92 @@ class EpubPackageBuilder:
 
         logger.debug("Updating links")
 
+        link_index = EpubLinkIndex(link_mappings)
+
         for source, destination in content_files:
             if source.endswith(".xhtml"):
-                destination = os.path.join(staging_directory, destination)
+                destination_file_path = os.path.join(staging_directory, destination)
+
+                document = epub_xhtml_helpers.load_xhtml(destination_file_path)
+                self.update_xhtml_document_links(document, source, destination, staging_directory, link_index)
+                self._content_writer.write_xml_file(destination_file_path, document, simulate = simulate)
+
+
+    def update_xhtml_document_links(self, # pylint: disable = too-many-arguments
+            document: lxml.etree._ElementTree, source: str, destination: str, staging_directory: str,
+            link_index: EpubLinkIndex) -> None:
+
+        # The document does not have to be staged, its destination and the link mappings are relative to the staging directory.
+        # The link index is built by the caller, once for all the documents to update.
+
+        destination = os.path.join(staging_directory, destination)
+        link_element_collection = epub_xhtml_helpers.try_find_xhtml_element_collection(document.getroot(), "./x:head/x:link")
+
+        for link_element in link_element_collection:
+            link_value = str(link_element.attrib["href"])
+            link_components = urllib.parse.urlparse(link_value)
+
+            if link_components.scheme == "" and link_components.netloc == "": # Relative path
+                link_value_updated = os.path.normpath(os.path.join(os.path.dirname(source), link_value))
+                matching_link = link_index.try_get_mapping_for_path(link_value_updated)
+                if matching_link is not None:
+                    link_value_updated = os.path.join(staging_directory, matching_link)
+                link_value_updated = os.path.relpath(link_value_updated, os.path.dirname(destination))
+                link_element.attrib["href"] = link_value_updated.replace("\\", "/")
 
-                document = epub_xhtml_helpers.load_xhtml(destination)
-                link_element_collection = epub_xhtml_helpers.try_find_xhtml_element_collection(document.getroot(), "./x:head/x:link")
+            else:
+                matching_link = link_index.try_get_mapping_for_link(link_value)
+                if matching_link is not None:
+                    link_element.attrib["href"] = matching_link
 
-                for link_element in link_element_collection:
-                    link_value = str(link_element.attrib["href"])
-                    link_components = urllib.parse.urlparse(link_value)
 
-                    if link_components.scheme == "" and link_components.netloc == "": # Relative path
-                        link_value_updated = os.path.normpath(os.path.join(os.path.dirname(source), link_value))
-                        matching_mapping = next((x for x in link_mappings if os.path.normpath(x[0]) == link_value_updated), None)
-                        if matching_mapping is not None:
-                            link_value_updated = os.path.join(staging_directory, matching_mapping[1])
-                        link_value_updated = os.path.relpath(link_value_updated, os.path.dirname(destination))
-                        link_element.attrib["href"] = link_value_updated.replace("\\", "/")
+    def write_package(self,
+            package_file_path: str,
+            all_file_entries: Iterable[Tuple[str, Optional[Callable[[IO[bytes]], None]]]],
+            simulate: bool = False,
+            source_package_file_path: Optional[str] = None) -> None:
+
+        # Create the package from write functions rather than from staged files, so that the entry data is written directly to it.
+        # Entries are written in order, each write function receiving the package entry to write to.
+        # Entries without a write function are copied from the source package without decompressing them,
+        # so that a package can be created again by writing only the entries which changed.
+
+        logger.debug("Creating package (Path: '%s')", package_file_path)
+
+        if not simulate:
+            os.makedirs(os.path.dirname(package_file_path), exist_ok = True)
+
+        logger.debug("Writing '%s'", package_file_path)
+
+        with contextlib.ExitStack() as exit_stack:
+            source_file: Optional[IO[bytes]] = None
+            all_source_entries: Dict[str,zipfile.ZipInfo] = {}
+
+            if source_package_file_path is not None:
+                source_file = exit_stack.enter_context(open(source_package_file_path, mode = "rb"))
+                with zipfile.ZipFile(source_file, mode = "r") as source_package:
+                    all_source_entries = { entry.filename: entry for entry in source_package.infolist() }
+
+            with xml_file_writer.open_output_file(package_file_path, simulate = simulate) as output_file:
+                package_writer = ZipPackageWriter(output_file)
+                package_writer.write_mimetype("application/epub+zip")
+
+                for destination, write_function in all_file_entries:
+                    destination = os.path.normpath(destination).replace("\\", "/")
+
+                    if write_function is not None:
+                        logger.debug("+ '%s'", destination)
+                        with package_writer.open_entry(destination) as entry_file:
+                            write_function(entry_file)
 
                     else:
-                        matching_mapping = next((x for x in link_mappings if x[0] == link_value), None)
-                        if matching_mapping is not None:
-                            link_element.attrib["href"] = matching_mapping[1]
+                        if source_file is None or destination not in all_source_entries:
+                            raise ValueError("Entry not found in source package: '%s'" % destination)
+
+                        logger.debug("+ '%s' (Copied from '%s')", destination, source_package_file_path)
+                        package_writer.copy_entry(source_file, all_source_entries[destination])
 
-                self._content_writer.write_xml_file(destination, document, simulate = simulate)
+                package_writer.close()
 
 
     def create_package(self, package_file_path: str, staging_directory: str, simulate: bool = False) -> None:
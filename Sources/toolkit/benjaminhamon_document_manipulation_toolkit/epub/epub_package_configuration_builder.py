@@ -3,7 +3,7 @@
 import datetime
 import os
 import re
-from typing import Callable, List, Optional, Tuple, Union
+from typing import Callable, List, Mapping, Optional, Tuple, Union
 
 from benjaminhamon_document_manipulation_toolkit import convert_helpers
 from benjaminhamon_document_manipulation_toolkit.documents import document_operations
@@ -21,14 +21,18 @@ from benjaminhamon_document_manipulation_toolkit.epub.epub_spine_item import Epu
 
 
 def create_package_configuration(
-        epub_generation_configuration: EpubGenerationConfiguration, source_directory_for_epub_files: str) -> EpubPackageConfiguration:
+        epub_generation_configuration: EpubGenerationConfiguration,
+        source_directory_for_epub_files: str,
+        modified: Union[str,datetime.datetime] = "{modified}",
+        title_getter: Optional[Callable[[str],str]] = None,
+        all_known_titles: Optional[Mapping[str,str]] = None) -> EpubPackageConfiguration:
 
     builder = EpubPackageConfigurationBuilder()
-    builder.add_metadata(epub_generation_configuration.metadata, "{modified}")
+    builder.add_metadata(epub_generation_configuration.metadata, modified)
     builder.add_main_files(source_directory_for_epub_files)
     if epub_generation_configuration.cover_file is not None:
         builder.add_cover(epub_generation_configuration.cover_file)
-    builder.add_content_files(epub_generation_configuration.content_files)
+    builder.add_content_files(epub_generation_configuration.content_files, title_getter, all_known_titles)
     builder.add_resource_files(epub_generation_configuration.resource_files)
     builder.add_link_overrides(epub_generation_configuration.link_overrides)
     builder.add_landmarks(epub_generation_configuration.landmarks)
@@ -50,8 +54,7 @@ class EpubPackageConfigurationBuilder:
 
 
     def add_metadata(self, metadata: List[EpubMetadataItem], modified: Union[str,datetime.datetime]) -> None:
-        for metadata_item in metadata:
-            self._package_document.add_metadata_item(metadata_item)
+        self._package_document.add_metadata_items(metadata)
         self._package_document.add_modified(modified)
 
 
@@ -75,16 +78,24 @@ class EpubPackageConfigurationBuilder:
         self._content_configuration.file_mappings.append((source_file_path, os.path.join("EPUB", "cover" + file_extension)))
 
 
-    def add_content_files(self, content_file_collection: List[str], title_getter: Optional[Callable[[str],str]] = None) -> None:
+    def add_content_files(self, # pylint: disable = too-many-locals
+            content_file_collection: List[str],
+            title_getter: Optional[Callable[[str],str]] = None,
+            all_known_titles: Optional[Mapping[str,str]] = None) -> None:
 
-        def get_title_from_xhtml(xhtml_file_path) -> str:
-            xhtml_document = epub_xhtml_helpers.load_xhtml(xhtml_file_path)
-            return epub_xhtml_helpers.get_xhtml_title(xhtml_document)
+        # Titles already known by the caller, such as the ones of documents it just converted, are used as they are.
+        # Other titles are read from the files, by parsing them only up to their title element.
 
         if title_getter is None:
-            title_getter = get_title_from_xhtml
+            title_getter = epub_xhtml_helpers.read_xhtml_title
+        if all_known_titles is None:
+            all_known_titles = {}
 
         file_count = len(content_file_collection)
+        all_manifest_items: List[EpubManifestItem] = []
+        all_spine_items: List[EpubSpineItem] = []
+        all_file_mappings: List[Tuple[str,str]] = []
+        all_navigation_items: List[EpubNavigationItem] = []
 
         for file_index, source_file_path in enumerate(content_file_collection):
             file_name = re.sub(r"^[0-9]+ - ", "", os.path.basename(source_file_path))
@@ -93,15 +104,25 @@ class EpubPackageConfigurationBuilder:
             reference = destination_file_path.replace("\\", "/")
             identifier = convert_helpers.sanitize_for_identifier(file_name)
             media_type = epub_xhtml_helpers.get_media_type(reference)
-            title = title_getter(source_file_path)
+            title = all_known_titles[source_file_path] if source_file_path in all_known_titles else title_getter(source_file_path)
 
-            self._package_document.add_manifest_item(EpubManifestItem(identifier, reference, media_type))
-            self._package_document.add_spine_item(EpubSpineItem(identifier))
-            self._content_configuration.file_mappings.append((source_file_path, destination_file_path))
-            self._navigation.navigation_items.append(EpubNavigationItem(reference, title))
+            all_manifest_items.append(EpubManifestItem(identifier, reference, media_type))
+            all_spine_items.append(EpubSpineItem(identifier))
+            all_file_mappings.append((source_file_path, destination_file_path))
+            all_navigation_items.append(EpubNavigationItem(reference, title))
+
+        # The items are added to the package document first, so that a conflict is reported before changing anything else
+        self._package_document.add_manifest_items(all_manifest_items)
+        self._package_document.add_spine_items(all_spine_items)
+        self._content_configuration.file_mappings.extend(all_file_mappings)
+        self._navigation.navigation_items.extend(all_navigation_items)
 
 
     def add_resource_files(self, resource_file_collection: List[str]) -> None:
+        all_manifest_items: List[EpubManifestItem] = []
+        all_file_mappings: List[Tuple[str,str]] = []
+        all_link_mappings: List[Tuple[str,str]] = []
+
         for source_file_path in resource_file_collection:
             file_name = os.path.basename(source_file_path)
             destination_file_path = os.path.join("EPUB", "Resources", convert_helpers.sanitize_for_file_name_and_href(file_name))
@@ -110,9 +131,13 @@ class EpubPackageConfigurationBuilder:
             identifier = convert_helpers.sanitize_for_identifier(file_name)
             media_type = epub_xhtml_helpers.get_media_type(link_after)
 
-            self._package_document.add_manifest_item(EpubManifestItem(identifier, link_after, media_type))
-            self._content_configuration.file_mappings.append((source_file_path, destination_file_path))
-            self._content_configuration.link_mappings.append((link_before, link_after))
+            all_manifest_items.append(EpubManifestItem(identifier, link_after, media_type))
+            all_file_mappings.append((source_file_path, destination_file_path))
+            all_link_mappings.append((link_before, link_after))
+
+        self._package_document.add_manifest_items(all_manifest_items)
+        self._content_configuration.file_mappings.extend(all_file_mappings)
+        self._content_configuration.link_mappings.extend(all_link_mappings)
 
 
     def add_link_overrides(self, link_override_collection: List[Tuple[str,str]]) -> None:
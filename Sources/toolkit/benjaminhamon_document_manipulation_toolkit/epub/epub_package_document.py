@@ -1,7 +1,7 @@
 # cspell:words dcterms
 
 import datetime
-from typing import List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Sequence, Union
 
 from benjaminhamon_document_manipulation_toolkit.epub.epub_manifest_item import EpubManifestItem
 from benjaminhamon_document_manipulation_toolkit.epub.epub_metadata_item import EpubMetadataItem
@@ -16,21 +16,32 @@ class EpubPackageDocument:
         self._manifest: List[EpubManifestItem] = []
         self._spine: List[EpubSpineItem] = []
 
+        # Indexes to find items without scanning the lists, so that building a package with many files is not quadratic
+        self._identifier_item: Optional[EpubMetadataItem] = None
+        self._manifest_by_identifier: Dict[str,EpubManifestItem] = {}
+
 
     def get_identifier(self) -> Optional[EpubMetadataItem]:
-        return next((x for x in self._metadata if x.key == "dc:identifier"), None)
+        return self._identifier_item
+
 
+    def get_metadata_items(self) -> Sequence[EpubMetadataItem]:
+        return self._metadata
 
-    def get_metadata_items(self) -> List[EpubMetadataItem]:
-        return list(self._metadata)
 
+    def get_manifest_items(self) -> Sequence[EpubManifestItem]:
+        return self._manifest
 
-    def get_manifest_items(self) -> List[EpubManifestItem]:
-        return list(self._manifest)
 
+    def get_spine_items(self) -> Sequence[EpubSpineItem]:
+        return self._spine
 
-    def get_spine_items(self) -> List[EpubSpineItem]:
-        return list(self._spine)
+
+    def get_manifest_item(self, item_identifier: str) -> EpubManifestItem:
+        item = self._manifest_by_identifier.get(item_identifier)
+        if item is None:
+            raise ValueError("Identifier '%s' does not exist in the manifest" % item_identifier)
+        return item
 
 
     def add_minimal_metadata(self, identifier: str, title: str, language: str) -> None:
@@ -44,36 +55,54 @@ class EpubPackageDocument:
 
 
     def add_metadata_item(self, item_to_add: EpubMetadataItem) -> None:
-        self._metadata.append(item_to_add)
+        self.add_metadata_items([ item_to_add ])
+
+
+    def add_metadata_items(self, items_to_add: Iterable[EpubMetadataItem]) -> None:
+        for item in items_to_add:
+            if self._identifier_item is None and item.key == "dc:identifier":
+                self._identifier_item = item
+            self._metadata.append(item)
 
 
     def add_manifest_item(self, item_to_add: EpubManifestItem) -> None:
-        existing_item = next((item for item in self._manifest if item.identifier == item_to_add.identifier), None)
-        if existing_item is not None:
-            raise ValueError("Identifier '%s' already exists in the manifest" % item_to_add.identifier)
+        self.add_manifest_items([ item_to_add ])
 
-        self._manifest.append(item_to_add)
 
+    def add_manifest_items(self, items_to_add: Iterable[EpubManifestItem]) -> None:
 
-    def set_manifest_item_as_navigation(self, item_identifier: str) -> None:
-        referenced_item = next((item for item in self._manifest if item.identifier == item_identifier), None)
-        if referenced_item is None:
-            raise ValueError("Identifier '%s' does not exist in the manifest" % item_identifier)
+        # All the items are checked before adding any of them, so that a conflict leaves the manifest unchanged
 
-        referenced_item.properties.append("nav")
+        items_to_add = list(items_to_add)
 
+        all_new_identifiers = set()
+        for item in items_to_add:
+            if item.identifier in self._manifest_by_identifier or item.identifier in all_new_identifiers:
+                raise ValueError("Identifier '%s' already exists in the manifest" % item.identifier)
+            all_new_identifiers.add(item.identifier)
+
+        for item in items_to_add:
+            self._manifest.append(item)
+            self._manifest_by_identifier[item.identifier] = item
 
-    def set_manifest_item_as_cover_image(self, item_identifier: str) -> None:
-        referenced_item = next((item for item in self._manifest if item.identifier == item_identifier), None)
-        if referenced_item is None:
-            raise ValueError("Identifier '%s' does not exist in the manifest" % item_identifier)
 
-        referenced_item.properties.append("cover-image")
+    def set_manifest_item_as_navigation(self, item_identifier: str) -> None:
+        self.get_manifest_item(item_identifier).properties.append("nav")
+
+
+    def set_manifest_item_as_cover_image(self, item_identifier: str) -> None:
+        self.get_manifest_item(item_identifier).properties.append("cover-image")
 
 
     def add_spine_item(self, item_to_add: EpubSpineItem) -> None:
-        referenced_item = next((item for item in self._manifest if item.identifier == item_to_add.reference), None)
-        if referenced_item is None:
-            raise ValueError("Identifier '%s' does not exist in the manifest" % item_to_add.reference)
+        self.add_spine_items([ item_to_add ])
+
+
+    def add_spine_items(self, items_to_add: Iterable[EpubSpineItem]) -> None:
+        items_to_add = list(items_to_add)
+
+        for item in items_to_add:
+            if item.reference not in self._manifest_by_identifier:
+                raise ValueError("Identifier '%s' does not exist in the manifest" % item.reference)
 
-        self._spine.append(item_to_add)
+        self._spine.extend(items_to_add)
@@ -6,9 +6,16 @@ import lxml.etree
 import lxml.html
 
 from benjaminhamon_document_manipulation_toolkit.epub import epub_namespaces
+from benjaminhamon_document_manipulation_toolkit.xml import xml_namespace
 from benjaminhamon_document_manipulation_toolkit.xml import xpath_helpers
 
 
+# XPath cannot work with the default namespace, thus we pass an explicit namespace for XHTML
+_xpath_namespaces: Dict[str,str] = { "x": epub_namespaces.xhtml_default_namespace }
+
+_xhtml_namespace = xml_namespace.get_namespace(epub_namespaces.xhtml_default_namespace)
+
+
 def get_namespaces() -> Dict[Optional[str],str]:
     return {
         None: epub_namespaces.xhtml_default_namespace,
@@ -53,7 +60,7 @@ def load_xhtml(xhtml_file_path: str) -> lxml.etree._ElementTree:
 
 
 def create_xhtml_element(tag: str, attributes: Optional[dict] = None, text: Optional[str] = None) -> lxml.etree._Element:
-    element = lxml.etree.Element(lxml.etree.QName(epub_namespaces.xhtml_default_namespace, tag), attrib = attributes, nsmap = None)
+    element = lxml.etree.Element(_xhtml_namespace.get_name(tag), attrib = attributes, nsmap = None)
     element.text = text
 
     return element
@@ -63,34 +70,22 @@ def create_xhtml_subelement(
         parent: lxml.etree._Element, tag: str,
         attributes: Optional[dict] = None, text: Optional[str] = None) -> lxml.etree._Element:
 
-    element = lxml.etree.SubElement(parent, lxml.etree.QName(epub_namespaces.xhtml_default_namespace, tag), attrib = attributes, nsmap = None)
+    element = lxml.etree.SubElement(parent, _xhtml_namespace.get_name(tag), attrib = attributes, nsmap = None)
     element.text = text
 
     return element
 
 
 def try_find_xhtml_element_collection(element: lxml.etree._Element, xpath: str) -> List[lxml.etree._Element]:
-
-    # XPath cannot work with the default namespace, thus we pass an explicit namespace for XHTML
-    namespaces: Dict[str,str] = { "x": epub_namespaces.xhtml_default_namespace }
-
-    return xpath_helpers.try_find_xml_element_collection(element, xpath, namespaces)
+    return xpath_helpers.try_find_xml_element_collection(element, xpath, _xpath_namespaces)
 
 
 def try_find_xhtml_element(element: lxml.etree._Element, xpath: str) -> Optional[lxml.etree._Element]:
-
-    # XPath cannot work with the default namespace, thus we pass an explicit namespace for XHTML
-    namespaces: Dict[str,str] = { "x": epub_namespaces.xhtml_default_namespace }
-
-    return xpath_helpers.try_find_xml_element(element, xpath, namespaces)
+    return xpath_helpers.try_find_xml_element(element, xpath, _xpath_namespaces)
 
 
 def find_xhtml_element(element: lxml.etree._Element, xpath: str) -> lxml.etree._Element:
-
-    # XPath cannot work with the default namespace, thus we pass an explicit namespace for XHTML
-    namespaces: Dict[str,str] = { "x": epub_namespaces.xhtml_default_namespace }
-
-    return xpath_helpers.find_xml_element(element, xpath, namespaces)
+    return xpath_helpers.find_xml_element(element, xpath, _xpath_namespaces)
 
 
 def get_xhtml_title(document: lxml.etree._ElementTree) -> str:
@@ -103,6 +98,21 @@ def get_xhtml_title(document: lxml.etree._ElementTree) -> str:
     return title_element.text
 
 
+def read_xhtml_title(xhtml_file_path: str) -> str:
+
+    # Parse the file incrementally and stop at the end of the title element, instead of loading the whole document only to read its head
+
+    title_tag = _xhtml_namespace.get_name("title")
+
+    with open(xhtml_file_path, mode = "rb") as xhtml_file:
+        for _, title_element in lxml.etree.iterparse(xhtml_file, events = ("end",), tag = title_tag):
+            if title_element.text is None:
+                raise ValueError("Title element has no text")
+            return title_element.text
+
+    raise ValueError("Title element not found")
+
+
 def get_media_type(file_path: str) -> str:
     if file_path.endswith(".css"):
         return "text/css"
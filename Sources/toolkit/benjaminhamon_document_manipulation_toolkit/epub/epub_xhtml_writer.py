@@ -1,18 +1,25 @@
 # cspell:words lxml nsmap
 
+import io
 import logging
 import os
-from typing import Mapping, Optional
+from typing import IO, Callable, Iterable, Iterator, Mapping, Optional, Tuple, Union
 
 import lxml.etree
 import lxml.html
 
 from benjaminhamon_document_manipulation_toolkit.documents import document_operations
+from benjaminhamon_document_manipulation_toolkit.documents import section_scheduler
 from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
+from benjaminhamon_document_manipulation_toolkit.documents.elements.section_element import SectionElement
 from benjaminhamon_document_manipulation_toolkit.epub import epub_xhtml_helpers
 from benjaminhamon_document_manipulation_toolkit.epub.document_to_xhtml_converter import DocumentToXhtmlConverter
 from benjaminhamon_document_manipulation_toolkit.html import html_operations
+from benjaminhamon_document_manipulation_toolkit.interfaces.output_sink import OutputSink
+from benjaminhamon_document_manipulation_toolkit.xml import xml_file_writer
 from benjaminhamon_document_manipulation_toolkit.xml import xml_operations
+from benjaminhamon_document_manipulation_toolkit.xml.xml_template import XmlTemplate
+from benjaminhamon_document_manipulation_toolkit.xml.xml_template_cache import XmlTemplateCache
 
 
 logger = logging.getLogger("EpubXhtmlWriter")
@@ -23,16 +30,35 @@ logger = logging.getLogger("EpubXhtmlWriter")
 class EpubXhtmlWriter:
 
 
-    def __init__(self, converter: DocumentToXhtmlConverter, parser: lxml.html.XHTMLParser) -> None:
+    def __init__(self,
+            converter: DocumentToXhtmlConverter,
+            parser: lxml.html.XHTMLParser,
+            template_cache: Optional[XmlTemplateCache] = None,
+            output_sink: Optional[OutputSink] = None) -> None:
+
         self._converter = converter
         self._parser = parser
+        self._template_cache = template_cache if template_cache is not None else XmlTemplateCache()
+        self._output_sink = output_sink
         self.pretty_print = True
         self.encoding = "utf-8"
 
 
-    def write_to_file(self, output_file_path: str, document_as_html: lxml.etree._ElementTree, simulate: bool = False) -> None:
+    def write_to_file(self,
+            output_file_path: str, document_as_html: lxml.etree._ElementTree, simulate: bool = False,
+            content: Optional[Iterable[lxml.etree._Element]] = None) -> None:
+
         logger.debug("Writing '%s'", output_file_path)
 
+        with xml_file_writer.open_output_file(output_file_path, simulate = simulate, output_sink = self._output_sink) as output_file:
+            self.write_to_stream(output_file, document_as_html, content = content)
+
+
+    def write_to_stream(self,
+            output_file: IO[bytes], document_as_html: lxml.etree._ElementTree, content: Optional[Iterable[lxml.etree._Element]] = None) -> None:
+
+        # When content is provided, its elements are appended to the document body while writing, as they are produced.
+
         write_options = {
             "encoding": self.encoding,
             "pretty_print": self.pretty_print,
@@ -40,53 +66,83 @@ class EpubXhtmlWriter:
         }
 
         # lxml.html.tostring exists but creates link elements which are not closed.
-        document_as_html_string: str = lxml.etree.tostring(document_as_html, **write_options).decode(self.encoding)
-
-        if not simulate:
-            with open(output_file_path + ".tmp", mode = "w", encoding = self.encoding) as output_file:
-                output_file.write(document_as_html_string)
-            os.replace(output_file_path + ".tmp", output_file_path)
+        if content is None:
+            xml_file_writer.write_document(output_file, document_as_html, **write_options)
+        else:
+            body_as_html = epub_xhtml_helpers.find_xhtml_element(document_as_html.getroot(), "./x:body")
+            xml_file_writer.write_document_with_content(output_file, document_as_html, body_as_html, content, **write_options)
 
 
     def write_as_single_document(self, # pylint: disable = too-many-arguments
-            output_file_path: str, title: str, content: RootElement,
+            output_file_path: str, title: str, content: Union[RootElement, Iterable[SectionElement]],
             template_file_path: Optional[str] = None, css_file_path: Optional[str] = None, simulate: bool = False) -> None:
 
         html_document = self._create_document(title, output_file_path, template_file_path, css_file_path)
-        html_document = self._converter.convert(html_document, content)
+        html_content = self._converter.enumerate_content_elements(content)
 
-        self.write_to_file(output_file_path, html_document, simulate = simulate)
+        self.write_to_file(output_file_path, html_document, simulate = simulate, content = html_content)
 
 
     def write_as_many_documents(self, # pylint: disable = too-many-arguments, too-many-locals
             output_directory: str,
             metadata: Mapping[str,str],
-            content: RootElement,
+            content: Union[RootElement, Iterable[SectionElement]],
             section_template_file_path: Optional[str] = None,
             information_template_file_path: Optional[str] = None,
             css_file_path: Optional[str] = None,
-            simulate: bool = False) -> None:
+            simulate: bool = False,
+            section_count: Optional[int] = None,
+            job_count: Optional[int] = 1,
+            writer_factory: Optional[Callable[[], "EpubXhtmlWriter"]] = None) -> None:
+
+        # Sections are rendered by several processes when job_count is not 1, each with its own writer created using the factory,
+        # and the files are then written in order by this process. See section_scheduler.render_sections.
 
-        section_count = content.get_section_count()
+        section_count = document_operations.get_section_count(content, section_count)
 
         if information_template_file_path is not None:
-            section_index = -1
-            file_name = document_operations.generate_section_file_name("Information", section_index, section_count)
-            output_file_path = os.path.join(output_directory, file_name + ".xhtml")
+            output_file_path = self._get_information_file_path(output_directory, section_count)
             self.write_metadata(output_file_path, metadata, information_template_file_path, simulate = simulate)
 
-        for section_index, section in enumerate(content.enumerate_sections()):
-            section_root = RootElement()
-            section_root.children.append(section)
-            title = section.get_heading().get_title()
+        all_arguments = (
+            (output_file_path, title, section, section_template_file_path, css_file_path)
+            for output_file_path, title, section in self._enumerate_sections_with_file_paths(output_directory, content, section_count)
+        )
 
-            file_name = document_operations.generate_section_file_name(title, section_index, section_count)
-            output_file_path = os.path.join(output_directory, file_name + ".xhtml")
+        all_results = section_scheduler.render_sections(
+            self, EpubXhtmlWriter._render_section, all_arguments, job_count = job_count, renderer_factory = writer_factory)
 
-            html_document = self._create_document(title, output_file_path, section_template_file_path, css_file_path)
-            html_document = self._converter.convert(html_document, section_root)
+        for output_file_path, document_as_bytes in all_results:
+            logger.debug("Writing '%s'", output_file_path)
 
-            self.write_to_file(output_file_path, html_document, simulate = simulate)
+            with xml_file_writer.open_output_file(output_file_path, simulate = simulate, output_sink = self._output_sink) as output_file:
+                output_file.write(document_as_bytes)
+
+
+    def enumerate_many_documents(self, # pylint: disable = too-many-arguments
+            output_directory: str,
+            metadata: Mapping[str,str],
+            content: Union[RootElement, Iterable[SectionElement]],
+            section_template_file_path: Optional[str] = None,
+            information_template_file_path: Optional[str] = None,
+            css_file_path: Optional[str] = None,
+            section_count: Optional[int] = None,
+            ) -> Iterator[Tuple[str, str, lxml.etree._ElementTree, Optional[Iterable[lxml.etree._Element]]]]:
+
+        # Produce the file path, title, document and content for each of the documents written by write_as_many_documents,
+        # so that they can be written elsewhere than to their files, for example directly to a package.
+        # The content elements are converted only once they are iterated, as when writing them with write_to_stream.
+
+        section_count = document_operations.get_section_count(content, section_count)
+
+        if information_template_file_path is not None:
+            output_file_path = self._get_information_file_path(output_directory, section_count)
+            html_document = self._create_metadata_document(output_file_path, metadata, information_template_file_path)
+            yield (output_file_path, "Information", html_document, None)
+
+        for output_file_path, title, section in self._enumerate_sections_with_file_paths(output_directory, content, section_count):
+            html_document, html_content = self._create_section_document(output_file_path, title, section, section_template_file_path, css_file_path)
+            yield (output_file_path, title, html_document, html_content)
 
 
     def write_metadata(self, # pylint: disable = too-many-arguments
@@ -96,9 +152,57 @@ class EpubXhtmlWriter:
             css_file_path: Optional[str] = None,
             simulate: bool = False) -> None:
 
+        html_document = self._create_metadata_document(output_file_path, metadata, template_file_path, css_file_path)
+        self.write_to_file(output_file_path, html_document, simulate = simulate)
+
+
+    def _get_information_file_path(self, output_directory: str, section_count: int) -> str:
+        file_name = document_operations.generate_section_file_name("Information", -1, section_count)
+        return os.path.join(output_directory, file_name + ".xhtml")
+
+
+    def _enumerate_sections_with_file_paths(self,
+            output_directory: str, content: Union[RootElement, Iterable[SectionElement]], section_count: int) -> Iterator[Tuple[str, str, SectionElement]]:
+
+        for section_index, section in enumerate(document_operations.enumerate_sections(content)):
+            title = section.get_heading().get_title()
+            file_name = document_operations.generate_section_file_name(title, section_index, section_count)
+            yield (os.path.join(output_directory, file_name + ".xhtml"), title, section)
+
+
+    def _create_section_document(self, # pylint: disable = too-many-arguments
+            output_file_path: str, title: str, section: SectionElement, template_file_path: Optional[str], css_file_path: Optional[str],
+            ) -> Tuple[lxml.etree._ElementTree, Iterable[lxml.etree._Element]]:
+
+        section_root = RootElement()
+        section_root.children.append(section)
+
+        html_document = self._create_document(title, output_file_path, template_file_path, css_file_path)
+        html_content = self._converter.enumerate_content_elements(section_root)
+        return (html_document, html_content)
+
+
+    def _render_section(self, # pylint: disable = too-many-arguments
+            output_file_path: str, title: str, section: SectionElement, template_file_path: Optional[str], css_file_path: Optional[str],
+            ) -> Tuple[str, bytes]:
+
+        html_document, html_content = self._create_section_document(output_file_path, title, section, template_file_path, css_file_path)
+
+        output_file = io.BytesIO()
+        self.write_to_stream(output_file, html_document, content = html_content)
+        return (output_file_path, output_file.getvalue())
+
+
+    def _create_metadata_document(self,
+            output_file_path: str,
+            metadata: Mapping[str,str],
+            template_file_path: str,
+            css_file_path: Optional[str] = None,
+            ) -> lxml.etree._ElementTree:
+
         html_document = self._create_document("Information", output_file_path, template_file_path, css_file_path)
         xml_operations.format_text_in_xml(html_document.getroot(), metadata)
-        self.write_to_file(output_file_path, html_document, simulate = simulate)
+        return html_document
 
 
     def _create_document(self,
@@ -108,16 +212,30 @@ class EpubXhtmlWriter:
             css_file_path: Optional[str],
             ) -> lxml.etree._ElementTree:
 
-        html_document = epub_xhtml_helpers.create_xhtml_base(title, self._parser, template_file_path)
-        html_root = html_document.getroot()
-        head_as_html = epub_xhtml_helpers.find_xhtml_element(html_root, "./x:head")
-        body_as_html = epub_xhtml_helpers.find_xhtml_element(html_root, "./x:body")
-        body_as_html.text = None
+        template = self._template_cache.get_template("xhtml", template_file_path, self._load_template)
+        html_document, anchors = template.create_document()
+        anchors["title"][0].text = title
 
         if template_file_path is not None:
-            for link_element in epub_xhtml_helpers.try_find_xhtml_element_collection(html_root, "//x:link"):
+            for link_element in anchors["links"]:
                 html_operations.update_link(link_element, template_file_path, output_file_path)
         if css_file_path is not None:
-            html_operations.add_style_sheet(head_as_html, str(epub_xhtml_helpers.qualify_tag("link")), css_file_path, output_file_path)
+            html_operations.add_style_sheet(anchors["head"][0], str(epub_xhtml_helpers.qualify_tag("link")), css_file_path, output_file_path)
 
         return html_document
+
+
+    def _load_template(self, template_file_path: Optional[str]) -> XmlTemplate:
+        html_document = epub_xhtml_helpers.create_xhtml_base("", self._parser, template_file_path)
+        html_root = html_document.getroot()
+        body_as_html = epub_xhtml_helpers.find_xhtml_element(html_root, "./x:body")
+        body_as_html.text = None
+
+        anchors = {
+            "head": [ epub_xhtml_helpers.find_xhtml_element(html_root, "./x:head") ],
+            "title": [ epub_xhtml_helpers.find_xhtml_element(html_root, "./x:head/x:title") ],
+            "body": [ body_as_html ],
+            "links": epub_xhtml_helpers.try_find_xhtml_element_collection(html_root, "//x:link"),
+        }
+
+        return XmlTemplate(html_document, anchors)
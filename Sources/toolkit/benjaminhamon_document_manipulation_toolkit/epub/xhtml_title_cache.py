@@ -0,0 +1,44 @@
+import os
+from typing import Dict, List, Optional
+
+from benjaminhamon_document_manipulation_toolkit import sidecar_file_helpers
+from benjaminhamon_document_manipulation_toolkit.epub import epub_xhtml_helpers
+
+
+class XhtmlTitleCache:
+    """ Cache of the titles read from XHTML files, kept between runs """
+
+
+    format_version = "1"
+
+
+    def __init__(self, cache_file_path: Optional[str] = None) -> None:
+        self.cache_file_path = cache_file_path
+        self._all_entries: Dict[str,List] = {}
+
+
+    def load(self) -> None:
+        if self.cache_file_path is None:
+            return
+
+        cache_data = sidecar_file_helpers.load_sidecar_file(self.cache_file_path, self.format_version)
+        if cache_data is not None:
+            self._all_entries = dict(cache_data.get("entries", {}))
+
+
+    def save(self, simulate: bool = False) -> None:
+        if self.cache_file_path is not None:
+            sidecar_file_helpers.save_sidecar_file(self.cache_file_path, self.format_version, { "entries": self._all_entries }, simulate = simulate)
+
+
+    def get_title(self, xhtml_file_path: str) -> str:
+        key = os.path.abspath(xhtml_file_path)
+        file_status = os.stat(xhtml_file_path)
+
+        entry = self._all_entries.get(key)
+        if entry is not None and entry[1] == file_status.st_size and entry[2] == file_status.st_mtime_ns:
+            return entry[0]
+
+        title = epub_xhtml_helpers.read_xhtml_title(xhtml_file_path)
+        self._all_entries[key] = [ title, file_status.st_size, file_status.st_mtime_ns ]
+        return title
@@ -1,7 +1,9 @@
-from typing import List
+from typing import Callable, List
 
 import lxml.html.html5parser
 
+from benjaminhamon_document_manipulation_toolkit.documents import document_operations
+from benjaminhamon_document_manipulation_toolkit.documents.document_data import DocumentData
 from benjaminhamon_document_manipulation_toolkit.documents.elements.document_comment import DocumentComment
 from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
 from benjaminhamon_document_manipulation_toolkit.html.html_to_document_converter import HtmlToDocumentConverter
@@ -24,10 +26,14 @@ class HtmlReader(DocumentReader):
         raise NotImplementedError
 
 
+    def read_metadata_from_bytes(self, document_data: bytes) -> dict:
+        raise NotImplementedError
+
+
     def read_content_from_file(self, document_file_path: str) -> RootElement:
-        with open(document_file_path, mode = "r", encoding = "utf-8") as document_file:
-            document_data = document_file.read()
-        return self.read_content_from_string(document_data)
+        with open(document_file_path, mode = "rb") as document_file:
+            document_as_xml = self._parser.parse(document_file, override_encoding = "utf-8")
+        return self._converter.convert_content(document_as_xml)
 
 
     def read_content_from_string(self, document_data: str) -> RootElement:
@@ -35,9 +41,35 @@ class HtmlReader(DocumentReader):
         return self._converter.convert_content(document_as_xml)
 
 
+    def read_content_from_bytes(self, document_data: bytes) -> RootElement:
+        document_as_xml = self._parser.parse(document_data, override_encoding = "utf-8")
+        return self._converter.convert_content(document_as_xml)
+
+
+    def read_selected_content_from_file(self, document_file_path: str, section_filter: Callable[[str], bool]) -> RootElement:
+        document_content = self.read_content_from_file(document_file_path)
+        return document_operations.filter_sections(document_content, section_filter)
+
+
     def read_comments_from_file(self, document_file_path: str) -> List[DocumentComment]:
         raise NotImplementedError
 
 
     def read_comments_from_string(self, document_data: str) -> List[DocumentComment]:
         raise NotImplementedError
+
+
+    def read_comments_from_bytes(self, document_data: bytes) -> List[DocumentComment]:
+        raise NotImplementedError
+
+
+    def read_document_from_file(self, document_file_path: str) -> DocumentData:
+        raise NotImplementedError
+
+
+    def read_document_from_string(self, document_data: str) -> DocumentData:
+        raise NotImplementedError
+
+
+    def read_document_from_bytes(self, document_data: bytes) -> DocumentData:
+        raise NotImplementedError
@@ -1,17 +1,24 @@
 # cspell:words lxml
 
+import io
 import logging
 import os
-from typing import Mapping, Optional
+from typing import IO, Callable, Iterator, Mapping, Optional, Tuple
 
 import lxml.etree
 import lxml.html.html5parser
 
 from benjaminhamon_document_manipulation_toolkit.documents import document_operations
+from benjaminhamon_document_manipulation_toolkit.documents import section_scheduler
 from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
+from benjaminhamon_document_manipulation_toolkit.documents.elements.section_element import SectionElement
 from benjaminhamon_document_manipulation_toolkit.html import html_operations
 from benjaminhamon_document_manipulation_toolkit.html.document_to_html_converter import DocumentToHtmlConverter
+from benjaminhamon_document_manipulation_toolkit.interfaces.output_sink import OutputSink
+from benjaminhamon_document_manipulation_toolkit.xml import xml_file_writer
 from benjaminhamon_document_manipulation_toolkit.xml import xml_operations, xpath_helpers
+from benjaminhamon_document_manipulation_toolkit.xml.xml_template import XmlTemplate
+from benjaminhamon_document_manipulation_toolkit.xml.xml_template_cache import XmlTemplateCache
 
 
 logger = logging.getLogger("HtmlWriter")
@@ -20,9 +27,16 @@ logger = logging.getLogger("HtmlWriter")
 class HtmlWriter:
 
 
-    def __init__(self, converter: DocumentToHtmlConverter, parser: lxml.html.html5parser.HTMLParser) -> None:
+    def __init__(self,
+            converter: DocumentToHtmlConverter,
+            parser: lxml.html.html5parser.HTMLParser,
+            template_cache: Optional[XmlTemplateCache] = None,
+            output_sink: Optional[OutputSink] = None) -> None:
+
         self._converter = converter
         self._parser = parser
+        self._template_cache = template_cache if template_cache is not None else XmlTemplateCache()
+        self._output_sink = output_sink
         self.pretty_print = True
         self.encoding = "utf-8"
 
@@ -30,6 +44,11 @@ class HtmlWriter:
     def write_to_file(self, output_file_path: str, document_as_html: lxml.etree._ElementTree, simulate: bool = False) -> None:
         logger.debug("Writing '%s'", output_file_path)
 
+        with xml_file_writer.open_output_file(output_file_path, simulate = simulate, output_sink = self._output_sink) as output_file:
+            self.write_to_stream(output_file, document_as_html)
+
+
+    def write_to_stream(self, output_file: IO[bytes], document_as_html: lxml.etree._ElementTree) -> None:
         write_options = {
             "encoding": self.encoding,
             "pretty_print": self.pretty_print,
@@ -37,20 +56,17 @@ class HtmlWriter:
         }
 
         # lxml.html.tostring exists but creates link elements which are not closed.
-        document_as_html_string: str = lxml.etree.tostring(document_as_html, **write_options).decode(self.encoding)
+        document_to_write = document_as_html
 
-        if not simulate:
-            if self.pretty_print:
-                # lxml.html.html5parser.HTMLParser does not have the remove_blank_text option, which causes the pretty_print to produce garbage.
-                # To work around that we parse the XML again through the base lxml parser.
-                parser = lxml.etree.XMLParser(remove_blank_text = True)
-                document_as_html_string = "\n".join(document_as_html_string.splitlines()[1:])
-                document_reloaded = lxml.etree.fromstring(document_as_html_string, parser)
-                document_as_html_string = lxml.etree.tostring(document_reloaded, **write_options).decode(self.encoding)
+        if self.pretty_print:
+            # lxml.html.html5parser.HTMLParser does not have the remove_blank_text option, which causes the pretty_print to produce garbage.
+            # To work around that we parse the XML again through the base lxml parser.
+            parser = lxml.etree.XMLParser(remove_blank_text = True, encoding = self.encoding)
+            document_as_bytes = lxml.etree.tostring(document_as_html, **write_options)
+            document_as_bytes = document_as_bytes.split(b"\n", 1)[1]
+            document_to_write = lxml.etree.fromstring(document_as_bytes, parser).getroottree()
 
-            with open(output_file_path + ".tmp", mode = "w", encoding = self.encoding) as output_file:
-                output_file.write(document_as_html_string)
-            os.replace(output_file_path + ".tmp", output_file_path)
+        xml_file_writer.write_document(output_file, document_to_write, **write_options)
 
 
     def write_as_single_document(self, # pylint: disable = too-many-arguments
@@ -63,7 +79,7 @@ class HtmlWriter:
         self.write_to_file(output_file_path, html_document, simulate = simulate)
 
 
-    def write_as_many_documents(self, # pylint: disable = too-many-arguments
+    def write_as_many_documents(self, # pylint: disable = too-many-arguments, too-many-locals
             output_directory: str,
             metadata: Mapping[str,str],
             document_content: RootElement,
@@ -71,8 +87,13 @@ class HtmlWriter:
             information_template_file_path: Optional[str] = None,
             css_file_path: Optional[str] = None,
             simulate: bool = False,
+            job_count: Optional[int] = 1,
+            writer_factory: Optional[Callable[[], "HtmlWriter"]] = None,
             ) -> None:
 
+        # Sections are rendered by several processes when job_count is not 1, each with its own writer created using the factory,
+        # and the files are then written in order by this process. See section_scheduler.render_sections.
+
         section_count = document_content.get_section_count()
 
         if information_template_file_path is not None:
@@ -81,16 +102,19 @@ class HtmlWriter:
             output_file_path = os.path.join(output_directory, file_name + ".html")
             self.write_metadata(output_file_path, metadata, information_template_file_path, css_file_path, simulate = simulate)
 
-        for section_index, section in enumerate(document_content.enumerate_sections()):
-            title = section.get_heading().get_title()
+        all_arguments = (
+            (output_file_path, title, section, section_template_file_path, css_file_path)
+            for output_file_path, title, section in self._enumerate_sections_with_file_paths(output_directory, document_content, section_count)
+        )
 
-            file_name = document_operations.generate_section_file_name(title, section_index, section_count)
-            output_file_path = os.path.join(output_directory, file_name + ".html")
+        all_results = section_scheduler.render_sections(
+            self, HtmlWriter._render_section, all_arguments, job_count = job_count, renderer_factory = writer_factory)
 
-            html_document = self._create_document(title, output_file_path, section_template_file_path, css_file_path)
-            html_document = self._converter.convert_as_section(html_document, section)
+        for output_file_path, document_as_bytes in all_results:
+            logger.debug("Writing '%s'", output_file_path)
 
-            self.write_to_file(output_file_path, html_document, simulate = simulate)
+            with xml_file_writer.open_output_file(output_file_path, simulate = simulate, output_sink = self._output_sink) as output_file:
+                output_file.write(document_as_bytes)
 
 
     def write_metadata(self, # pylint: disable = too-many-arguments
@@ -105,6 +129,27 @@ class HtmlWriter:
         self.write_to_file(output_file_path, html_document, simulate = simulate)
 
 
+    def _enumerate_sections_with_file_paths(self,
+            output_directory: str, document_content: RootElement, section_count: int) -> Iterator[Tuple[str, str, SectionElement]]:
+
+        for section_index, section in enumerate(document_content.enumerate_sections()):
+            title = section.get_heading().get_title()
+            file_name = document_operations.generate_section_file_name(title, section_index, section_count)
+            yield (os.path.join(output_directory, file_name + ".html"), title, section)
+
+
+    def _render_section(self, # pylint: disable = too-many-arguments
+            output_file_path: str, title: str, section: SectionElement, template_file_path: Optional[str], css_file_path: Optional[str],
+            ) -> Tuple[str, bytes]:
+
+        html_document = self._create_document(title, output_file_path, template_file_path, css_file_path)
+        html_document = self._converter.convert_as_section(html_document, section)
+
+        output_file = io.BytesIO()
+        self.write_to_stream(output_file, html_document)
+        return (output_file_path, output_file.getvalue())
+
+
     def _create_document(self,
             title: str,
             destination_file_path: str,
@@ -112,6 +157,21 @@ class HtmlWriter:
             css_file_path: Optional[str],
             ) -> lxml.etree._ElementTree:
 
+        template = self._template_cache.get_template("html", template_file_path, self._load_template)
+        html_document, anchors = template.create_document()
+        anchors["title"][0].text = title
+
+        if template_file_path is not None:
+            for link_element in anchors["links"]:
+                html_operations.update_link(link_element, template_file_path, destination_file_path)
+        if css_file_path is not None:
+            html_operations.add_style_sheet(anchors["head"][0], "link", css_file_path, destination_file_path)
+
+        return html_document
+
+
+    def _load_template(self, template_file_path: Optional[str]) -> XmlTemplate:
+
         def create_base():
             if template_file_path is not None:
                 with open(template_file_path, mode = "r", encoding = "utf-8") as template_file:
@@ -125,16 +185,14 @@ class HtmlWriter:
 
         html_document = create_base()
         html_root = html_document.getroot()
-        head_as_html = xpath_helpers.find_xml_element(html_root, "./head")
-        title_as_html = xpath_helpers.find_xml_element(html_root, "./head/title")
-        title_as_html.text = title
         body_as_html = xpath_helpers.find_xml_element(html_root, "./body")
         body_as_html.text = None
 
-        if template_file_path is not None:
-            for link_element in xpath_helpers.try_find_xml_element_collection(html_root, "//link"):
-                html_operations.update_link(link_element, template_file_path, destination_file_path)
-        if css_file_path is not None:
-            html_operations.add_style_sheet(head_as_html, "link", css_file_path, destination_file_path)
+        anchors = {
+            "head": [ xpath_helpers.find_xml_element(html_root, "./head") ],
+            "title": [ xpath_helpers.find_xml_element(html_root, "./head/title") ],
+            "body": [ body_as_html ],
+            "links": xpath_helpers.try_find_xml_element_collection(html_root, "//link"),
+        }
 
-        return html_document
+        return XmlTemplate(html_document, anchors)
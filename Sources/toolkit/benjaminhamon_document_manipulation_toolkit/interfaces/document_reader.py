@@ -1,6 +1,7 @@
 import abc
-from typing import List
+from typing import Callable, List
 
+from benjaminhamon_document_manipulation_toolkit.documents.document_data import DocumentData
 from benjaminhamon_document_manipulation_toolkit.documents.elements.document_comment import DocumentComment
 from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
 
@@ -18,6 +19,11 @@ class DocumentReader(abc.ABC):
         pass
 
 
+    @abc.abstractmethod
+    def read_metadata_from_bytes(self, document_data: bytes) -> dict:
+        pass
+
+
     @abc.abstractmethod
     def read_content_from_file(self, document_file_path: str) -> RootElement:
         pass
@@ -28,6 +34,16 @@ class DocumentReader(abc.ABC):
         pass
 
 
+    @abc.abstractmethod
+    def read_content_from_bytes(self, document_data: bytes) -> RootElement:
+        pass
+
+
+    @abc.abstractmethod
+    def read_selected_content_from_file(self, document_file_path: str, section_filter: Callable[[str], bool]) -> RootElement:
+        pass
+
+
     @abc.abstractmethod
     def read_comments_from_file(self, document_file_path: str) -> List[DocumentComment]:
         pass
@@ -36,3 +52,23 @@ class DocumentReader(abc.ABC):
     @abc.abstractmethod
     def read_comments_from_string(self, document_data: str) -> List[DocumentComment]:
         pass
+
+
+    @abc.abstractmethod
+    def read_comments_from_bytes(self, document_data: bytes) -> List[DocumentComment]:
+        pass
+
+
+    @abc.abstractmethod
+    def read_document_from_file(self, document_file_path: str) -> DocumentData:
+        pass
+
+
+    @abc.abstractmethod
+    def read_document_from_string(self, document_data: str) -> DocumentData:
+        pass
+
+
+    @abc.abstractmethod
+    def read_document_from_bytes(self, document_data: bytes) -> DocumentData:
+        pass
@@ -0,0 +1,47 @@
+import abc
+from typing import IO, ContextManager
+
+
+class OutputSink(abc.ABC):
+    """ Destination for the files created by writers, which become visible only once committed """
+
+
+    @abc.abstractmethod
+    def open_file(self, file_path: str) -> ContextManager[IO[bytes]]:
+        pass
+
+
+    @abc.abstractmethod
+    def commit(self) -> None:
+        pass
+
+
+    @abc.abstractmethod
+    def discard(self) -> None:
+        pass
+
+
+    def write_file(self, file_path: str, data: bytes) -> None:
+        with self.open_file(file_path) as output_file:
+            output_file.write(data)
+
+
+    def close(self) -> None:
+        pass
+
+
+    def __enter__(self) -> "OutputSink":
+        return self
+
+
+    def __exit__(self, exception_type, exception_value, traceback) -> None:
+
+        # The files are committed only if all of them were written successfully, so that a failure leaves the previous output in place
+
+        try:
+            if exception_type is None:
+                self.commit()
+            else:
+                self.discard()
+        finally:
+            self.close()
@@ -1,5 +1,6 @@
-from typing import List
+from typing import Iterable, List, Union
 
+from benjaminhamon_document_manipulation_toolkit.documents import document_operations
 from benjaminhamon_document_manipulation_toolkit.documents.elements.heading_element import HeadingElement
 from benjaminhamon_document_manipulation_toolkit.documents.elements.paragraph_element import ParagraphElement
 from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
@@ -14,12 +15,12 @@ class DocumentToMarkdownConverter:
         self.heading_top_margin = 2
 
 
-    def convert_content(self, title: str, root: RootElement) -> str:
+    def convert_content(self, title: str, root: Union[RootElement, Iterable[SectionElement]]) -> str:
         content_as_markdown_lines: List[str] = []
         content_as_markdown_lines.append("# " + title)
         content_as_markdown_lines.extend([ "" ] * (self.heading_top_margin + 1))
 
-        for section in root.enumerate_sections():
+        for section in document_operations.enumerate_sections(root):
             content_as_markdown_lines.extend(self._convert_section(section, level = 2))
 
         return "\n".join(content_as_markdown_lines).rstrip() + "\n"
@@ -1,5 +1,7 @@
-from typing import List
+from typing import Callable, List
 
+from benjaminhamon_document_manipulation_toolkit.documents import document_operations
+from benjaminhamon_document_manipulation_toolkit.documents.document_data import DocumentData
 from benjaminhamon_document_manipulation_toolkit.documents.elements.document_comment import DocumentComment
 from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
 from benjaminhamon_document_manipulation_toolkit.html.html_reader import HtmlReader
@@ -23,6 +25,10 @@ class MarkdownReader(DocumentReader):
         raise NotImplementedError
 
 
+    def read_metadata_from_bytes(self, document_data: bytes) -> dict:
+        raise NotImplementedError
+
+
     def read_content_from_file(self, document_file_path: str) -> RootElement:
         with open(document_file_path, mode = "r", encoding = "utf-8") as document_file:
             document_data = document_file.read()
@@ -34,9 +40,35 @@ class MarkdownReader(DocumentReader):
         return self._html_reader.read_content_from_string(document_as_html_string)
 
 
+    def read_content_from_bytes(self, document_data: bytes) -> RootElement:
+        # The markdown converter only works on strings, so the data must be decoded anyway
+        return self.read_content_from_string(document_data.decode("utf-8"))
+
+
+    def read_selected_content_from_file(self, document_file_path: str, section_filter: Callable[[str], bool]) -> RootElement:
+        document_content = self.read_content_from_file(document_file_path)
+        return document_operations.filter_sections(document_content, section_filter)
+
+
     def read_comments_from_file(self, document_file_path: str) -> List[DocumentComment]:
         raise NotImplementedError
 
 
     def read_comments_from_string(self, document_data: str) -> List[DocumentComment]:
         raise NotImplementedError
+
+
+    def read_comments_from_bytes(self, document_data: bytes) -> List[DocumentComment]:
+        raise NotImplementedError
+
+
+    def read_document_from_file(self, document_file_path: str) -> DocumentData:
+        raise NotImplementedError
+
+
+    def read_document_from_string(self, document_data: str) -> DocumentData:
+        raise NotImplementedError
+
+
+    def read_document_from_bytes(self, document_data: bytes) -> DocumentData:
+        raise NotImplementedError
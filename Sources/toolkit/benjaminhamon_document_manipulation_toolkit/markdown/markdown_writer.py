@@ -1,11 +1,15 @@
 import logging
 import os
-from typing import Mapping
+from typing import Callable, Iterable, Iterator, Mapping, Optional, Tuple, Union
 
 from benjaminhamon_document_manipulation_toolkit.documents import document_operations
+from benjaminhamon_document_manipulation_toolkit.documents import section_scheduler
 from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
+from benjaminhamon_document_manipulation_toolkit.documents.elements.section_element import SectionElement
+from benjaminhamon_document_manipulation_toolkit.interfaces.output_sink import OutputSink
 from benjaminhamon_document_manipulation_toolkit.markdown.document_to_markdown_converter import DocumentToMarkdownConverter
 from benjaminhamon_document_manipulation_toolkit.serialization.serializer import Serializer
+from benjaminhamon_document_manipulation_toolkit.xml import xml_file_writer
 
 
 logger = logging.getLogger("MarkdownWriter")
@@ -14,23 +18,24 @@ logger = logging.getLogger("MarkdownWriter")
 class MarkdownWriter:
 
 
-    def __init__(self, converter: DocumentToMarkdownConverter, serializer: Serializer) -> None:
+    def __init__(self, converter: DocumentToMarkdownConverter, serializer: Serializer, output_sink: Optional[OutputSink] = None) -> None:
         self._converter = converter
         self._serializer = serializer
+        self._output_sink = output_sink
         self.encoding = "utf-8"
 
 
     def write_to_file(self, output_file_path: str, document: str, simulate: bool = False) -> None:
         logger.debug("Writing '%s'", output_file_path)
 
-        if not simulate:
-            with open(output_file_path + ".tmp", mode = "w", encoding = self.encoding) as output_file:
-                output_file.write(document)
-            os.replace(output_file_path + ".tmp", output_file_path)
+        with xml_file_writer.open_output_file(output_file_path, simulate = simulate, output_sink = self._output_sink) as output_file:
+            # The text is written with the platform line endings, as a file opened in text mode would
+            output_file.write(document.replace("\n", os.linesep).encode(self.encoding))
 
 
     def write_as_single_document(self, # pylint: disable = too-many-arguments
-            output_file_path: str, title: str, metadata: Mapping[str,str], content: RootElement, simulate: bool = False) -> None:
+            output_file_path: str, title: str, metadata: Mapping[str,str], content: Union[RootElement, Iterable[SectionElement]],
+            simulate: bool = False) -> None:
 
         document_as_markdown = ""
 
@@ -45,10 +50,15 @@ class MarkdownWriter:
         self.write_to_file(output_file_path, document_as_markdown, simulate = simulate)
 
 
-    def write_as_many_documents(self, # pylint: disable = too-many-arguments
-            output_directory: str, metadata: Mapping[str,str], content: RootElement, simulate: bool = False) -> None:
+    def write_as_many_documents(self, # pylint: disable = too-many-arguments, too-many-locals
+            output_directory: str, metadata: Mapping[str,str], content: Union[RootElement, Iterable[SectionElement]],
+            simulate: bool = False, section_count: Optional[int] = None,
+            job_count: Optional[int] = 1, writer_factory: Optional[Callable[[], "MarkdownWriter"]] = None) -> None:
 
-        section_count = content.get_section_count()
+        # Sections are rendered by several processes when job_count is not 1, each with its own writer created using the factory,
+        # and the files are then written in order by this process. See section_scheduler.render_sections.
+
+        section_count = document_operations.get_section_count(content, section_count)
 
         if len(metadata) > 0:
             section_index = -1
@@ -60,11 +70,23 @@ class MarkdownWriter:
 
             self.write_to_file(output_file_path, metadata_as_markdown, simulate = simulate)
 
-        for section_index, section in enumerate(content.enumerate_sections()):
-            title = section.get_heading().get_title()
-            section_as_markdown = self._converter.convert_content_as_section(section)
+        all_arguments = self._enumerate_sections_with_file_paths(output_directory, content, section_count)
 
-            file_name = document_operations.generate_section_file_name(title, section_index, section_count)
-            markdown_file_path = os.path.join(output_directory, file_name + ".md")
+        all_results = section_scheduler.render_sections(
+            self, MarkdownWriter._render_section, all_arguments, job_count = job_count, renderer_factory = writer_factory)
 
+        for markdown_file_path, section_as_markdown in all_results:
             self.write_to_file(markdown_file_path, section_as_markdown, simulate = simulate)
+
+
+    def _enumerate_sections_with_file_paths(self,
+            output_directory: str, content: Union[RootElement, Iterable[SectionElement]], section_count: int) -> Iterator[Tuple[str, SectionElement]]:
+
+        for section_index, section in enumerate(document_operations.enumerate_sections(content)):
+            title = section.get_heading().get_title()
+            file_name = document_operations.generate_section_file_name(title, section_index, section_count)
+            yield (os.path.join(output_directory, file_name + ".md"), section)
+
+
+    def _render_section(self, markdown_file_path: str, section: SectionElement) -> Tuple[str, str]:
+        return (markdown_file_path, self._converter.convert_content_as_section(section))
@@ -1,10 +1,10 @@
 # cspell:words lxml nsmap
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
 
 import lxml.etree
 
-from benjaminhamon_document_manipulation_toolkit.documents import document_element_factory
+from benjaminhamon_document_manipulation_toolkit.documents import document_operations
 from benjaminhamon_document_manipulation_toolkit.documents.elements.document_comment import DocumentComment
 from benjaminhamon_document_manipulation_toolkit.documents.elements.document_element import DocumentElement
 from benjaminhamon_document_manipulation_toolkit.documents.elements.heading_element import HeadingElement
@@ -14,23 +14,27 @@ from benjaminhamon_document_manipulation_toolkit.documents.elements.section_elem
 from benjaminhamon_document_manipulation_toolkit.documents.elements.text_element import TextElement
 from benjaminhamon_document_manipulation_toolkit.documents.elements.text_region_end_element import TextRegionEndElement
 from benjaminhamon_document_manipulation_toolkit.documents.elements.text_region_start_element import TextRegionStartElement
+from benjaminhamon_document_manipulation_toolkit.xml import xml_namespace
 from benjaminhamon_document_manipulation_toolkit.xml import xpath_helpers
+from benjaminhamon_document_manipulation_toolkit.xml.xml_namespace import XmlNamespace
 
 
 class DocumentToOdtConverter:
 
 
+    def __init__(self) -> None:
+        self._all_style_attributes: Dict[Tuple[str,str],Dict[str,str]] = {}
+
+
     def convert(self,
             xml_document: lxml.etree._ElementTree,
-            content: RootElement,
+            content: Union[RootElement, Iterable[SectionElement]],
             comment_collection: Dict[str,DocumentComment]) -> lxml.etree._ElementTree:
 
         namespaces = xpath_helpers.sanitize_namespaces_for_xpath(xml_document.getroot().nsmap)
         body_as_xml = xpath_helpers.find_xml_element(xml_document.getroot(), "./office:body/office:text", namespaces)
 
-        xml_element_collection: List[lxml.etree._Element] = []
-        for section_element in content.enumerate_sections():
-            xml_element_collection.extend(self._convert_section(section_element, comment_collection, namespaces))
+        xml_element_collection = list(self.enumerate_content_elements(xml_document, content, comment_collection))
 
         for xml_element in xml_element_collection:
             body_as_xml.append(xml_element)
@@ -38,141 +42,118 @@ class DocumentToOdtConverter:
         return xml_document
 
 
-    def _convert_section(self,
-            section_element: SectionElement, comment_collection: Dict[str,DocumentComment], namespaces: Dict[str, str]) -> List[lxml.etree._Element]:
+    def enumerate_content_elements(self,
+            xml_document: lxml.etree._ElementTree,
+            content: Union[RootElement, Iterable[SectionElement]],
+            comment_collection: Dict[str,DocumentComment]) -> Iterator[lxml.etree._Element]:
 
-        xml_element_collection: List[lxml.etree._Element] = []
+        # Elements for the document body are produced section by section, so that they can be written without building the complete tree
 
-        xml_element_collection.append(self._convert_heading(section_element.get_heading(), comment_collection, namespaces))
-        for paragraph in section_element.enumerate_paragraphs():
-            xml_element_collection.append(self._convert_paragraph(paragraph, comment_collection, namespaces))
-        for subsection in section_element.enumerate_subsections():
-            xml_element_collection.extend(self._convert_section(subsection, comment_collection, namespaces))
+        namespaces_as_uri = xpath_helpers.sanitize_namespaces_for_xpath(xml_document.getroot().nsmap)
+        namespaces = { prefix: xml_namespace.get_namespace(uri) for prefix, uri in namespaces_as_uri.items() }
 
-        return xml_element_collection
+        for section_element in document_operations.enumerate_sections(content):
+            yield from self._convert_section(section_element, comment_collection, namespaces)
 
 
-    def _convert_heading(self,
-            heading_element: HeadingElement, comment_collection: Dict[str,DocumentComment], namespaces: Dict[str, str]) -> lxml.etree._Element:
+    def _convert_section(self,
+            section_element: SectionElement,
+            comment_collection: Dict[str,DocumentComment],
+            namespaces: Dict[str,XmlNamespace],
+            ) -> Iterator[lxml.etree._Element]:
 
-        attributes: Dict[str,str] = {}
+        yield self._convert_heading(section_element.get_heading(), comment_collection, namespaces)
+        for paragraph in section_element.enumerate_paragraphs():
+            yield self._convert_paragraph(paragraph, comment_collection, namespaces)
+        for subsection in section_element.enumerate_subsections():
+            yield from self._convert_section(subsection, comment_collection, namespaces)
 
-        style = self._get_style_from_document_element(heading_element)
-        if style is not None:
-            attributes[str(lxml.etree.QName(namespaces["text"], "style-name"))] = style
 
-        heading_as_xml = lxml.etree.Element(lxml.etree.QName(namespaces["text"], "h"), attrib = attributes)
-        for child in heading_element.children:
-            new_elements = self._convert_text(child, comment_collection, namespaces)
-            for element in new_elements:
-                heading_as_xml.append(element)
+    def _convert_heading(self,
+            heading_element: HeadingElement, comment_collection: Dict[str,DocumentComment], namespaces: Dict[str,XmlNamespace]) -> lxml.etree._Element:
+
+        attributes = self._get_style_attributes(heading_element, namespaces)
+        heading_as_xml = lxml.etree.Element(namespaces["text"].get_name("h"), attrib = attributes)
+        self._convert_text(heading_as_xml, heading_element.children, comment_collection, namespaces)
 
         return heading_as_xml
 
 
     def _convert_paragraph(self,
-            paragraph_element: ParagraphElement,
-            comment_collection: Optional[Dict[str,DocumentComment]],
-            namespaces: Dict[str, str],
-            ) -> lxml.etree._Element:
+            paragraph_element: ParagraphElement, comment_collection: Dict[str,DocumentComment], namespaces: Dict[str,XmlNamespace]) -> lxml.etree._Element:
 
-        attributes: Dict[str,str] = {}
-
-        style = self._get_style_from_document_element(paragraph_element)
-        if style is not None:
-            attributes[str(lxml.etree.QName(namespaces["text"], "style-name"))] = style
-
-        paragraph_as_xml = lxml.etree.Element(lxml.etree.QName(namespaces["text"], "p"), attrib = attributes)
-        for child in paragraph_element.children:
-            new_elements = self._convert_text(child, comment_collection, namespaces)
-            for element in new_elements:
-                paragraph_as_xml.append(element)
+        attributes = self._get_style_attributes(paragraph_element, namespaces)
+        paragraph_as_xml = lxml.etree.Element(namespaces["text"].get_name("p"), attrib = attributes)
+        self._convert_text(paragraph_as_xml, paragraph_element.children, comment_collection, namespaces)
 
         return paragraph_as_xml
 
 
     def _convert_text(self,
-            element: DocumentElement,
-            comment_collection: Optional[Dict[str,DocumentComment]],
-            namespaces: Dict[str, str],
-            ) -> List[lxml.etree._Element]:
-
-        xml_element_collection: List[lxml.etree._Element] = []
-
-        if isinstance(element, TextElement):
-            xml_element_collection.append(self._convert_text_span(element, namespaces))
-            if element.line_break:
-                xml_element_collection.append(self._create_line_break(namespaces))
-            return xml_element_collection
-
-        if isinstance(element, TextRegionStartElement):
-            if element.identifier is None:
-                raise ValueError("Region element must have an identifier")
-            if comment_collection is not None:
+            parent_as_xml: lxml.etree._Element,
+            element_collection: Iterable[DocumentElement],
+            comment_collection: Dict[str,DocumentComment],
+            namespaces: Dict[str,XmlNamespace],
+            ) -> None:
+
+        for element in element_collection:
+            if isinstance(element, TextElement):
+                attributes = self._get_style_attributes(element, namespaces)
+                span_as_xml = lxml.etree.SubElement(parent_as_xml, namespaces["text"].get_name("span"), attrib = attributes)
+                span_as_xml.text = element.text
+                if element.line_break:
+                    lxml.etree.SubElement(parent_as_xml, namespaces["text"].get_name("line-break"))
+
+            elif isinstance(element, TextRegionStartElement):
+                if element.identifier is None:
+                    raise ValueError("Region element must have an identifier")
                 comment = comment_collection.get(element.identifier)
                 if comment is not None:
-                    xml_element_collection.append(self._convert_annotation(element, comment, namespaces))
-            return xml_element_collection
+                    self._convert_annotation(parent_as_xml, element.identifier, comment, namespaces)
 
-        if isinstance(element, TextRegionEndElement):
-            if element.identifier is None:
-                raise ValueError("Region element must have an identifier")
-            if comment_collection is not None:
+            elif isinstance(element, TextRegionEndElement):
+                if element.identifier is None:
+                    raise ValueError("Region element must have an identifier")
                 comment = comment_collection.get(element.identifier)
                 if comment is not None:
-                    xml_element_collection.append(self._convert_annotation_end(element, namespaces))
-            return xml_element_collection
-
-        raise ValueError("Unsupported element type: '%s'" % type(element))
-
-
-    def _convert_text_span(self, text_element: TextElement, namespaces: Dict[str, str]) -> lxml.etree._Element:
-        attributes: Dict[str,str] = {}
-
-        style = self._get_style_from_document_element(text_element)
-        if style is not None:
-            attributes[str(lxml.etree.QName(namespaces["text"], "style-name"))] = style
+                    attributes = { namespaces["office"].get_name("name"): element.identifier }
+                    lxml.etree.SubElement(parent_as_xml, namespaces["office"].get_name("annotation-end"), attrib = attributes)
 
-        span_as_xml = lxml.etree.Element(lxml.etree.QName(namespaces["text"], "span"), attrib = attributes)
-        span_as_xml.text = text_element.text
-
-        return span_as_xml
-
-
-    def _create_line_break(self, namespaces: Dict[str, str]) -> lxml.etree._Element:
-        return lxml.etree.Element(lxml.etree.QName(namespaces["text"], "line-break"))
+            else:
+                raise ValueError("Unsupported element type: '%s'" % type(element))
 
 
     def _convert_annotation(self,
-            region_start_element: TextRegionStartElement, comment: DocumentComment, namespaces: Dict[str, str]) -> lxml.etree._Element:
-
-        if region_start_element.identifier is None:
-            raise ValueError("Region element must have an identifier")
+            parent_as_xml: lxml.etree._Element, region_identifier: str, comment: DocumentComment, namespaces: Dict[str,XmlNamespace]) -> None:
 
         attributes: Dict[str,str] = {}
-        if region_start_element.identifier.startswith("__Annotation__"):
-            attributes[str(lxml.etree.QName(namespaces["office"], "name"))] = region_start_element.identifier
-        annotation_xml = lxml.etree.Element(lxml.etree.QName(namespaces["office"], "annotation"), attrib = attributes)
+        if region_identifier.startswith("__Annotation__"):
+            attributes[namespaces["office"].get_name("name")] = region_identifier
+        annotation_xml = lxml.etree.SubElement(parent_as_xml, namespaces["office"].get_name("annotation"), attrib = attributes)
 
-        lxml.etree.SubElement(annotation_xml, lxml.etree.QName(namespaces["dc"], "creator")).text = comment.author
-        lxml.etree.SubElement(annotation_xml, lxml.etree.QName(namespaces["dc"], "date")).text = comment.date.isoformat()
+        lxml.etree.SubElement(annotation_xml, namespaces["dc"].get_name("creator")).text = comment.author
+        lxml.etree.SubElement(annotation_xml, namespaces["dc"].get_name("date")).text = comment.date.isoformat()
 
         for paragraph_text in comment.text.splitlines():
-            paragraph_element = document_element_factory.create_paragraph([ paragraph_text ])
-            annotation_xml.append(self._convert_paragraph(paragraph_element, comment_collection = None, namespaces = namespaces))
+            paragraph_as_xml = lxml.etree.SubElement(annotation_xml, namespaces["text"].get_name("p"))
+            lxml.etree.SubElement(paragraph_as_xml, namespaces["text"].get_name("span")).text = paragraph_text
 
-        return annotation_xml
 
+    def _get_style_attributes(self, document_element: DocumentElement, namespaces: Dict[str,XmlNamespace]) -> Dict[str,str]:
 
-    def _convert_annotation_end(self, region_end_element: TextRegionEndElement, namespaces: Dict[str, str]) -> lxml.etree._Element:
-        if region_end_element.identifier is None:
-            raise ValueError("Region element must have an identifier")
+        # Attributes are shared by the elements with the same style, lxml copies them when creating an element
 
-        attributes: Dict[str,str] = {}
-        attributes[str(lxml.etree.QName(namespaces["office"], "name"))] = region_end_element.identifier
-        annotation_end_xml = lxml.etree.Element(lxml.etree.QName(namespaces["office"], "annotation-end"), attrib = attributes)
+        style = self._get_style_from_document_element(document_element)
+        if style is None:
+            return {}
+
+        key = (namespaces["text"].uri, style)
+        attributes = self._all_style_attributes.get(key)
+        if attributes is None:
+            attributes = { namespaces["text"].get_name("style-name"): style }
+            self._all_style_attributes[key] = attributes
 
-        return annotation_end_xml
+        return attributes
 
 
     def _get_style_from_document_element(self, document_element: DocumentElement) -> Optional[str]:
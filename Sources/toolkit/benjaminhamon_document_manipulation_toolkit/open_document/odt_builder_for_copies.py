@@ -1,12 +1,13 @@
-# cspell:words addnext iterchildren localname lxml nsmap
+# cspell:words addnext iterchildren lxml nsmap
 
 import copy
-from typing import Dict, List, Optional
+from typing import Iterable, Iterator, List, Mapping, Optional, Sized, Tuple
 
 import lxml.etree
 
 from benjaminhamon_document_manipulation_toolkit.open_document import odt_operations
-from benjaminhamon_document_manipulation_toolkit.xml import xml_operations
+from benjaminhamon_document_manipulation_toolkit.xml import xml_namespace
+from benjaminhamon_document_manipulation_toolkit.xml.xml_text_template import XmlTextTemplate
 
 
 class OdtBuilderForCopies:
@@ -23,64 +24,105 @@ class OdtBuilderForCopies:
 
     def add_copies(self, source_odt_document: lxml.etree._ElementTree, all_format_parameters: List[dict]) -> None:
         new_body = odt_operations.get_body_text_element(self._xml_document)
+
+        # Frames are inserted after the last one, which is tracked rather than searched for each insertion
+        last_frame = next((x for x in new_body.iterchildren(reversed = True) if xml_namespace.get_local_name(x) == "frame"), None)
+
+        for element in self.enumerate_copies(source_odt_document, all_format_parameters):
+            if xml_namespace.get_local_name(element) == "frame":
+                if last_frame is None:
+                    new_body.append(element)
+                else:
+                    last_frame.addnext(element)
+                last_frame = element
+
+            else:
+                new_body.append(element)
+
+
+    def enumerate_copies(self,
+            source_odt_document: lxml.etree._ElementTree,
+            all_format_parameters: Iterable[Mapping[str,str]],
+            item_count: Optional[int] = None,
+            ) -> Iterator[lxml.etree._Element]:
+
+        # Elements are produced in their order in the body, so that they can be written as they are produced,
+        # for example by passing them as content to OdtWriter.write_to_file, to create copies without holding them in memory.
+        # Frames anchored to pages are grouped, for all the copies, where the first frame of the first copy is,
+        # and only depend on the copy index, so they are produced all at once while producing the first copy.
+        # The parameter sets are consumed once, so they can be read incrementally, in which case the item count must be provided.
+
+        if item_count is None:
+            if not isinstance(all_format_parameters, Sized):
+                raise ValueError("Item count must be provided when the format parameters are not a collection")
+            item_count = len(all_format_parameters)
+
         source_body = odt_operations.get_body_text_element(source_odt_document)
+        namespaces = source_body.nsmap
 
+        all_source_frames, all_source_templates, templates_before_frames = self._parse_source_body(source_body)
+
+        item_index = -1
         for item_index, format_parameters in enumerate(all_format_parameters):
-            item_elements = self._copy_body_children(source_body, item_index, format_parameters, source_body.nsmap)
+            if item_index >= item_count:
+                raise ValueError("Format parameters do not match the item count (ItemCount: %s)" % item_count)
+
+            if item_index == 0:
+                for source_template in all_source_templates[ : templates_before_frames ]:
+                    yield source_template.format(format_parameters)
+                for frame_item_index in range(item_count):
+                    for frame in all_source_frames:
+                        yield self._copy_frame(frame, frame_item_index, namespaces)
+                for source_template in all_source_templates[ templates_before_frames : ]:
+                    yield source_template.format(format_parameters)
+
+            else:
+                for source_template in all_source_templates:
+                    yield source_template.format(format_parameters)
 
-            for element in item_elements:
-                self._append_element_to_body(new_body, element)
+        if item_index + 1 != item_count:
+            raise ValueError("Format parameters do not match the item count (ItemCount: %s)" % item_count)
 
 
-    def _copy_body_children(self,
-            body_as_xml: lxml.etree._Element,
-            item_index: int,
-            format_parameters: Dict[str,str],
-            namespaces: Dict[Optional[str], str],
-            ) -> List[lxml.etree._Element]:
+    def _parse_source_body(self, source_body: lxml.etree._Element) -> Tuple[List[lxml.etree._Element], List[XmlTextTemplate], int]:
 
-        element_collection: List[lxml.etree._Element] = []
+        # The source elements are parsed for format fields once, rather than for each copy.
+        # Returns the frames, the text templates, and how many of the templates come before the first frame.
 
-        for element in body_as_xml.iterchildren():
-            element_copy = copy.deepcopy(element)
+        all_source_frames: List[lxml.etree._Element] = []
+        all_source_templates: List[XmlTextTemplate] = []
+        templates_before_frames: Optional[int] = None
 
-            tag = lxml.etree.QName(element_copy).localname
+        for element in source_body.iterchildren():
+            tag = xml_namespace.get_local_name(element)
 
             if tag not in ( "h", "p", "frame" ):
                 raise ValueError("Unsupported text tag: '%s'" % tag)
 
             if tag == "frame":
-                name_attribute_key = lxml.etree.QName(namespaces["draw"], "name")
-                frame_name = element_copy.attrib.get(str(name_attribute_key))
-                if frame_name is not None:
-                    element_copy.attrib[str(name_attribute_key)] = str(frame_name) + "-" + str(item_index + 1)
-
-                anchor_page_number_attribute_key = lxml.etree.QName(namespaces["text"], "anchor-page-number")
-                anchor_page_number = element_copy.attrib.get(str(anchor_page_number_attribute_key))
-                if anchor_page_number is not None:
-                    element_copy.attrib[str(anchor_page_number_attribute_key)] = str(item_index + 1)
-
-                element_collection.append(element_copy)
-
+                all_source_frames.append(element)
+                if templates_before_frames is None:
+                    templates_before_frames = len(all_source_templates)
             if tag in ( "h", "p" ):
-                xml_operations.format_text_in_xml(element_copy, format_parameters)
-                element_collection.append(element_copy)
+                all_source_templates.append(XmlTextTemplate(element))
 
-        return element_collection
+        if templates_before_frames is None:
+            templates_before_frames = len(all_source_templates)
 
+        return (all_source_frames, all_source_templates, templates_before_frames)
 
-    def _append_element_to_body(self, body: lxml.etree._Element, element: lxml.etree._Element):
-        tag = lxml.etree.QName(element).localname
 
-        if tag not in ( "h", "p", "frame" ):
-            raise ValueError("Unsupported text tag: '%s'" % tag)
+    def _copy_frame(self, frame: lxml.etree._Element, item_index: int, namespaces: Mapping[Optional[str],str]) -> lxml.etree._Element:
+        frame_copy = copy.deepcopy(frame)
 
-        if tag == "frame":
-            last_frame = next((x for x in body.iterchildren(reversed = True) if lxml.etree.QName(x).localname == "frame"), None)
-            if last_frame is None:
-                body.append(element)
-            else:
-                last_frame.addnext(element)
+        name_attribute_key = lxml.etree.QName(namespaces["draw"], "name")
+        frame_name = frame_copy.attrib.get(str(name_attribute_key))
+        if frame_name is not None:
+            frame_copy.attrib[str(name_attribute_key)] = str(frame_name) + "-" + str(item_index + 1)
+
+        anchor_page_number_attribute_key = lxml.etree.QName(namespaces["text"], "anchor-page-number")
+        anchor_page_number = frame_copy.attrib.get(str(anchor_page_number_attribute_key))
+        if anchor_page_number is not None:
+            frame_copy.attrib[str(anchor_page_number_attribute_key)] = str(item_index + 1)
 
-        if tag in ( "h", "p" ):
-            body.append(element)
+        return frame_copy
@@ -2,6 +2,7 @@
 
 dc_namespace = "http://purl.org/dc/elements/1.1/"
 draw_namespace = "urn:oasis:names:tc:opendocument:xmlns:drawing:1.0"
+manifest_namespace = "urn:oasis:names:tc:opendocument:xmlns:manifest:1.0"
 meta_namespace="urn:oasis:names:tc:opendocument:xmlns:meta:1.0"
 office_namespace = "urn:oasis:names:tc:opendocument:xmlns:office:1.0"
 text_namespace =  "urn:oasis:names:tc:opendocument:xmlns:text:1.0"
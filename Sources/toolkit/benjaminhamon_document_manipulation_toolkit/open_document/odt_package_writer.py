@@ -0,0 +1,41 @@
+# cspell:words lxml opendocument
+
+from typing import Mapping
+
+import lxml.etree
+
+from benjaminhamon_document_manipulation_toolkit.open_document import odt_namespaces
+from benjaminhamon_document_manipulation_toolkit.output.zip_package_writer import ZipPackageWriter
+
+
+odt_mimetype = "application/vnd.oasis.opendocument.text"
+
+
+class OdtPackageWriter(ZipPackageWriter):
+    """ Writer for ODT packages, adding the manifest and the template entries to a zip package """
+
+
+    def write_mimetype(self, mimetype: str = odt_mimetype) -> None:
+        super().write_mimetype(mimetype)
+
+
+    def write_manifest(self, all_file_entries: Mapping[str,str], mimetype: str = odt_mimetype) -> None:
+        namespaces = { "manifest": odt_namespaces.manifest_namespace }
+
+        manifest_element = lxml.etree.Element(lxml.etree.QName(namespaces["manifest"], "manifest"), nsmap = namespaces) # type: ignore
+
+        for full_path, media_type in [ ("/", mimetype) ] + list(all_file_entries.items()):
+            attributes = {
+                str(lxml.etree.QName(namespaces["manifest"], "full-path")): full_path,
+                str(lxml.etree.QName(namespaces["manifest"], "media-type")): media_type,
+            }
+
+            lxml.etree.SubElement(manifest_element, lxml.etree.QName(namespaces["manifest"], "file-entry"), attrib = attributes)
+
+        manifest_as_bytes = lxml.etree.tostring(manifest_element, encoding = "utf-8", xml_declaration = True, pretty_print = True)
+        self.write_entry("META-INF/manifest.xml", manifest_as_bytes)
+
+
+    def copy_entries_from_template(self, template_file_path: str) -> None:
+        # The template provides every entry except the content, including its manifest, styles and pictures
+        self.copy_entries_from_package(template_file_path, excluded_entries = [ "mimetype", "content.xml" ])
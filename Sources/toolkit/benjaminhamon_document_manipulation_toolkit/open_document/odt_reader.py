@@ -1,14 +1,19 @@
-# cspell:words fodt lxml
+# cspell:words fodt iterancestors iterparse lxml
 
+import contextlib
 import zipfile
-from typing import List
+from typing import IO, Callable, ContextManager, Iterator, List, Optional
 
 import lxml.etree
 
+from benjaminhamon_document_manipulation_toolkit.documents.document_data import DocumentData
 from benjaminhamon_document_manipulation_toolkit.documents.elements.document_comment import DocumentComment
 from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
+from benjaminhamon_document_manipulation_toolkit.documents.elements.section_element import SectionElement
 from benjaminhamon_document_manipulation_toolkit.interfaces.document_reader import DocumentReader
+from benjaminhamon_document_manipulation_toolkit.open_document import odt_namespaces
 from benjaminhamon_document_manipulation_toolkit.open_document.odt_to_document_converter import OdtToDocumentConverter
+from benjaminhamon_document_manipulation_toolkit.xml import xpath_helpers
 
 
 class OdtReader(DocumentReader):
@@ -20,8 +25,8 @@ class OdtReader(DocumentReader):
 
 
     def read_metadata_from_file(self, document_file_path: str) -> dict:
-        document_data = self._read_odt(document_file_path, "meta.xml")
-        return self.read_metadata_from_string(document_data)
+        odt_as_xml = self._parse_odt(document_file_path, "meta.xml")
+        return self._converter.convert_metadata(odt_as_xml)
 
 
     def read_metadata_from_string(self, document_data: str) -> dict:
@@ -29,9 +34,14 @@ class OdtReader(DocumentReader):
         return self._converter.convert_metadata(odt_as_xml)
 
 
+    def read_metadata_from_bytes(self, document_data: bytes) -> dict:
+        odt_as_xml = lxml.etree.fromstring(document_data, self._xml_parser)
+        return self._converter.convert_metadata(odt_as_xml)
+
+
     def read_content_from_file(self, document_file_path: str) -> RootElement:
-        document_data = self._read_odt(document_file_path, "content.xml")
-        return self.read_content_from_string(document_data)
+        odt_as_xml = self._parse_odt(document_file_path, "content.xml")
+        return self._converter.convert_content(odt_as_xml)
 
 
     def read_content_from_string(self, document_data: str) -> RootElement:
@@ -39,9 +49,22 @@ class OdtReader(DocumentReader):
         return self._converter.convert_content(odt_as_xml)
 
 
+    def read_content_from_bytes(self, document_data: bytes) -> RootElement:
+        odt_as_xml = lxml.etree.fromstring(document_data, self._xml_parser)
+        return self._converter.convert_content(odt_as_xml)
+
+
+    def read_selected_content_from_file(self, document_file_path: str, section_filter: Callable[[str], bool]) -> RootElement:
+        root_element = RootElement()
+        root_element.identifier = "root"
+        with self.open_content_file(document_file_path) as content_file:
+            root_element.children.extend(self.enumerate_sections_from_stream(content_file, section_filter))
+        return root_element
+
+
     def read_comments_from_file(self, document_file_path: str) -> List[DocumentComment]:
-        document_data = self._read_odt(document_file_path, "content.xml")
-        return self.read_comments_from_string(document_data)
+        odt_as_xml = self._parse_odt(document_file_path, "content.xml")
+        return self._converter.convert_comments(odt_as_xml)
 
 
     def read_comments_from_string(self, document_data: str) -> List[DocumentComment]:
@@ -49,21 +72,113 @@ class OdtReader(DocumentReader):
         return self._converter.convert_comments(odt_as_xml)
 
 
-    def _read_odt(self, odt_file_path: str, file_path_in_archive: str) -> str:
+    def read_comments_from_bytes(self, document_data: bytes) -> List[DocumentComment]:
+        odt_as_xml = lxml.etree.fromstring(document_data, self._xml_parser)
+        return self._converter.convert_comments(odt_as_xml)
+
+
+    def read_document_from_file(self, document_file_path: str) -> DocumentData:
+        if document_file_path.endswith(".odt"):
+            with zipfile.ZipFile(document_file_path, mode = "r") as odt_file:
+                with odt_file.open("content.xml", mode = "r") as content_file:
+                    content_as_xml = lxml.etree.parse(content_file, self._xml_parser).getroot()
+                metadata_as_xml = None
+                if "meta.xml" in odt_file.namelist():
+                    with odt_file.open("meta.xml", mode = "r") as metadata_file:
+                        metadata_as_xml = lxml.etree.parse(metadata_file, self._xml_parser).getroot()
+            return self._convert_document(content_as_xml, metadata_as_xml)
+
+        odt_as_xml = self._parse_odt(document_file_path, "content.xml")
+        return self._convert_document(odt_as_xml, odt_as_xml)
+
+
+    def read_document_from_string(self, document_data: str) -> DocumentData:
+        odt_as_xml = lxml.etree.fromstring(document_data, self._xml_parser)
+        return self._convert_document(odt_as_xml, odt_as_xml)
+
+
+    def read_document_from_bytes(self, document_data: bytes) -> DocumentData:
+        odt_as_xml = lxml.etree.fromstring(document_data, self._xml_parser)
+        return self._convert_document(odt_as_xml, odt_as_xml)
+
+
+    def open_content_file(self, document_file_path: str) -> ContextManager[IO[bytes]]:
+        return self._open_odt(document_file_path, "content.xml")
+
+
+    def enumerate_sections_from_stream(
+            self, content_file: IO[bytes], section_filter: Optional[Callable[[str], bool]] = None) -> Iterator[SectionElement]:
+
+        # The content file is opened by the caller, with open_content_file, so that it is closed even if the sections are not all consumed
+        return self._converter.convert_content_incrementally(self._iterate_text_elements(content_file), section_filter)
+
+
+    def read_section_count_from_file(self, document_file_path: str) -> int:
+        with self._open_odt(document_file_path, "content.xml") as document_file:
+            return sum(1 for element in self._iterate_text_elements(document_file) if lxml.etree.QName(element).localname == "h")
+
+
+    def _convert_document(self, content_as_xml: lxml.etree._Element, metadata_as_xml: Optional[lxml.etree._Element]) -> DocumentData:
+        # Metadata is optional, documents without it are read with empty metadata
+        document_metadata: dict = {}
+        if metadata_as_xml is not None:
+            namespaces = xpath_helpers.sanitize_namespaces_for_xpath(metadata_as_xml.nsmap)
+            if xpath_helpers.try_find_xml_element(metadata_as_xml, "office:meta", namespaces) is not None:
+                document_metadata = self._converter.convert_metadata(metadata_as_xml)
+
+        document_content = self._converter.convert_content(content_as_xml)
+        document_comments = self._converter.convert_comments(content_as_xml)
+
+        return DocumentData(document_content, document_comments, document_metadata)
+
+
+    def _iterate_text_elements(self, document_file: IO[bytes]) -> Iterator[lxml.etree._Element]:
+
+        # Elements are released once the consumer moves on to the next one,
+        # so that only the element being converted and its ancestors are kept in memory.
+        # Paragraphs inside annotations are part of their parent element and are not yielded by themselves.
+
+        text_tags = [ lxml.etree.QName(odt_namespaces.text_namespace, "h"), lxml.etree.QName(odt_namespaces.text_namespace, "p") ]
+        annotation_tag = lxml.etree.QName(odt_namespaces.office_namespace, "annotation")
+
+        for _, element in lxml.etree.iterparse(document_file, events = ("end",), tag = text_tags, remove_blank_text = True):
+            if next(element.iterancestors(annotation_tag), None) is not None:
+                continue
+
+            yield element
+
+            element.clear(keep_tail = True)
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+
+    @contextlib.contextmanager
+    def _open_odt(self, odt_file_path: str, file_path_in_archive: str) -> Iterator[IO[bytes]]:
+        if odt_file_path.endswith(".fodt"):
+            with open(odt_file_path, mode = "rb") as fodt_file:
+                yield fodt_file
+            return
+
+        if odt_file_path.endswith(".odt"):
+            with zipfile.ZipFile(odt_file_path, mode = "r") as odt_file:
+                with odt_file.open(file_path_in_archive, mode = "r") as file_in_archive:
+                    yield file_in_archive
+            return
+
+        raise ValueError("File extension should be fodt or odt: '%s'" % odt_file_path)
+
 
-        def strip_encoding_declaration(xml_data: str) -> str:
-            if not xml_data.startswith("<?xml "):
-                return xml_data
+    def _parse_odt(self, odt_file_path: str, file_path_in_archive: str) -> lxml.etree._Element:
 
-            xml_data_start_index = xml_data.index("<", 1)
-            return xml_data[xml_data_start_index:]
+        # The data is given to lxml as raw bytes, without decoding it to a string first.
+        # A fodt file is read by libxml2 directly and an archive entry is streamed from its zip file.
 
         if odt_file_path.endswith(".fodt"):
-            with open(odt_file_path, mode = "r", encoding = "utf-8") as fodt_file:
-                return strip_encoding_declaration(fodt_file.read())
+            return lxml.etree.parse(odt_file_path, self._xml_parser).getroot()
 
         if odt_file_path.endswith(".odt"):
             with zipfile.ZipFile(odt_file_path, mode = "r") as odt_file:
-                return strip_encoding_declaration(odt_file.read(file_path_in_archive).decode("utf-8"))
+                with odt_file.open(file_path_in_archive, mode = "r") as file_in_archive:
+                    return lxml.etree.parse(file_in_archive, self._xml_parser).getroot()
 
         raise ValueError("File extension should be fodt or odt: '%s'" % odt_file_path)
@@ -1,11 +1,11 @@
-# cspell:words dateutil localname lxml nsmap
+# cspell:words localname lxml nsmap
 
 import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-import dateutil.parser
 import lxml.etree
 
+from benjaminhamon_document_manipulation_toolkit import datetime_helpers
 from benjaminhamon_document_manipulation_toolkit.documents.elements.document_comment import DocumentComment
 from benjaminhamon_document_manipulation_toolkit.documents.elements.document_element import DocumentElement
 from benjaminhamon_document_manipulation_toolkit.documents.elements.heading_element import HeadingElement
@@ -15,6 +15,8 @@ from benjaminhamon_document_manipulation_toolkit.documents.elements.section_elem
 from benjaminhamon_document_manipulation_toolkit.documents.elements.text_element import TextElement
 from benjaminhamon_document_manipulation_toolkit.documents.elements.text_region_end_element import TextRegionEndElement
 from benjaminhamon_document_manipulation_toolkit.documents.elements.text_region_start_element import TextRegionStartElement
+from benjaminhamon_document_manipulation_toolkit.open_document import odt_namespaces
+from benjaminhamon_document_manipulation_toolkit.xml import xml_namespace
 from benjaminhamon_document_manipulation_toolkit.xml import xpath_helpers
 
 
@@ -24,6 +26,16 @@ class OdtToDocumentConverter:
     def __init__(self) -> None:
         self._region_counter: int = 0
 
+        self._layout_tags = [
+            str(lxml.etree.QName(odt_namespaces.text_namespace, "s")),
+            str(lxml.etree.QName(odt_namespaces.text_namespace, "soft-page-break")),
+        ]
+
+        self._annotation_tag = str(lxml.etree.QName(odt_namespaces.office_namespace, "annotation"))
+
+        # Style names are shared by all the elements using them, rather than creating a string for each element
+        self._all_style_names: Dict[str,str] = {}
+
 
     def convert_metadata(self, odt_as_xml: lxml.etree._Element) -> dict:
         namespaces = xpath_helpers.sanitize_namespaces_for_xpath(odt_as_xml.nsmap)
@@ -32,7 +44,7 @@ class OdtToDocumentConverter:
         metadata = {}
 
         for item_as_xml in metadata_as_xml.iter():
-            key = lxml.etree.QName(item_as_xml).localname
+            key = xml_namespace.get_local_name(item_as_xml)
             value = item_as_xml.text
 
             if key == "meta" or value is None:
@@ -45,10 +57,10 @@ class OdtToDocumentConverter:
                 metadata["author"] = value
 
             if key == "creation-date":
-                metadata["creation_date"] = dateutil.parser.parse(value).astimezone(datetime.timezone.utc).replace(microsecond = 0)
+                metadata["creation_date"] = datetime_helpers.parse_datetime(value).astimezone(datetime.timezone.utc).replace(microsecond = 0)
 
             if key == "date":
-                metadata["update_date"] = dateutil.parser.parse(value).astimezone(datetime.timezone.utc).replace(microsecond = 0)
+                metadata["update_date"] = datetime_helpers.parse_datetime(value).astimezone(datetime.timezone.utc).replace(microsecond = 0)
 
             if key == "editing-cycles":
                 metadata["revision"] = int(value)
@@ -59,34 +71,27 @@ class OdtToDocumentConverter:
         return metadata
 
 
-    def convert_content(self, odt_as_xml: lxml.etree._Element) -> RootElement:
-        self._region_counter = 0
-        self._strip_annotation_data(odt_as_xml)
-        self._strip_layout_elements(odt_as_xml)
-
+    def convert_content(self, odt_as_xml: lxml.etree._Element, section_filter: Optional[Callable[[str], bool]] = None) -> RootElement:
         namespaces = xpath_helpers.sanitize_namespaces_for_xpath(odt_as_xml.nsmap)
         body_as_xml = xpath_helpers.find_xml_element(odt_as_xml, "office:body/office:text", namespaces)
-        text_elements = xpath_helpers.try_find_xml_element_collection(body_as_xml, "//*[self::text:h or self::text:p]", namespaces)
+        text_elements = xpath_helpers.try_find_xml_element_collection(
+            body_as_xml, "//*[(self::text:h or self::text:p) and not(ancestor::office:annotation)]", namespaces)
 
         root_element = RootElement()
         root_element.identifier = "root"
+        root_element.children.extend(self._convert_text_elements(text_elements, namespaces, section_filter))
 
-        current_section = None
-
-        for element in text_elements:
-            tag = lxml.etree.QName(element).localname
+        return root_element
 
-            if tag == "h":
-                current_section = self._convert_section_element(element, namespaces)
-                root_element.children.append(current_section)
 
-            if tag == "p":
-                if current_section is None:
-                    continue
+    def convert_content_incrementally(self,
+            text_element_collection: Iterable[lxml.etree._Element], section_filter: Optional[Callable[[str], bool]] = None) -> Iterator[SectionElement]:
 
-                current_section.children.append(self._convert_paragraph_element(element, namespaces))
+        # Elements are expected as they are parsed, for example from lxml.etree.iterparse, without the paragraphs from annotations.
+        # Each element is converted before requesting the next one, so the caller is free to clear it afterwards.
 
-        return root_element
+        namespaces = { "office": odt_namespaces.office_namespace, "text": odt_namespaces.text_namespace }
+        yield from self._convert_text_elements(text_element_collection, namespaces, section_filter)
 
 
     def convert_comments(self, odt_as_xml: lxml.etree._Element) -> List[DocumentComment]:
@@ -103,23 +108,41 @@ class OdtToDocumentConverter:
         return all_comments
 
 
-    def _strip_annotation_data(self, odt_as_xml: lxml.etree._Element) -> None:
-        namespaces = xpath_helpers.sanitize_namespaces_for_xpath(odt_as_xml.nsmap)
-        all_annotation_elements = xpath_helpers.try_find_xml_element_collection(
-            odt_as_xml, "//*[self::office:annotation or self::office:annotation-end]", namespaces)
+    def _convert_text_elements(self,
+            text_element_collection: Iterable[lxml.etree._Element],
+            namespaces: Dict[str, str],
+            section_filter: Optional[Callable[[str], bool]] = None) -> Iterator[SectionElement]:
 
-        for annotation_element in all_annotation_elements:
-            for annotation_element_child in list(annotation_element):
-                annotation_element.remove(annotation_element_child)
+        # Sections rejected by the filter are dropped once their heading is converted, without converting their paragraphs.
+        # Their annotations are still counted, so that regions without a name get the same identifier as their comment.
 
+        self._region_counter = 0
+        current_section: Optional[SectionElement] = None
+        skip_section = False
 
-    def _strip_layout_elements(self, odt_as_xml: lxml.etree._Element) -> None:
-        element_tags = [
-            lxml.etree.QName(odt_as_xml.nsmap["text"], "s"),
-            lxml.etree.QName(odt_as_xml.nsmap["text"], "soft-page-break"),
-        ]
+        for element in text_element_collection:
+            tag = xml_namespace.get_local_name(element)
+
+            if tag == "h":
+                if current_section is not None:
+                    yield current_section
+                current_section = self._convert_section_element(element, namespaces)
+                skip_section = section_filter is not None and not section_filter(current_section.get_heading().get_title())
+                if skip_section:
+                    current_section = None
+
+            if tag == "p":
+                if skip_section:
+                    self._region_counter += sum(1 for _ in element.iter(self._annotation_tag))
+                    continue
+
+                if current_section is None:
+                    continue
 
-        lxml.etree.strip_elements(odt_as_xml, *element_tags, with_tail = False)
+                current_section.children.append(self._convert_paragraph_element(element, namespaces))
+
+        if current_section is not None:
+            yield current_section
 
 
     def _convert_section_element(self, section_as_xml: lxml.etree._Element, namespaces: Dict[str, str]) -> SectionElement:
@@ -153,7 +176,7 @@ class OdtToDocumentConverter:
         date_element = xpath_helpers.find_xml_element(comment_as_xml, "./dc:date", namespaces)
         if date_element.text is None:
             raise ValueError("Date element is empty")
-        date = dateutil.parser.parse(date_element.text).replace(microsecond = 0)
+        date = datetime_helpers.parse_datetime(date_element.text).replace(microsecond = 0)
 
         text = ""
         all_text_elements = xpath_helpers.try_find_xml_element_collection(comment_as_xml, "./text:p", namespaces)
@@ -175,8 +198,8 @@ class OdtToDocumentConverter:
         all_text_elements: List[DocumentElement] = []
         previous_text_element: Optional[TextElement] = None
 
-        for current_xml_element in text_as_xml.iter(None):
-            tag = lxml.etree.QName(current_xml_element).localname
+        for current_xml_element, current_text, current_tail in self._enumerate_text_nodes(text_as_xml):
+            tag = xml_namespace.get_local_name(current_xml_element)
 
             if tag not in ( "a", "h", "p", "span", "line-break", "annotation", "annotation-end" ):
                 raise ValueError("Unsupported text tag: '%s'" % tag)
@@ -184,14 +207,14 @@ class OdtToDocumentConverter:
             if tag == "line-break" and previous_text_element is not None:
                 previous_text_element.line_break = True
 
-            if current_xml_element.text is not None:
+            if current_text is not None:
                 if tag in ( "h", "p" ):
-                    text_element = TextElement(current_xml_element.text)
+                    text_element = TextElement(current_text)
                     all_text_elements.append(text_element)
                     previous_text_element = text_element
 
                 if tag in ( "a", "span" ):
-                    text_element = TextElement(current_xml_element.text)
+                    text_element = TextElement(current_text)
                     text_element.style_collection = self._get_styles_from_element(current_xml_element, namespaces)
                     all_text_elements.append(text_element)
                     previous_text_element = text_element
@@ -208,28 +231,76 @@ class OdtToDocumentConverter:
                     text_location_element = TextRegionEndElement(region_identifier)
                     all_text_elements.append(text_location_element)
 
-            if current_xml_element.tail is not None and not current_xml_element.tail.isspace():
-                text_element = TextElement(current_xml_element.tail)
+            if current_tail is not None and not current_tail.isspace():
+                text_element = TextElement(current_tail)
                 all_text_elements.append(text_element)
                 previous_text_element = text_element
 
         return all_text_elements
 
 
+    def _enumerate_text_nodes(self, text_as_xml: lxml.etree._Element) -> Iterator[Tuple[lxml.etree._Element, Optional[str], Optional[str]]]:
+
+        # Iterate on the elements with their text and tail, as if layout elements (spaces and soft page breaks)
+        # and the content of annotations had been removed, but without modifying the tree.
+        # The text following a skipped layout element is joined to the text or tail preceding it.
+
+        def join_text(first: Optional[str], second: Optional[str]) -> Optional[str]:
+            if first is None:
+                return second
+            if second is None:
+                return first
+            return first + second
+
+        def enumerate_recursively(element: lxml.etree._Element, tail: Optional[str]) -> Iterator[Tuple[lxml.etree._Element, Optional[str], Optional[str]]]:
+            tag = xml_namespace.get_local_name(element)
+            children = [] if tag in ( "annotation", "annotation-end" ) else list(element)
+
+            text = element.text
+            child_index = 0
+            while child_index < len(children) and children[child_index].tag in self._layout_tags:
+                text = join_text(text, children[child_index].tail)
+                child_index += 1
+
+            yield (element, text, tail)
+
+            while child_index < len(children):
+                child = children[child_index]
+                child_tail = child.tail
+                child_index += 1
+                while child_index < len(children) and children[child_index].tag in self._layout_tags:
+                    child_tail = join_text(child_tail, children[child_index].tail)
+                    child_index += 1
+
+                yield from enumerate_recursively(child, child_tail)
+
+        text_tail = text_as_xml.tail
+        next_element = text_as_xml.getnext()
+        while next_element is not None and next_element.tag in self._layout_tags:
+            text_tail = join_text(text_tail, next_element.tail)
+            next_element = next_element.getnext()
+
+        yield from enumerate_recursively(text_as_xml, text_tail)
+
+
     def _get_styles_from_element(self, element_as_xml: lxml.etree._Element, namespaces: Dict[str, str]) -> List[str]:
         style_collection = []
 
-        style_name_attribute_key = lxml.etree.QName(namespaces["text"], "style-name")
-        odt_style = element_as_xml.attrib.get(str(style_name_attribute_key))
+        style_name_attribute_key = xml_namespace.get_namespace(namespaces["text"]).get_name("style-name")
+        odt_style = element_as_xml.attrib.get(style_name_attribute_key)
         if odt_style is not None:
-            style_collection.append(str(odt_style).replace("_20_", " ")) # Spaces in style names are stored as "_20_"
+            style_name = self._all_style_names.get(odt_style)
+            if style_name is None:
+                style_name = str(odt_style).replace("_20_", " ") # Spaces in style names are stored as "_20_"
+                self._all_style_names[odt_style] = style_name
+            style_collection.append(style_name)
 
         return style_collection
 
 
     def _get_region_identifier_from_element(self, element_as_xml: lxml.etree._Element, namespaces: Dict[str, str]) -> str:
-        region_identifier_attribute_key = lxml.etree.QName(namespaces["office"], "name")
-        region_identifier = element_as_xml.attrib.get(str(region_identifier_attribute_key))
+        region_identifier_attribute_key = xml_namespace.get_namespace(namespaces["office"]).get_name("name")
+        region_identifier = element_as_xml.attrib.get(region_identifier_attribute_key)
         if region_identifier is not None:
             return str(region_identifier)
         return "AnnotationWithoutName_" + str(self._region_counter)
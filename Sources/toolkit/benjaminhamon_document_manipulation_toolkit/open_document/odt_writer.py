@@ -1,17 +1,27 @@
 # cspell:words fodt lxml
 
+import io
 import logging
 import os
-from typing import List, Optional
-import zipfile
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import lxml.etree
 
 from benjaminhamon_document_manipulation_toolkit.documents import document_operations
+from benjaminhamon_document_manipulation_toolkit.documents import section_scheduler
 from benjaminhamon_document_manipulation_toolkit.documents.elements.document_comment import DocumentComment
 from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
+from benjaminhamon_document_manipulation_toolkit.documents.elements.section_element import SectionElement
+from benjaminhamon_document_manipulation_toolkit.documents.elements.text_region_end_element import TextRegionEndElement
+from benjaminhamon_document_manipulation_toolkit.documents.elements.text_region_start_element import TextRegionStartElement
+from benjaminhamon_document_manipulation_toolkit.interfaces.output_sink import OutputSink
 from benjaminhamon_document_manipulation_toolkit.open_document import odt_operations
 from benjaminhamon_document_manipulation_toolkit.open_document.document_to_odt_converter import DocumentToOdtConverter
+from benjaminhamon_document_manipulation_toolkit.open_document.odt_package_writer import OdtPackageWriter
+from benjaminhamon_document_manipulation_toolkit.xml import xml_file_writer
+from benjaminhamon_document_manipulation_toolkit.xml import xpath_helpers
+from benjaminhamon_document_manipulation_toolkit.xml.xml_template import XmlTemplate
+from benjaminhamon_document_manipulation_toolkit.xml.xml_template_cache import XmlTemplateCache
 
 
 logger = logging.getLogger("OdtWriter")
@@ -20,110 +30,180 @@ logger = logging.getLogger("OdtWriter")
 class OdtWriter:
 
 
-    def __init__(self, converter: DocumentToOdtConverter, xml_parser: lxml.etree.XMLParser) -> None:
+    def __init__(self,
+            converter: DocumentToOdtConverter,
+            xml_parser: lxml.etree.XMLParser,
+            template_cache: Optional[XmlTemplateCache] = None,
+            output_sink: Optional[OutputSink] = None) -> None:
+
         self._converter = converter
         self._xml_parser = xml_parser
+        self._template_cache = template_cache if template_cache is not None else XmlTemplateCache()
+        self._output_sink = output_sink
 
         self.pretty_print = True
         self.encoding = "utf-8"
 
 
-    def write_to_file(self, output_file_path: str, document: lxml.etree._ElementTree, flat_odt: bool = False, simulate: bool = False) -> None:
+    def write_to_file(self, # pylint: disable = too-many-arguments
+            output_file_path: str, document: lxml.etree._ElementTree, flat_odt: bool = False, simulate: bool = False,
+            content: Optional[Iterable[lxml.etree._Element]] = None, template_file_path: Optional[str] = None) -> None:
+
+        # When content is provided, its elements are appended to the document body while writing, as they are produced.
+        # When writing a package from an ODT template, the template entries other than the content are copied to it.
+
         logger.debug("Writing '%s'", output_file_path)
 
+        with xml_file_writer.open_output_file(output_file_path, simulate = simulate, output_sink = self._output_sink) as output_file:
+            self.write_to_stream(output_file, document, flat_odt = flat_odt, content = content, template_file_path = template_file_path)
+
+
+    def write_to_stream(self, # pylint: disable = too-many-arguments
+            output_file: IO[bytes], document: lxml.etree._ElementTree, flat_odt: bool = False,
+            content: Optional[Iterable[lxml.etree._Element]] = None, template_file_path: Optional[str] = None) -> None:
+
         write_options = {
             "doctype": "<?xml version=\"1.0\" encoding=\"%s\"?>" % self.encoding,
             "encoding": self.encoding,
             "pretty_print": self.pretty_print,
         }
 
-        document_as_xml_string = lxml.etree.tostring(document, **write_options).decode(self.encoding)
-        if self.pretty_print:
-            document_as_xml_string = self._collapse_body_elements(document_as_xml_string)
+        collapsed_elements = self._prepare_body_elements_for_collapsing(document) if self.pretty_print else []
 
-        if flat_odt:
-            if not simulate:
-                with open(output_file_path + ".tmp", mode = "w", encoding = self.encoding) as output_file:
-                    output_file.write(document_as_xml_string)
-                os.replace(output_file_path + ".tmp", output_file_path)
+        def write_content(content_file: IO[bytes]) -> None:
+            if content is None:
+                xml_file_writer.write_document(content_file, document, **write_options)
+            else:
+                body_as_xml = odt_operations.get_body_text_element(document)
+                xml_file_writer.write_document_with_content(content_file, document, body_as_xml, content, **write_options, indent_content = False)
 
-        else:
-            if not simulate:
-                with zipfile.ZipFile(output_file_path + ".tmp", mode = "w") as output_file:
-                    output_file.writestr("content.xml", document_as_xml_string)
-                os.replace(output_file_path + ".tmp", output_file_path)
+        try:
+            self._write_content_stream(output_file, flat_odt, template_file_path, write_content)
+        finally:
+            for element in collapsed_elements:
+                element.text = None
 
 
     def write_as_single_document(self, # pylint: disable = too-many-arguments
-            output_file_path: str, document_content: RootElement, document_comments: List[DocumentComment],
+            output_file_path: str, document_content: Union[RootElement, Iterable[SectionElement]], document_comments: List[DocumentComment],
             template_file_path: Optional[str] = None, flat_odt: bool = False, simulate: bool = False) -> None:
 
         document_comments_as_dictionary = { comment.region_identifier: comment for comment in document_comments }
 
         xml_document = self._create_document(template_file_path)
-        xml_document = self._converter.convert(xml_document, document_content, document_comments_as_dictionary)
+        xml_content = self._converter.enumerate_content_elements(xml_document, document_content, document_comments_as_dictionary)
 
-        self.write_to_file(output_file_path, xml_document, flat_odt = flat_odt, simulate = simulate)
+        self.write_to_file(output_file_path, xml_document,
+            flat_odt = flat_odt, simulate = simulate, content = xml_content, template_file_path = template_file_path)
 
 
     def write_as_many_documents(self, # pylint: disable = too-many-arguments, too-many-locals
-            output_directory: str, document_content: RootElement, document_comments: List[DocumentComment],
-            template_file_path: Optional[str] = None, flat_odt: bool = False, simulate: bool = False) -> None:
+            output_directory: str, document_content: Union[RootElement, Iterable[SectionElement]], document_comments: List[DocumentComment],
+            template_file_path: Optional[str] = None, flat_odt: bool = False, simulate: bool = False, section_count: Optional[int] = None,
+            job_count: Optional[int] = 1, writer_factory: Optional[Callable[[], "OdtWriter"]] = None) -> None:
+
+        # Sections are rendered by several processes when job_count is not 1, each with its own writer created using the factory,
+        # and the files are then written in order by this process. See section_scheduler.render_sections.
+        # Each section gets only the comments it refers to, so that the others are not sent along with it.
 
         document_comments_as_dictionary = { comment.region_identifier: comment for comment in document_comments }
-        section_count = document_content.get_section_count()
+        section_count = document_operations.get_section_count(document_content, section_count)
+
+        def enumerate_arguments() -> Iterator[tuple]:
+            for section_index, section in enumerate(document_operations.enumerate_sections(document_content)):
+                title = section.get_heading().get_title()
+                file_name = document_operations.generate_section_file_name(title, section_index, section_count)
+                odt_file_path = os.path.join(output_directory, file_name + (".fodt" if flat_odt else ".odt"))
+                section_comments = self._get_section_comments(section, document_comments_as_dictionary)
+                yield (odt_file_path, section, section_comments, template_file_path, flat_odt)
+
+        all_results = section_scheduler.render_sections(
+            self, OdtWriter._render_section, enumerate_arguments(), job_count = job_count, renderer_factory = writer_factory)
 
-        for section_index, section in enumerate(document_content.enumerate_sections()):
-            section_root = RootElement()
-            section_root.children.append(section)
-            title = section.get_heading().get_title()
+        for odt_file_path, document_as_bytes in all_results:
+            logger.debug("Writing '%s'", odt_file_path)
 
-            xml_document = self._create_document(template_file_path)
-            xml_document = self._converter.convert(xml_document, section_root, document_comments_as_dictionary)
+            with xml_file_writer.open_output_file(odt_file_path, simulate = simulate, output_sink = self._output_sink) as output_file:
+                output_file.write(document_as_bytes)
 
-            file_name = document_operations.generate_section_file_name(title, section_index, section_count)
-            odt_file_path = os.path.join(output_directory, file_name + (".fodt" if flat_odt else ".odt"))
 
-            self.write_to_file(odt_file_path, xml_document, flat_odt = flat_odt, simulate = simulate)
+    def _render_section(self, # pylint: disable = too-many-arguments
+            odt_file_path: str, section: SectionElement, section_comments: Dict[str,DocumentComment],
+            template_file_path: Optional[str], flat_odt: bool) -> Tuple[str, bytes]:
+
+        section_root = RootElement()
+        section_root.children.append(section)
+
+        xml_document = self._create_document(template_file_path)
+        xml_content = self._converter.enumerate_content_elements(xml_document, section_root, section_comments)
+
+        output_file = io.BytesIO()
+        self.write_to_stream(output_file, xml_document, flat_odt = flat_odt, content = xml_content, template_file_path = template_file_path)
+        return (odt_file_path, output_file.getvalue())
+
+
+    def _get_section_comments(self, section: SectionElement, document_comments: Dict[str,DocumentComment]) -> Dict[str,DocumentComment]:
+        section_comments: Dict[str,DocumentComment] = {}
+
+        for element in document_operations.enumerate_all_elements(section):
+            if isinstance(element, (TextRegionStartElement, TextRegionEndElement)) and element.identifier in document_comments:
+                section_comments[element.identifier] = document_comments[element.identifier]
+
+        return section_comments
 
 
     def _create_document(self, template_file_path: Optional[str]) -> lxml.etree._ElementTree:
         if template_file_path is None:
             return odt_operations.create_document()
-        return odt_operations.load_document(self._xml_parser, template_file_path)
 
+        template = self._template_cache.get_template("odt", template_file_path, self._load_template)
+        xml_document, _ = template.create_document()
+        return xml_document
+
+
+    def _load_template(self, template_file_path: Optional[str]) -> XmlTemplate:
+        if template_file_path is None:
+            raise ValueError("Template file path must not be None")
+
+        xml_document = odt_operations.load_document(self._xml_parser, template_file_path)
+        return XmlTemplate(xml_document, {})
 
-    def _collapse_body_elements(self, document_as_xml_string: str, indent_for_collapsing: int = 6) -> str:
-        document_as_xml_string_fixed = ""
-        is_body = False
-        is_collapsing = False
 
-        line: str
-        for line in document_as_xml_string.splitlines():
-            line_stripped = line.strip()
-            indent = len(line) - len(line.lstrip())
+    def _write_content_stream(self,
+            output_file: IO[bytes], flat_odt: bool, template_file_path: Optional[str], write_content: Callable[[IO[bytes]], None]) -> None:
+
+        if flat_odt:
+            write_content(output_file)
+            return
+
+        package_writer = OdtPackageWriter(output_file)
+        package_writer.write_mimetype()
+
+        with package_writer.open_entry("content.xml") as content_file:
+            write_content(content_file)
+
+        if template_file_path is not None and template_file_path.endswith(".odt"):
+            package_writer.copy_entries_from_template(template_file_path)
+        else:
+            package_writer.write_manifest({ "content.xml": "text/xml" })
+
+        package_writer.close()
 
-            if line_stripped == "<office:body>":
-                is_body = True
-            if line_stripped == "</office:body>":
-                is_body = False
 
-            if is_body:
-                if indent == indent_for_collapsing:
-                    if (line_stripped.startswith("<text:h") or line_stripped.startswith("<text:p")) and not line_stripped.endswith("/>"):
-                        document_as_xml_string_fixed += line
-                        is_collapsing = True
-                        continue
+    def _prepare_body_elements_for_collapsing(self, document: lxml.etree._ElementTree) -> List[lxml.etree._Element]:
 
-                    if (line_stripped.startswith("</text:h") or line_stripped.startswith("</text:p")):
-                        document_as_xml_string_fixed += line_stripped + "\n"
-                        is_collapsing = False
-                        continue
+        # Headings and paragraphs from the body are written on a single line, since indenting their children would add whitespace to the text.
+        # libxml2 does not indent the content of an element with text, so the elements without any are given an empty text while serializing.
+        # The returned elements should get their text reset to None afterwards.
 
-                if is_collapsing:
-                    document_as_xml_string_fixed += line_stripped
-                    continue
+        root = document.getroot()
+        namespaces = xpath_helpers.sanitize_namespaces_for_xpath(root.nsmap)
+        all_text_elements = xpath_helpers.try_find_xml_element_collection(root, "./office:body/office:text/*[self::text:h or self::text:p]", namespaces)
 
-            document_as_xml_string_fixed += line + "\n"
+        collapsed_elements: List[lxml.etree._Element] = []
+        for element in all_text_elements:
+            if element.text is None and len(element) > 0:
+                element.text = ""
+                collapsed_elements.append(element)
 
-        return document_as_xml_string_fixed
+        return collapsed_elements
@@ -0,0 +1,78 @@
+import hashlib
+import os
+from typing import Dict, List, Optional
+
+from benjaminhamon_document_manipulation_toolkit import sidecar_file_helpers
+
+
+class FileHashIndex:
+    """ Index of the digests of written files, to compare new data with the existing files without reading them """
+
+
+    format_version = "1"
+
+
+    def __init__(self, index_file_path: Optional[str] = None) -> None:
+        self.index_file_path = index_file_path
+        self._all_entries: Dict[str,List] = {}
+
+
+    def load(self) -> None:
+        if self.index_file_path is None:
+            return
+
+        index_data = sidecar_file_helpers.load_sidecar_file(self.index_file_path, self.format_version)
+        if index_data is not None:
+            self._all_entries = dict(index_data.get("entries", {}))
+
+
+    def save(self, simulate: bool = False) -> None:
+        if self.index_file_path is not None:
+            sidecar_file_helpers.save_sidecar_file(self.index_file_path, self.format_version, { "entries": self._all_entries }, simulate = simulate)
+
+
+    def get_digest(self, file_path: str) -> Optional[str]:
+
+        # The recorded digest is used only if the file still has the recorded size and modification time,
+        # otherwise the file is read, so that a file modified by another program is never considered unchanged.
+
+        key = os.path.abspath(file_path)
+
+        try:
+            file_status = os.stat(file_path)
+        except FileNotFoundError:
+            self._all_entries.pop(key, None)
+            return None
+
+        entry = self._all_entries.get(key)
+        if entry is not None and entry[1] == file_status.st_size and entry[2] == file_status.st_mtime_ns:
+            return entry[0]
+
+        digest = compute_file_digest(file_path)
+        self._all_entries[key] = [ digest, file_status.st_size, file_status.st_mtime_ns ]
+        return digest
+
+
+    def record(self, file_path: str, digest: str) -> None:
+        file_status = os.stat(file_path)
+        self._all_entries[os.path.abspath(file_path)] = [ digest, file_status.st_size, file_status.st_mtime_ns ]
+
+
+    def remove(self, file_path: str) -> None:
+        self._all_entries.pop(os.path.abspath(file_path), None)
+
+
+    def get_all_file_paths(self) -> List[str]:
+        return list(self._all_entries)
+
+
+def compute_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def compute_file_digest(file_path: str) -> str:
+    hash_object = hashlib.sha256()
+    with open(file_path, mode = "rb") as source_file:
+        for chunk in iter(lambda: source_file.read(1024 * 1024), b""):
+            hash_object.update(chunk)
+    return hash_object.hexdigest()
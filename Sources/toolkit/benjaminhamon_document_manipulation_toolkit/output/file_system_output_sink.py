@@ -0,0 +1,193 @@
+import concurrent.futures
+import contextlib
+import io
+import logging
+import os
+import shutil
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+from benjaminhamon_document_manipulation_toolkit.interfaces.output_sink import OutputSink
+from benjaminhamon_document_manipulation_toolkit.output import file_hash_index
+from benjaminhamon_document_manipulation_toolkit.output.file_hash_index import FileHashIndex
+
+
+logger = logging.getLogger("FileSystemOutputSink")
+
+
+class FileSystemOutputSink(OutputSink): # pylint: disable = too-many-instance-attributes
+    """ Output sink writing files to temporary files, which replace their destination all at once on commit """
+
+
+    def __init__(self, # pylint: disable = too-many-arguments
+            thread_count: int = 0,
+            skip_unchanged: bool = False,
+            hash_index: Optional[FileHashIndex] = None,
+            destination_directory: Optional[str] = None,
+            simulate: bool = False) -> None:
+
+        self.simulate = simulate
+        self.destination_directory = destination_directory
+        self.skip_unchanged = skip_unchanged
+        self.hash_index = hash_index if hash_index is not None else FileHashIndex()
+
+        self.all_file_paths: List[str] = []
+        self.written_file_count = 0
+        self.skipped_file_count = 0
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers = thread_count) if thread_count > 0 else None
+        self._write_limit = thread_count * 2
+        self._all_pending_files: Dict[str,Tuple[str,Optional[str]]] = {}
+        self._all_pending_writes: List[concurrent.futures.Future] = []
+        self._all_pending_writes_by_path: Dict[str,concurrent.futures.Future] = {}
+
+
+    @contextlib.contextmanager
+    def open_file(self, file_path: str) -> Iterator[IO[bytes]]:
+
+        # With a thread pool, the data is buffered and written by a thread, so that the caller can produce the next file in the meantime.
+        # When skipping unchanged files, the data is buffered to compare its digest with the existing file before writing anything.
+        # Otherwise, it is written directly to the temporary file.
+        # When simulating, the data is still produced but discarded, so that errors are reported the same way.
+
+        temporary_file_path = file_path + ".tmp"
+
+        if self.skip_unchanged or self._executor is not None:
+            with io.BytesIO() as output_file:
+                yield output_file
+                data = output_file.getvalue()
+            self._add_file(file_path, data)
+
+        elif self.simulate:
+            with open(os.devnull, mode = "wb") as output_file:
+                yield output_file
+            self.all_file_paths.append(file_path)
+            self.written_file_count += 1
+
+        else:
+            self._all_pending_files[file_path] = (temporary_file_path, None)
+            with open(temporary_file_path, mode = "wb") as output_file:
+                yield output_file
+            self.all_file_paths.append(file_path)
+            self.written_file_count += 1
+
+
+    def commit(self) -> None:
+        self._wait_for_pending_writes()
+
+        logger.debug("Committing %s files", len(self._all_pending_files))
+
+        all_pending_files = self._all_pending_files
+        self._all_pending_files = {}
+
+        for file_path, (temporary_file_path, digest) in all_pending_files.items():
+            os.replace(temporary_file_path, file_path)
+            if digest is not None:
+                self.hash_index.record(file_path, digest)
+
+        if self.destination_directory is not None:
+            self._remove_stale_files(self.destination_directory)
+
+        if self.skip_unchanged:
+            self.hash_index.save(simulate = self.simulate)
+
+
+    def discard(self) -> None:
+        try:
+            self._wait_for_pending_writes()
+        finally:
+            all_pending_files = self._all_pending_files
+            self._all_pending_files = {}
+
+            for temporary_file_path, _ in all_pending_files.values():
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(temporary_file_path)
+
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+
+
+    def _add_file(self, file_path: str, data: bytes) -> None:
+        self.all_file_paths.append(file_path)
+
+        digest = None
+        if self.skip_unchanged:
+            digest = file_hash_index.compute_digest(data)
+            if file_path not in self._all_pending_files and self.hash_index.get_digest(file_path) == digest:
+                self.skipped_file_count += 1
+                return
+
+        self.written_file_count += 1
+
+        if self.simulate:
+            return
+
+        temporary_file_path = file_path + ".tmp"
+
+        if self._executor is None:
+            _write_file(temporary_file_path, data)
+        else:
+            # A file written again must not be written by two threads at the same time, so wait for its previous write first
+            previous_write = self._all_pending_writes_by_path.get(file_path)
+            if previous_write is not None:
+                concurrent.futures.wait([ previous_write ])
+
+            # The data waiting to be written is kept in memory, so wait for the older writes in turn to keep only a few of them in progress
+            if len(self._all_pending_writes) >= self._write_limit:
+                concurrent.futures.wait([ self._all_pending_writes[-self._write_limit] ])
+
+            future = self._executor.submit(_write_file, temporary_file_path, data)
+            self._all_pending_writes.append(future)
+            self._all_pending_writes_by_path[file_path] = future
+
+        self._all_pending_files[file_path] = (temporary_file_path, digest)
+
+
+    def _wait_for_pending_writes(self) -> None:
+        all_pending_writes = self._all_pending_writes
+        self._all_pending_writes = []
+        self._all_pending_writes_by_path = {}
+
+        # Wait for all the writes before reporting an error, so that no thread is still writing a file which is about to be removed
+        error: Optional[BaseException] = None
+        for future in all_pending_writes:
+            if future.exception() is not None and error is None:
+                error = future.exception()
+
+        if error is not None:
+            raise error
+
+
+    def _remove_stale_files(self, directory: str) -> None:
+
+        # The files which were not written are removed, so that the directory ends up as if it was replaced by the new files.
+        # When skipping unchanged files, the directory is updated in place, so only the files recorded in the hash index are removed,
+        # such as the ones for sections which no longer exist, and any other file is left untouched.
+
+        all_written_file_paths = { os.path.normcase(os.path.abspath(file_path)) for file_path in self.all_file_paths }
+
+        if self.skip_unchanged:
+            directory = os.path.abspath(directory)
+            all_candidate_file_paths = [ file_path for file_path in self.hash_index.get_all_file_paths()
+                if os.path.normcase(os.path.dirname(file_path)) == os.path.normcase(directory) ]
+        elif os.path.isdir(directory):
+            all_candidate_file_paths = [ os.path.join(directory, file_name) for file_name in os.listdir(directory) ]
+        else:
+            all_candidate_file_paths = []
+
+        for file_path in sorted(all_candidate_file_paths):
+            if os.path.normcase(os.path.abspath(file_path)) not in all_written_file_paths:
+                logger.info("Removing '%s'", file_path)
+                self.hash_index.remove(file_path)
+                if not self.simulate:
+                    if os.path.isdir(file_path):
+                        shutil.rmtree(file_path)
+                    else:
+                        with contextlib.suppress(FileNotFoundError):
+                            os.remove(file_path)
+
+
+def _write_file(file_path: str, data: bytes) -> None:
+    with open(file_path, mode = "wb") as output_file:
+        output_file.write(data)
@@ -0,0 +1,35 @@
+import contextlib
+import io
+import os
+from typing import IO, Dict, Iterator
+
+from benjaminhamon_document_manipulation_toolkit.interfaces.output_sink import OutputSink
+
+
+class MemoryOutputSink(OutputSink):
+    """ Output sink keeping files in memory, by normalized path, for tests and for pipelines processing them further """
+
+
+    def __init__(self) -> None:
+        self.all_files: Dict[str,bytes] = {}
+        self._all_pending_files: Dict[str,bytes] = {}
+
+
+    @contextlib.contextmanager
+    def open_file(self, file_path: str) -> Iterator[IO[bytes]]:
+        with io.BytesIO() as output_file:
+            yield output_file
+            self._all_pending_files[os.path.normpath(file_path)] = output_file.getvalue()
+
+
+    def get_file(self, file_path: str) -> bytes:
+        return self.all_files[os.path.normpath(file_path)]
+
+
+    def commit(self) -> None:
+        self.all_files.update(self._all_pending_files)
+        self._all_pending_files = {}
+
+
+    def discard(self) -> None:
+        self._all_pending_files = {}
@@ -0,0 +1,82 @@
+import contextlib
+import logging
+import os
+from typing import IO, Iterator, Optional
+
+from benjaminhamon_document_manipulation_toolkit.interfaces.output_sink import OutputSink
+from benjaminhamon_document_manipulation_toolkit.output.zip_package_writer import ZipPackageWriter
+
+
+logger = logging.getLogger("ZipOutputSink")
+
+
+class ZipOutputSink(OutputSink):
+    """ Output sink writing files as the entries of a zip archive, named after their path relative to a base directory """
+
+
+    def __init__(self, archive_file_path: str, base_directory: str, mimetype: Optional[str] = None, simulate: bool = False) -> None:
+        self.archive_file_path = archive_file_path
+        self.base_directory = base_directory
+        self.mimetype = mimetype
+        self.simulate = simulate
+
+        self._archive_file: Optional[IO[bytes]] = None
+        self._package_writer: Optional[ZipPackageWriter] = None
+
+
+    @contextlib.contextmanager
+    def open_file(self, file_path: str) -> Iterator[IO[bytes]]:
+        entry_name = self._get_entry_name(file_path)
+        package_writer = self._open_archive()
+
+        with package_writer.open_entry(entry_name) as entry_file:
+            yield entry_file
+
+
+    def commit(self) -> None:
+        if self._archive_file is None or self._package_writer is None:
+            return
+
+        logger.debug("Writing '%s'", self.archive_file_path)
+
+        self._package_writer.close()
+        self._archive_file.close()
+        self._package_writer = None
+        self._archive_file = None
+
+        if not self.simulate:
+            os.replace(self.archive_file_path + ".tmp", self.archive_file_path)
+
+
+    def discard(self) -> None:
+        if self._archive_file is None:
+            return
+
+        self._archive_file.close()
+        self._package_writer = None
+        self._archive_file = None
+
+        if not self.simulate:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.archive_file_path + ".tmp")
+
+
+    def _open_archive(self) -> ZipPackageWriter:
+
+        # The archive is created with the first file and completed on commit, entries being streamed to it in the meantime.
+        # A mimetype entry is written first when set, as required by formats such as ODT and EPUB.
+
+        if self._package_writer is None:
+            self._archive_file = open(os.devnull if self.simulate else self.archive_file_path + ".tmp", mode = "wb") # pylint: disable = consider-using-with
+            self._package_writer = ZipPackageWriter(self._archive_file)
+            if self.mimetype is not None:
+                self._package_writer.write_mimetype(self.mimetype)
+
+        return self._package_writer
+
+
+    def _get_entry_name(self, file_path: str) -> str:
+        relative_file_path = os.path.relpath(file_path, self.base_directory)
+        if relative_file_path == os.curdir or relative_file_path.split(os.sep)[0] == os.pardir:
+            raise ValueError("File is outside of the archive base directory: '%s'" % file_path)
+        return relative_file_path.replace(os.sep, "/")
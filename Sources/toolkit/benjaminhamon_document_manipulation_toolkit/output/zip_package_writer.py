@@ -0,0 +1,253 @@
+# cspell:words crc
+
+import contextlib
+import dataclasses
+import os
+import struct
+import time
+import zipfile
+import zlib
+from typing import IO, Callable, Iterable, Iterator, List, Tuple
+
+
+_local_file_header_signature = 0x04034b50
+_data_descriptor_signature = 0x08074b50
+_central_directory_header_signature = 0x02014b50
+_end_of_central_directory_signature = 0x06054b50
+
+_local_file_header_struct = struct.Struct("<IHHHHHIIIHH")
+_data_descriptor_struct = struct.Struct("<IIII")
+_central_directory_header_struct = struct.Struct("<IHHHHHHIIIHHHHHII")
+_end_of_central_directory_struct = struct.Struct("<IHHHHIIH")
+
+_flag_data_descriptor = 0x08
+_flag_utf8 = 0x800
+
+_zip_version = 20
+_zip_limit = 0xFFFFFFFF
+_zip_entry_count_limit = 0xFFFF
+
+
+@dataclasses.dataclass
+class _EntryDescriptor:
+    """ Checksum and sizes for a package entry, in the order they are written in the zip headers """
+
+    crc: int = 0
+    compressed_size: int = 0
+    size: int = 0
+
+
+@dataclasses.dataclass
+class _PackageEntry:
+    name: str
+    flags: int
+    compression: int
+    date_time: Tuple[int,int,int,int,int,int]
+    descriptor: _EntryDescriptor = dataclasses.field(default_factory = _EntryDescriptor)
+    offset: int = 0
+    version_made_by: int = _zip_version
+    version_needed: int = _zip_version
+    external_attributes: int = 0
+
+
+class _DeflatedEntryFile:
+
+
+    def __init__(self, entry: _PackageEntry, write_function: Callable[[bytes], None], compression_level: int) -> None:
+        self._entry = entry
+        self._write_function = write_function
+        self._compressor = zlib.compressobj(compression_level, zlib.DEFLATED, -zlib.MAX_WBITS)
+
+
+    def write(self, data: bytes) -> int:
+        self._entry.descriptor.crc = zlib.crc32(data, self._entry.descriptor.crc)
+        self._entry.descriptor.size += len(data)
+        self._write_compressed(self._compressor.compress(data))
+        return len(data)
+
+
+    def flush(self) -> None:
+        pass
+
+
+    def finish(self) -> None:
+        self._write_compressed(self._compressor.flush())
+
+
+    def _write_compressed(self, data: bytes) -> None:
+        if len(data) > 0:
+            self._entry.descriptor.compressed_size += len(data)
+            self._write_function(data)
+
+
+class ZipPackageWriter:
+    """ Writer for zip packages, streaming new entries and copying entries from another package without recompressing them """
+
+
+    def __init__(self, output_file: IO[bytes], compression_level: int = zlib.Z_DEFAULT_COMPRESSION) -> None:
+        self._output_file = output_file
+        self._compression_level = compression_level
+        self._position = 0
+        self._all_entries: List[_PackageEntry] = []
+        self._has_incomplete_entry = False
+
+
+    def write_mimetype(self, mimetype: str) -> None:
+
+        # The mimetype must be the first entry, stored without compression nor extra field,
+        # so that applications can identify the file type at a fixed offset, as required by formats such as ODT and EPUB.
+
+        if len(self._all_entries) > 0:
+            raise ValueError("The mimetype must be the first entry in the package")
+
+        data = mimetype.encode("ascii")
+        entry = _PackageEntry(name = "mimetype", flags = 0, compression = zipfile.ZIP_STORED, date_time = _get_current_date_time())
+        entry.descriptor = _EntryDescriptor(crc = zlib.crc32(data), compressed_size = len(data), size = len(data))
+
+        self._write_local_file_header(entry)
+        self._write(data)
+        self._all_entries.append(entry)
+
+
+    @contextlib.contextmanager
+    def open_entry(self, name: str) -> Iterator[IO[bytes]]:
+
+        # The entry is compressed while it is written, so its sizes and checksum are written after the data, in a data descriptor.
+        # Its header is written first, so the package cannot be completed anymore if writing the data fails.
+
+        entry = _PackageEntry(name = name, flags = _flag_data_descriptor, compression = zipfile.ZIP_DEFLATED, date_time = _get_current_date_time())
+
+        self._write_local_file_header(entry)
+        entry_file = _DeflatedEntryFile(entry, self._write, self._compression_level)
+
+        try:
+            yield entry_file # type: ignore
+        except Exception:
+            self._has_incomplete_entry = True
+            raise
+
+        entry_file.finish()
+
+        self._check_entry_sizes(entry)
+        self._write(_data_descriptor_struct.pack(_data_descriptor_signature, *dataclasses.astuple(entry.descriptor)))
+        self._all_entries.append(entry)
+
+
+    def write_entry(self, name: str, data: bytes) -> None:
+        with self.open_entry(name) as entry_file:
+            entry_file.write(data)
+
+
+    def copy_entries_from_package(self, source_file_path: str, excluded_entries: Iterable[str]) -> None:
+
+        # The compressed data is copied as is, using the sizes and checksum from the source central directory.
+
+        excluded_entries = set(excluded_entries)
+
+        with open(source_file_path, mode = "rb") as source_file:
+            with zipfile.ZipFile(source_file, mode = "r") as source_package:
+                all_source_entries = source_package.infolist()
+
+            for source_entry in all_source_entries:
+                if source_entry.filename not in excluded_entries:
+                    self.copy_entry(source_file, source_entry)
+
+
+    def copy_entry(self, source_file: IO[bytes], source_entry: zipfile.ZipInfo) -> None:
+        # The source entry must come from the central directory of the package opened as source file
+        source_file.seek(source_entry.header_offset)
+        local_file_header = _local_file_header_struct.unpack(source_file.read(_local_file_header_struct.size))
+        if local_file_header[0] != _local_file_header_signature:
+            raise ValueError("Invalid local file header for entry '%s'" % source_entry.filename)
+        source_file.seek(local_file_header[9] + local_file_header[10], os.SEEK_CUR)
+
+        entry = _PackageEntry(
+            name = source_entry.filename,
+            flags = source_entry.flag_bits & ~(_flag_data_descriptor | _flag_utf8),
+            compression = source_entry.compress_type,
+            date_time = source_entry.date_time,
+            descriptor = _EntryDescriptor(crc = source_entry.CRC, compressed_size = source_entry.compress_size, size = source_entry.file_size),
+            version_made_by = (source_entry.create_system << 8) | source_entry.create_version,
+            version_needed = source_entry.extract_version,
+            external_attributes = source_entry.external_attr,
+        )
+
+        self._check_entry_sizes(entry)
+        self._write_local_file_header(entry)
+
+        remaining_size = entry.descriptor.compressed_size
+        while remaining_size > 0:
+            chunk = source_file.read(min(remaining_size, 1024 * 1024))
+            if len(chunk) == 0:
+                raise ValueError("Unexpected end of data for entry '%s'" % source_entry.filename)
+            self._write(chunk)
+            remaining_size -= len(chunk)
+
+        self._all_entries.append(entry)
+
+
+    def close(self) -> None:
+        if self._has_incomplete_entry:
+            raise ValueError("Package has an incomplete entry")
+        if len(self._all_entries) > _zip_entry_count_limit:
+            raise ValueError("Too many entries in package: '%s'" % len(self._all_entries))
+
+        central_directory_offset = self._position
+
+        for entry in self._all_entries:
+            entry_name = entry.name.encode("utf-8")
+
+            central_directory_header = _central_directory_header_struct.pack(
+                _central_directory_header_signature, entry.version_made_by, entry.version_needed,
+                entry.flags | _get_name_flags(entry.name), entry.compression, *_to_dos_time_and_date(entry.date_time),
+                *dataclasses.astuple(entry.descriptor), len(entry_name), 0, 0, 0, 0, entry.external_attributes, entry.offset)
+
+            self._write(central_directory_header)
+            self._write(entry_name)
+
+        central_directory_size = self._position - central_directory_offset
+        if self._position > _zip_limit:
+            raise ValueError("Package is too large")
+
+        self._write(_end_of_central_directory_struct.pack(
+            _end_of_central_directory_signature, 0, 0, len(self._all_entries), len(self._all_entries), central_directory_size, central_directory_offset, 0))
+
+
+    def _write_local_file_header(self, entry: _PackageEntry) -> None:
+        entry.offset = self._position
+        if entry.offset > _zip_limit:
+            raise ValueError("Package is too large")
+
+        entry_name = entry.name.encode("utf-8")
+
+        local_file_header = _local_file_header_struct.pack(
+            _local_file_header_signature, entry.version_needed, entry.flags | _get_name_flags(entry.name), entry.compression,
+            *_to_dos_time_and_date(entry.date_time), *dataclasses.astuple(entry.descriptor), len(entry_name), 0)
+
+        self._write(local_file_header)
+        self._write(entry_name)
+
+
+    def _check_entry_sizes(self, entry: _PackageEntry) -> None:
+        if entry.descriptor.compressed_size > _zip_limit or entry.descriptor.size > _zip_limit:
+            raise ValueError("Entry is too large: '%s'" % entry.name)
+
+
+    def _write(self, data: bytes) -> None:
+        # The position is tracked here rather than with tell, since the output may be a stream which does not support it
+        self._output_file.write(data)
+        self._position += len(data)
+
+
+def _get_current_date_time() -> Tuple[int,int,int,int,int,int]:
+    return time.localtime()[:6] # type: ignore
+
+
+def _get_name_flags(name: str) -> int:
+    return 0 if name.isascii() else _flag_utf8
+
+
+def _to_dos_time_and_date(date_time: Tuple[int,int,int,int,int,int]) -> Tuple[int,int]:
+    dos_time = date_time[3] << 11 | date_time[4] << 5 | date_time[5] // 2
+    dos_date = (date_time[0] - 1980) << 9 | date_time[1] << 5 | date_time[2]
+    return (dos_time, dos_date)
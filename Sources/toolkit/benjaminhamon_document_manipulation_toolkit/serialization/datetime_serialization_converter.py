@@ -1,10 +1,7 @@
-# cspell:words dateutil
-
 import datetime
 from typing import Any
 
-import dateutil.parser
-
+from benjaminhamon_document_manipulation_toolkit import datetime_helpers
 from benjaminhamon_document_manipulation_toolkit.serialization.serialization_converter import SerializationConverter
 
 
@@ -18,7 +15,7 @@ class DatetimeSerializationConverter(SerializationConverter):
         if not isinstance(obj_as_serializable, str):
             raise ValueError("obj_as_serializable is not of the expected type")
 
-        return dateutil.parser.parse(obj_as_serializable)
+        return datetime_helpers.parse_datetime(obj_as_serializable)
 
 
     def convert_to_serializable(self, obj: Any) -> Any:
@@ -0,0 +1,39 @@
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+
+logger = logging.getLogger("SidecarFileHelpers")
+
+
+def load_sidecar_file(file_path: str, format_version: str) -> Optional[Dict[str,Any]]:
+
+    # A file which is missing, invalid or from another format is ignored, so that its data is computed again
+
+    try:
+        with open(file_path, mode = "r", encoding = "utf-8") as sidecar_file:
+            data = json.load(sidecar_file)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        logger.warning("Discarding invalid file '%s'", file_path)
+        return None
+
+    if not isinstance(data, dict) or data.get("format_version") != format_version:
+        return None
+
+    return data
+
+
+def save_sidecar_file(file_path: str, format_version: str, data: Dict[str,Any], simulate: bool = False) -> None:
+
+    # The data is written to a temporary file which replaces the previous one once complete, so that an interrupted save leaves it intact
+
+    logger.debug("Writing '%s'", file_path)
+
+    if not simulate:
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok = True)
+        with open(file_path + ".tmp", mode = "w", encoding = "utf-8") as sidecar_file:
+            json.dump({ "format_version": format_version, **data }, sidecar_file, sort_keys = True)
+        os.replace(file_path + ".tmp", file_path)
@@ -1,18 +1,23 @@
 # cspell:words lxml svglib
 
 import logging
-import os
 from typing import Optional
 
 import lxml.etree
 from reportlab.graphics import renderPM
 import svglib.svglib
 
+from benjaminhamon_document_manipulation_toolkit.interfaces.output_sink import OutputSink
+from benjaminhamon_document_manipulation_toolkit.xml import xml_file_writer
+
 
 logger = logging.getLogger("SvgOperations")
 
 
-def write_to_file(output_file_path: str, svg_as_xml: lxml.etree._ElementTree, encoding: Optional[str] = None, simulate: bool = False) -> None:
+def write_to_file(
+        output_file_path: str, svg_as_xml: lxml.etree._ElementTree,
+        encoding: Optional[str] = None, simulate: bool = False, output_sink: Optional[OutputSink] = None) -> None:
+
     logger.debug("Writing '%s'", output_file_path)
 
     if encoding is None:
@@ -24,12 +29,8 @@ def write_to_file(output_file_path: str, svg_as_xml: lxml.etree._ElementTree, en
         "doctype": "<?xml version=\"1.0\" encoding=\"%s\"?>" % encoding,
     }
 
-    svg_as_xml_string = lxml.etree.tostring(svg_as_xml, **write_options).decode(encoding)
-
-    if not simulate:
-        with open(output_file_path + ".tmp", mode = "w", encoding = encoding) as output_file:
-            output_file.write(svg_as_xml_string)
-        os.replace(output_file_path + ".tmp", output_file_path)
+    with xml_file_writer.open_output_file(output_file_path, simulate = simulate, output_sink = output_sink) as output_file:
+        xml_file_writer.write_document(output_file, svg_as_xml, **write_options)
 
 
 def convert_to_image(output_file_path: str, svg_as_xml: lxml.etree._ElementTree, source_file_path: str, image_format: str, simulate: bool = False) -> None:
@@ -1,8 +1,13 @@
+import functools
 from typing import Mapping
 
+from benjaminhamon_document_manipulation_toolkit.text_template import TextTemplate
+
 
 def format_text(source_text: str, parameters: Mapping[str,str]) -> str:
-    try:
-        return source_text.format(**parameters)
-    except KeyError as exception:
-        raise KeyError("Parameter '%s' is required" % exception.args[0]) from exception
+    return compile_text(source_text).format(parameters)
+
+
+@functools.lru_cache(maxsize = 1024)
+def compile_text(source_text: str) -> TextTemplate:
+    return TextTemplate(source_text)
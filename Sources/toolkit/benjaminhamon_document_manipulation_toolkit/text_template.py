@@ -0,0 +1,42 @@
+import string
+from typing import List, Mapping, Optional, Tuple
+
+
+_formatter = string.Formatter()
+
+
+class TextTemplate:
+    """ Text with format fields, parsed once so that it can be formatted with many parameter sets """
+
+
+    def __init__(self, source_text: str) -> None:
+        self.source_text = source_text
+
+        self._all_parts: List[Tuple[str, Optional[str], Optional[str], Optional[str]]] = list(_formatter.parse(source_text))
+        self.has_fields = any(field_name is not None for _, field_name, _, _ in self._all_parts)
+
+        # Without fields, the result is the text with its escaped braces replaced, whatever the parameters
+        self._literal_text = "".join(literal_text for literal_text, _, _, _ in self._all_parts) if not self.has_fields else None
+
+
+    def format(self, parameters: Mapping[str,str]) -> str:
+        if self._literal_text is not None:
+            return self._literal_text
+
+        result: List[str] = []
+
+        try:
+            for literal_text, field_name, format_specification, conversion in self._all_parts:
+                result.append(literal_text)
+
+                if field_name is not None:
+                    value, _ = _formatter.get_field(field_name, (), parameters)
+                    value = _formatter.convert_field(value, conversion)
+                    if format_specification is not None and "{" in format_specification:
+                        format_specification = format_specification.format(**parameters)
+                    result.append(format(value, format_specification or ""))
+
+        except KeyError as exception:
+            raise KeyError("Parameter '%s' is required" % exception.args[0]) from exception
+
+        return "".join(result)
@@ -0,0 +1,116 @@
+# cspell:words devnull lxml nsmap xmlfile
+
+import codecs
+import contextlib
+import itertools
+import os
+import uuid
+from typing import IO, Iterable, Iterator, Optional, Tuple
+
+import lxml.etree
+
+from benjaminhamon_document_manipulation_toolkit.interfaces.output_sink import OutputSink
+
+
+@contextlib.contextmanager
+def open_output_file(output_file_path: str, simulate: bool = False, output_sink: Optional[OutputSink] = None) -> Iterator[IO[bytes]]:
+
+    # The data is written to a temporary file which replaces the destination once complete.
+    # When an output sink is set, the file is written to it instead, and becomes visible once the sink is committed.
+    # The sink then handles the simulation itself, so that it still keeps track of the files.
+    # When simulating, the data is still produced but discarded, so that errors are reported the same way.
+
+    if output_sink is not None:
+        with output_sink.open_file(output_file_path) as output_file:
+            yield output_file
+        return
+
+    if simulate:
+        with open(os.devnull, mode = "wb") as output_file:
+            yield output_file
+        return
+
+    with open(output_file_path + ".tmp", mode = "wb") as output_file:
+        yield output_file
+    os.replace(output_file_path + ".tmp", output_file_path)
+
+
+def write_document(
+        output_file: IO[bytes], document: lxml.etree._ElementTree,
+        encoding: str = "utf-8", pretty_print: bool = True, doctype: Optional[str] = None) -> None:
+
+    document.write(output_file, encoding = encoding, pretty_print = pretty_print, doctype = doctype)
+
+
+def write_document_with_content( # pylint: disable = too-many-arguments, too-many-locals
+        output_file: IO[bytes],
+        document: lxml.etree._ElementTree,
+        container: lxml.etree._Element,
+        content: Iterable[lxml.etree._Element],
+        encoding: str = "utf-8",
+        pretty_print: bool = True,
+        doctype: Optional[str] = None,
+        indent_content: bool = True) -> None:
+
+    # Write the document with the content elements appended to the container, serializing them one at a time as they are produced,
+    # so that the complete output tree is never built. The output is the same as writing the complete tree.
+    # The document is serialized with a placeholder in the container, and each content element is serialized
+    # in an empty copy of the container ancestors, so that it gets the same namespace prefixes and indentation.
+    # lxml.etree.xmlfile is not used since it declares all the namespaces in scope again on every element it writes.
+    # The parts are split as text rather than as bytes, and encoded again as a single stream, so that the XML declaration
+    # and the byte order mark required by some encodings are written only once, at the start of the document.
+    # Content elements are written without indentation when indent_content is false, for formats where whitespace inside them matters.
+
+    content_iterator = iter(content)
+    first_element = next(content_iterator, None)
+    if first_element is None:
+        write_document(output_file, document, encoding = encoding, pretty_print = pretty_print, doctype = doctype)
+        return
+
+    def serialize(element: lxml.etree._Element, pretty_print: bool) -> str:
+        return lxml.etree.tostring(element, encoding = encoding, pretty_print = pretty_print, xml_declaration = False).decode(encoding)
+
+    placeholder = lxml.etree.Comment(" %s " % uuid.uuid4().hex)
+    placeholder_as_string = serialize(placeholder, False)
+
+    container.append(placeholder)
+    try:
+        document_as_string = lxml.etree.tostring(document, encoding = encoding, pretty_print = pretty_print, doctype = doctype).decode(encoding)
+    finally:
+        container.remove(placeholder)
+
+    document_start, document_end = _split_at_placeholder(document_as_string, placeholder_as_string)
+    separator = document_start[document_start.rfind("\n"):] if pretty_print else ""
+
+    container_path = list(reversed(list(container.iterancestors()))) + [ container ]
+    container_copy_root = lxml.etree.Element(container_path[0].tag, nsmap = container.nsmap)
+    container_copy = container_copy_root
+    for element in container_path[1:]:
+        container_copy = lxml.etree.SubElement(container_copy, element.tag)
+
+    def serialize_in_container(element: lxml.etree._Element) -> str:
+        container_copy.append(element)
+        try:
+            return serialize(container_copy_root, pretty_print and indent_content)
+        finally:
+            container_copy.remove(element)
+
+    element_start, element_end = _split_at_placeholder(serialize_in_container(placeholder), placeholder_as_string)
+    encoder = codecs.getincrementalencoder(encoding)()
+
+    output_file.write(encoder.encode(document_start))
+
+    for element_index, element in enumerate(itertools.chain([ first_element ], content_iterator)):
+        if element_index > 0:
+            output_file.write(encoder.encode(separator))
+        element_as_string = serialize_in_container(element)
+        output_file.write(encoder.encode(element_as_string[len(element_start):len(element_as_string) - len(element_end)]))
+
+    output_file.write(encoder.encode(document_end, final = True))
+
+
+def _split_at_placeholder(text: str, placeholder: str) -> Tuple[str,str]:
+    placeholder_index = text.find(placeholder)
+    if placeholder_index == -1:
+        raise ValueError("Placeholder not found in serialized document")
+    return (text[:placeholder_index], text[placeholder_index + len(placeholder):])
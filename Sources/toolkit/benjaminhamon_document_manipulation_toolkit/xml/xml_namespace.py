@@ -0,0 +1,40 @@
+# cspell:words localname lxml
+
+import functools
+from typing import Dict
+
+import lxml.etree
+
+
+class XmlNamespace:
+    """ Factory for the tags and attribute keys of a namespace, creating each qualified name only once """
+
+
+    def __init__(self, uri: str) -> None:
+        self.uri = uri
+        self._all_names: Dict[str,str] = {}
+
+
+    def get_name(self, local_name: str) -> str:
+        name = self._all_names.get(local_name)
+        if name is None:
+            name = str(lxml.etree.QName(self.uri, local_name))
+            self._all_names[local_name] = name
+        return name
+
+
+@functools.lru_cache(maxsize = None)
+def get_namespace(uri: str) -> XmlNamespace:
+    return XmlNamespace(uri)
+
+
+def get_local_name(element: lxml.etree._Element) -> str:
+    tag = element.tag
+    if isinstance(tag, str):
+        return _get_local_name_from_tag(tag)
+    return lxml.etree.QName(element).localname
+
+
+@functools.lru_cache(maxsize = 1024)
+def _get_local_name_from_tag(tag: str) -> str:
+    return lxml.etree.QName(tag).localname
@@ -1,14 +1,45 @@
-# cspell:words localname lxml
+# cspell:words lxml
 
-from typing import Mapping
+from typing import List, Mapping
 
 import lxml.etree
 
 from benjaminhamon_document_manipulation_toolkit import text_operations
+from benjaminhamon_document_manipulation_toolkit.xml import xml_namespace
 
 
 def format_text_in_xml(xml_root: lxml.etree._Element, format_parameters: Mapping[str,str]) -> None:
-    for xml_element in xml_root.iter():
-        tag = lxml.etree.QName(xml_element).localname
-        if tag != "style" and xml_element.text is not None:
+
+    # Text and tails without braces are left as they are, without parsing them.
+    # The text in style elements is not formatted since it is CSS, but their tail is.
+
+    for xml_element in xml_root.iter(lxml.etree.Element):
+        if xml_element.text is not None and is_text_to_format(xml_element.text) and xml_namespace.get_local_name(xml_element) != "style":
             xml_element.text = text_operations.format_text(xml_element.text, format_parameters)
+        if xml_element.tail is not None and is_text_to_format(xml_element.tail) and xml_element is not xml_root:
+            xml_element.tail = text_operations.format_text(xml_element.tail, format_parameters)
+
+
+def is_text_to_format(text: str) -> bool:
+    return "{" in text or "}" in text
+
+
+def get_element_position(root: lxml.etree._Element, element: lxml.etree._Element) -> List[int]:
+    position: List[int] = []
+
+    while element is not root:
+        parent = element.getparent()
+        if parent is None:
+            raise ValueError("Element is not a descendant of the root")
+        position.append(parent.index(element))
+        element = parent
+
+    position.reverse()
+    return position
+
+
+def find_element_at_position(root: lxml.etree._Element, position: List[int]) -> lxml.etree._Element:
+    element = root
+    for index in position:
+        element = element[index]
+    return element
@@ -0,0 +1,31 @@
+# cspell:words lxml
+
+import copy
+from typing import Dict, List, Tuple
+
+import lxml.etree
+
+from benjaminhamon_document_manipulation_toolkit.xml import xml_operations
+
+
+class XmlTemplate:
+    """ Parsed template document, with the positions of the elements to update in the documents created from it """
+
+
+    def __init__(self, document: lxml.etree._ElementTree, anchors: Dict[str,List[lxml.etree._Element]]) -> None:
+        self.document = document
+
+        # Positions are stored as child indexes from the root, which are cheaper to follow in a copy than running the XPath again
+        root = document.getroot()
+        self._anchor_positions = {
+            name: [ xml_operations.get_element_position(root, element) for element in elements ] for name, elements in anchors.items() }
+
+
+    def create_document(self) -> Tuple[lxml.etree._ElementTree, Dict[str,List[lxml.etree._Element]]]:
+        document = copy.deepcopy(self.document)
+        root = document.getroot()
+
+        anchors = {
+            name: [ xml_operations.find_element_at_position(root, position) for position in positions ] for name, positions in self._anchor_positions.items() }
+
+        return (document, anchors)
@@ -0,0 +1,31 @@
+import logging
+import os
+from typing import Callable, Dict, Optional, Tuple
+
+from benjaminhamon_document_manipulation_toolkit.xml.xml_template import XmlTemplate
+
+
+logger = logging.getLogger("XmlTemplateCache")
+
+
+class XmlTemplateCache:
+    """ In-memory cache for parsed templates, so that each template is loaded once when creating many documents from it """
+
+
+    def __init__(self) -> None:
+        self._all_templates: Dict[Tuple[str,Optional[str]],XmlTemplate] = {}
+
+
+    def get_template(self,
+            template_type: str, template_file_path: Optional[str], load_function: Callable[[Optional[str]], XmlTemplate]) -> XmlTemplate:
+
+        # The template type identifies the load function, since writers for different formats can share the cache
+        key = (template_type, os.path.abspath(template_file_path) if template_file_path is not None else None)
+
+        template = self._all_templates.get(key)
+        if template is None:
+            logger.debug("Loading template '%s' (Type: '%s')", template_file_path, template_type)
+            template = load_function(template_file_path)
+            self._all_templates[key] = template
+
+        return template
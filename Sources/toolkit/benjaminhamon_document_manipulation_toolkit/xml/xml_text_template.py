@@ -0,0 +1,44 @@
+# cspell:words lxml
+
+import copy
+from typing import List, Mapping, Tuple
+
+import lxml.etree
+
+from benjaminhamon_document_manipulation_toolkit.text_template import TextTemplate
+from benjaminhamon_document_manipulation_toolkit.xml import xml_namespace
+from benjaminhamon_document_manipulation_toolkit.xml import xml_operations
+
+
+class XmlTextTemplate:
+    """ XML element with format fields in its text and tails, recording which text nodes to format so that each copy only visits those """
+
+
+    def __init__(self, xml_root: lxml.etree._Element) -> None:
+        self.xml_root = xml_root
+
+        # Each slot is the element position from the root, whether the field is in its tail rather than its text, and the parsed text
+        self._all_slots: List[Tuple[List[int], bool, TextTemplate]] = []
+
+        for xml_element in xml_root.iter(lxml.etree.Element):
+            if xml_element.text is not None and xml_operations.is_text_to_format(xml_element.text) and xml_namespace.get_local_name(xml_element) != "style":
+                self._all_slots.append((xml_operations.get_element_position(xml_root, xml_element), False, TextTemplate(xml_element.text)))
+            if xml_element.tail is not None and xml_operations.is_text_to_format(xml_element.tail) and xml_element is not xml_root:
+                self._all_slots.append((xml_operations.get_element_position(xml_root, xml_element), True, TextTemplate(xml_element.tail)))
+
+
+    def has_fields(self) -> bool:
+        return len(self._all_slots) > 0
+
+
+    def format(self, parameters: Mapping[str,str]) -> lxml.etree._Element:
+        xml_copy = copy.deepcopy(self.xml_root)
+
+        for position, is_tail, text_template in self._all_slots:
+            xml_element = xml_operations.find_element_at_position(xml_copy, position)
+            if is_tail:
+                xml_element.tail = text_template.format(parameters)
+            else:
+                xml_element.text = text_template.format(parameters)
+
+        return xml_copy
@@ -1,14 +1,25 @@
 # cspell:words lxml
 
-from typing import Dict, List, Mapping, Optional
+import functools
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple
 
 import lxml.etree
 
 
+def get_compiled_xpath(xpath: str, namespaces: Optional[Mapping[str,str]] = None) -> lxml.etree.XPath:
+    namespaces_as_set = frozenset(namespaces.items()) if namespaces is not None else frozenset()
+    return _compile_xpath(xpath, namespaces_as_set)
+
+
+@functools.lru_cache(maxsize = 1024)
+def _compile_xpath(xpath: str, namespaces: FrozenSet[Tuple[str,str]]) -> lxml.etree.XPath:
+    return lxml.etree.XPath(xpath, namespaces = dict(namespaces))
+
+
 def try_find_xml_element_collection(
         element: lxml.etree._Element, xpath: str, namespaces: Optional[Mapping[str,str]] = None) -> List[lxml.etree._Element]:
 
-    xpath_result = element.xpath(xpath, namespaces = namespaces)
+    xpath_result = get_compiled_xpath(xpath, namespaces)(element)
     if xpath_result is None or not isinstance(xpath_result, list):
         return []
 
@@ -18,7 +29,7 @@ def try_find_xml_element_collection(
 def try_find_xml_element(
         element: lxml.etree._Element, xpath: str, namespaces: Optional[Mapping[str,str]] = None) -> Optional[lxml.etree._Element]:
 
-    xpath_result = element.xpath(xpath , namespaces = namespaces)
+    xpath_result = get_compiled_xpath(xpath, namespaces)(element)
     if xpath_result is None or not isinstance(xpath_result, list) or len(xpath_result) == 0:
         return None
 
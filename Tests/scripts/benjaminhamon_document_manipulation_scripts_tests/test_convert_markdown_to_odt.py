@@ -4,6 +4,7 @@ import os
 
 from benjaminhamon_document_manipulation_scripts.convert_markdown_to_odt import convert_markdown_to_odt
 from benjaminhamon_document_manipulation_scripts.convert_markdown_to_odt import create_serializer
+from benjaminhamon_document_manipulation_toolkit.markdown.markdown_reader import MarkdownReader
 
 
 def test_convert_markdown_to_odt(tmpdir):
@@ -26,6 +27,41 @@ def test_convert_markdown_to_odt(tmpdir):
     _assert_output(workspace_directory)
 
 
+def test_convert_markdown_to_odt_with_cache(tmpdir, monkeypatch):
+    workspace_directory = os.path.join(tmpdir, "Workspace")
+    output_file_path = os.path.join(workspace_directory, "FullText.fodt")
+    cache_directory = os.path.join(tmpdir, "Cache")
+
+    _setup_workspace(workspace_directory)
+
+    def run() -> None:
+        convert_markdown_to_odt(
+            serializer = create_serializer("yaml"),
+            configuration_file_path = os.path.join(workspace_directory, "MarkdownToOdtConfiguration.yaml"),
+            definition_file_path = None,
+            source_file_path = os.path.join(workspace_directory, "FullText.md"),
+            destination_file_path = output_file_path,
+            cache_directory = cache_directory,
+            overwrite = True,
+            simulate = False,
+        )
+
+    run()
+
+    assert len(os.listdir(cache_directory)) > 0
+    os.remove(output_file_path)
+
+    # The source is not read again, the document being loaded from the cache
+    def read_content_from_file(self, document_file_path): # pylint: disable = unused-argument
+        raise RuntimeError("Unexpected read")
+
+    monkeypatch.setattr(MarkdownReader, "read_content_from_file", read_content_from_file)
+
+    run()
+
+    _assert_output(workspace_directory)
+
+
 def test_convert_markdown_to_odt_with_simulate(tmpdir):
     workspace_directory = os.path.join(tmpdir, "Workspace")
     configuration_file_path = os.path.join(workspace_directory, "MarkdownToOdtConfiguration.yaml")
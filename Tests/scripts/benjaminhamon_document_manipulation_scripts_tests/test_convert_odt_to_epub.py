@@ -7,7 +7,10 @@ import zipfile
 
 import pytest
 
+from benjaminhamon_document_manipulation_scripts.convert_odt_to_epub import compute_section_hash
 from benjaminhamon_document_manipulation_scripts.convert_odt_to_epub import convert_odt_to_epub
+from benjaminhamon_document_manipulation_toolkit.documents import document_element_factory
+from benjaminhamon_document_manipulation_toolkit.documents import document_operations
 
 
 def test_convert_odt_to_epub(tmpdir):
@@ -32,6 +35,121 @@ def test_convert_odt_to_epub(tmpdir):
 
     _assert_output(workspace_directory)
 
+    assert os.listdir(intermediate_directory) == [ "BuildManifest.json" ]
+
+
+def test_convert_odt_to_epub_incremental(tmpdir, caplog):
+    workspace_directory = os.path.join(tmpdir, "Workspace")
+    configuration_file_path = os.path.join(workspace_directory, "OdtToEpubConfiguration.yaml")
+    definition_file_path = os.path.join(workspace_directory, "DocumentDefinition.yaml")
+    intermediate_directory = os.path.join(workspace_directory, "Intermediate")
+    package_file_path = os.path.join(workspace_directory, "Document.epub")
+
+    _setup_workspace(workspace_directory)
+
+    def convert() -> None:
+        convert_odt_to_epub(
+            configuration_file_path = configuration_file_path,
+            definition_file_path = definition_file_path,
+            source_file_path = None,
+            destination_file_path = package_file_path,
+            intermediate_directory = intermediate_directory,
+            now = datetime.datetime(2020, 1, 1, tzinfo = datetime.timezone.utc),
+            extra_information = {},
+            simulate = False,
+            incremental = True,
+        )
+
+    def read_package_entries() -> dict:
+        with zipfile.ZipFile(package_file_path, mode = "r") as package_file:
+            return { entry.filename: package_file.read(entry) for entry in package_file.infolist() }
+
+    convert()
+    _assert_output(workspace_directory)
+
+    package_file_status = os.stat(package_file_path)
+    convert()
+
+    assert os.stat(package_file_path).st_mtime_ns == package_file_status.st_mtime_ns
+
+    package_entries_before = read_package_entries()
+
+    _replace_in_file(os.path.join(workspace_directory, "FullText.fodt"), "Chapter 2 paragraph 2", "Chapter 2 paragraph 2 updated")
+
+    caplog.clear()
+    convert()
+
+    # The package document is written again along with the updated section, for its modification date
+    assert "Updating package (Updated: 2, Unchanged: 6)" in caplog.messages
+
+    package_entries_after = read_package_entries()
+
+    assert list(package_entries_after) == list(package_entries_before)
+    for entry_name, data in package_entries_after.items():
+        if entry_name == "EPUB/Content/3_-_Chapter_2.xhtml":
+            assert data == package_entries_before[entry_name].replace(b"Chapter 2 paragraph 2", b"Chapter 2 paragraph 2 updated")
+        else:
+            assert data == package_entries_before[entry_name]
+
+
+def test_convert_odt_to_epub_incremental_without_now(tmpdir, caplog):
+    workspace_directory = os.path.join(tmpdir, "Workspace")
+    configuration_file_path = os.path.join(workspace_directory, "OdtToEpubConfiguration.yaml")
+    definition_file_path = os.path.join(workspace_directory, "DocumentDefinition.yaml")
+    intermediate_directory = os.path.join(workspace_directory, "Intermediate")
+    package_file_path = os.path.join(workspace_directory, "Document.epub")
+
+    _setup_workspace(workspace_directory)
+
+    def convert() -> None:
+        convert_odt_to_epub(
+            configuration_file_path = configuration_file_path,
+            definition_file_path = definition_file_path,
+            source_file_path = None,
+            destination_file_path = package_file_path,
+            intermediate_directory = intermediate_directory,
+            extra_information = {},
+            simulate = False,
+            incremental = True,
+        )
+
+    convert()
+
+    package_file_status = os.stat(package_file_path)
+    caplog.clear()
+    convert()
+
+    assert "Package is up to date: '%s'" % package_file_path in caplog.messages
+    assert os.stat(package_file_path).st_mtime_ns == package_file_status.st_mtime_ns
+
+
+def test_convert_odt_to_epub_with_intermediate_files(tmpdir):
+    workspace_directory = os.path.join(tmpdir, "Workspace")
+    configuration_file_path = os.path.join(workspace_directory, "OdtToEpubConfiguration.yaml")
+    definition_file_path = os.path.join(workspace_directory, "DocumentDefinition.yaml")
+    intermediate_directory = os.path.join(workspace_directory, "Intermediate")
+    package_file_path = os.path.join(workspace_directory, "Document.epub")
+
+    _setup_workspace(workspace_directory)
+
+    convert_odt_to_epub(
+        configuration_file_path = configuration_file_path,
+        definition_file_path = definition_file_path,
+        source_file_path = None,
+        destination_file_path = package_file_path,
+        intermediate_directory = intermediate_directory,
+        now = datetime.datetime(2020, 1, 1, tzinfo = datetime.timezone.utc),
+        extra_information = {},
+        simulate = False,
+        write_intermediate_files = True,
+    )
+
+    _assert_output(workspace_directory)
+
+    assert os.path.exists(os.path.join(intermediate_directory, "EpubGenerationConfiguration.yaml"))
+    assert os.path.exists(os.path.join(intermediate_directory, "SectionsAsXhtml", "1 - Chapter 1.xhtml"))
+    assert os.path.exists(os.path.join(intermediate_directory, "Staging", "EPUB", "content.opf"))
+
 
 def test_convert_odt_to_epub_with_simulate(tmpdir):
     workspace_directory = os.path.join(tmpdir, "Workspace")
@@ -58,6 +176,36 @@ def test_convert_odt_to_epub_with_simulate(tmpdir):
     assert not os.path.exists(package_file_path)
 
 
+def test_compute_section_hash():
+    text = [ [ "First paragraph." ], [ "Second paragraph." ] ]
+
+    section = document_element_factory.create_section(heading = "Section", text = text)
+    for element in document_operations.enumerate_all_elements(section):
+        element.style_collection = [ "".join([ "a_", "style" ]) ]
+
+    section_with_shared_styles = document_element_factory.create_section(heading = "Section", text = text)
+    shared_style_collection = [ "a_style" ]
+    for element in document_operations.enumerate_all_elements(section_with_shared_styles):
+        element.style_collection = shared_style_collection
+
+    section_with_other_structure = document_element_factory.create_section(heading = "Section", text = [ [ "First paragraph.", "Second paragraph." ] ])
+    for element in document_operations.enumerate_all_elements(section_with_other_structure):
+        element.style_collection = [ "a_style" ]
+
+    assert compute_section_hash(section) == compute_section_hash(section_with_shared_styles)
+    assert compute_section_hash(section) != compute_section_hash(section_with_other_structure)
+
+    section.get_heading().children[0].line_break = True
+    assert compute_section_hash(section) != compute_section_hash(section_with_shared_styles)
+
+
+def _replace_in_file(file_path: str, old: str, new: str) -> None:
+    with open(file_path, mode = "r", encoding = "utf-8") as text_file:
+        text = text_file.read()
+    with open(file_path, mode = "w", encoding = "utf-8") as text_file:
+        text_file.write(text.replace(old, new))
+
+
 def _setup_workspace(workspace_directory: str) -> None:
 
     def create_configuration() -> None:
@@ -2,6 +2,8 @@
 
 import os
 
+import pytest
+
 from benjaminhamon_document_manipulation_scripts.convert_odt_to_markdown import convert_odt_to_markdown
 
 
@@ -207,6 +209,87 @@ def test_convert_odt_to_markdown_as_many_documents_with_simulate(tmpdir):
     assert not os.path.exists(output_directory)
 
 
+def test_convert_odt_to_markdown_as_many_documents_with_skip_unchanged(tmpdir, caplog):
+    workspace_directory = os.path.join(tmpdir, "Workspace")
+    configuration_file_path = os.path.join(workspace_directory, "OdtToMarkdownConfiguration.yaml")
+    source_file_path = os.path.join(workspace_directory, "FullText.fodt")
+    output_directory = os.path.join(workspace_directory, "SectionsAsMarkdown")
+    cache_directory = os.path.join(tmpdir, "Cache")
+
+    _setup_workspace(workspace_directory)
+
+    def run(simulate: bool = False) -> None:
+        convert_odt_to_markdown(
+            configuration_file_path = configuration_file_path,
+            definition_file_path = None,
+            source_file_path = source_file_path,
+            destination_file_path_or_directory = output_directory,
+            write_as_single_file = False,
+            cache_directory = cache_directory,
+            skip_unchanged = True,
+            overwrite = True,
+            simulate = simulate,
+        )
+
+    run()
+
+    all_file_modification_times = { file_name: os.stat(os.path.join(output_directory, file_name)).st_mtime_ns for file_name in os.listdir(output_directory) }
+    assert len(all_file_modification_times) == 5
+
+    with open(os.path.join(output_directory, "Notes.txt"), mode = "w", encoding = "utf-8") as other_file:
+        other_file.write("Notes")
+
+    with open(source_file_path, mode = "r", encoding = "utf-8") as fodt_file:
+        fodt_data = fodt_file.read()
+    with open(source_file_path, mode = "w", encoding = "utf-8") as fodt_file:
+        fodt_data = fodt_data.replace("Chapter 2 paragraph 2", "Chapter 2 paragraph 2 updated")
+        fodt_data = fodt_data.replace(">Chapter 3</text:h>", ">Chapter 3 renamed</text:h>")
+        fodt_file.write(fodt_data)
+
+    caplog.clear()
+    caplog.set_level("INFO")
+
+    run(simulate = True)
+
+    assert "Output files (Written: 2, Unchanged: 3)" in caplog.messages
+    assert "Removing '%s'" % os.path.join(output_directory, "4 - Chapter 3.md") in caplog.messages
+    assert sorted(os.listdir(output_directory)) == sorted(list(all_file_modification_times) + [ "Notes.txt" ])
+
+    caplog.clear()
+
+    run()
+
+    assert "Output files (Written: 2, Unchanged: 3)" in caplog.messages
+    assert sorted(os.listdir(output_directory)) == sorted([ file_name for file_name in all_file_modification_times if file_name != "4 - Chapter 3.md" ]
+        + [ "4 - Chapter 3 renamed.md", "Notes.txt" ])
+
+    for file_name, modification_time in all_file_modification_times.items():
+        if file_name not in [ "3 - Chapter 2.md", "4 - Chapter 3.md" ]:
+            assert os.stat(os.path.join(output_directory, file_name)).st_mtime_ns == modification_time
+
+    with open(os.path.join(output_directory, "3 - Chapter 2.md"), mode = "r", encoding = "utf-8") as markdown_file:
+        assert "Chapter 2 paragraph 2 updated" in markdown_file.read()
+
+
+def test_convert_odt_to_markdown_as_many_documents_with_skip_unchanged_without_overwrite(tmpdir):
+    workspace_directory = os.path.join(tmpdir, "Workspace")
+    output_directory = os.path.join(workspace_directory, "SectionsAsMarkdown")
+
+    _setup_workspace(workspace_directory)
+    os.makedirs(output_directory)
+
+    with pytest.raises(RuntimeError):
+        convert_odt_to_markdown(
+            configuration_file_path = os.path.join(workspace_directory, "OdtToMarkdownConfiguration.yaml"),
+            definition_file_path = None,
+            source_file_path = os.path.join(workspace_directory, "FullText.fodt"),
+            destination_file_path_or_directory = output_directory,
+            write_as_single_file = False,
+            skip_unchanged = True,
+            simulate = False,
+        )
+
+
 def _assert_output_as_many_documents(workspace_directory: str) -> None:
     output_directory = os.path.join(workspace_directory, "SectionsAsMarkdown")
 
@@ -0,0 +1,32 @@
+# cspell:words lxml
+
+""" Unit tests for script_helpers """
+
+import os
+
+import lxml.etree
+
+from benjaminhamon_document_manipulation_scripts import convert_markdown_to_odt
+from benjaminhamon_document_manipulation_scripts import script_helpers
+from benjaminhamon_document_manipulation_toolkit.documents.cached_document_reader import CachedDocumentReader
+from benjaminhamon_document_manipulation_toolkit.open_document.odt_reader import OdtReader
+from benjaminhamon_document_manipulation_toolkit.open_document.odt_to_document_converter import OdtToDocumentConverter
+
+
+def test_add_cache_to_document_reader(tmpdir):
+    odt_reader = OdtReader(OdtToDocumentConverter(), lxml.etree.XMLParser())
+
+    assert script_helpers.add_cache_to_document_reader(odt_reader, None) is odt_reader
+
+    cached_reader = script_helpers.add_cache_to_document_reader(odt_reader, os.path.join(tmpdir, "Cache"), cache_size_limit = 1024)
+
+    assert isinstance(cached_reader, CachedDocumentReader)
+    assert cached_reader._document_cache.size_limit == 1024 # pylint: disable = protected-access
+
+
+def test_get_document_reader_version():
+    odt_reader_version = script_helpers.get_document_reader_version(OdtReader(OdtToDocumentConverter(), lxml.etree.XMLParser()))
+
+    assert odt_reader_version == script_helpers.get_document_reader_version(OdtReader(OdtToDocumentConverter(), lxml.etree.XMLParser()))
+    assert len(odt_reader_version) == 64
+    assert odt_reader_version != script_helpers.get_document_reader_version(convert_markdown_to_odt.create_document_reader())
@@ -0,0 +1,30 @@
+# cspell:words dateutil
+
+""" Benchmarks for datetime_helpers, run as a module from the Tests/toolkit directory """
+
+import dateutil.parser
+
+from benjaminhamon_document_manipulation_toolkit import datetime_helpers
+from benjaminhamon_document_manipulation_toolkit_tests import benchmark_helpers
+
+
+def main() -> None:
+    all_values = [ "2020-01-01T10:11:%02d.123456789" % (index % 60) for index in range(1000) ]
+    all_unique_values = [ "2020-01-%02dT10:%02d:%02d.123456789" % (index // 3600 + 1, index // 60 % 60, index % 60) for index in range(5000) ]
+
+    repeated_options = { "number": 10, "repeat": 5, "item_count": len(all_values), "item_name": "value" }
+    unique_options = { "number": 10, "repeat": 5, "item_count": len(all_unique_values), "item_name": "value" }
+
+    benchmark_helpers.run_benchmark("dateutil.parser.parse (repeated timestamps)",
+        lambda: [ dateutil.parser.parse(value) for value in all_values ], **repeated_options)
+    benchmark_helpers.run_benchmark("datetime_helpers.parse_datetime (repeated timestamps)",
+        lambda: [ datetime_helpers.parse_datetime(value) for value in all_values ], **repeated_options)
+
+    benchmark_helpers.run_benchmark("dateutil.parser.parse (unique timestamps)",
+        lambda: [ dateutil.parser.parse(value) for value in all_unique_values ], **unique_options)
+    benchmark_helpers.run_benchmark("datetime_helpers.parse_datetime (unique timestamps, without cache)",
+        lambda: [ datetime_helpers.parse_datetime.__wrapped__(value) for value in all_unique_values ], **unique_options)
+
+
+if __name__ == "__main__":
+    main()
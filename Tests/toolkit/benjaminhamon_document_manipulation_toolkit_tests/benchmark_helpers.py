@@ -0,0 +1,32 @@
+""" Helpers for the benchmarks, which are run as modules from the Tests/toolkit directory """
+
+import timeit
+from typing import Any, Callable
+
+from benjaminhamon_document_manipulation_toolkit.documents import document_element_factory
+from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
+
+
+def run_benchmark(name: str, statement: Callable[[], Any], number: int, # pylint: disable = too-many-arguments
+        repeat: int = 3, item_count: int = 1, item_name: str = "call") -> None:
+
+    duration = min(timeit.repeat(statement, number = number, repeat = repeat)) / number / item_count
+    duration_as_string = ("%.2f us" % (duration * 1000 * 1000)) if duration < 0.001 else ("%.1f ms" % (duration * 1000))
+    print("%s: %s per %s" % (name.ljust(80), duration_as_string, item_name))
+
+
+def create_document(section_count: int, paragraph_count: int) -> RootElement:
+    document = RootElement()
+
+    for section_index in range(section_count):
+        section = document_element_factory.create_section(heading = "Section %s" % (section_index + 1), text = [])
+
+        for paragraph_index in range(paragraph_count):
+            paragraph = document_element_factory.create_paragraph([ "Paragraph %s has " % (paragraph_index + 1), "styled text", " in the middle." ])
+            paragraph.style_collection.append("Text Body")
+            paragraph.children[1].style_collection.append("Emphasis")
+            section.children.append(paragraph)
+
+        document.children.append(section)
+
+    return document
@@ -0,0 +1,62 @@
+""" Unit tests for DocumentCache """
+
+import os
+
+from benjaminhamon_document_manipulation_toolkit.documents import document_element_factory
+from benjaminhamon_document_manipulation_toolkit.documents.document_cache import DocumentCache
+from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
+
+
+def test_set_and_get(tmpdir):
+    source_file_path = os.path.join(tmpdir, "Source.txt")
+    cache_directory = os.path.join(tmpdir, "Cache")
+
+    with open(source_file_path, mode = "w", encoding = "utf-8") as source_file:
+        source_file.write("Some text")
+
+    document_cache = DocumentCache(cache_directory, "1.0")
+    key = document_cache.create_key(source_file_path, "content")
+
+    assert document_cache.try_get(key) is None
+
+    document = RootElement()
+    document.children.append(document_element_factory.create_section(heading = "Section 1", text = [ [ "Some text." ] ]))
+
+    document_cache.set(key, document)
+    document_from_cache = document_cache.try_get(key)
+
+    assert isinstance(document_from_cache, RootElement)
+    assert next(document_from_cache.enumerate_sections()).get_heading().get_title() == "Section 1"
+
+
+def test_create_key(tmpdir):
+    source_file_path = os.path.join(tmpdir, "Source.txt")
+    cache_directory = os.path.join(tmpdir, "Cache")
+
+    with open(source_file_path, mode = "w", encoding = "utf-8") as source_file:
+        source_file.write("Some text")
+
+    document_cache = DocumentCache(cache_directory, "1.0")
+    key = document_cache.create_key(source_file_path, "content")
+
+    assert document_cache.create_key(source_file_path, "content") == key
+    assert document_cache.create_key(source_file_path, "comments") != key
+    assert DocumentCache(cache_directory, "2.0").create_key(source_file_path, "content") != key
+
+    with open(source_file_path, mode = "w", encoding = "utf-8") as source_file:
+        source_file.write("Some other text")
+
+    assert document_cache.create_key(source_file_path, "content") != key
+
+
+def test_evict(tmpdir):
+    cache_directory = os.path.join(tmpdir, "Cache")
+
+    document_cache = DocumentCache(cache_directory, "1.0", size_limit = 1024)
+
+    document_cache.set("first", os.urandom(600))
+    os.utime(os.path.join(cache_directory, "first.cache"), (0, 0))
+    document_cache.set("second", os.urandom(600))
+
+    assert document_cache.try_get("first") is None
+    assert document_cache.try_get("second") is not None
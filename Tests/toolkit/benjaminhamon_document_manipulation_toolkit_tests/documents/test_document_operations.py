@@ -1,6 +1,95 @@
+# cspell:words lxml
+
 """ Unit tests for document_operations """
 
+import os
+from typing import Optional
+
+import lxml.html.html5parser
+import pytest
+
+from benjaminhamon_document_manipulation_toolkit.documents import document_element_factory
 from benjaminhamon_document_manipulation_toolkit.documents import document_operations
+from benjaminhamon_document_manipulation_toolkit.documents.document_definition import DocumentDefinition
+from benjaminhamon_document_manipulation_toolkit.documents.elements.paragraph_element import ParagraphElement
+from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
+from benjaminhamon_document_manipulation_toolkit.documents.elements.text_element import TextElement
+from benjaminhamon_document_manipulation_toolkit.documents.elements.text_region_start_element import TextRegionStartElement
+from benjaminhamon_document_manipulation_toolkit.html.html_reader import HtmlReader
+from benjaminhamon_document_manipulation_toolkit.html.html_to_document_converter import HtmlToDocumentConverter
+from benjaminhamon_document_manipulation_toolkit.interfaces.document_reader import DocumentReader
+from benjaminhamon_document_manipulation_toolkit.markdown.markdown_reader import MarkdownReader
+from benjaminhamon_document_manipulation_toolkit.markdown.markdown_to_html_converter import MarkdownToHtmlConverter
+
+
+def test_compile_section_identifiers():
+    section_filter = document_operations.compile_section_identifiers([ "Chapter *", "Epilogue" ])
+
+    assert section_filter("Chapter 1")
+    assert section_filter("Epilogue")
+    assert not section_filter("Prologue")
+    assert not section_filter("Epilogue 2")
+
+    section_filter = document_operations.compile_section_identifiers([])
+
+    assert not section_filter("Chapter 1")
+
+
+def test_select_sections_from_definition():
+    document_source = RootElement()
+    for title in [ "Chapter 1", "Epilogue", "Chapter 2", "Prologue", "Notes" ]:
+        document_source.children.append(document_element_factory.create_section(heading = title, text = [ [ "Some text." ] ]))
+
+    document_definition = DocumentDefinition(
+        front_section_identifiers = [ "Prologue" ],
+        content_section_identifiers = [ "Chapter *" ],
+        back_section_identifiers = [ "Epilogue" ])
+
+    document_content = document_operations.select_sections_from_definition(document_definition, document_source)
+
+    all_titles = [ section.get_heading().get_title() for section in document_content.enumerate_sections() ]
+    assert all_titles == [ "Prologue", "Chapter 1", "Chapter 2", "Epilogue" ]
+
+
+def create_markdown_reader() -> DocumentReader:
+    html_parser = lxml.html.html5parser.HTMLParser(namespaceHTMLElements = False)
+    html_reader = HtmlReader(HtmlToDocumentConverter(), html_parser)
+    return MarkdownReader(MarkdownToHtmlConverter(), html_reader)
+
+
+def create_source_directory(source_directory: str, section_count: int) -> DocumentDefinition:
+    os.makedirs(source_directory)
+
+    section_file_path_collection = []
+    for section_index in range(section_count):
+        section_file_path = "Section %s.md" % (section_index + 1)
+        with open(os.path.join(source_directory, section_file_path), mode = "w", encoding = "utf-8") as section_file:
+            section_file.write("# Section %s\n\nSome text.\n" % (section_index + 1))
+        section_file_path_collection.append(section_file_path)
+
+    return DocumentDefinition(
+        source_directory = source_directory,
+        front_section_file_paths = section_file_path_collection[:1],
+        content_section_file_paths = section_file_path_collection[1:-1],
+        back_section_file_paths = section_file_path_collection[-1:])
+
+
+@pytest.mark.parametrize("job_count", [ 1, 2 ])
+def test_load_document_from_definition_as_many_files(tmpdir, job_count):
+    document_definition = create_source_directory(os.path.join(tmpdir, "Source"), 5)
+
+    document_content = document_operations.load_document_from_definition(
+        document_definition, create_markdown_reader(), job_count = job_count, document_reader_factory = create_markdown_reader)
+
+    all_titles = [ section.get_heading().get_title() for section in document_content.enumerate_sections() ]
+    assert all_titles == [ "Section 1", "Section 2", "Section 3", "Section 4", "Section 5" ]
+
+
+def test_load_document_from_definition_as_many_files_without_factory(tmpdir):
+    document_definition = create_source_directory(os.path.join(tmpdir, "Source"), 5)
+
+    with pytest.raises(ValueError):
+        document_operations.load_document_from_definition(document_definition, create_markdown_reader(), job_count = 2)
 
 
 def test_generate_section_file_name():
@@ -18,3 +107,37 @@ def test_generate_section_file_name():
     actual = document_operations.generate_section_file_name("My section title", 41, 200)
 
     assert actual == expected
+
+
+def test_merge_text_elements():
+
+    def create_text(text: str, style: Optional[str] = None, line_break: bool = False) -> TextElement:
+        text_element = TextElement(text)
+        text_element.style_collection = [ style ] if style is not None else []
+        text_element.line_break = line_break
+        return text_element
+
+    paragraph = ParagraphElement()
+    paragraph.children.extend([
+        create_text("Some "),
+        create_text("text "),
+        create_text("with a line break.", line_break = True),
+        create_text("Some "),
+        create_text("emphasis", style = "Emphasis"),
+        create_text(" and", style = "Emphasis"),
+        create_text(" a "),
+        TextRegionStartElement("Region"),
+        create_text("region."),
+    ])
+
+    document_operations.merge_text_elements(paragraph)
+
+    assert [ (child.text, child.style_collection, child.line_break) for child in paragraph.children if isinstance(child, TextElement) ] == [
+        ("Some text with a line break.", [], True),
+        ("Some ", [], False),
+        ("emphasis and", [ "Emphasis" ], False),
+        (" a ", [], False),
+        ("region.", [], False),
+    ]
+
+    assert isinstance(paragraph.children[4], TextRegionStartElement)
@@ -0,0 +1,67 @@
+""" Unit tests for section_scheduler """
+
+import os
+from typing import Tuple
+
+import pytest
+
+from benjaminhamon_document_manipulation_toolkit.documents import document_element_factory
+from benjaminhamon_document_manipulation_toolkit.documents import section_scheduler
+from benjaminhamon_document_manipulation_toolkit.documents.elements.section_element import SectionElement
+
+
+class FakeRenderer:
+
+
+    def __init__(self, prefix: str) -> None:
+        self.prefix = prefix
+
+
+    def render(self, section_index: int, section: SectionElement) -> Tuple[int, str]:
+        return (os.getpid(), "%s%s - %s" % (self.prefix, section_index + 1, section.get_heading().get_title()))
+
+
+def create_renderer() -> FakeRenderer:
+    return FakeRenderer("Rendered ")
+
+
+@pytest.mark.parametrize("job_count", [ 1, 2 ])
+def test_render_sections(job_count):
+    all_sections = [ document_element_factory.create_section(heading = "Section %s" % (index + 1), text = []) for index in range(10) ]
+    all_arguments = iter(enumerate(all_sections))
+
+    all_results = list(section_scheduler.render_sections(
+        create_renderer(), FakeRenderer.render, all_arguments, job_count = job_count, renderer_factory = create_renderer))
+
+    assert [ result for _, result in all_results ] == [ "Rendered %s - Section %s" % (index + 1, index + 1) for index in range(10) ]
+
+    if job_count == 1:
+        assert all(process_identifier == os.getpid() for process_identifier, _ in all_results)
+    else:
+        assert all(process_identifier != os.getpid() for process_identifier, _ in all_results)
+
+
+def test_render_sections_with_bounded_submission():
+    all_sections = [ document_element_factory.create_section(heading = "Section %s" % (index + 1), text = []) for index in range(20) ]
+    consumed_argument_count = 0
+
+    def enumerate_arguments():
+        nonlocal consumed_argument_count
+        for section_index, section in enumerate(all_sections):
+            consumed_argument_count += 1
+            yield (section_index, section)
+
+    all_results = section_scheduler.render_sections(
+        create_renderer(), FakeRenderer.render, enumerate_arguments(), job_count = 2, renderer_factory = create_renderer)
+
+    assert next(all_results)[1] == "Rendered 1 - Section 1"
+    assert consumed_argument_count <= 5
+
+    assert [ result for _, result in all_results ] == [ "Rendered %s - Section %s" % (index + 1, index + 1) for index in range(1, 20) ]
+
+
+def test_render_sections_without_factory():
+    all_sections = [ document_element_factory.create_section(heading = "Section %s" % (index + 1), text = []) for index in range(2) ]
+
+    with pytest.raises(ValueError):
+        list(section_scheduler.render_sections(create_renderer(), FakeRenderer.render, enumerate(all_sections), job_count = 2))
@@ -0,0 +1,35 @@
+# cspell:words lxml
+
+""" Benchmarks for DocumentToXhtmlConverter and EpubNavigationXhtmlBuilder, run as a module from the Tests/toolkit directory """
+
+from benjaminhamon_document_manipulation_toolkit.epub import epub_xhtml_helpers
+from benjaminhamon_document_manipulation_toolkit.epub.document_to_xhtml_converter import DocumentToXhtmlConverter
+from benjaminhamon_document_manipulation_toolkit.epub.epub_navigation_item import EpubNavigationItem
+from benjaminhamon_document_manipulation_toolkit.epub.epub_navigation_xhtml_builder import EpubNavigationXhtmlBuilder
+from benjaminhamon_document_manipulation_toolkit_tests import benchmark_helpers
+
+
+def main() -> None:
+    section_count = 300
+    paragraph_count = 50
+
+    document = benchmark_helpers.create_document(section_count, paragraph_count)
+    converter = DocumentToXhtmlConverter()
+
+    navigation_items = [
+        EpubNavigationItem(reference = "Text/Section %s.xhtml" % index, display_name = "Section %s" % index)
+        for index in range(section_count * 10)
+    ]
+
+    def build_navigation():
+        navigation_builder = EpubNavigationXhtmlBuilder("Table of Contents")
+        navigation_builder.add_table_of_contents(navigation_items, "Text")
+
+    size_label = "%s sections, %s paragraphs each" % (section_count, paragraph_count)
+    benchmark_helpers.run_benchmark("DocumentToXhtmlConverter.convert (%s)" % size_label,
+        lambda: converter.convert(epub_xhtml_helpers.create_xhtml_base("Benchmark"), document), 1)
+    benchmark_helpers.run_benchmark("EpubNavigationXhtmlBuilder.add_table_of_contents (%s items)" % len(navigation_items), build_navigation, 10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+""" Unit tests for EpubBuildManifest """
+
+import os
+
+from benjaminhamon_document_manipulation_toolkit.epub import epub_build_manifest
+from benjaminhamon_document_manipulation_toolkit.epub.epub_build_manifest import EpubBuildManifest
+
+
+def test_save_and_load(tmpdir):
+    manifest_file_path = os.path.join(tmpdir, "BuildManifest.json")
+    package_file_path = os.path.join(tmpdir, "Document.epub")
+
+    with open(package_file_path, mode = "wb") as package_file:
+        package_file.write(b"package")
+
+    build_manifest = EpubBuildManifest("inputs")
+    build_manifest.cover_hash = epub_build_manifest.compute_hash([ b"cover" ])
+    build_manifest.entry_hashes = { "EPUB/content.opf": epub_build_manifest.compute_hash([ b"content" ]) }
+    build_manifest.record_package(package_file_path)
+    build_manifest.save_to_file(manifest_file_path)
+
+    build_manifest_loaded = EpubBuildManifest("inputs")
+    build_manifest_loaded.load_from_file(manifest_file_path)
+
+    assert build_manifest_loaded.cover_hash == build_manifest.cover_hash
+    assert build_manifest_loaded.entry_hashes == build_manifest.entry_hashes
+    assert build_manifest_loaded.is_package_unchanged(package_file_path)
+
+    with open(package_file_path, mode = "ab") as package_file:
+        package_file.write(b" modified")
+
+    assert not build_manifest_loaded.is_package_unchanged(package_file_path)
+
+    build_manifest_other_inputs = EpubBuildManifest("other inputs")
+    build_manifest_other_inputs.load_from_file(manifest_file_path)
+
+    assert build_manifest_other_inputs.cover_hash is None
+    assert len(build_manifest_other_inputs.entry_hashes) == 0
+
+
+def test_load_invalid(tmpdir):
+    manifest_file_path = os.path.join(tmpdir, "BuildManifest.json")
+
+    build_manifest = EpubBuildManifest("inputs")
+    build_manifest.load_from_file(manifest_file_path)
+
+    assert len(build_manifest.entry_hashes) == 0
+
+    with open(manifest_file_path, mode = "w", encoding = "utf-8") as manifest_file:
+        manifest_file.write("{ invalid")
+
+    build_manifest.load_from_file(manifest_file_path)
+
+    assert len(build_manifest.entry_hashes) == 0
+    assert not build_manifest.is_package_unchanged(os.path.join(tmpdir, "Document.epub"))
+
+
+def test_compute_hash():
+    assert epub_build_manifest.compute_hash([ b"ab", b"c" ]) != epub_build_manifest.compute_hash([ b"a", b"bc" ])
+    assert epub_build_manifest.compute_hash([ b"ab", b"c" ]) == epub_build_manifest.compute_hash([ b"ab", b"c" ])
@@ -1,8 +1,12 @@
+# cspell:words lxml
+
 """ Unit tests for EpubPackageBuilder """
 
 import os
 import zipfile
 
+import lxml.etree
+
 from benjaminhamon_document_manipulation_toolkit.epub import epub_xhtml_helpers
 from benjaminhamon_document_manipulation_toolkit.epub.epub_content_configuration import EpubContentConfiguration
 from benjaminhamon_document_manipulation_toolkit.epub.epub_content_writer import EpubContentWriter
@@ -121,3 +125,99 @@ def test_create_package(tmpdir):
         file_collection.sort()
 
         assert file_collection == file_collection_expected
+
+
+def test_write_package(tmpdir):
+    content_writer = EpubContentWriter()
+    package_builder = EpubPackageBuilder(content_writer)
+
+    package_file_path = os.path.join(tmpdir, "Output", "package.epub")
+    section_document = epub_xhtml_helpers.create_xhtml_base("my_section")
+
+    all_file_entries = [
+        (os.path.join("EPUB", "my_section.xhtml"), lambda output_file: content_writer.write_xml_to_stream(output_file, section_document)),
+        (os.path.join("EPUB", "Resources", "Styles.css"), lambda output_file: output_file.write(b"p { margin: 0; }")),
+        (os.path.join("META-INF", "container.xml"),
+            lambda output_file: content_writer.write_xml_to_stream(output_file, content_writer.create_container_as_xml(os.path.join("EPUB", "content.opf")))),
+    ]
+
+    package_builder.write_package(package_file_path, all_file_entries, simulate = True)
+
+    assert not os.path.exists(package_file_path)
+
+    package_builder.write_package(package_file_path, all_file_entries, simulate = False)
+
+    assert os.path.exists(package_file_path)
+    assert not os.path.exists(package_file_path + ".tmp")
+
+    with zipfile.ZipFile(package_file_path, mode = "r") as package_file:
+        assert package_file.testzip() is None
+        assert [ x.filename for x in package_file.filelist ] == [ "mimetype", "EPUB/my_section.xhtml", "EPUB/Resources/Styles.css", "META-INF/container.xml" ]
+        assert package_file.getinfo("mimetype").compress_type == zipfile.ZIP_STORED
+        assert package_file.read("mimetype") == b"application/epub+zip"
+        assert package_file.read("EPUB/Resources/Styles.css") == b"p { margin: 0; }"
+        assert package_file.read("EPUB/my_section.xhtml") == lxml.etree.tostring(
+            section_document, encoding = "utf-8", pretty_print = True, doctype = "<?xml version=\"1.0\" encoding=\"utf-8\"?>")
+
+
+def test_stage_files_with_link_mappings(tmpdir):
+    content_writer = EpubContentWriter()
+    package_builder = EpubPackageBuilder(content_writer)
+
+    source_directory = os.path.join(tmpdir, "Sources")
+    staging_directory = os.path.join(tmpdir, "Working")
+
+    xhtml_file_content_initial = """
+<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">
+  <head>
+    <link href="https://www.example.com/Styles/Examples.css" rel="stylesheet" type="text/css"/>
+    <link href="../Styles/Generic.css" rel="stylesheet" type="text/css"/>
+  </head>
+  <body/>
+</html>
+"""
+
+    os.makedirs(os.path.join(source_directory, "Xhtml"))
+    os.makedirs(os.path.join(source_directory, "Styles"))
+
+    with open(os.path.join(source_directory, "Xhtml", "File.xhtml"), mode = "w", encoding = "utf-8") as xhtml_file:
+        xhtml_file.write(xhtml_file_content_initial.lstrip())
+    with open(os.path.join(source_directory, "Styles", "Generic.css"), mode = "w", encoding = "utf-8") as css_file:
+        css_file.write("p { margin: 0; }")
+
+    file_mappings = [
+        (os.path.join(source_directory, "Xhtml", "File.xhtml"), os.path.join("EPUB", "Content", "File.xhtml")),
+        (os.path.join(source_directory, "Styles", "Generic.css"), os.path.join("EPUB", "Resources", "Generic.css")),
+    ]
+
+    link_mappings = [
+        ("https://www.example.com/Styles/Examples.css", "https://www.example.com/Styles/ExamplesModified.css"),
+        (os.path.join(source_directory, "Styles", "Generic.css"), os.path.join("EPUB", "Resources", "Generic.css")),
+        (os.path.join(source_directory, "Styles", "..", "Styles", "Generic.css"), os.path.join("EPUB", "Resources", "Other.css")),
+    ]
+
+    package_builder.stage_files(staging_directory, file_mappings, simulate = True, link_mappings = link_mappings)
+
+    assert not os.path.exists(staging_directory)
+
+    package_builder.stage_files(staging_directory, file_mappings, simulate = False, link_mappings = link_mappings)
+
+    with open(os.path.join(staging_directory, "EPUB", "Content", "File.xhtml"), mode = "r", encoding = "utf-8") as xhtml_file:
+        xhtml_file_content_final = xhtml_file.read()
+
+    xhtml_file_content_expected = """
+<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">
+  <head>
+    <link href="https://www.example.com/Styles/ExamplesModified.css" rel="stylesheet" type="text/css"/>
+    <link href="../Resources/Generic.css" rel="stylesheet" type="text/css"/>
+  </head>
+  <body/>
+</html>
+"""
+
+    assert xhtml_file_content_final == xhtml_file_content_expected.lstrip()
+
+    with open(os.path.join(staging_directory, "EPUB", "Resources", "Generic.css"), mode = "r", encoding = "utf-8") as css_file:
+        assert css_file.read() == "p { margin: 0; }"
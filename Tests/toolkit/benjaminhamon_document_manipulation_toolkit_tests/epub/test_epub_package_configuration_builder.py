@@ -81,6 +81,32 @@ def test_add_content_files():
     assert configuration.navigation.navigation_items == navigation_expected
 
 
+def test_add_content_files_with_known_titles():
+
+    def get_title(xhtml_file_path: str) -> str:
+        return "Read " + os.path.basename(xhtml_file_path)
+
+    builder = EpubPackageConfigurationBuilder()
+
+    content_file_collection = [
+        os.path.join("SectionsAsXhtml", "File1.xhtml"),
+        os.path.join("SectionsAsXhtml", "File2.xhtml"),
+    ]
+
+    all_known_titles = { os.path.join("SectionsAsXhtml", "File2.xhtml"): "Known" }
+
+    builder.add_content_files(content_file_collection, get_title, all_known_titles)
+
+    configuration = builder.get_configuration()
+
+    navigation_expected = [
+        EpubNavigationItem("EPUB/Content/1_-_File1.xhtml", "Read File1.xhtml"),
+        EpubNavigationItem("EPUB/Content/2_-_File2.xhtml", "Known"),
+    ]
+
+    assert configuration.navigation.navigation_items == navigation_expected
+
+
 
 def test_add_cover():
     builder = EpubPackageConfigurationBuilder()
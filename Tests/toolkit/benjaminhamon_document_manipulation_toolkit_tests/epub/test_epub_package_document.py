@@ -3,6 +3,7 @@
 import pytest
 
 from benjaminhamon_document_manipulation_toolkit.epub.epub_manifest_item import EpubManifestItem
+from benjaminhamon_document_manipulation_toolkit.epub.epub_metadata_item import EpubMetadataItem
 from benjaminhamon_document_manipulation_toolkit.epub.epub_package_document import EpubPackageDocument
 from benjaminhamon_document_manipulation_toolkit.epub.epub_spine_item import EpubSpineItem
 
@@ -128,3 +129,57 @@ def test_add_spine_item_with_missing():
 
     with pytest.raises(ValueError):
         document.add_spine_item(spine_item)
+
+
+def test_add_manifest_items_with_conflict():
+    document = EpubPackageDocument()
+
+    first_item = EpubManifestItem(identifier = "id1", reference = "file_1.xhtml", media_type = "application/xhtml+xml")
+    second_item = EpubManifestItem(identifier = "id2", reference = "file_2.xhtml", media_type = "application/xhtml+xml")
+    third_item = EpubManifestItem(identifier = "id1", reference = "file_3.xhtml", media_type = "application/xhtml+xml")
+
+    with pytest.raises(ValueError):
+        document.add_manifest_items([ first_item, second_item, third_item ])
+
+    assert document.get_manifest_items() == [] # pylint: disable = use-implicit-booleaness-not-comparison
+
+    document.add_manifest_items([ first_item, second_item ])
+
+    assert document.get_manifest_items() == [ first_item, second_item ]
+    assert document.get_manifest_item("id2") == second_item
+
+
+def test_add_spine_items_with_missing():
+    document = EpubPackageDocument()
+
+    manifest_item = EpubManifestItem(identifier = "id1", reference = "file_1.xhtml", media_type = "application/xhtml+xml")
+    document.add_manifest_item(manifest_item)
+
+    with pytest.raises(ValueError):
+        document.add_spine_items([ EpubSpineItem(reference = "id1"), EpubSpineItem(reference = "missing") ])
+
+    assert document.get_spine_items() == [] # pylint: disable = use-implicit-booleaness-not-comparison
+
+
+def test_get_identifier():
+    document = EpubPackageDocument()
+
+    assert document.get_identifier() is None
+
+    document.add_minimal_metadata("the-identifier", "The Title", "en")
+    document.add_metadata_item(EpubMetadataItem("dc:identifier", "other-identifier"))
+
+    assert document.get_identifier() == document.get_metadata_items()[0]
+    assert document.get_identifier().value == "the-identifier"
+
+
+def test_get_items_as_views():
+    document = EpubPackageDocument()
+
+    manifest_items = document.get_manifest_items()
+    assert len(manifest_items) == 0
+
+    manifest_item = EpubManifestItem(identifier = "id1", reference = "file_1.xhtml", media_type = "application/xhtml+xml")
+    document.add_manifest_item(manifest_item)
+
+    assert list(manifest_items) == [ manifest_item ]
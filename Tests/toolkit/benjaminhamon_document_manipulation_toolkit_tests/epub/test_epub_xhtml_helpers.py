@@ -3,6 +3,7 @@
 """ Unit tests for epub_xhtml_helpers """
 
 import io
+import os
 
 import lxml.etree
 import pytest
@@ -45,3 +46,41 @@ def test_find_xhtml_element():
     epub_xhtml_helpers.find_xhtml_element(document.getroot(), "./x:head")
     with pytest.raises(ValueError):
         epub_xhtml_helpers.find_xhtml_element(document.getroot(), "./x:something")
+
+
+def test_read_xhtml_title(tmpdir):
+    document_as_string = """
+<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">
+  <head>
+    <title>The Title</title>
+  </head>
+  <body>
+    <svg xmlns="http://www.w3.org/2000/svg"><title>Not The Title</title></svg>
+  </body>
+</html>
+"""
+
+    xhtml_file_path = os.path.join(tmpdir, "Document.xhtml")
+    with open(xhtml_file_path, mode = "w", encoding = "utf-8") as xhtml_file:
+        xhtml_file.write(document_as_string.lstrip())
+
+    assert epub_xhtml_helpers.read_xhtml_title(xhtml_file_path) == "The Title"
+    assert epub_xhtml_helpers.read_xhtml_title(xhtml_file_path) == epub_xhtml_helpers.get_xhtml_title(epub_xhtml_helpers.load_xhtml(xhtml_file_path))
+
+
+def test_read_xhtml_title_without_title(tmpdir):
+    document_as_string = """
+<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml">
+  <head/>
+  <body/>
+</html>
+"""
+
+    xhtml_file_path = os.path.join(tmpdir, "Document.xhtml")
+    with open(xhtml_file_path, mode = "w", encoding = "utf-8") as xhtml_file:
+        xhtml_file.write(document_as_string.lstrip())
+
+    with pytest.raises(ValueError):
+        epub_xhtml_helpers.read_xhtml_title(xhtml_file_path)
@@ -0,0 +1,48 @@
+""" Unit tests for XhtmlTitleCache """
+
+import os
+
+from benjaminhamon_document_manipulation_toolkit.epub.xhtml_title_cache import XhtmlTitleCache
+
+
+def write_xhtml(file_path: str, title: str) -> None:
+    with open(file_path, mode = "w", encoding = "utf-8") as xhtml_file:
+        xhtml_file.write("<html xmlns=\"http://www.w3.org/1999/xhtml\"><head><title>%s</title></head><body/></html>" % title)
+
+
+def test_get_title(tmpdir):
+    cache_file_path = os.path.join(tmpdir, "Cache", "XhtmlTitles.json")
+    xhtml_file_path = os.path.join(tmpdir, "Document.xhtml")
+
+    write_xhtml(xhtml_file_path, "First")
+
+    title_cache = XhtmlTitleCache(cache_file_path)
+    assert title_cache.get_title(xhtml_file_path) == "First"
+    title_cache.save()
+
+    # The cached title is used as long as the file keeps the same size and modification time
+    file_status = os.stat(xhtml_file_path)
+    write_xhtml(xhtml_file_path, "Other")
+    os.utime(xhtml_file_path, ns = (file_status.st_atime_ns, file_status.st_mtime_ns))
+
+    title_cache = XhtmlTitleCache(cache_file_path)
+    title_cache.load()
+    assert title_cache.get_title(xhtml_file_path) == "First"
+
+    os.utime(xhtml_file_path, ns = (file_status.st_atime_ns, file_status.st_mtime_ns + 1000))
+    assert title_cache.get_title(xhtml_file_path) == "Other"
+
+
+def test_load_invalid(tmpdir):
+    cache_file_path = os.path.join(tmpdir, "XhtmlTitles.json")
+    xhtml_file_path = os.path.join(tmpdir, "Document.xhtml")
+
+    with open(cache_file_path, mode = "w", encoding = "utf-8") as cache_file:
+        cache_file.write("{ invalid")
+
+    write_xhtml(xhtml_file_path, "Title")
+
+    title_cache = XhtmlTitleCache(cache_file_path)
+    title_cache.load()
+
+    assert title_cache.get_title(xhtml_file_path) == "Title"
@@ -194,3 +194,32 @@ def test_read_content_with_subsection():
     assert text_elements[0].text == "Cras eget neque semper, cursus eros at, bibendum nisl. Morbi accumsan nunc pellentesque, pharetra ipsum vel, convallis libero. Morbi condimentum hendrerit congue. Ut facilisis dolor et lorem facilisis, sagittis lacinia nibh tempor. Nam imperdiet fermentum sem sit amet porttitor. In consectetur vehicula imperdiet. Aliquam eleifend turpis vitae tincidunt fringilla."
 # cspell:enable
     assert text_elements[0].style_collection == []
+
+
+def test_read_content_from_bytes():
+    html_data = """
+<!doctype html>
+<html>
+    <head>
+        <title>My document</title>
+    </head>
+    <body>
+        <section>
+            <h1>Section 1 - Élan</h1>
+            <p>Un paragraphe avec des caractères accentués.</p>
+        </section>
+    </body>
+</html>
+"""
+
+    html_data = html_data.lstrip()
+
+    html_parser = lxml.html.html5parser.HTMLParser(namespaceHTMLElements = False)
+    html_reader = HtmlReader(HtmlToDocumentConverter(), html_parser)
+
+    document_content = html_reader.read_content_from_bytes(html_data.encode("utf-8"))
+
+    section = next(document_content.enumerate_sections())
+
+    assert section.get_heading().get_title() == "Section 1 - Élan"
+    assert next(next(section.enumerate_paragraphs()).enumerate_text()).text == "Un paragraphe avec des caractères accentués."
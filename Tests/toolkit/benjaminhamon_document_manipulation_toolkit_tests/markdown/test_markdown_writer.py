@@ -2,13 +2,20 @@
 
 import os
 
+import pytest
+
 from benjaminhamon_document_manipulation_toolkit.documents import document_element_factory
 from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
 from benjaminhamon_document_manipulation_toolkit.markdown.document_to_markdown_converter import DocumentToMarkdownConverter
 from benjaminhamon_document_manipulation_toolkit.markdown.markdown_writer import MarkdownWriter
+from benjaminhamon_document_manipulation_toolkit.output.memory_output_sink import MemoryOutputSink
 from benjaminhamon_document_manipulation_toolkit.serialization.yaml_serializer import YamlSerializer
 
 
+def create_markdown_writer() -> MarkdownWriter:
+    return MarkdownWriter(DocumentToMarkdownConverter(), YamlSerializer())
+
+
 def create_document() -> RootElement:
     document = RootElement()
 
@@ -94,15 +101,17 @@ def test_write_as_single_document_with_simulate(tmpdir):
     assert not os.path.exists(markdown_file_path)
 
 
-def test_write_as_many_documents(tmpdir):
-    markdown_writer = MarkdownWriter(DocumentToMarkdownConverter(), YamlSerializer())
+@pytest.mark.parametrize("job_count", [ 1, 2 ])
+def test_write_as_many_documents(tmpdir, job_count):
+    markdown_writer = create_markdown_writer()
 
     metadata = { "author": "The Author" }
     document = create_document()
     markdown_directory = os.path.join(tmpdir, "Working", "MyDocument")
 
     os.makedirs(markdown_directory)
-    markdown_writer.write_as_many_documents(markdown_directory, metadata, document, simulate = False)
+    markdown_writer.write_as_many_documents(markdown_directory, metadata, document,
+        simulate = False, job_count = job_count, writer_factory = create_markdown_writer)
 
     assert len(os.listdir(markdown_directory)) == 3
 
@@ -156,6 +165,25 @@ And a second paragraph for the second section.
     assert actual_content == expected_content
 
 
+def test_write_as_many_documents_to_memory():
+    metadata = { "author": "The Author" }
+    document = create_document()
+    markdown_directory = os.path.join("Working", "MyDocument")
+
+    with MemoryOutputSink() as output_sink:
+        markdown_writer = MarkdownWriter(DocumentToMarkdownConverter(), YamlSerializer(), output_sink = output_sink)
+        markdown_writer.write_as_many_documents(markdown_directory, metadata, document, simulate = False)
+
+    assert sorted(output_sink.all_files) == [
+        os.path.join(markdown_directory, "0 - Information.yaml"),
+        os.path.join(markdown_directory, "1 - Section 1.md"),
+        os.path.join(markdown_directory, "2 - Section 2.md"),
+    ]
+
+    actual_content = output_sink.get_file(os.path.join(markdown_directory, "1 - Section 1.md")).decode("utf-8")
+    assert actual_content.replace(os.linesep, "\n").startswith("# Section 1\n\nSome text for the first section.\n")
+
+
 def test_write_as_many_documents_with_simulate(tmpdir):
     markdown_writer = MarkdownWriter(DocumentToMarkdownConverter(), YamlSerializer())
 
@@ -0,0 +1,33 @@
+# cspell:words lxml
+
+""" Benchmarks for DocumentToOdtConverter and OdtToDocumentConverter, run as a module from the Tests/toolkit directory """
+
+from benjaminhamon_document_manipulation_toolkit.open_document import odt_operations
+from benjaminhamon_document_manipulation_toolkit.open_document.document_to_odt_converter import DocumentToOdtConverter
+from benjaminhamon_document_manipulation_toolkit.open_document.odt_to_document_converter import OdtToDocumentConverter
+from benjaminhamon_document_manipulation_toolkit_tests import benchmark_helpers
+
+
+def main() -> None:
+    section_count = 300
+    paragraph_count = 50
+
+    document = benchmark_helpers.create_document(section_count, paragraph_count)
+    converter = DocumentToOdtConverter()
+
+    def convert_to_odt():
+        return converter.convert(odt_operations.create_document(), document, {})
+
+    odt_document = convert_to_odt()
+    odt_root = odt_document.getroot()
+
+    def convert_to_document():
+        OdtToDocumentConverter().convert_content(odt_root)
+
+    size_label = "%s sections, %s paragraphs each" % (section_count, paragraph_count)
+    benchmark_helpers.run_benchmark("DocumentToOdtConverter.convert (%s)" % size_label, convert_to_odt, 1)
+    benchmark_helpers.run_benchmark("OdtToDocumentConverter.convert_content (%s)" % size_label, convert_to_document, 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# cspell:words lxml
+
+""" Benchmarks for OdtBuilderForCopies, run as a module from the Tests/toolkit directory """
+
+import lxml.etree
+
+from benjaminhamon_document_manipulation_toolkit.open_document import odt_namespaces
+from benjaminhamon_document_manipulation_toolkit.open_document import odt_operations
+from benjaminhamon_document_manipulation_toolkit.open_document.odt_builder_for_copies import OdtBuilderForCopies
+from benjaminhamon_document_manipulation_toolkit_tests import benchmark_helpers
+
+
+def create_source_document(paragraph_count: int) -> lxml.etree._ElementTree:
+    document = odt_operations.create_document()
+    body = odt_operations.get_body_text_element(document)
+
+    frame = lxml.etree.SubElement(body, str(lxml.etree.QName(odt_namespaces.draw_namespace, "frame")))
+    frame.attrib[str(lxml.etree.QName(odt_namespaces.draw_namespace, "name"))] = "image"
+    frame.attrib[str(lxml.etree.QName(odt_namespaces.text_namespace, "anchor-page-number"))] = "1"
+
+    for paragraph_index in range(paragraph_count):
+        paragraph = lxml.etree.SubElement(body, str(lxml.etree.QName(odt_namespaces.text_namespace, "p")))
+        span = lxml.etree.SubElement(paragraph, str(lxml.etree.QName(odt_namespaces.text_namespace, "span")))
+        span.text = "Certificate for {name}" if paragraph_index % 5 == 0 else "Some text in paragraph %s" % (paragraph_index + 1)
+        span.tail = " and more text."
+
+    return document
+
+
+def main() -> None:
+    paragraph_count = 20
+    source_document = create_source_document(paragraph_count)
+
+    for item_count in [ 500, 2000 ]:
+        all_format_parameters = [ { "name": "Person %s" % (item_index + 1) } for item_index in range(item_count) ]
+
+        def add_copies():
+            OdtBuilderForCopies(odt_operations.create_document()).add_copies(source_document, all_format_parameters) # pylint: disable = cell-var-from-loop
+
+        benchmark_helpers.run_benchmark("OdtBuilderForCopies.add_copies (%s copies, %s paragraphs)" % (item_count, paragraph_count), add_copies, 1)
+
+
+if __name__ == "__main__":
+    main()
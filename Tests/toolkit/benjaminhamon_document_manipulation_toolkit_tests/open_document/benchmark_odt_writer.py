@@ -0,0 +1,83 @@
+# cspell:words fodt lxml
+
+""" Benchmarks for OdtWriter, run as a module from the Tests/toolkit directory """
+
+import lxml.etree
+
+from benjaminhamon_document_manipulation_toolkit.open_document import odt_namespaces
+from benjaminhamon_document_manipulation_toolkit.open_document import odt_operations
+from benjaminhamon_document_manipulation_toolkit.open_document.document_to_odt_converter import DocumentToOdtConverter
+from benjaminhamon_document_manipulation_toolkit.open_document.odt_writer import OdtWriter
+from benjaminhamon_document_manipulation_toolkit_tests import benchmark_helpers
+
+
+def create_odt_document(paragraph_count: int) -> lxml.etree._ElementTree:
+    document = odt_operations.create_document()
+    body_text = odt_operations.get_body_text_element(document)
+
+    paragraph_tag = lxml.etree.QName(odt_namespaces.text_namespace, "p")
+    span_tag = lxml.etree.QName(odt_namespaces.text_namespace, "span")
+    style_attribute = lxml.etree.QName(odt_namespaces.text_namespace, "style-name")
+
+    for paragraph_index in range(paragraph_count):
+        paragraph = lxml.etree.SubElement(body_text, paragraph_tag)
+        lxml.etree.SubElement(paragraph, span_tag).text = "Paragraph %s has " % paragraph_index
+        lxml.etree.SubElement(paragraph, span_tag, { style_attribute: "Emphasis" }).text = "styled text"
+        lxml.etree.SubElement(paragraph, span_tag).text = " in the middle."
+
+    return document
+
+
+def collapse_body_elements_by_line(document_as_xml_string: str, indent_for_collapsing: int = 6) -> str:
+    """ Previous implementation, collapsing the serialized document line by line with string concatenation """
+
+    document_as_xml_string_fixed = ""
+    is_body = False
+    is_collapsing = False
+
+    for line in document_as_xml_string.splitlines():
+        line_stripped = line.strip()
+        indent = len(line) - len(line.lstrip())
+
+        if line_stripped == "<office:body>":
+            is_body = True
+        if line_stripped == "</office:body>":
+            is_body = False
+
+        if is_body:
+            if indent == indent_for_collapsing:
+                if (line_stripped.startswith("<text:h") or line_stripped.startswith("<text:p")) and not line_stripped.endswith("/>"):
+                    document_as_xml_string_fixed += line
+                    is_collapsing = True
+                    continue
+
+                if (line_stripped.startswith("</text:h") or line_stripped.startswith("</text:p")):
+                    document_as_xml_string_fixed += line_stripped + "\n"
+                    is_collapsing = False
+                    continue
+
+            if is_collapsing:
+                document_as_xml_string_fixed += line_stripped
+                continue
+
+        document_as_xml_string_fixed += line + "\n"
+
+    return document_as_xml_string_fixed
+
+
+def main() -> None:
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    odt_writer = OdtWriter(DocumentToOdtConverter(), xml_parser)
+
+    for paragraph_count in [ 5000, 50000 ]:
+        document = create_odt_document(paragraph_count)
+
+        benchmark_helpers.run_benchmark("Collapsing by line (%s paragraphs)" % paragraph_count,
+            lambda document = document: collapse_body_elements_by_line(
+                lxml.etree.tostring(document, encoding = "utf-8", pretty_print = True).decode("utf-8")), 1)
+        benchmark_helpers.run_benchmark("OdtWriter.write_to_file (%s paragraphs)" % paragraph_count,
+            lambda document = document: odt_writer.write_to_file("Benchmark.fodt", document, flat_odt = True, simulate = True), 1)
+
+
+if __name__ == "__main__":
+    main()
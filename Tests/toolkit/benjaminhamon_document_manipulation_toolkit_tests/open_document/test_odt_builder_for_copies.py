@@ -1,12 +1,17 @@
-# cspell:words lxml opendocument
+# cspell:words fodt lxml opendocument
+
+import os
 
 import lxml.etree
+import pytest
 
 from benjaminhamon_document_manipulation_toolkit.open_document import odt_operations
+from benjaminhamon_document_manipulation_toolkit.open_document.document_to_odt_converter import DocumentToOdtConverter
 from benjaminhamon_document_manipulation_toolkit.open_document.odt_builder_for_copies import OdtBuilderForCopies
+from benjaminhamon_document_manipulation_toolkit.open_document.odt_writer import OdtWriter
 
-def test_add_copies():
-    odt_as_bytes = """
+
+source_odt_as_string = """
 <?xml version="1.0" encoding="utf-8"?>
 <office:document
     xmlns:draw="urn:oasis:names:tc:opendocument:xmlns:drawing:1.0"
@@ -21,9 +26,11 @@ def test_add_copies():
     </office:text>
   </office:body>
 </office:document>
-    """
+"""
 
-    odt_as_bytes = odt_as_bytes.lstrip().encode("utf-8")
+
+def test_add_copies():
+    odt_as_bytes = source_odt_as_string.lstrip().encode("utf-8")
 
     xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
     odt_as_xml = lxml.etree.ElementTree(lxml.etree.fromstring(odt_as_bytes, xml_parser))
@@ -59,3 +66,72 @@ def test_add_copies():
     expected = expected.strip()
 
     assert new_document_as_string == expected
+
+
+def test_enumerate_copies_to_file(tmpdir):
+    odt_as_bytes = source_odt_as_string.lstrip().encode("utf-8")
+    expected_file_path = os.path.join(tmpdir, "Expected.fodt")
+    output_file_path = os.path.join(tmpdir, "Output.fodt")
+
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    odt_as_xml = lxml.etree.ElementTree(lxml.etree.fromstring(odt_as_bytes, xml_parser))
+    all_format_parameters = [ { "code": "aaa" }, { "code": "bbb" }, { "code": "ccc" } ]
+
+    odt_builder = OdtBuilderForCopies(odt_operations.create_document())
+    odt_builder.add_copies(odt_as_xml, all_format_parameters)
+
+    odt_writer = OdtWriter(DocumentToOdtConverter(), xml_parser)
+    odt_writer.write_to_file(expected_file_path, odt_builder.get_xml_document(), flat_odt = True)
+
+    # The parameters are produced lazily, as they would be when read from a large data file
+    content = OdtBuilderForCopies(odt_operations.create_document()).enumerate_copies(
+        odt_as_xml, (format_parameters for format_parameters in all_format_parameters), item_count = len(all_format_parameters))
+    odt_writer.write_to_file(output_file_path, odt_operations.create_document(), flat_odt = True, content = content)
+
+    with open(expected_file_path, mode = "rb") as expected_file:
+        with open(output_file_path, mode = "rb") as output_file:
+            assert output_file.read() == expected_file.read()
+
+
+def test_add_copies_with_frame_between_paragraphs():
+    source_odt_with_frame_between_paragraphs_as_string = source_odt_as_string.replace(
+        "<draw:frame draw:name=\"image\" text:anchor-type=\"page\" text:anchor-page-number=\"1\"/>\n      <text:h>A title</text:h>",
+        "<text:h>A title {code}</text:h>\n      <draw:frame draw:name=\"image\" text:anchor-type=\"page\" text:anchor-page-number=\"1\"/>")
+    odt_as_bytes = source_odt_with_frame_between_paragraphs_as_string.lstrip().encode("utf-8")
+
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    odt_as_xml = lxml.etree.ElementTree(lxml.etree.fromstring(odt_as_bytes, xml_parser))
+    all_format_parameters = [ { "code": "aaa" }, { "code": "bbb" } ]
+
+    def describe(element: lxml.etree._Element) -> str:
+        if element.text is None:
+            return "frame:" + element.attrib["{urn:oasis:names:tc:opendocument:xmlns:drawing:1.0}name"]
+        return lxml.etree.QName(element).localname + ":" + element.text
+
+    # Frames are inserted after the last frame of the body and text at its end, so all the frames follow the text before the first one
+    expected = [ "h:A title aaa", "frame:image-1", "frame:image-2", "p:Some text", "p:aaa", "h:A title bbb", "p:Some text", "p:bbb" ]
+
+    odt_builder = OdtBuilderForCopies(odt_operations.create_document())
+    odt_builder.add_copies(odt_as_xml, all_format_parameters)
+
+    new_body = odt_operations.get_body_text_element(odt_builder.get_xml_document())
+    assert [ describe(element) for element in new_body ] == expected
+
+    content = OdtBuilderForCopies(odt_operations.create_document()).enumerate_copies(
+        odt_as_xml, iter(all_format_parameters), item_count = len(all_format_parameters))
+    assert [ describe(element) for element in content ] == expected
+
+
+def test_enumerate_copies_with_wrong_item_count():
+    odt_as_bytes = source_odt_as_string.lstrip().encode("utf-8")
+
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    odt_as_xml = lxml.etree.ElementTree(lxml.etree.fromstring(odt_as_bytes, xml_parser))
+    odt_builder = OdtBuilderForCopies(odt_operations.create_document())
+
+    with pytest.raises(ValueError):
+        list(odt_builder.enumerate_copies(odt_as_xml, iter([ { "code": "aaa" } ])))
+    with pytest.raises(ValueError):
+        list(odt_builder.enumerate_copies(odt_as_xml, iter([ { "code": "aaa" } ]), item_count = 2))
+    with pytest.raises(ValueError):
+        list(odt_builder.enumerate_copies(odt_as_xml, iter([ { "code": "aaa" }, { "code": "bbb" } ]), item_count = 1))
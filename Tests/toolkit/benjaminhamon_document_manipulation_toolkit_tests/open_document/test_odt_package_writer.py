@@ -0,0 +1,56 @@
+# cspell:words lxml opendocument
+
+""" Unit tests for OdtPackageWriter """
+
+import io
+import os
+import zipfile
+
+import lxml.etree
+
+from benjaminhamon_document_manipulation_toolkit.open_document import odt_namespaces
+from benjaminhamon_document_manipulation_toolkit.open_document.odt_package_writer import OdtPackageWriter
+
+
+def test_write_package():
+    output_file = io.BytesIO()
+
+    package_writer = OdtPackageWriter(output_file)
+    package_writer.write_mimetype()
+    package_writer.write_entry("content.xml", b"<content/>")
+    package_writer.write_manifest({ "content.xml": "text/xml" })
+    package_writer.close()
+
+    with zipfile.ZipFile(output_file, mode = "r") as package:
+        assert package.testzip() is None
+        assert package.namelist() == [ "mimetype", "content.xml", "META-INF/manifest.xml" ]
+        assert package.read("mimetype") == b"application/vnd.oasis.opendocument.text"
+
+        manifest = lxml.etree.fromstring(package.read("META-INF/manifest.xml"))
+
+    all_file_entries = manifest.findall(str(lxml.etree.QName(odt_namespaces.manifest_namespace, "file-entry")))
+    full_path_attribute = str(lxml.etree.QName(odt_namespaces.manifest_namespace, "full-path"))
+    media_type_attribute = str(lxml.etree.QName(odt_namespaces.manifest_namespace, "media-type"))
+    assert [ entry.attrib[full_path_attribute] for entry in all_file_entries ] == [ "/", "content.xml" ]
+    assert [ entry.attrib[media_type_attribute] for entry in all_file_entries ] == [ "application/vnd.oasis.opendocument.text", "text/xml" ]
+
+
+def test_copy_entries_from_template():
+    template_file_path = os.path.join(os.path.dirname(__file__), "simple.odt")
+    output_file = io.BytesIO()
+
+    package_writer = OdtPackageWriter(output_file)
+    package_writer.write_mimetype()
+    package_writer.write_entry("content.xml", b"<content/>")
+    package_writer.copy_entries_from_template(template_file_path)
+    package_writer.close()
+
+    with zipfile.ZipFile(template_file_path, mode = "r") as template_package:
+        with zipfile.ZipFile(output_file, mode = "r") as package:
+            assert package.testzip() is None
+            all_copied_entries = [ name for name in template_package.namelist() if name not in [ "mimetype", "content.xml" ] ]
+            assert package.namelist() == [ "mimetype", "content.xml" ] + all_copied_entries
+            assert package.read("content.xml") == b"<content/>"
+
+            for entry_name in all_copied_entries:
+                assert package.read(entry_name) == template_package.read(entry_name)
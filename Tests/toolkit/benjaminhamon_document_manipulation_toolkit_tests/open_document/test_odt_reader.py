@@ -99,6 +99,26 @@ def test_read_content_from_simple_fodt():
     assert text_elements[2].style_collection == []
 
 
+def test_read_content_from_bytes():
+    fodt_file_path = os.path.join(os.path.dirname(__file__), "simple.fodt")
+
+    with open(fodt_file_path, mode = "rb") as fodt_file:
+        fodt_data = fodt_file.read()
+
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    odt_reader = OdtReader(OdtToDocumentConverter(), xml_parser)
+
+    document_content = odt_reader.read_content_from_bytes(fodt_data)
+
+    assert sum(1 for _ in document_content.enumerate_sections()) == 1
+
+    section = next(document_content.enumerate_sections())
+    paragraph = next(section.enumerate_paragraphs())
+
+    assert section.get_heading().get_title() == "My heading"
+    assert [ text_element.text for text_element in paragraph.enumerate_text() ] == [ "This is a sentence with ", "emphasis", ". And then it ends." ]
+
+
 def test_read_content_from_simple_odt():
     odt_file_path = os.path.join(os.path.dirname(__file__), "simple.odt")
 
@@ -326,3 +346,169 @@ def test_read_comments():
     assert document_comments[0].author == "Benjamin Hamon"
     assert document_comments[0].date == datetime.datetime(2020, 1, 1)
     assert document_comments[0].text == "Some comment.\nMore text in the comment."
+
+
+def test_read_document_from_fodt():
+    fodt_file_path = os.path.join(os.path.dirname(__file__), "simple.fodt")
+
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    odt_reader = OdtReader(OdtToDocumentConverter(), xml_parser)
+
+    document = odt_reader.read_document_from_file(fodt_file_path)
+
+    assert document.metadata["title"] == "My Document"
+    assert document.content.get_section_count() == 1
+    assert next(document.content.enumerate_sections()).get_heading().get_title() == "My heading"
+    assert len(document.comments) == 0
+
+
+def test_read_document_from_odt():
+    odt_file_path = os.path.join(os.path.dirname(__file__), "simple.odt")
+
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    odt_reader = OdtReader(OdtToDocumentConverter(), xml_parser)
+
+    document = odt_reader.read_document_from_file(odt_file_path)
+
+    assert document.metadata["title"] == "My Document"
+    assert document.content.get_section_count() == 1
+    assert next(document.content.enumerate_sections()).get_heading().get_title() == "My heading"
+    assert len(document.comments) == 0
+
+
+def test_read_document_with_comments():
+    fodt_data = """
+<office:document xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0">
+  <office:meta>
+    <dc:title>My Document</dc:title>
+  </office:meta>
+  <office:body>
+    <office:text>
+      <text:h>The Section</text:h>
+      <text:p>Before the comment. <office:annotation office:name="__Annotation__123"><dc:creator>Benjamin Hamon</dc:creator><dc:date>2020-01-01T00:00:00</dc:date><text:p>Some comment</text:p></office:annotation>Inside the comment.</text:p>
+      <text:p>Inside the comment again.<office:annotation-end office:name="__Annotation__123"/> After the comment.</text:p>
+    </office:text>
+  </office:body>
+</office:document>
+    """
+
+    fodt_data = fodt_data.lstrip()
+
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    odt_reader = OdtReader(OdtToDocumentConverter(), xml_parser)
+
+    document = odt_reader.read_document_from_string(fodt_data)
+
+    assert document.metadata == { "title": "My Document" }
+
+    assert len(document.comments) == 1
+    assert document.comments[0].region_identifier == "__Annotation__123"
+    assert document.comments[0].text == "Some comment"
+
+    section = next(document.content.enumerate_sections())
+    paragraph = next(section.enumerate_paragraphs())
+
+    assert len(paragraph.children) == 3
+    assert isinstance(paragraph.children[1], TextRegionStartElement)
+    assert paragraph.children[1].identifier == "__Annotation__123"
+
+
+def test_enumerate_sections_from_stream(tmpdir):
+    fodt_data = """
+<office:document xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0">
+  <office:body>
+    <office:text>
+      <text:p>Before the first section.</text:p>
+      <text:h>Section 1</text:h>
+      <text:p>Before the comment. <office:annotation office:name="__Annotation__123"><dc:creator>Benjamin Hamon</dc:creator><dc:date>2020-01-01T00:00:00</dc:date><text:p>Some comment</text:p></office:annotation>Inside the comment.</text:p>
+      <text:p>Inside the comment again.<office:annotation-end office:name="__Annotation__123"/> After the comment.</text:p>
+      <text:h>Section 2</text:h>
+      <text:p>Some text with a soft page break <text:soft-page-break/>somewhere.</text:p>
+    </office:text>
+  </office:body>
+</office:document>
+    """
+
+    fodt_file_path = os.path.join(tmpdir, "MyDocument.fodt")
+    with open(fodt_file_path, mode = "w", encoding = "utf-8") as fodt_file:
+        fodt_file.write(fodt_data.lstrip())
+
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    odt_reader = OdtReader(OdtToDocumentConverter(), xml_parser)
+
+    with odt_reader.open_content_file(fodt_file_path) as content_file:
+        all_sections = list(odt_reader.enumerate_sections_from_stream(content_file))
+
+    assert len(all_sections) == 2
+    assert odt_reader.read_section_count_from_file(fodt_file_path) == 2
+
+    section = all_sections[0]
+
+    assert section.get_heading().get_title() == "Section 1"
+    assert sum(1 for _ in section.enumerate_paragraphs()) == 2
+
+    paragraph = next(section.enumerate_paragraphs())
+
+    assert len(paragraph.children) == 3
+    assert isinstance(paragraph.children[0], TextElement)
+    assert paragraph.children[0].text == "Before the comment. "
+    assert isinstance(paragraph.children[1], TextRegionStartElement)
+    assert paragraph.children[1].identifier == "__Annotation__123"
+    assert isinstance(paragraph.children[2], TextElement)
+    assert paragraph.children[2].text == "Inside the comment."
+
+    section = all_sections[1]
+
+    assert section.get_heading().get_title() == "Section 2"
+    assert sum(1 for _ in section.enumerate_paragraphs()) == 1
+
+    paragraph = next(section.enumerate_paragraphs())
+    text_elements = list(paragraph.enumerate_text())
+
+    assert len(text_elements) == 1
+    assert text_elements[0].text == "Some text with a soft page break somewhere."
+
+
+def test_enumerate_sections_from_odt():
+    odt_file_path = os.path.join(os.path.dirname(__file__), "simple.odt")
+
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    odt_reader = OdtReader(OdtToDocumentConverter(), xml_parser)
+
+    with odt_reader.open_content_file(odt_file_path) as content_file:
+        all_sections = list(odt_reader.enumerate_sections_from_stream(content_file))
+
+    assert len(all_sections) == 1
+    assert all_sections[0].get_heading().get_title() == "My heading"
+
+
+def test_read_selected_content_from_file(tmpdir):
+    fodt_data = """
+<office:document xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0">
+  <office:body>
+    <office:text>
+      <text:h>Section 1</text:h>
+      <text:p>Some text with a comment.<office:annotation><dc:creator>Benjamin Hamon</dc:creator><dc:date>2020-01-01T00:00:00</dc:date><text:p>Some comment</text:p></office:annotation></text:p>
+      <text:h>Section 2</text:h>
+      <text:p>Some other text with a comment.<office:annotation><dc:creator>Benjamin Hamon</dc:creator><dc:date>2020-01-01T00:00:00</dc:date><text:p>Some comment</text:p></office:annotation></text:p>
+    </office:text>
+  </office:body>
+</office:document>
+    """
+
+    fodt_file_path = os.path.join(tmpdir, "MyDocument.fodt")
+    with open(fodt_file_path, mode = "w", encoding = "utf-8") as fodt_file:
+        fodt_file.write(fodt_data.lstrip())
+
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    odt_reader = OdtReader(OdtToDocumentConverter(), xml_parser)
+
+    document_content = odt_reader.read_selected_content_from_file(fodt_file_path, lambda title: title == "Section 2")
+
+    assert [ section.get_heading().get_title() for section in document_content.enumerate_sections() ] == [ "Section 2" ]
+
+    paragraph = next(next(document_content.enumerate_sections()).enumerate_paragraphs())
+    document_comments = odt_reader.read_comments_from_file(fodt_file_path)
+
+    assert isinstance(paragraph.children[1], TextRegionStartElement)
+    assert paragraph.children[1].identifier == document_comments[1].region_identifier
@@ -0,0 +1,48 @@
+# cspell:words fodt lxml opendocument
+
+""" Unit tests for OdtToDocumentConverter """
+
+import lxml.etree
+
+from benjaminhamon_document_manipulation_toolkit.documents.elements.text_region_start_element import TextRegionStartElement
+from benjaminhamon_document_manipulation_toolkit.open_document.odt_to_document_converter import OdtToDocumentConverter
+
+
+def test_convert_content_without_modifying_source():
+    fodt_data = """
+<office:document xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0">
+  <office:body>
+    <office:text>
+      <text:h>The Section</text:h>
+      <text:p>Before the comment. <office:annotation office:name="__Annotation__123"><dc:creator>Benjamin Hamon</dc:creator><dc:date>2020-01-01T00:00:00</dc:date><text:p>Some comment</text:p></office:annotation>Inside the comment.</text:p>
+      <text:p>Inside the comment again.<office:annotation-end office:name="__Annotation__123"/> After the comment.</text:p>
+      <text:p><text:span text:style-name="span-style">Some text with<text:s/> spaces and<text:soft-page-break/> a soft page break.</text:span></text:p>
+    </office:text>
+  </office:body>
+</office:document>
+    """
+
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    odt_as_xml = lxml.etree.fromstring(fodt_data.strip(), xml_parser)
+    odt_as_string = lxml.etree.tostring(odt_as_xml)
+
+    converter = OdtToDocumentConverter()
+    document_content = converter.convert_content(odt_as_xml)
+    document_comments = converter.convert_comments(odt_as_xml)
+
+    assert lxml.etree.tostring(odt_as_xml) == odt_as_string
+
+    section = next(document_content.enumerate_sections())
+    all_paragraphs = list(section.enumerate_paragraphs())
+
+    assert len(all_paragraphs) == 3
+    assert isinstance(all_paragraphs[0].children[1], TextRegionStartElement)
+
+    text_elements = list(all_paragraphs[2].enumerate_text())
+
+    assert len(text_elements) == 1
+    assert text_elements[0].text == "Some text with spaces and a soft page break."
+    assert text_elements[0].style_collection == [ "span-style" ]
+
+    assert len(document_comments) == 1
+    assert document_comments[0].text == "Some comment"
@@ -5,16 +5,25 @@
 import datetime
 import os
 import zipfile
+from typing import Optional
 
 import lxml.etree
+import pytest
 
 from benjaminhamon_document_manipulation_toolkit.documents import document_element_factory
 from benjaminhamon_document_manipulation_toolkit.documents.elements.document_comment import DocumentComment
 from benjaminhamon_document_manipulation_toolkit.documents.elements.root_element import RootElement
 from benjaminhamon_document_manipulation_toolkit.documents.elements.text_region_end_element import TextRegionEndElement
 from benjaminhamon_document_manipulation_toolkit.documents.elements.text_region_start_element import TextRegionStartElement
+from benjaminhamon_document_manipulation_toolkit.interfaces.output_sink import OutputSink
 from benjaminhamon_document_manipulation_toolkit.open_document.document_to_odt_converter import DocumentToOdtConverter
 from benjaminhamon_document_manipulation_toolkit.open_document.odt_writer import OdtWriter
+from benjaminhamon_document_manipulation_toolkit.output.zip_output_sink import ZipOutputSink
+
+
+def create_odt_writer(output_sink: Optional[OutputSink] = None) -> OdtWriter:
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    return OdtWriter(DocumentToOdtConverter(), xml_parser, output_sink = output_sink)
 
 
 def create_generic_document() -> RootElement:
@@ -250,6 +259,61 @@ def test_write_as_single_document_to_fodt_with_template_and_whitespace(tmpdir):
     assert actual_content == expected_content
 
 
+def test_write_as_single_document_to_fodt_with_template_and_body(tmpdir):
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    odt_writer = OdtWriter(DocumentToOdtConverter(), xml_parser)
+
+    document = create_generic_document()
+    template_file_path = os.path.join(tmpdir, "Working", "Template.fodt")
+    fodt_file_path = os.path.join(tmpdir, "Working", "MyDocument.fodt")
+
+    template_content = """
+<?xml version="1.0" encoding="utf-8"?>
+<office:document xmlns:draw="urn:oasis:names:tc:opendocument:xmlns:drawing:1.0" xmlns:meta="urn:oasis:names:tc:opendocument:xmlns:meta:1.0" xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0">
+  <office:body>
+    <office:text>
+      <text:h>Template Heading</text:h>
+      <text:p>Template paragraph.</text:p>
+    </office:text>
+  </office:body>
+</office:document>
+"""
+
+    template_content = template_content.lstrip()
+
+    os.makedirs(os.path.dirname(fodt_file_path))
+    with open(template_file_path, mode = "w", encoding = "utf-8") as template_file:
+        template_file.write(template_content)
+    odt_writer.write_as_single_document(fodt_file_path, document, [], template_file_path, flat_odt = True, simulate = False)
+
+    assert os.path.exists(fodt_file_path)
+
+    with open(fodt_file_path, mode = "r", encoding = "utf-8") as odt_file:
+        actual_content = odt_file.read()
+
+    expected_content = """
+<?xml version="1.0" encoding="utf-8"?>
+<office:document xmlns:draw="urn:oasis:names:tc:opendocument:xmlns:drawing:1.0" xmlns:meta="urn:oasis:names:tc:opendocument:xmlns:meta:1.0" xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0">
+  <office:body>
+    <office:text>
+      <text:h>Template Heading</text:h>
+      <text:p>Template paragraph.</text:p>
+      <text:h><text:span>Section 1</text:span></text:h>
+      <text:p><text:span>Some text for the first section.</text:span></text:p>
+      <text:p><text:span>And a second paragraph for the first section.</text:span></text:p>
+      <text:h><text:span>Section 2</text:span></text:h>
+      <text:p><text:span>Some text for the second section.</text:span></text:p>
+      <text:p><text:span>And a second paragraph for the second section.</text:span></text:p>
+    </office:text>
+  </office:body>
+</office:document>
+"""
+
+    expected_content = expected_content.lstrip()
+
+    assert actual_content == expected_content
+
+
 def test_write_as_single_document_to_odt(tmpdir):
     xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
     odt_writer = OdtWriter(DocumentToOdtConverter(), xml_parser)
@@ -286,6 +350,34 @@ def test_write_as_single_document_to_odt(tmpdir):
     assert actual_content == expected_content
 
 
+def test_write_as_single_document_to_odt_with_template(tmpdir):
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    odt_writer = OdtWriter(DocumentToOdtConverter(), xml_parser)
+
+    document = create_generic_document()
+    template_file_path = os.path.join(os.path.dirname(__file__), "simple.odt")
+    odt_file_path = os.path.join(tmpdir, "Working", "MyDocument.odt")
+
+    os.makedirs(os.path.dirname(odt_file_path))
+    odt_writer.write_as_single_document(odt_file_path, document, [], template_file_path = template_file_path, flat_odt = False, simulate = False)
+
+    with zipfile.ZipFile(template_file_path, mode = "r") as template_file:
+        with zipfile.ZipFile(odt_file_path, mode = "r") as odt_file:
+            assert odt_file.testzip() is None
+            assert odt_file.namelist()[0] == "mimetype"
+            assert odt_file.getinfo("mimetype").compress_type == zipfile.ZIP_STORED
+            assert odt_file.getinfo("content.xml").compress_type == zipfile.ZIP_DEFLATED
+            assert sorted(odt_file.namelist()) == sorted(template_file.namelist())
+            assert odt_file.read("styles.xml") == template_file.read("styles.xml")
+            assert odt_file.read("META-INF/manifest.xml") == template_file.read("META-INF/manifest.xml")
+
+            content_as_xml = lxml.etree.fromstring(odt_file.read("content.xml"))
+
+    namespaces = { "text": "urn:oasis:names:tc:opendocument:xmlns:text:1.0" }
+    all_headings = content_as_xml.xpath("//text:h/text:span/text()", namespaces = namespaces)
+    assert all_headings[-2:] == [ "Section 1", "Section 2" ]
+
+
 def test_write_as_single_document_to_fodt_with_simulate(tmpdir):
     xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
     odt_writer = OdtWriter(DocumentToOdtConverter(), xml_parser)
@@ -432,6 +524,81 @@ def test_write_as_many_documents_to_odt(tmpdir):
     assert actual_content == expected_content
 
 
+@pytest.mark.parametrize("flat_odt", [ True, False ])
+def test_write_as_many_documents_with_several_jobs(tmpdir, flat_odt):
+    odt_writer = create_odt_writer()
+
+    document = create_generic_document()
+    document.children[0].children[2].children.insert(0, TextRegionStartElement("__Annotation__123"))
+    document.children[1].children[1].children.insert(0, TextRegionEndElement("__Annotation__123"))
+    comment = DocumentComment("__Annotation__123", "Benjamin Hamon", datetime.datetime(2020, 1, 1), "Some comment.")
+
+    for job_count in [ 1, 2 ]:
+        odt_directory = os.path.join(tmpdir, "Working", "Jobs-%s" % job_count)
+        os.makedirs(odt_directory)
+        odt_writer.write_as_many_documents(odt_directory, document, [ comment ],
+            flat_odt = flat_odt, simulate = False, job_count = job_count, writer_factory = create_odt_writer)
+
+    all_file_names = sorted(os.listdir(os.path.join(tmpdir, "Working", "Jobs-1")))
+    assert sorted(os.listdir(os.path.join(tmpdir, "Working", "Jobs-2"))) == all_file_names
+    assert len(all_file_names) == 2
+
+    for file_name in all_file_names:
+        with open(os.path.join(tmpdir, "Working", "Jobs-1", file_name), mode = "rb") as odt_file:
+            expected_content = odt_file.read()
+        with open(os.path.join(tmpdir, "Working", "Jobs-2", file_name), mode = "rb") as odt_file:
+            actual_content = odt_file.read()
+
+        assert actual_content == expected_content
+
+    if flat_odt:
+        with open(os.path.join(tmpdir, "Working", "Jobs-2", "2 - Section 2.fodt"), mode = "r", encoding = "utf-8") as odt_file:
+            assert "<office:annotation-end office:name=\"__Annotation__123\"/>" in odt_file.read()
+
+
+def test_write_as_many_documents_to_zip(tmpdir):
+    document = create_generic_document()
+    odt_directory = os.path.join(tmpdir, "Working", "MyDocument")
+    archive_file_path = os.path.join(tmpdir, "MyDocument.zip")
+
+    os.makedirs(odt_directory)
+    create_odt_writer().write_as_many_documents(odt_directory, document, [], flat_odt = True, simulate = False)
+
+    with ZipOutputSink(archive_file_path, odt_directory) as output_sink:
+        create_odt_writer(output_sink).write_as_many_documents(odt_directory, document, [], flat_odt = True, simulate = False)
+
+    with zipfile.ZipFile(archive_file_path, mode = "r") as archive_file:
+        assert archive_file.namelist() == [ "1 - Section 1.fodt", "2 - Section 2.fodt" ]
+
+        for entry_name in archive_file.namelist():
+            with open(os.path.join(odt_directory, entry_name), mode = "rb") as odt_file:
+                assert archive_file.read(entry_name) == odt_file.read()
+
+
+def test_write_as_many_documents_from_section_iterator(tmpdir):
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    odt_writer = OdtWriter(DocumentToOdtConverter(), xml_parser)
+
+    document = create_generic_document()
+    odt_directory = os.path.join(tmpdir, "Working", "MyDocument")
+
+    os.makedirs(odt_directory)
+    odt_writer.write_as_many_documents(odt_directory, iter(document.children), [], flat_odt = True, simulate = False, section_count = 2)
+
+    assert sorted(os.listdir(odt_directory)) == [ "1 - Section 1.fodt", "2 - Section 2.fodt" ]
+
+
+def test_write_as_many_documents_from_section_iterator_without_count(tmpdir):
+    xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
+    odt_writer = OdtWriter(DocumentToOdtConverter(), xml_parser)
+
+    document = create_generic_document()
+    odt_directory = os.path.join(tmpdir, "Working", "MyDocument")
+
+    with pytest.raises(ValueError):
+        odt_writer.write_as_many_documents(odt_directory, iter(document.children), [], flat_odt = True, simulate = True)
+
+
 def test_write_as_many_documents_to_fodt_with_simulate(tmpdir):
     xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
     odt_writer = OdtWriter(DocumentToOdtConverter(), xml_parser)
@@ -456,7 +623,7 @@ def test_write_as_many_documents_to_odt_with_simulate(tmpdir):
     assert not os.path.exists(odt_directory)
 
 
-def test_collapse_body_elements():
+def test_collapse_body_elements(tmpdir):
     document = """
 <?xml version="1.0" encoding="utf-8"?>
 <office:document xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:draw="urn:oasis:names:tc:opendocument:xmlns:drawing:1.0" xmlns:meta="urn:oasis:names:tc:opendocument:xmlns:meta:1.0" xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0">
@@ -507,6 +674,10 @@ def test_collapse_body_elements():
     xml_parser = lxml.etree.XMLParser(encoding = "utf-8", remove_blank_text = True)
     odt_writer = OdtWriter(DocumentToOdtConverter(), xml_parser)
 
-    document_formatted_actual = odt_writer._collapse_body_elements(document) # pylint: disable = protected-access
+    output_file_path = os.path.join(tmpdir, "MyDocument.fodt")
+    odt_writer.write_to_file(output_file_path, lxml.etree.ElementTree(lxml.etree.fromstring(document.encode("utf-8"), xml_parser)), flat_odt = True)
+
+    with open(output_file_path, mode = "r", encoding = "utf-8") as output_file:
+        document_formatted_actual = output_file.read()
 
     assert document_formatted_actual == document_formatted_expected
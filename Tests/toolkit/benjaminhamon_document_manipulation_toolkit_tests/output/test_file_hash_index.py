@@ -0,0 +1,44 @@
+""" Unit tests for FileHashIndex """
+
+import os
+
+from benjaminhamon_document_manipulation_toolkit.output import file_hash_index
+from benjaminhamon_document_manipulation_toolkit.output.file_hash_index import FileHashIndex
+
+
+def test_get_digest(tmpdir):
+    index_file_path = os.path.join(tmpdir, "Index.json")
+    file_path = os.path.join(tmpdir, "File.txt")
+
+    hash_index = FileHashIndex(index_file_path)
+    assert hash_index.get_digest(file_path) is None
+
+    with open(file_path, mode = "wb") as output_file:
+        output_file.write(b"Content")
+
+    hash_index.record(file_path, file_hash_index.compute_digest(b"Content"))
+    hash_index.save()
+
+    hash_index = FileHashIndex(index_file_path)
+    hash_index.load()
+    assert hash_index.get_digest(file_path) == file_hash_index.compute_digest(b"Content")
+
+    # A file modified since it was recorded is read again, rather than trusting the index
+    file_status = os.stat(file_path)
+    with open(file_path, mode = "wb") as output_file:
+        output_file.write(b"Modified")
+    os.utime(file_path, ns = (file_status.st_atime_ns, file_status.st_mtime_ns + 1000))
+
+    assert hash_index.get_digest(file_path) == file_hash_index.compute_digest(b"Modified")
+
+
+def test_load_invalid(tmpdir):
+    index_file_path = os.path.join(tmpdir, "Index.json")
+
+    with open(index_file_path, mode = "w", encoding = "utf-8") as index_file:
+        index_file.write("{ invalid")
+
+    hash_index = FileHashIndex(index_file_path)
+    hash_index.load()
+
+    assert hash_index.get_digest(os.path.join(tmpdir, "File.txt")) is None
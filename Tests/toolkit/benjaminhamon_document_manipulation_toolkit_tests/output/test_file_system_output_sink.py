@@ -0,0 +1,98 @@
+""" Unit tests for FileSystemOutputSink """
+
+import os
+
+import pytest
+
+from benjaminhamon_document_manipulation_toolkit.output.file_hash_index import FileHashIndex
+from benjaminhamon_document_manipulation_toolkit.output.file_system_output_sink import FileSystemOutputSink
+
+
+@pytest.mark.parametrize("thread_count", [ 0, 2 ])
+def test_commit(tmpdir, thread_count):
+    all_file_paths = [ os.path.join(tmpdir, "File %s.txt" % index) for index in range(10) ]
+
+    with open(all_file_paths[0], mode = "wb") as existing_file:
+        existing_file.write(b"Previous")
+
+    with FileSystemOutputSink(thread_count = thread_count) as output_sink:
+        for index, file_path in enumerate(all_file_paths):
+            output_sink.write_file(file_path, ("Content %s" % index).encode("utf-8"))
+
+        output_sink.write_file(all_file_paths[1], b"Content again")
+
+        with open(all_file_paths[0], mode = "rb") as existing_file:
+            assert existing_file.read() == b"Previous"
+        assert not os.path.exists(all_file_paths[2])
+
+    assert sorted(os.listdir(tmpdir)) == sorted(os.path.basename(file_path) for file_path in all_file_paths)
+
+    for index, file_path in enumerate(all_file_paths):
+        with open(file_path, mode = "rb") as output_file:
+            assert output_file.read() == (b"Content again" if index == 1 else ("Content %s" % index).encode("utf-8"))
+
+
+@pytest.mark.parametrize("thread_count", [ 0, 2 ])
+def test_commit_with_destination_directory(tmpdir, thread_count):
+    destination_directory = os.path.join(tmpdir, "Destination")
+    os.makedirs(os.path.join(destination_directory, "Directory"))
+
+    with open(os.path.join(destination_directory, "Stale.txt"), mode = "wb") as stale_file:
+        stale_file.write(b"Previous")
+
+    with FileSystemOutputSink(thread_count = thread_count, destination_directory = destination_directory) as output_sink:
+        for index in range(10):
+            output_sink.write_file(os.path.join(destination_directory, "File %s.txt" % index), ("Content %s" % index).encode("utf-8"))
+
+        assert os.path.exists(os.path.join(destination_directory, "Stale.txt"))
+
+    assert sorted(os.listdir(destination_directory)) == sorted("File %s.txt" % index for index in range(10))
+
+
+@pytest.mark.parametrize("thread_count", [ 0, 2 ])
+def test_discard(tmpdir, thread_count):
+    file_path = os.path.join(tmpdir, "File.txt")
+
+    with pytest.raises(RuntimeError):
+        with FileSystemOutputSink(thread_count = thread_count) as output_sink:
+            output_sink.write_file(file_path, b"Content")
+            raise RuntimeError("Failure")
+
+    assert os.listdir(tmpdir) == []
+
+
+def test_simulate(tmpdir):
+    with FileSystemOutputSink(simulate = True) as output_sink:
+        output_sink.write_file(os.path.join(tmpdir, "File.txt"), b"Content")
+
+    assert os.listdir(tmpdir) == []
+
+
+@pytest.mark.parametrize("thread_count", [ 0, 2 ])
+def test_skip_unchanged(tmpdir, thread_count):
+    all_file_paths = [ os.path.join(tmpdir, "File %s.txt" % index) for index in range(3) ]
+    hash_index = FileHashIndex(os.path.join(tmpdir, "Hashes", "Index.json"))
+
+    with FileSystemOutputSink(thread_count = thread_count, skip_unchanged = True, hash_index = hash_index) as output_sink:
+        for index, file_path in enumerate(all_file_paths):
+            output_sink.write_file(file_path, ("Content %s" % index).encode("utf-8"))
+
+    assert (output_sink.written_file_count, output_sink.skipped_file_count) == (3, 0)
+
+    all_file_modification_times = [ os.stat(file_path).st_mtime_ns for file_path in all_file_paths ]
+
+    hash_index = FileHashIndex(os.path.join(tmpdir, "Hashes", "Index.json"))
+    hash_index.load()
+
+    with FileSystemOutputSink(thread_count = thread_count, skip_unchanged = True, hash_index = hash_index) as output_sink:
+        for index, file_path in enumerate(all_file_paths):
+            output_sink.write_file(file_path, ("Content %s" % index if index != 1 else "Content updated").encode("utf-8"))
+
+    assert (output_sink.written_file_count, output_sink.skipped_file_count) == (1, 2)
+    assert output_sink.all_file_paths == all_file_paths
+
+    assert os.stat(all_file_paths[0]).st_mtime_ns == all_file_modification_times[0]
+    assert os.stat(all_file_paths[2]).st_mtime_ns == all_file_modification_times[2]
+
+    with open(all_file_paths[1], mode = "rb") as output_file:
+        assert output_file.read() == b"Content updated"
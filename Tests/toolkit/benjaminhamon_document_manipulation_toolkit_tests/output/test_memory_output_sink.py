@@ -0,0 +1,23 @@
+""" Unit tests for MemoryOutputSink """
+
+import os
+
+import pytest
+
+from benjaminhamon_document_manipulation_toolkit.output.memory_output_sink import MemoryOutputSink
+
+
+def test_commit():
+    output_sink = MemoryOutputSink()
+
+    with output_sink:
+        output_sink.write_file(os.path.join("Output", "First.txt"), b"First content")
+        assert len(output_sink.all_files) == 0
+
+    with pytest.raises(RuntimeError):
+        with output_sink:
+            output_sink.write_file(os.path.join("Output", "Second.txt"), b"Second content")
+            raise RuntimeError("Failure")
+
+    assert list(output_sink.all_files) == [ os.path.join("Output", "First.txt") ]
+    assert output_sink.get_file(os.path.join("Output", ".", "First.txt")) == b"First content"
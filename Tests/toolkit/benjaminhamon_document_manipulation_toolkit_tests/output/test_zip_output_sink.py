@@ -0,0 +1,51 @@
+""" Unit tests for ZipOutputSink """
+
+import os
+import zipfile
+
+import pytest
+
+from benjaminhamon_document_manipulation_toolkit.output.zip_output_sink import ZipOutputSink
+
+
+def test_commit(tmpdir):
+    archive_file_path = os.path.join(tmpdir, "Archive.zip")
+    base_directory = os.path.join(tmpdir, "Output")
+
+    with ZipOutputSink(archive_file_path, base_directory, mimetype = "application/epub+zip") as output_sink:
+        output_sink.write_file(os.path.join(base_directory, "First.txt"), b"First content")
+        with output_sink.open_file(os.path.join(base_directory, "Directory", "Second.txt")) as output_file:
+            output_file.write(b"Second ")
+            output_file.write(b"content")
+
+        with pytest.raises(ValueError):
+            output_sink.write_file(os.path.join(tmpdir, "Outside.txt"), b"Outside")
+
+        assert not os.path.exists(archive_file_path)
+
+    with zipfile.ZipFile(archive_file_path, mode = "r") as archive_file:
+        assert archive_file.testzip() is None
+        assert archive_file.namelist() == [ "mimetype", "First.txt", "Directory/Second.txt" ]
+        assert archive_file.read("mimetype") == b"application/epub+zip"
+        assert archive_file.read("First.txt") == b"First content"
+        assert archive_file.read("Directory/Second.txt") == b"Second content"
+
+    assert os.listdir(tmpdir) == [ "Archive.zip" ]
+
+
+def test_discard(tmpdir):
+    archive_file_path = os.path.join(tmpdir, "Archive.zip")
+
+    with pytest.raises(RuntimeError):
+        with ZipOutputSink(archive_file_path, str(tmpdir)) as output_sink:
+            output_sink.write_file(os.path.join(tmpdir, "File.txt"), b"Content")
+            raise RuntimeError("Failure")
+
+    assert os.listdir(tmpdir) == []
+
+
+def test_simulate(tmpdir):
+    with ZipOutputSink(os.path.join(tmpdir, "Archive.zip"), str(tmpdir), simulate = True) as output_sink:
+        output_sink.write_file(os.path.join(tmpdir, "File.txt"), b"Content")
+
+    assert os.listdir(tmpdir) == []
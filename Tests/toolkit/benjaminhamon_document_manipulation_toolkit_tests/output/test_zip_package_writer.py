@@ -0,0 +1,84 @@
+""" Unit tests for ZipPackageWriter """
+
+import io
+import os
+import zipfile
+
+import pytest
+
+from benjaminhamon_document_manipulation_toolkit.output.zip_package_writer import ZipPackageWriter
+
+
+def test_write_package():
+    output_file = io.BytesIO()
+
+    package_writer = ZipPackageWriter(output_file)
+    package_writer.write_mimetype("application/epub+zip")
+    with package_writer.open_entry("content.xml") as content_file:
+        content_file.write(b"<content>")
+        content_file.write(b"Some text" * 100)
+        content_file.write(b"</content>")
+    package_writer.write_entry("Pictures/Image é.svg", b"<svg/>")
+    package_writer.close()
+
+    assert output_file.getvalue()[30:38] == b"mimetype"
+
+    with zipfile.ZipFile(output_file, mode = "r") as package:
+        assert package.testzip() is None
+        assert package.namelist() == [ "mimetype", "content.xml", "Pictures/Image é.svg" ]
+        assert package.getinfo("mimetype").compress_type == zipfile.ZIP_STORED
+        assert package.getinfo("content.xml").compress_type == zipfile.ZIP_DEFLATED
+        assert package.read("mimetype") == b"application/epub+zip"
+        assert package.read("content.xml") == b"<content>" + b"Some text" * 100 + b"</content>"
+        assert package.read("Pictures/Image é.svg") == b"<svg/>"
+
+
+def test_write_package_with_late_mimetype():
+    package_writer = ZipPackageWriter(io.BytesIO())
+    package_writer.write_entry("content.xml", b"<content/>")
+
+    with pytest.raises(ValueError, match = "The mimetype must be the first entry in the package"):
+        package_writer.write_mimetype("application/epub+zip")
+
+
+def test_write_package_with_failed_entry():
+    package_writer = ZipPackageWriter(io.BytesIO())
+    package_writer.write_mimetype("application/epub+zip")
+
+    with pytest.raises(RuntimeError):
+        with package_writer.open_entry("content.xml") as content_file:
+            content_file.write(b"<content>")
+            raise RuntimeError("Failure")
+
+    with pytest.raises(ValueError, match = "Package has an incomplete entry"):
+        package_writer.close()
+
+
+def test_copy_entries_from_package(tmpdir):
+    source_file_path = os.path.join(tmpdir, "Source.zip")
+    output_file = io.BytesIO()
+
+    with zipfile.ZipFile(source_file_path, mode = "w") as source_package:
+        source_package.writestr("mimetype", b"application/epub+zip", compress_type = zipfile.ZIP_STORED)
+        source_package.writestr("content.xml", b"<content>Source</content>", compress_type = zipfile.ZIP_DEFLATED)
+        source_package.writestr("styles.xml", b"<styles>" + b"Some style" * 100 + b"</styles>", compress_type = zipfile.ZIP_DEFLATED)
+        source_package.writestr("Pictures/Image.svg", b"<svg/>", compress_type = zipfile.ZIP_STORED)
+
+    package_writer = ZipPackageWriter(output_file)
+    package_writer.write_mimetype("application/epub+zip")
+    package_writer.write_entry("content.xml", b"<content/>")
+    package_writer.copy_entries_from_package(source_file_path, excluded_entries = [ "mimetype", "content.xml" ])
+    package_writer.close()
+
+    with zipfile.ZipFile(source_file_path, mode = "r") as source_package:
+        with zipfile.ZipFile(output_file, mode = "r") as package:
+            assert package.testzip() is None
+            assert package.namelist() == [ "mimetype", "content.xml", "styles.xml", "Pictures/Image.svg" ]
+            assert package.read("content.xml") == b"<content/>"
+
+            for source_entry_name in [ "styles.xml", "Pictures/Image.svg" ]:
+                source_entry = source_package.getinfo(source_entry_name)
+                entry = package.getinfo(source_entry_name)
+                assert entry.compress_type == source_entry.compress_type
+                assert entry.compress_size == source_entry.compress_size
+                assert package.read(entry) == source_package.read(source_entry)
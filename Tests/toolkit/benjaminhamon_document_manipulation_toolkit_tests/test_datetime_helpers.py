@@ -0,0 +1,36 @@
+# cspell:words dateutil
+
+""" Unit tests for datetime_helpers """
+
+import datetime
+
+import dateutil.parser
+import pytest
+
+from benjaminhamon_document_manipulation_toolkit import datetime_helpers
+
+
+@pytest.mark.parametrize("value", [
+    "2020-01-01",
+    "2020-01-01T10:11:12",
+    "2020-01-01 10:11:12",
+    "2020-01-01T10:11:12.123",
+    "2020-01-01T10:11:12.123456789",
+    "2020-01-01T10:11:12Z",
+    "2020-01-01T10:11:12.5+02:00",
+    "2020-01-01T10:11:12-05:30",
+    "January 1, 2020 10:11",
+])
+def test_parse_datetime(value):
+    assert datetime_helpers.parse_datetime(value) == dateutil.parser.parse(value)
+
+
+def test_parse_datetime_with_timezone():
+    assert datetime_helpers.parse_datetime("2020-01-01T10:11:12Z").utcoffset() == datetime.timedelta(0)
+    assert datetime_helpers.parse_datetime("2020-01-01T10:11:12+02:00").utcoffset() == datetime.timedelta(hours = 2)
+    assert datetime_helpers.parse_datetime("2020-01-01T10:11:12").tzinfo is None
+
+
+def test_parse_datetime_invalid():
+    with pytest.raises(ValueError):
+        datetime_helpers.parse_datetime("2020-02-30T10:11:12")
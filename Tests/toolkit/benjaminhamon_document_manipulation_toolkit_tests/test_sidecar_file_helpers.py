@@ -0,0 +1,35 @@
+""" Unit tests for sidecar_file_helpers """
+
+import os
+
+from benjaminhamon_document_manipulation_toolkit import sidecar_file_helpers
+
+
+def test_save_and_load(tmpdir):
+    file_path = os.path.join(tmpdir, "Cache", "Data.json")
+
+    sidecar_file_helpers.save_sidecar_file(file_path, "1", { "entries": { "key": "value" } })
+
+    assert os.listdir(os.path.join(tmpdir, "Cache")) == [ "Data.json" ]
+    assert sidecar_file_helpers.load_sidecar_file(file_path, "1") == { "format_version": "1", "entries": { "key": "value" } }
+    assert sidecar_file_helpers.load_sidecar_file(file_path, "2") is None
+
+
+def test_save_with_simulate(tmpdir):
+    file_path = os.path.join(tmpdir, "Cache", "Data.json")
+
+    sidecar_file_helpers.save_sidecar_file(file_path, "1", { "entries": {} }, simulate = True)
+
+    assert not os.path.exists(os.path.join(tmpdir, "Cache"))
+
+
+def test_load_missing_or_invalid(tmpdir):
+    file_path = os.path.join(tmpdir, "Data.json")
+
+    assert sidecar_file_helpers.load_sidecar_file(file_path, "1") is None
+
+    for data in [ "{ invalid", "[ \"format_version\" ]" ]:
+        with open(file_path, mode = "w", encoding = "utf-8") as sidecar_file:
+            sidecar_file.write(data)
+
+        assert sidecar_file_helpers.load_sidecar_file(file_path, "1") is None
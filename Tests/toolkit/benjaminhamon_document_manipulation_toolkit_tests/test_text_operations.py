@@ -0,0 +1,27 @@
+""" Unit tests for text_operations """
+
+import pytest
+
+from benjaminhamon_document_manipulation_toolkit import text_operations
+
+
+def test_format_text():
+    parameters = { "name": "World", "count": 5, "width": 4 }
+
+    for source_text in [ "Hello {name}!", "No fields", "Escaped {{braces}}", "{count:03d}", "{count:{width}}", "{name!r}" ]:
+        assert text_operations.format_text(source_text, parameters) == source_text.format(**parameters)
+
+
+def test_format_text_with_missing_parameter():
+    with pytest.raises(KeyError, match = "Parameter 'other' is required"):
+        text_operations.format_text("Hello {other}!", { "name": "World" })
+
+
+def test_compile_text():
+    text_template = text_operations.compile_text("Hello {name}!")
+
+    assert text_operations.compile_text("Hello {name}!") is text_template
+    assert text_template.has_fields
+    assert not text_operations.compile_text("Hello {{name}}!").has_fields
+    assert text_template.format({ "name": "first" }) == "Hello first!"
+    assert text_template.format({ "name": "second" }) == "Hello second!"
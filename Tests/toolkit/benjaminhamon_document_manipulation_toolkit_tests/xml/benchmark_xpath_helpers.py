@@ -0,0 +1,45 @@
+# cspell:words lxml nsmap opendocument
+
+""" Benchmarks for xpath_helpers, run as a module from the Tests/toolkit directory """
+
+import lxml.etree
+
+from benjaminhamon_document_manipulation_toolkit.epub import epub_xhtml_helpers
+from benjaminhamon_document_manipulation_toolkit.xml import xpath_helpers
+from benjaminhamon_document_manipulation_toolkit_tests import benchmark_helpers
+
+
+def create_odt_content(paragraph_count: int) -> lxml.etree._Element:
+    root = lxml.etree.fromstring(
+        "<office:document xmlns:office=\"urn:oasis:names:tc:opendocument:xmlns:office:1.0\""
+        + " xmlns:text=\"urn:oasis:names:tc:opendocument:xmlns:text:1.0\"><office:body><office:text/></office:body></office:document>")
+
+    body = root[0][0]
+    for paragraph_index in range(paragraph_count):
+        paragraph = lxml.etree.SubElement(body, "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}p")
+        paragraph.text = "Paragraph %s" % paragraph_index
+
+    return root
+
+
+def main() -> None:
+    root = create_odt_content(10)
+    paragraph = root[0][0][0]
+    namespaces = xpath_helpers.sanitize_namespaces_for_xpath(root.nsmap)
+    xhtml_document = epub_xhtml_helpers.create_xhtml_base("Title")
+
+    number = 20000
+
+    benchmark_helpers.run_benchmark("lxml element.xpath (compiled on every call)",
+        lambda: paragraph.xpath("./ancestor::office:body", namespaces = namespaces), number, repeat = 5)
+    benchmark_helpers.run_benchmark("xpath_helpers.find_xml_element (compiled once)",
+        lambda: xpath_helpers.find_xml_element(paragraph, "./ancestor::office:body", namespaces), number, repeat = 5)
+
+    benchmark_helpers.run_benchmark("epub_xhtml_helpers.find_xhtml_element (compiled on every call)",
+        lambda: xhtml_document.getroot().xpath("./x:head/x:title", namespaces = { "x": "http://www.w3.org/1999/xhtml" }), number, repeat = 5)
+    benchmark_helpers.run_benchmark("epub_xhtml_helpers.find_xhtml_element (compiled once)",
+        lambda: epub_xhtml_helpers.find_xhtml_element(xhtml_document.getroot(), "./x:head/x:title"), number, repeat = 5)
+
+
+if __name__ == "__main__":
+    main()
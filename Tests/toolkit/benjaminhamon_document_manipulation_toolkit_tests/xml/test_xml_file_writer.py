@@ -0,0 +1,102 @@
+# cspell:words lxml
+
+""" Unit tests for xml_file_writer """
+
+import copy
+import io
+import os
+
+import lxml.etree
+import pytest
+
+from benjaminhamon_document_manipulation_toolkit.xml import xml_file_writer
+
+
+document_as_string = (
+    "<root xmlns=\"urn:default\" xmlns:x=\"urn:example\">"
+    + "<head><title>Title</title></head>"
+    + "<body><x:section x:id=\"first\"><x:p>Some <x:span>text</x:span></x:p></x:section><x:section><x:p/></x:section></body>"
+    + "</root>"
+)
+
+
+@pytest.mark.parametrize("pretty_print", [ True, False ])
+def test_write_document_with_content(pretty_print):
+    document = lxml.etree.ElementTree(lxml.etree.fromstring(document_as_string))
+    doctype = "<?xml version=\"1.0\" encoding=\"utf-8\"?>"
+
+    expected_output = lxml.etree.tostring(document, encoding = "utf-8", pretty_print = pretty_print, doctype = doctype)
+
+    body = document.getroot()[1]
+    content = list(body)
+    for element in content:
+        body.remove(element)
+
+    output_file = io.BytesIO()
+    xml_file_writer.write_document_with_content(output_file, document, body, iter(content), pretty_print = pretty_print, doctype = doctype)
+
+    assert output_file.getvalue() == expected_output
+    assert len(body) == 0
+
+
+@pytest.mark.parametrize("encoding", [ "iso-8859-1", "ascii", "utf-16" ])
+def test_write_document_with_content_with_encoding(encoding):
+    document = lxml.etree.ElementTree(lxml.etree.fromstring(document_as_string.replace("Some", "Somé")))
+
+    expected_output = lxml.etree.tostring(document, encoding = encoding, pretty_print = True)
+
+    body = document.getroot()[1]
+    content = list(body)
+    for element in content:
+        body.remove(element)
+
+    output_file = io.BytesIO()
+    xml_file_writer.write_document_with_content(output_file, document, body, iter(content), encoding = encoding)
+
+    assert output_file.getvalue() == expected_output
+
+
+def test_write_document_with_content_without_indentation():
+    document = lxml.etree.ElementTree(lxml.etree.fromstring(document_as_string))
+
+    body = document.getroot()[1]
+    content = list(body)
+    for element in content:
+        body.remove(element)
+
+    output_file = io.BytesIO()
+    xml_file_writer.write_document_with_content(output_file, document, body, iter(copy.deepcopy(content)), indent_content = False)
+
+    for element in content:
+        body.append(element)
+        element.text = element.text if element.text is not None else ""
+
+    assert output_file.getvalue() == lxml.etree.tostring(document, encoding = "utf-8", pretty_print = True)
+
+
+def test_write_document_with_content_empty():
+    document = lxml.etree.ElementTree(lxml.etree.fromstring(document_as_string))
+    body = document.getroot()[1]
+
+    output_file = io.BytesIO()
+    xml_file_writer.write_document_with_content(output_file, document, body, [])
+
+    assert output_file.getvalue() == lxml.etree.tostring(document, encoding = "utf-8", pretty_print = True)
+
+
+def test_open_output_file(tmpdir):
+    output_file_path = os.path.join(tmpdir, "Output.xml")
+
+    with xml_file_writer.open_output_file(output_file_path, simulate = True) as output_file:
+        output_file.write(b"<root/>")
+
+    assert not os.path.exists(output_file_path)
+
+    with xml_file_writer.open_output_file(output_file_path) as output_file:
+        output_file.write(b"<root/>")
+        assert not os.path.exists(output_file_path)
+
+    assert not os.path.exists(output_file_path + ".tmp")
+
+    with open(output_file_path, mode = "rb") as output_file:
+        assert output_file.read() == b"<root/>"
@@ -0,0 +1,22 @@
+# cspell:words lxml
+
+""" Unit tests for xml_namespace """
+
+import lxml.etree
+
+from benjaminhamon_document_manipulation_toolkit.xml import xml_namespace
+
+
+def test_get_name():
+    namespace = xml_namespace.get_namespace("urn:example")
+
+    assert xml_namespace.get_namespace("urn:example") is namespace
+    assert namespace.get_name("item") == str(lxml.etree.QName("urn:example", "item"))
+    assert namespace.get_name("item") is namespace.get_name("item")
+
+
+def test_get_local_name():
+    root = lxml.etree.fromstring("<x:root xmlns:x=\"urn:example\"><x:item/><other/><!-- comment --></x:root>")
+
+    assert xml_namespace.get_local_name(root) == "root"
+    assert [ xml_namespace.get_local_name(element) for element in root if element.tag is not lxml.etree.Comment ] == [ "item", "other" ]
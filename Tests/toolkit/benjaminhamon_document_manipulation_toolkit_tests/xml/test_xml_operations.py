@@ -0,0 +1,28 @@
+# cspell:words lxml
+
+""" Unit tests for xml_operations """
+
+import lxml.etree
+
+from benjaminhamon_document_manipulation_toolkit.xml import xml_operations
+
+
+def test_format_text_in_xml():
+    root = lxml.etree.fromstring(
+        "<html><head><style>p { color: red; }</style></head><body><p>Hello <b>{name}</b>, from {place}.<!-- {comment} --></p></body></html>")
+
+    xml_operations.format_text_in_xml(root, { "name": "World", "place": "here" })
+
+    assert lxml.etree.tostring(root) == (
+        b"<html><head><style>p { color: red; }</style></head><body><p>Hello <b>World</b>, from here.<!-- {comment} --></p></body></html>")
+
+
+def test_find_element_at_position():
+    root = lxml.etree.fromstring("<root><first/><second><item/><item/></second></root>")
+    element = root[1][1]
+
+    position = xml_operations.get_element_position(root, element)
+
+    assert position == [ 1, 1 ]
+    assert xml_operations.find_element_at_position(root, position) is element
+    assert len(xml_operations.get_element_position(root, root)) == 0
@@ -0,0 +1,45 @@
+# cspell:words lxml
+
+""" Unit tests for XmlTemplateCache """
+
+from typing import List, Optional
+
+import lxml.etree
+
+from benjaminhamon_document_manipulation_toolkit.xml.xml_template import XmlTemplate
+from benjaminhamon_document_manipulation_toolkit.xml.xml_template_cache import XmlTemplateCache
+
+
+def test_get_template():
+    all_loaded_templates: List[Optional[str]] = []
+
+    def load_template(template_file_path: Optional[str]) -> XmlTemplate:
+        all_loaded_templates.append(template_file_path)
+        root = lxml.etree.fromstring("<html><head><title/><link href=\"style.css\"/></head><body/></html>")
+        return XmlTemplate(root.getroottree(), { "links": root.findall("./head/link"), "body": [ root.find("./body") ] })
+
+    template_cache = XmlTemplateCache()
+
+    template = template_cache.get_template("html", "Template.html", load_template)
+    assert template_cache.get_template("html", "Template.html", load_template) is template
+    assert template_cache.get_template("xhtml", "Template.html", load_template) is not template
+    assert template_cache.get_template("html", None, load_template) is not template
+    assert all_loaded_templates == [ "Template.html", "Template.html", None ]
+
+
+def test_create_document():
+    root = lxml.etree.fromstring("<html><head><title/><link href=\"style.css\"/></head><body/></html>")
+    template = XmlTemplate(root.getroottree(), { "links": root.findall("./head/link"), "body": [ root.find("./body") ] })
+
+    first_document, first_anchors = template.create_document()
+    second_document, second_anchors = template.create_document()
+
+    assert first_anchors["links"][0].getroottree().getroot() is first_document.getroot()
+    assert first_anchors["body"][0].tag == "body"
+
+    first_anchors["links"][0].attrib["href"] = "../style.css"
+    first_anchors["body"][0].text = "Some text"
+
+    assert second_anchors["links"][0].attrib["href"] == "style.css"
+    assert second_anchors["body"][0].text is None
+    assert lxml.etree.tostring(template.document) == lxml.etree.tostring(second_document)
@@ -0,0 +1,29 @@
+# cspell:words lxml
+
+""" Unit tests for XmlTextTemplate """
+
+import lxml.etree
+
+from benjaminhamon_document_manipulation_toolkit.xml.xml_text_template import XmlTextTemplate
+
+
+def test_format():
+    root = lxml.etree.fromstring("<p><span>Dear {name},</span><br/>{greeting}<span>No fields</span></p>")
+    xml_template = XmlTextTemplate(root)
+
+    assert xml_template.has_fields()
+
+    first_copy = xml_template.format({ "name": "Alice", "greeting": "Hello" })
+    second_copy = xml_template.format({ "name": "Bob", "greeting": "Goodbye" })
+
+    assert lxml.etree.tostring(first_copy) == b"<p><span>Dear Alice,</span><br/>Hello<span>No fields</span></p>"
+    assert lxml.etree.tostring(second_copy) == b"<p><span>Dear Bob,</span><br/>Goodbye<span>No fields</span></p>"
+    assert lxml.etree.tostring(root) == b"<p><span>Dear {name},</span><br/>{greeting}<span>No fields</span></p>"
+
+
+def test_format_without_fields():
+    root = lxml.etree.fromstring("<p><span>No fields</span></p>")
+    xml_template = XmlTextTemplate(root)
+
+    assert not xml_template.has_fields()
+    assert lxml.etree.tostring(xml_template.format({})) == lxml.etree.tostring(root)
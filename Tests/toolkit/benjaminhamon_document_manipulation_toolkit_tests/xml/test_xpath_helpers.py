@@ -0,0 +1,33 @@
+# cspell:words lxml opendocument
+
+""" Unit tests for xpath_helpers """
+
+import lxml.etree
+
+from benjaminhamon_document_manipulation_toolkit.xml import xpath_helpers
+
+
+def test_get_compiled_xpath():
+    namespaces = { "text": "urn:oasis:names:tc:opendocument:xmlns:text:1.0" }
+
+    xpath = xpath_helpers.get_compiled_xpath("./text:p", namespaces)
+
+    assert xpath_helpers.get_compiled_xpath("./text:p", dict(namespaces)) is xpath
+    assert xpath_helpers.get_compiled_xpath("./text:h", namespaces) is not xpath
+    assert xpath_helpers.get_compiled_xpath("./text:p", { "text": "urn:example" }) is not xpath
+
+
+def test_find_xml_element():
+    root = lxml.etree.fromstring("<root xmlns:x=\"urn:example\"><x:item>first</x:item><x:item>second</x:item></root>")
+    namespaces = xpath_helpers.sanitize_namespaces_for_xpath(root.nsmap)
+
+    assert xpath_helpers.find_xml_element(root, "./x:item", namespaces).text == "first"
+    assert [ element.text for element in xpath_helpers.try_find_xml_element_collection(root, "./x:item", namespaces) ] == [ "first", "second" ]
+    assert xpath_helpers.try_find_xml_element(root, "./x:other", namespaces) is None
+
+
+def test_sanitize_namespaces_for_xpath():
+    namespaces = { None: "urn:default", "x": "urn:example" }
+
+    assert xpath_helpers.sanitize_namespaces_for_xpath(namespaces, "d") == { "d": "urn:default", "x": "urn:example" }
+    assert xpath_helpers.sanitize_namespaces_for_xpath({ "x": "urn:example" }) == { "x": "urn:example" }